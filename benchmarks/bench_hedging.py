@@ -0,0 +1,121 @@
+"""
+Hedged Requests Benchmark
+
+Runs a batch of calls against a fake worker-tier model with a long latency
+tail (lognormal body plus occasional stragglers), once without hedging and
+once through HedgedLlm, and reports p50/p95/p99 latency, the hedge rate and
+the extra requests sent. Latencies are scaled down (--median seconds) so the
+run takes seconds.
+
+Usage:
+    python benchmarks/bench_hedging.py --calls 400 --percentile 0.95 --max-hedge-rate 0.1
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from shouldisignthis.llm.hedging import HedgedLlm, HedgePolicy
+
+OUTPUT_DIR = Path(__file__).parent.parent / "test_output" / "benchmarks"
+
+
+class LongTailModel(BaseLlm):
+    """Fake model: lognormal latency, with `straggler_rate` of calls `straggler_factor` times slower."""
+
+    median: float = 0.05
+    sigma: float = 0.4
+    straggler_rate: float = 0.03
+    straggler_factor: float = 10.0
+    requests: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.requests += 1
+        latency = self.median * math.exp(self.sigma * random.gauss(0, 1))
+        if random.random() < self.straggler_rate:
+            latency *= self.straggler_factor
+        await asyncio.sleep(latency)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="{}")]))
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+async def run(llm: BaseLlm, calls: int, concurrency: int) -> list:
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="Find the risks.")])])
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            async for _ in llm.generate_content_async(request):
+                pass
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return latencies
+
+
+def summarize(name: str, latencies: list, requests: int, calls: int) -> dict:
+    result = {
+        "mode": name,
+        "p50_s": round(statistics.median(latencies), 4),
+        "p95_s": round(percentile(latencies, 0.95), 4),
+        "p99_s": round(percentile(latencies, 0.99), 4),
+        "extra_requests": round(requests / calls - 1, 3),
+    }
+    print(f"{'🏇' if name == 'hedged' else '🐢'} {name:>9}: p50 {result['p50_s'] * 1000:.0f} ms, p95 {result['p95_s'] * 1000:.0f} ms, "
+          f"p99 {result['p99_s'] * 1000:.0f} ms, extra requests {result['extra_requests']:.1%}")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tail latency with and without hedged requests.")
+    parser.add_argument("--calls", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--median", type=float, default=0.05, help="Median latency of the fake model (s)")
+    parser.add_argument("--straggler-rate", type=float, default=0.03)
+    parser.add_argument("--percentile", type=float, default=0.95)
+    parser.add_argument("--max-hedge-rate", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    model_args = {"model": "bench-worker", "median": args.median, "straggler_rate": args.straggler_rate}
+
+    baseline_model = LongTailModel(**model_args)
+    baseline = summarize("unhedged", asyncio.run(run(baseline_model, args.calls, args.concurrency)), baseline_model.requests, args.calls)
+
+    hedged_model = LongTailModel(**model_args)
+    policy = HedgePolicy(
+        "bench-worker", percentile=args.percentile, max_hedge_rate=args.max_hedge_rate, control_rate=0.0,
+        initial_delay_seconds=args.median * 4, min_delay_seconds=0.0
+    )
+    hedged = summarize("hedged", asyncio.run(run(HedgedLlm.wrap(hedged_model, policy=policy), args.calls, args.concurrency)), hedged_model.requests, args.calls)
+    hedged["hedge_rate"] = round(policy.stats()["hedge_rate"], 3)
+    print(f"📉 p99 {baseline['p99_s'] * 1000:.0f} -> {hedged['p99_s'] * 1000:.0f} ms "
+          f"({1 - hedged['p99_s'] / baseline['p99_s']:.0%} lower) for {hedged['extra_requests']:.1%} extra requests")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output = OUTPUT_DIR / "hedging.json"
+    with open(output, "w") as f:
+        json.dump({"args": vars(args), "results": [baseline, hedged]}, f, indent=2)
+    print(f"💾 Results saved to: {output}")
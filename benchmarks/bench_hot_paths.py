@@ -0,0 +1,200 @@
+"""
+Hot Path Microbenchmarks
+
+Measures ops/sec and memory allocations of the CPU-side functions that run on
+every request: orchestrator.parse_json, risk_calculator.assess_contract_risk,
+pdf_generator.create_contract_report and create_comparison_report.
+
+Each function is run on realistic inputs (ground-truth outputs of the sample
+contracts) and adversarial ones (500-risk evidence sets, 1 MB model outputs,
+200-row risk tables).
+
+Usage:
+    python benchmarks/bench_hot_paths.py
+    python benchmarks/bench_hot_paths.py --filter parse_json --min-time 2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shouldisignthis.orchestrator import parse_json
+from shouldisignthis.tools.pdf_generator import create_contract_report, create_comparison_report
+from shouldisignthis.tools.risk_calculator import assess_contract_risk
+
+REPO_ROOT = Path(__file__).parent.parent
+GROUND_TRUTH_DIR = REPO_ROOT / "shouldisignthis" / "tests" / "ground_truth" / "complex_contract"
+COMPARISON_OUTPUT = REPO_ROOT / "sample_test_outputs" / "comparator_integration_output.json"
+DEFAULT_OUTPUT = REPO_ROOT / "test_output" / "benchmarks" / "hot_paths.json"
+
+SEVERITIES = ["CRITICAL", "HIGH", "MEDIUM", "LOW"]
+ONE_MB = 1024 * 1024
+
+
+def load_json(path: Path):
+    with open(path) as f:
+        return json.load(f)
+
+
+# --- INPUT GENERATORS ---
+
+def make_risks(n: int, rng: random.Random) -> list:
+    """Synthetic Skeptic risks shaped like the ground-truth ones."""
+    return [
+        {
+            "risk": f"Risk {i}: {rng.choice(['Termination', 'Liability', 'Payment', 'Indemnity', 'Non-Compete', 'IP'])} Clause",
+            "severity": rng.choice(SEVERITIES),
+            "page": rng.randint(1, 40),
+            "risk_type": rng.choice(["UNFAVORABLE_TERM", "MISSING_CLAUSE", "AMBIGUOUS"]),
+            "deviation_type": "UNFAVORABLE",
+            "explanation": "The clause allocates risk one-sidedly and lacks a cure period. " * rng.randint(1, 4),
+        }
+        for i in range(n)
+    ]
+
+
+def make_counters(n: int, rng: random.Random) -> list:
+    return [
+        {
+            "topic": rng.choice(["Termination", "Liability", "Payment", "Indemnity", "Non-Compete", "IP"]) + f" {i}",
+            "counter": "This is standard for the industry and negotiable in practice. " * 2,
+            "confidence": rng.choice(["HIGH", "MEDIUM", "LOW"]),
+        }
+        for i in range(n)
+    ]
+
+
+def make_payload(size: int, rng: random.Random) -> str:
+    """A valid JSON risk list of at least `size` bytes."""
+    risks = []
+    while True:
+        risks.extend(make_risks(100, rng))
+        payload = json.dumps({"risks": risks})
+        if len(payload) >= size:
+            return payload
+
+
+def pad_to(text: str, size: int) -> str:
+    return (text * (size // max(1, len(text)) + 1))[:size]
+
+
+def build_cases(rng: random.Random) -> list:
+    """
+    Builds the benchmark cases.
+
+    Returns:
+        list: (group, name, callable) tuples.
+    """
+    risks = load_json(GROUND_TRUTH_DIR / "skeptic_risks.json")["risks"]
+    counters = load_json(GROUND_TRUTH_DIR / "advocate_defense.json")["counters"]
+    verdict = load_json(GROUND_TRUTH_DIR / "final_verdict.json")
+    comparison = load_json(COMPARISON_OUTPUT)
+
+    verdict_raw = json.dumps(verdict, indent=2)
+    big_risks = make_risks(500, rng)
+    big_counters = make_counters(500, rng)
+    big_payload = make_payload(ONE_MB, rng)
+    prose = "Here is my analysis of the contract. I considered every clause carefully. "
+
+    parse_inputs = {
+        "fenced_verdict": f"```json\n{verdict_raw}\n```",
+        "1mb_fenced": f"```json\n{big_payload}\n```",
+        # Conversational text around the JSON forces the regex fallback
+        "1mb_prose_wrapped": f"{pad_to(prose, ONE_MB // 2)}\n{verdict_raw}\n{pad_to(prose, ONE_MB // 2)}",
+        # Truncated output (no closing brace): both parse attempts fail
+        "1mb_truncated": big_payload[:ONE_MB],
+        "dict_passthrough": verdict,
+    }
+
+    comparison_rows = dict(comparison)
+    comparison_rows["key_differences"] = (comparison["key_differences"] * (200 // max(1, len(comparison["key_differences"])) + 1))[:200]
+
+    cases = [("parse_json", name, (lambda raw=raw: parse_json(raw))) for name, raw in parse_inputs.items()]
+    cases += [
+        ("assess_contract_risk", "ground_truth", lambda: assess_contract_risk(json.dumps(risks), json.dumps(counters))),
+        ("assess_contract_risk", "500_risks_500_counters", lambda: assess_contract_risk(json.dumps(big_risks), json.dumps(big_counters))),
+        ("assess_contract_risk", "500_risks_no_counters", lambda: assess_contract_risk(json.dumps(big_risks), "[]")),
+        ("create_contract_report", "ground_truth", lambda: create_contract_report("complex_contract.pdf", verdict["verdict"], verdict["risk_score"], verdict["summary"], risks)),
+        ("create_contract_report", "200_risk_rows", lambda: create_contract_report("big.pdf", "REJECT", 10, verdict["summary"], big_risks[:200])),
+        ("create_comparison_report", "ground_truth", lambda: create_comparison_report("a.pdf", "b.pdf", comparison, verdict, verdict)),
+        ("create_comparison_report", "200_difference_rows", lambda: create_comparison_report("a.pdf", "b.pdf", comparison_rows, verdict, verdict)),
+    ]
+    return cases
+
+
+# --- HARNESS ---
+
+def measure(fn, min_time: float, min_runs: int) -> dict:
+    """
+    Times `fn` for at least `min_time` seconds, then measures one call under tracemalloc.
+
+    Returns:
+        dict: ops/sec, per-call latency and allocation stats.
+    """
+    fn()  # warm-up (imports, caches, font loading)
+    timings = []
+    start = time.perf_counter()
+    while len(timings) < min_runs or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    timings.sort()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn()
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename") if stat.size_diff > 0)
+
+    return {
+        "runs": len(timings),
+        "ops_per_sec": round(len(timings) / elapsed, 2),
+        "median_ms": round(timings[len(timings) // 2] * 1000, 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+        "peak_alloc_kb": round(peak / 1024, 1),
+        "retained_kb": round(allocated / 1024, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for local hot paths.")
+    parser.add_argument("--filter", type=str, help="Only run cases whose group or name contains this string")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Minimum seconds per case")
+    parser.add_argument("--min-runs", type=int, default=3, help="Minimum runs per case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    # parse_json logs failures; the benchmark inputs fail on purpose
+    logging.disable(logging.CRITICAL)
+
+    results = []
+    print(f"{'function':<26} {'case':<24} {'ops/s':>10} {'median_ms':>10} {'p95_ms':>10} {'peak_kb':>10}")
+    for group, name, fn in build_cases(random.Random(args.seed)):
+        if args.filter and args.filter not in group and args.filter not in name:
+            continue
+        # assess_contract_risk prints a tool-call banner on every call
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = measure(fn, args.min_time, args.min_runs)
+        results.append({"function": group, "case": name, **stats})
+        print(f"{group:<26} {name:<24} {stats['ops_per_sec']:>10} {stats['median_ms']:>10} {stats['p95_ms']:>10} {stats['peak_alloc_kb']:>10}")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}, f, indent=2)
+    print(f"💾 Results saved to: {output}")
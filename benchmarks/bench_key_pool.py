@@ -0,0 +1,118 @@
+"""
+API Key Pool Throughput Benchmark
+
+Simulates a batch of model calls against keys that each enforce a
+requests-per-minute quota (a fake model answering 429 over quota), and
+measures calls/minute with 1, 2 and 4 keys in the pool. The window is scaled
+down (--window seconds instead of 60) so the run takes seconds.
+
+Usage:
+    python benchmarks/bench_key_pool.py --keys 1 2 4 --rpm 10 --calls 40
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import httpx
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from shouldisignthis.llm import key_pool
+from shouldisignthis.llm.key_pool import KeyPool, KeyPoolLlm
+
+OUTPUT_DIR = Path(__file__).parent.parent / "test_output" / "benchmarks"
+
+
+class QuotaLimitedModel(BaseLlm):
+    """Fake model enforcing an RPM quota per key over a sliding window."""
+
+    rpm: int = 10
+    window: float = 1.0
+    latency: float = 0.02
+    throttled: int = 0
+
+    def model_post_init(self, __context):
+        self._calls = collections.deque()
+
+    async def generate_content_async(self, llm_request, stream=False):
+        now = time.monotonic()
+        while self._calls and self._calls[0] <= now - self.window:
+            self._calls.popleft()
+        if len(self._calls) >= self.rpm:
+            self.throttled += 1
+            response = httpx.Response(429, request=httpx.Request("POST", "https://example.invalid"))
+            raise errors.ClientError(429, {"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}}, response)
+        self._calls.append(now)
+        await asyncio.sleep(self.latency)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=500),
+        )
+
+
+async def bench(num_keys: int, rpm: int, calls: int, window: float, concurrency: int) -> dict:
+    keys = [f"bench-key-{i}" for i in range(num_keys)]
+    models = {key: QuotaLimitedModel(model="bench-model", rpm=rpm, window=window) for key in keys}
+    # The pool knows the quota; keep its accounting slightly under the server's
+    pool = KeyPool("bench-model", keys, rpm=rpm * 0.9, tpm=10_000_000, cooldown_seconds=window / 4)
+    llm = KeyPoolLlm(model="bench-model", inner=models[keys[0]], models=models, pool=pool)
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="clause " * 200)])])
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def one():
+        nonlocal failed
+        async with semaphore:
+            try:
+                async for _ in llm.generate_content_async(request):
+                    pass
+            except errors.ClientError:
+                failed += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    elapsed = time.perf_counter() - start
+    return {
+        "keys": num_keys,
+        "calls": calls,
+        "failed": failed,
+        "throttled": sum(m.throttled for m in models.values()),
+        "elapsed_s": round(elapsed, 2),
+        "calls_per_window": round((calls - failed) / elapsed * window, 1),
+        "per_key": [row["requests"] for row in pool.utilization()],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput of the API key pool under per-key RPM quotas.")
+    parser.add_argument("--keys", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--rpm", type=int, default=10, help="Requests per window allowed per key")
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--window", type=float, default=1.0, help="Quota window in seconds (60 in production)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    key_pool.WINDOW_SECONDS = args.window
+    results = []
+    for num_keys in args.keys:
+        result = asyncio.run(bench(num_keys, args.rpm, args.calls, args.window, args.concurrency))
+        results.append(result)
+        print(f"🔑 {num_keys} key(s): {result['calls_per_window']} calls/window, "
+              f"{result['elapsed_s']}s, throttled {result['throttled']}, failed {result['failed']}, per key {result['per_key']}")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output = OUTPUT_DIR / "key_pool.json"
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to: {output}")
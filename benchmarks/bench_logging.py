@@ -0,0 +1,144 @@
+"""
+Logging Overhead Benchmark
+
+Measures the per-pipeline cost of logging by running the full orchestrator on
+the offline replay backend (zero model latency, so logging dominates) under:
+
+    off      - logging disabled, no ADK logging plugin (baseline)
+    legacy   - synchronous stdout/file handlers + ADK LoggingPlugin (print)
+    pipeline - queue-based handlers + SampledLoggingPlugin (current default)
+
+at INFO and DEBUG. stdout is redirected to a temp file whose writes take
+--sink-latency-ms each, standing in for a container log driver or a full
+pipe. Modes are interleaved run by run so drift affects them equally.
+
+Usage:
+    python benchmarks/bench_logging.py --runs 20
+    python benchmarks/bench_logging.py --runs 20 --sink-latency-ms 0
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+os.environ["SHOULDISIGNTHIS_MODEL_BACKEND"] = "replay"
+os.environ["SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE"] = "0"
+
+from google.adk.plugins.logging_plugin import LoggingPlugin
+
+from shouldisignthis import orchestrator
+from shouldisignthis.config import APP_CONFIG, configure_logging
+from shouldisignthis.observability.log_pipeline import stop_log_listener
+from shouldisignthis.observability.plugins import MetricsPlugin, UsagePlugin
+
+SAMPLE_CONTRACT = Path(__file__).parent.parent / "shouldisignthis" / "tests" / "sample_contracts" / "sample_contract.pdf"
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "test_output" / "benchmarks" / "logging.json"
+
+DEFAULT_GET_PLUGINS = orchestrator.get_plugins
+
+
+def _legacy_plugins() -> list:
+    return [LoggingPlugin(), UsagePlugin(), MetricsPlugin()]
+
+
+def _no_logging_plugins() -> list:
+    return [UsagePlugin(), MetricsPlugin()]
+
+
+class SlowSink:
+    """A file-like stdout whose writes block for a fixed time."""
+
+    def __init__(self, stream, latency_s: float):
+        self.stream = stream
+        self.latency_s = latency_s
+
+    def write(self, data: str) -> int:
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        return self.stream.write(data)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def setup(mode: str, level: int, log_dir: str) -> None:
+    """Configures logging and the orchestrator plugins for one benchmark mode."""
+    logging.disable(logging.NOTSET)
+    APP_CONFIG.setdefault("logging", {})["log_dir"] = log_dir
+    APP_CONFIG["logging"]["async"] = mode == "pipeline"
+    configure_logging(log_file_override=f"bench_{mode}.log", log_level_override=level)
+    if mode == "off":
+        logging.disable(logging.CRITICAL)
+        orchestrator.get_plugins = _no_logging_plugins
+    elif mode == "legacy":
+        orchestrator.get_plugins = _legacy_plugins
+    else:
+        orchestrator.get_plugins = DEFAULT_GET_PLUGINS
+
+
+def bench(runs: int, pdf_bytes: bytes) -> list:
+    async def run_all():
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await orchestrator.run_pipeline(pdf_bytes, "application/pdf", "bench_user", str(uuid.uuid4()), tone="Professional")
+            timings.append(time.perf_counter() - start)
+        return timings
+    return asyncio.run(run_all())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-pipeline logging overhead.")
+    parser.add_argument("--runs", type=int, default=20, help="Pipelines per configuration")
+    parser.add_argument("--sink-latency-ms", type=float, default=0.1, help="Blocking time of each stdout write")
+    parser.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    pdf_bytes = SAMPLE_CONTRACT.read_bytes()
+    modes = ("off", "legacy", "pipeline")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.path.join(tmp, "stdout.txt"), "w") as stdout_file:
+        sink = SlowSink(stdout_file, args.sink_latency_ms / 1000)
+        for level_name in ("INFO", "DEBUG"):
+            level = getattr(logging, level_name)
+            timings = {mode: [] for mode in modes}
+            with redirect_stdout(sink):
+                for i in range(args.runs + 1):
+                    for mode in modes:
+                        setup(mode, level, tmp)
+                        elapsed = bench(1, pdf_bytes)[0]
+                        stop_log_listener()
+                        if i > 0:  # first round is warm-up
+                            timings[mode].append(elapsed)
+            for mode in modes:
+                results[f"{level_name}/{mode}"] = {
+                    "mean_ms": round(statistics.mean(timings[mode]) * 1000, 2),
+                    "median_ms": round(statistics.median(timings[mode]) * 1000, 2),
+                }
+                print(f"⏱️ {level_name:<5} {mode:<8} {results[f'{level_name}/{mode}']['median_ms']:>8} ms/pipeline (median)")
+
+    logging.disable(logging.NOTSET)
+    print(f"\n{'level':<6} {'legacy overhead':>16} {'pipeline overhead':>18}")
+    for level_name in ("INFO", "DEBUG"):
+        base = results[f"{level_name}/off"]["median_ms"]
+        for mode in ("legacy", "pipeline"):
+            results[f"{level_name}/{mode}"]["overhead_ms"] = round(results[f"{level_name}/{mode}"]["median_ms"] - base, 2)
+        print(f"{level_name:<6} {results[f'{level_name}/legacy']['overhead_ms']:>13} ms {results[f'{level_name}/pipeline']['overhead_ms']:>15} ms")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"runs": args.runs, "sink_latency_ms": args.sink_latency_ms, "results": results}, f, indent=2)
+    print(f"💾 Results saved to: {output}")
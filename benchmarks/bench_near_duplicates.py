@@ -0,0 +1,79 @@
+"""
+Near-Duplicate Lookup Benchmark
+
+Fills a SimHashIndex with random fingerprints (stand-ins for analyzed
+contracts) and measures lookup latency for near duplicates (a few bits
+flipped from a stored fingerprint) and for new contracts (random
+fingerprints), plus the recall of the near-duplicate lookups.
+
+Usage:
+    python benchmarks/bench_near_duplicates.py --contracts 100000 --max-distance 6
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shouldisignthis.near_duplicates import SimHashIndex
+
+OUTPUT_DIR = Path(__file__).parent.parent / "test_output" / "benchmarks"
+
+
+def timed_queries(index, queries):
+    latencies = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(index.query(query))
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return results, {
+        "p50_us": round(statistics.median(latencies) * 1e6, 1),
+        "p99_us": round(latencies[int(len(latencies) * 0.99) - 1] * 1e6, 1),
+        "max_us": round(latencies[-1] * 1e6, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SimHash near-duplicate lookup latency.")
+    parser.add_argument("--contracts", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=5000)
+    parser.add_argument("--max-distance", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    index = SimHashIndex(args.max_distance)
+    stored = [rng.getrandbits(64) for _ in range(args.contracts)]
+    start = time.perf_counter()
+    for key, fingerprint in enumerate(stored):
+        index.add(key, fingerprint)
+    print(f"🧬 Indexed {args.contracts} fingerprints in {time.perf_counter() - start:.2f}s")
+
+    targets = [rng.randrange(args.contracts) for _ in range(args.queries)]
+    near_queries = []
+    for key in targets:
+        query = stored[key]
+        for bit in rng.sample(range(64), rng.randint(1, args.max_distance)):
+            query ^= 1 << bit
+        near_queries.append(query)
+    near_results, near = timed_queries(index, near_queries)
+    near["recall"] = sum(key in dict(result) for key, result in zip(targets, near_results)) / args.queries
+    _, new = timed_queries(index, [rng.getrandbits(64) for _ in range(args.queries)])
+
+    print(f"⏱️ near duplicates: p50 {near['p50_us']} µs, p99 {near['p99_us']} µs, recall {near['recall']:.1%}")
+    print(f"⏱️ new contracts:   p50 {new['p50_us']} µs, p99 {new['p99_us']} µs")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    output = OUTPUT_DIR / "near_duplicates.json"
+    with open(output, "w") as f:
+        json.dump({"args": vars(args), "near_duplicates": near, "new_contracts": new}, f, indent=2)
+    print(f"💾 Results saved to: {output}")
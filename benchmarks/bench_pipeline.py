@@ -0,0 +1,218 @@
+"""
+Pipeline Benchmark Suite
+
+Runs every stage for each sample contract in tests/sample_contracts/ and
+records per stage: wall time, model-call count, input/output tokens, tool
+calls and retries, plus the process peak RSS. Results are written to JSON and
+can be compared against a stored baseline to flag regressions.
+
+Usage:
+    # Offline (replay backend, no API calls)
+    python benchmarks/bench_pipeline.py run --backend replay --latency-scale 0
+
+    # Live Gemini API (costs money)
+    python benchmarks/bench_pipeline.py run --backend live --contracts sample_contract
+
+    # Flag regressions (exit code 1 if any)
+    python benchmarks/bench_pipeline.py compare test_output/benchmarks/pipeline.json \\
+        --baseline benchmarks/baselines/replay.json
+
+    # Refresh the stored baseline
+    python benchmarks/bench_pipeline.py run --backend replay --latency-scale 0 \\
+        --output benchmarks/baselines/replay.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+import uuid
+from datetime import datetime
+from importlib import metadata
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+SAMPLE_CONTRACTS_DIR = Path(__file__).parent.parent / "shouldisignthis" / "tests" / "sample_contracts"
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "test_output" / "benchmarks" / "pipeline.json"
+STAGES = ["stage_1", "stage_2", "stage_2_5", "stage_3", "stage_4"]
+
+# Per-stage metrics summarised and compared against the baseline (lower is better)
+COMPARED_METRICS = ["wall_s", "model_calls", "input_tokens", "output_tokens", "retries"]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+async def bench_contract(pdf_path: Path, tone: str) -> dict:
+    """Runs all stages on one contract, measuring each stage separately."""
+    from shouldisignthis.observability.usage import track_usage
+    from shouldisignthis.orchestrator import run_stage_1, run_stage_2, run_stage_2_5, run_stage_3, run_stage_4, parse_json
+
+    pdf_bytes = pdf_path.read_bytes()
+    user_id = "benchmark_user"
+    session_id = str(uuid.uuid4())
+    stages = {}
+
+    async def measure(name, coro):
+        with track_usage() as usage:
+            start = time.perf_counter()
+            out = await coro
+            wall = time.perf_counter() - start
+        stages[name] = {"wall_s": round(wall, 4), **usage.as_dict(), "peak_rss_mb": peak_rss_mb()}
+        return out
+
+    auditor_out = await measure("stage_1", run_stage_1(pdf_bytes, "application/pdf", user_id, session_id))
+    if not auditor_out or not auditor_out.get("is_contract") or auditor_out.get("is_safe") is False:
+        return {"status": "REJECTED", "stages": stages}
+
+    fact_sheet = auditor_out.get("fact_sheet")
+    state, _ = await measure("stage_2", run_stage_2(user_id, session_id, fact_sheet))
+    risks = parse_json(state.get("skeptic_risks")).get("risks", [])
+    counters = parse_json(state.get("advocate_defense")).get("counters", [])
+    evidence = await measure("stage_2_5", run_stage_2_5(user_id, session_id, risks, counters, auditor_out.get("full_text")))
+    verdict = await measure("stage_3", run_stage_3(user_id, session_id, fact_sheet, evidence))
+    await measure("stage_4", run_stage_4(user_id, session_id, verdict, tone))
+    return {"status": "COMPLETE", "stages": stages}
+
+
+def summarize(contracts: dict) -> dict:
+    """Per-stage medians across contracts and repeats."""
+    summary = {}
+    for stage in STAGES:
+        rows = [run["stages"][stage] for runs in contracts.values() for run in runs if stage in run["stages"]]
+        if not rows:
+            continue
+        summary[stage] = {m: round(statistics.median(r[m] for r in rows), 4) for m in COMPARED_METRICS}
+        summary[stage]["samples"] = len(rows)
+    totals = [sum(s["wall_s"] for s in run["stages"].values()) for runs in contracts.values() for run in runs]
+    summary["pipeline"] = {"wall_s": round(statistics.median(totals), 4), "samples": len(totals)} if totals else {}
+    return summary
+
+
+def run_benchmark(args) -> dict:
+    if args.backend == "replay":
+        os.environ["SHOULDISIGNTHIS_MODEL_BACKEND"] = "replay"
+        os.environ["SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    else:
+        os.environ["SHOULDISIGNTHIS_MODEL_BACKEND"] = "gemini"
+    random.seed(args.seed)
+
+    from shouldisignthis.config import configure_logging, models_cfg
+    configure_logging(log_file_override="benchmark.log")
+
+    names = args.contracts or sorted(p.stem for p in SAMPLE_CONTRACTS_DIR.glob("*.pdf"))
+    contracts = {}
+    for name in names:
+        contracts[name] = []
+        for i in range(args.repeat):
+            print(f"⏱️ {name} (run {i + 1}/{args.repeat})...")
+            contracts[name].append(asyncio.run(bench_contract(SAMPLE_CONTRACTS_DIR / f"{name}.pdf", args.tone)))
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "backend": args.backend,
+            "latency_scale": args.latency_scale if args.backend == "replay" else None,
+            "models": {k: v for k, v in models_cfg.items() if isinstance(v, str)},
+            "google_adk": metadata.version("google-adk"),
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "contracts": contracts,
+        "summary": summarize(contracts),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float, min_wall_delta: float) -> list:
+    """
+    Flags per-stage metrics that got worse than the baseline by more than `threshold`.
+
+    Returns:
+        list: Human-readable regression descriptions (empty if none).
+    """
+    regressions = []
+    for stage, base in baseline.get("summary", {}).items():
+        cur = current.get("summary", {}).get(stage)
+        if not cur:
+            continue
+        for metric, base_value in base.items():
+            if metric == "samples" or metric not in cur:
+                continue
+            cur_value = cur[metric]
+            limit = base_value * (1 + threshold)
+            # Ignore sub-noise wall time changes on fast stages
+            if metric == "wall_s" and cur_value - base_value < min_wall_delta:
+                continue
+            if cur_value > limit and cur_value != base_value:
+                change = (cur_value - base_value) / base_value if base_value else float("inf")
+                regressions.append(f"{stage}.{metric}: {base_value} -> {cur_value} (+{change:.0%})")
+    return regressions
+
+
+def print_summary(result: dict) -> None:
+    print(f"\n{'stage':<10} {'wall_s':>8} {'calls':>6} {'in_tok':>8} {'out_tok':>8} {'retries':>8}")
+    for stage, s in result["summary"].items():
+        if stage == "pipeline":
+            continue
+        print(f"{stage:<10} {s['wall_s']:>8} {s['model_calls']:>6} {s['input_tokens']:>8} {s['output_tokens']:>8} {s['retries']:>8}")
+    if result["summary"].get("pipeline"):
+        print(f"{'pipeline':<10} {result['summary']['pipeline']['wall_s']:>8}")
+    print(f"Peak RSS: {result['peak_rss_mb']} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipeline latency and token benchmarks.")
+    sub = parser.add_subparsers(dest="command")
+
+    run_p = sub.add_parser("run", help="Run the benchmark")
+    run_p.add_argument("--backend", choices=["replay", "live"], default="replay")
+    run_p.add_argument("--latency-scale", type=float, default=1.0, help="Replay latency multiplier (0 = no sleeping)")
+    run_p.add_argument("--contracts", nargs="*", help="Contract names (default: all sample contracts)")
+    run_p.add_argument("--repeat", type=int, default=1)
+    run_p.add_argument("--tone", default="Professional")
+    run_p.add_argument("--seed", type=int, default=0, help="Seed for replay latency sampling")
+    run_p.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT))
+
+    cmp_p = sub.add_parser("compare", help="Compare a result file against a baseline")
+    cmp_p.add_argument("result", type=str)
+    cmp_p.add_argument("--baseline", type=str, required=True)
+    cmp_p.add_argument("--threshold", type=float, default=0.15, help="Allowed relative increase (0.15 = 15%%)")
+    cmp_p.add_argument("--min-wall-delta", type=float, default=0.05, help="Ignore wall time increases below this many seconds")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        result = run_benchmark(args)
+        print_summary(result)
+        output = Path(args.output)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        with open(output, "w") as f:
+            json.dump(result, f, indent=2)
+        print(f"💾 Results saved to: {output}")
+    elif args.command == "compare":
+        with open(args.result) as f:
+            current = json.load(f)
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold, args.min_wall_delta)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for r in regressions:
+                print(f"  • {r}")
+            sys.exit(1)
+        print("✅ No regressions against baseline.")
+    else:
+        parser.print_help()
@@ -0,0 +1,124 @@
+"""
+Sharded Skeptic Benchmark
+
+Runs Stage 2 (Debate Team) on the recorded fact sheets in tests/ground_truth/
+with the single Skeptic and with the category-sharded Skeptic
+(`debate.sharded_skeptic`), on the replay backend, and compares the Stage 2
+wall time (p50 / p95), model calls and tokens of the two.
+
+Replay latency is the tier's lognormal draw plus a decoding time per output
+token (--seconds-per-token), so a Skeptic that writes fewer risks finishes
+sooner. Both modes return the same recorded risks.
+
+Usage:
+    python benchmarks/bench_sharded_skeptic.py --repeat 5 --latency-scale 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import uuid
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+GROUND_TRUTH_DIR = Path(__file__).parent.parent / "shouldisignthis" / "tests" / "ground_truth"
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "test_output" / "benchmarks" / "sharded_skeptic.json"
+MODES = {"single": "0", "sharded": "1"}
+
+
+def fact_sheets() -> dict:
+    """Recorded Auditor fact sheets per contract."""
+    sheets = {}
+    for path in sorted(GROUND_TRUTH_DIR.glob("*/auditor_output.json")):
+        fact_sheet = json.loads(path.read_text()).get("fact_sheet")
+        if fact_sheet:
+            sheets[path.parent.name] = fact_sheet
+    return sheets
+
+
+async def bench_stage_2(fact_sheet: dict) -> dict:
+    from shouldisignthis.observability.usage import track_usage
+    from shouldisignthis.orchestrator import parse_json, run_stage_2
+
+    with track_usage() as usage:
+        state, duration = await run_stage_2("benchmark_user", str(uuid.uuid4()), fact_sheet)
+    stats = usage.as_dict()
+    return {
+        "wall_s": round(duration, 4),
+        "model_calls": stats["model_calls"],
+        "input_tokens": stats["input_tokens"],
+        "output_tokens": stats["output_tokens"],
+        "risks": len(parse_json(state.get("skeptic_risks")).get("risks", [])),
+    }
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def summarize(runs: list) -> dict:
+    walls = [run["wall_s"] for run in runs]
+    return {
+        "p50_s": round(statistics.median(walls), 4),
+        "p95_s": round(percentile(walls, 0.95), 4),
+        "model_calls": statistics.median(run["model_calls"] for run in runs),
+        "input_tokens": statistics.median(run["input_tokens"] for run in runs),
+        "output_tokens": statistics.median(run["output_tokens"] for run in runs),
+        "samples": len(runs),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stage 2 latency: single vs category-sharded Skeptic.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-scale", type=float, default=0.2, help="Replay latency multiplier")
+    parser.add_argument("--seconds-per-token", type=float, default=0.005, help="Replay decoding time per output token")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for replay latency sampling")
+    parser.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    os.environ["SHOULDISIGNTHIS_MODEL_BACKEND"] = "replay"
+    os.environ["SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE"] = str(args.latency_scale)
+    os.environ["SHOULDISIGNTHIS_REPLAY_SECONDS_PER_TOKEN"] = str(args.seconds_per_token)
+    os.environ["SHOULDISIGNTHIS_CLAUSE_CACHE"] = "0"
+
+    from shouldisignthis.config import configure_logging
+    configure_logging(log_file_override="benchmark.log")
+
+    sheets = fact_sheets()
+    results = {}
+    for mode, flag in MODES.items():
+        os.environ["SHOULDISIGNTHIS_SHARDED_SKEPTIC"] = flag
+        random.seed(args.seed)
+        runs = []
+        for name, fact_sheet in sheets.items():
+            for i in range(args.repeat):
+                print(f"⏱️ {mode}: {name} (run {i + 1}/{args.repeat})...")
+                runs.append({"contract": name, **asyncio.run(bench_stage_2(fact_sheet))})
+        results[mode] = {"runs": runs, "summary": summarize(runs)}
+
+    single, sharded = results["single"]["summary"], results["sharded"]["summary"]
+    report = {
+        "meta": {"latency_scale": args.latency_scale, "seconds_per_token": args.seconds_per_token, "repeat": args.repeat},
+        **results,
+        "speedup_p50": round(single["p50_s"] / sharded["p50_s"], 2) if sharded["p50_s"] else None,
+        "speedup_p95": round(single["p95_s"] / sharded["p95_s"], 2) if sharded["p95_s"] else None,
+    }
+
+    print(f"\n{'skeptic':<8} {'p50_s':>8} {'p95_s':>8} {'calls':>6} {'in_tok':>8} {'out_tok':>8}")
+    for mode in MODES:
+        s = results[mode]["summary"]
+        print(f"{mode:<8} {s['p50_s']:>8} {s['p95_s']:>8} {s['model_calls']:>6} {s['input_tokens']:>8} {s['output_tokens']:>8}")
+    print(f"Stage 2 speedup: {report['speedup_p50']}x p50, {report['speedup_p95']}x p95")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"💾 Saved to {output}")
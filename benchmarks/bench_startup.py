@@ -0,0 +1,147 @@
+"""
+Startup (Cold Import) Benchmark
+
+Measures the time to import the Streamlit app module in a fresh interpreter,
+i.e. the work done before the first page renders on a cold Cloud Run
+instance. Each run is a new `python -X importtime -c "import <module>"`
+process; the cumulative import time of the module and of each of its direct
+imports is reported (median over runs).
+
+Fails (exit 1) when the median exceeds --budget-ms or when any of the
+--forbid modules (agents, google.adk/genai, reportlab) is imported at startup;
+those must load on first use.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --runs 10 --budget-ms 600
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).parent.parent
+DEFAULT_OUTPUT = REPO_ROOT / "test_output" / "benchmarks" / "startup.json"
+DEFAULT_FORBIDDEN = [
+    "google.adk",
+    "google.genai",
+    "reportlab",
+    "shouldisignthis.orchestrator",
+    "shouldisignthis.agents",
+]
+
+# "import time:   self [us] | cumulative | <indent>module"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> List[Tuple[int, str, int]]:
+    """
+    Parses `-X importtime` output.
+
+    Returns:
+        List[Tuple[int, str, int]]: (depth, module, cumulative_us) per imported module, in import order.
+    """
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            depth = (len(match.group(3)) - 1) // 2
+            imports.append((depth, match.group(4), int(match.group(2))))
+    return imports
+
+
+def measure(module: str) -> Dict:
+    """Imports `module` in a fresh interpreter and returns its import profile."""
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    imports = parse_importtime(proc.stderr)
+    total_us = next(cumulative for depth, name, cumulative in imports if depth == 0 and name == module)
+    # Direct imports of the module are the entries at depth 1 preceding it
+    # (importtime prints children before their parent)
+    target_index = next(i for i, (depth, name, _) in enumerate(imports) if depth == 0 and name == module)
+    start_index = max((i + 1 for i, (depth, _, _) in enumerate(imports[:target_index]) if depth == 0), default=0)
+    children = {name: cumulative for depth, name, cumulative in imports[start_index:target_index] if depth == 1}
+    return {
+        "import_ms": total_us / 1000,
+        "wall_ms": wall_ms,
+        "children_ms": {name: us / 1000 for name, us in children.items()},
+        "modules": [name for _, name, _ in imports],
+    }
+
+
+def forbidden_imports(modules: List[str], forbidden: List[str]) -> List[str]:
+    """Returns the forbidden packages (or their submodules) found in `modules`."""
+    return sorted({
+        prefix for prefix in forbidden
+        for name in modules if name == prefix or name.startswith(prefix + ".")
+    })
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold import time of the app, with a budget.")
+    parser.add_argument("--module", type=str, default="shouldisignthis.app", help="Module to import")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to measure")
+    parser.add_argument("--budget-ms", type=float, default=800.0, help="Max median import time")
+    parser.add_argument("--forbid", nargs="*", default=DEFAULT_FORBIDDEN, help="Packages that must not load at startup")
+    parser.add_argument("--top", type=int, default=10, help="Heaviest direct imports to show")
+    parser.add_argument("--output", type=str, default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    measure(args.module)  # warm the OS file cache
+    runs = []
+    for i in range(args.runs):
+        runs.append(measure(args.module))
+        print(f"⏱️ Run {i + 1}: import {runs[-1]['import_ms']:.0f} ms, process {runs[-1]['wall_ms']:.0f} ms")
+
+    import_ms = statistics.median(r["import_ms"] for r in runs)
+    wall_ms = statistics.median(r["wall_ms"] for r in runs)
+    children = {
+        name: statistics.median(r["children_ms"].get(name, 0.0) for r in runs)
+        for name in runs[-1]["children_ms"]
+    }
+    violations = forbidden_imports(runs[-1]["modules"], args.forbid)
+
+    print(f"\n📦 Heaviest imports of {args.module}:")
+    for name, ms in sorted(children.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"   {ms:>8.1f} ms  {name}")
+    print(f"\n🚀 import {args.module}: {import_ms:.0f} ms (median), process {wall_ms:.0f} ms, budget {args.budget_ms:.0f} ms")
+
+    failed = False
+    if import_ms > args.budget_ms:
+        print(f"❌ Over budget by {import_ms - args.budget_ms:.0f} ms")
+        failed = True
+    if violations:
+        print(f"❌ Loaded at startup (should load on first use): {', '.join(violations)}")
+        failed = True
+    if not failed:
+        print("✅ Within budget")
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({
+            "module": args.module,
+            "runs": args.runs,
+            "budget_ms": args.budget_ms,
+            "import_ms": round(import_ms, 1),
+            "wall_ms": round(wall_ms, 1),
+            "children_ms": {name: round(ms, 1) for name, ms in children.items()},
+            "forbidden_loaded": violations,
+        }, f, indent=2)
+    print(f"💾 Results saved to: {output}")
+    sys.exit(1 if failed else 0)
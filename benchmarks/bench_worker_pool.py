@@ -0,0 +1,84 @@
+"""
+Worker Pool Throughput Benchmark
+
+Measures contracts/hour against worker count using the fake pipeline
+(simulated model latency + real local CPU work).
+
+Usage:
+    python benchmarks/bench_worker_pool.py --workers 1 2 4 --jobs 24 --latency 0.5
+
+    # Full orchestrator (real ADK agents) on the offline replay backend
+    SHOULDISIGNTHIS_MODEL_BACKEND=replay SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE=0.1 \
+        python benchmarks/bench_worker_pool.py --pipeline shouldisignthis.orchestrator:run_pipeline
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add repo root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shouldisignthis.job_queue import JobQueue
+from shouldisignthis.worker import run_pool
+
+SAMPLE_CONTRACTS_DIR = Path(__file__).parent.parent / "shouldisignthis" / "tests" / "sample_contracts"
+OUTPUT_DIR = Path(__file__).parent.parent / "test_output" / "benchmarks"
+
+
+def bench(num_workers: int, num_jobs: int, pipeline: str) -> dict:
+    samples = sorted(SAMPLE_CONTRACTS_DIR.glob("*.pdf"))
+    with tempfile.TemporaryDirectory() as tmp:
+        queue_path = os.path.join(tmp, "bench_jobs.db")
+        queue = JobQueue(queue_path)
+        job_ids = []
+        for i in range(num_jobs):
+            pdf = samples[i % len(samples)]
+            job_ids.append(queue.enqueue(pdf.read_bytes(), "application/pdf", pdf.name))
+
+        start = time.time()
+        run_pool(num_workers, queue_path, pipeline, exit_when_empty=True)
+        elapsed = time.time() - start
+        stats = queue.stats()
+
+        # Steady-state window: first job start -> last job end (excludes process spawn/import time)
+        runs = [queue.get(job_id)["result"]["job"] for job_id in job_ids if queue.get(job_id)["result"]]
+        window = max(r["started_at"] + r["duration"] for r in runs) - min(r["started_at"] for r in runs) if runs else elapsed
+
+    return {
+        "workers": num_workers,
+        "jobs": num_jobs,
+        "done": stats["DONE"],
+        "failed": stats["FAILED"],
+        "elapsed_s": round(elapsed, 2),
+        "processing_window_s": round(window, 2),
+        "contracts_per_hour": round(stats["DONE"] / window * 3600, 1),
+        "contracts_per_hour_incl_startup": round(stats["DONE"] / elapsed * 3600, 1),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark contracts/hour vs worker count.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=24)
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated seconds per model call")
+    parser.add_argument("--pipeline", type=str, default="benchmarks.fake_pipeline:run_fake_pipeline")
+    args = parser.parse_args()
+
+    os.environ["FAKE_MODEL_LATENCY"] = str(args.latency)
+    results = []
+    print(f"{'workers':>8} {'jobs':>6} {'window':>9} {'contracts/h':>12}")
+    for n in args.workers:
+        r = bench(n, args.jobs, args.pipeline)
+        results.append(r)
+        print(f"{r['workers']:>8} {r['done']:>6} {r['processing_window_s']:>8}s {r['contracts_per_hour']:>12}")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    out = OUTPUT_DIR / "worker_pool.json"
+    with open(out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"💾 Results saved to: {out}")
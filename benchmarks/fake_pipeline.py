@@ -0,0 +1,67 @@
+"""
+Fake Pipeline
+
+Drop-in replacement for `orchestrator.run_pipeline` that never calls Gemini.
+Each stage sleeps for a simulated model latency and then does the real
+local CPU work (JSON parsing, risk scoring, PDF rendering) on recorded
+ground truth outputs, so worker-pool throughput can be measured offline.
+
+Latency per model call is read from FAKE_MODEL_LATENCY (seconds, default 0.5).
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from shouldisignthis.orchestrator import parse_json
+from shouldisignthis.tools.risk_calculator import assess_contract_risk
+from shouldisignthis.tools.pdf_generator import create_contract_report
+
+GROUND_TRUTH_DIR = Path(__file__).parent.parent / "shouldisignthis" / "tests" / "ground_truth"
+
+
+def _load_recording(file_bytes: bytes) -> Dict[str, str]:
+    """Picks a ground truth contract deterministically from the input bytes."""
+    contracts = sorted(d for d in GROUND_TRUTH_DIR.iterdir() if (d / "final_verdict.json").exists())
+    contract_dir = contracts[int(hashlib.sha256(file_bytes).hexdigest(), 16) % len(contracts)]
+    return {f.stem: f.read_text() for f in contract_dir.glob("*.json")}
+
+
+async def run_fake_pipeline(file_bytes: bytes, mime_type: str, user_id: str, session_id: str, api_key: Optional[str] = None, tone: Optional[str] = None) -> Dict:
+    """
+    Same signature and result shape as `orchestrator.run_pipeline`.
+    """
+    latency = float(os.environ.get("FAKE_MODEL_LATENCY", "0.5"))
+    recording = _load_recording(file_bytes)
+    result = {"status": "COMPLETE", "timings": {}}
+
+    # Model calls per stage: Auditor 1, Debate 2 (parallel), Bailiff+Clerk 2, Judge 2 (tool round-trip)
+    for stage, key, calls in [("stage_1", "auditor_output", 1), ("stage_2", "skeptic_risks", 1),
+                              ("stage_2_5", "validated_evidence", 2), ("stage_3", "final_verdict", 2)]:
+        start = time.time()
+        await asyncio.sleep(latency * calls)
+        result[stage] = parse_json(recording[key])
+        result["timings"][stage] = time.time() - start
+
+    evidence = result["stage_2_5"]
+    assess_contract_risk(json.dumps(evidence.get("risks", [])), json.dumps(evidence.get("counters", [])))
+    verdict = result["stage_3"]
+    create_contract_report(
+        filename=session_id,
+        verdict=verdict.get("verdict", "UNKNOWN"),
+        risk_score=verdict.get("risk_score", 0),
+        summary=verdict.get("summary", ""),
+        risks=evidence.get("risks", [])
+    )
+    return {
+        "status": result["status"],
+        "timings": result["timings"],
+        "auditor": result["stage_1"],
+        "skeptic": result["stage_2"],
+        "evidence": result["stage_2_5"],
+        "verdict": result["stage_3"],
+    }
@@ -1,22 +1,11 @@
 from google.adk.agents import LlmAgent
+from google.adk.tools.google_search_tool import GoogleSearchTool
 from ..config import get_worker_model
+from ..norms import norms_settings
+from ..tools.norms_tools import lookup_industry_norms
 from ..tools.search_tools import search_tool
 
-def get_advocate_agent(api_key=None):
-    """
-    Creates the Advocate agent responsible for defending the contract with external research.
-
-    Args:
-        api_key (str, optional): Google API Key for the model.
-
-    Returns:
-        LlmAgent: Configured Advocate agent.
-    """
-    return LlmAgent(
-        name="Advocate",
-        model=get_worker_model(api_key=api_key),
-        tools=[search_tool], # <--- POWER UP!
-        instruction="""
+ADVOCATE_INSTRUCTION = """
         ROLE: Business Deal Strategist & Researcher.
         
         TASK: Provide industry context for contract terms.
@@ -34,12 +23,14 @@ def get_advocate_agent(api_key=None):
         - Respond with ONLY valid JSON.
         - Do NOT include any introductory text (e.g. "Here is the analysis").
         - Do NOT use markdown code blocks.
+        - "clause" is the FACT SHEET key the counter is about (e.g. 'liability_cap', 'financial_terms[1]'), or 'general'.
         
         OUTPUT JSON (strict format):
         {
           "counters": [
             {
               "topic": "Liability Cap",
+              "clause": "liability_cap",
               "counter": "While $1,000 seems low, search results indicate typical caps for micro-contracts range from $1k-$5k.",
               "confidence": "HIGH",
               "industry_context": "Backed by search: 60% of small service agreements use fees-paid caps.",
@@ -47,6 +38,36 @@ def get_advocate_agent(api_key=None):
             }
           ]
         }
-        """,
+        """
+
+# With the industry norms store, the Advocate asks it before searching the web
+NORMS_PROTOCOL = """
+           FIRST call `lookup_industry_norms` with the term's topic and the industry. If it finds norms, use them
+           and their sources and do NOT search. Use `Google Search` only for topics it has nothing on."""
+
+
+def get_advocate_agent(api_key=None):
+    """
+    Creates the Advocate agent responsible for defending the contract with external research.
+    With `norms.enabled`, it consults the local industry norms store before searching the web.
+
+    Args:
+        api_key (str, optional): Google API Key for the model.
+
+    Returns:
+        LlmAgent: Configured Advocate agent.
+    """
+    tools, instruction = [search_tool], ADVOCATE_INSTRUCTION # <--- POWER UP!
+    if norms_settings()["enabled"]:
+        # Built-in search next to a function tool runs as a search sub-agent
+        tools = [lookup_industry_norms, GoogleSearchTool(bypass_multi_tools_limit=True)]
+        step = "2. If a term seems unfavorable"
+        line_end = instruction.index("\n", instruction.index(step))
+        instruction = instruction[:line_end] + NORMS_PROTOCOL + instruction[line_end:]
+    return LlmAgent(
+        name="Advocate",
+        model=get_worker_model(api_key=api_key),
+        tools=tools,
+        instruction=instruction,
         output_key="advocate_defense"
     )
@@ -94,4 +94,49 @@ def get_auditor_agent(api_key=None):
         - All string values must be properly escaped.
         """,
         output_key="auditor_output"
-    )
\ No newline at end of file
+    )
+
+# --- AGENT: THE FIELD EXTRACTOR (Targeted re-extraction) ---
+class RefinedField(BaseModel):
+    field: str
+    value: str
+    page: int
+    confidence: Literal["HIGH", "MEDIUM", "LOW"]
+
+class RefinedFields(BaseModel):
+    fields: list[RefinedField] = Field(default_factory=list)
+
+def get_field_extractor_agent(api_key=None):
+    """
+    Creates the Field Extractor agent, which re-reads a few pages for specific fact fields
+    the Auditor extracted with low confidence or missed.
+
+    Args:
+        api_key (str, optional): Google API Key for the model.
+
+    Returns:
+        LlmAgent: Configured Field Extractor agent.
+    """
+    return LlmAgent(
+        name="Field_Extractor",
+        model=get_auditor_model(api_key=api_key),
+        output_schema=RefinedFields,
+        instruction="""
+        ROLE: Fact Extraction Specialist
+        TASK: Re-read the provided pages of a contract and extract ONLY the fields you are asked for.
+
+        INPUT: A file (PDF pages or an image) and a list of fields, each with the value extracted
+        earlier (which may be wrong, incomplete or "NOT FOUND").
+
+        RULES:
+        - Quote the contract's own wording for 'value'; keep amounts, dates and durations exact.
+        - 'page' is the page within the provided file (1-indexed) where the clause begins.
+        - 'confidence' is HIGH when the text states the term explicitly, MEDIUM when it has to be
+          pieced together, LOW when you are guessing.
+        - If a field is not in the provided pages, return it with value="NOT FOUND".
+        - Return one entry per requested field, with 'field' spelled exactly as requested.
+
+        OUTPUT: Respond with ONLY valid JSON: {"fields": [{"field", "value", "page", "confidence"}]}
+        """,
+        output_key="refined_fields"
+    )
@@ -1,10 +1,43 @@
+import os
+from typing import Dict
+
 from google.adk.agents import ParallelAgent
-from .skeptic import get_skeptic_agent
+from .skeptic import get_sharded_skeptic_agent, get_skeptic_agent
 from .advocate import get_advocate_agent
 
+
+def get_debate_settings(debate_cfg: Dict) -> Dict:
+    """
+    Reads the Debate Team settings from the 'debate' config section (env vars take priority).
+    SHOULDISIGNTHIS_SHARDED_SKEPTIC=1 splits the Skeptic into category specialists, =0 keeps one Skeptic;
+    SHOULDISIGNTHIS_PIPELINED_BAILIFF=1 starts verifying the Skeptic's risks before the Advocate is done.
+
+    Args:
+        debate_cfg (Dict): The 'debate' section of the app config.
+
+    Returns:
+        Dict: {"sharded_skeptic": bool, "pipelined_bailiff": bool}.
+    """
+    settings = {}
+    for key, env_var in (("sharded_skeptic", "SHOULDISIGNTHIS_SHARDED_SKEPTIC"), ("pipelined_bailiff", "SHOULDISIGNTHIS_PIPELINED_BAILIFF")):
+        env_value = os.environ.get(env_var)
+        if env_value is not None:
+            settings[key] = env_value.strip().lower() not in ("0", "false", "no", "off", "")
+        else:
+            settings[key] = bool(debate_cfg.get(key, False))
+    return settings
+
+
+def debate_settings() -> Dict:
+    """Returns the Debate Team settings of the app config."""
+    from ..config import APP_CONFIG
+    return get_debate_settings(APP_CONFIG.get("debate", {}) or {})
+
+
 def get_debate_team(api_key=None):
     """
     Creates the Debate Team parallel agent (Skeptic & Advocate).
+    With `debate.sharded_skeptic`, the Skeptic is a panel of category specialists run in parallel.
     
     Args:
         api_key (str, optional): Google API Key for the models.
@@ -12,10 +45,11 @@ def get_debate_team(api_key=None):
     Returns:
         ParallelAgent: Configured Debate Team agent.
     """
+    skeptic = get_sharded_skeptic_agent if debate_settings()["sharded_skeptic"] else get_skeptic_agent
     return ParallelAgent(
         name="Debate_Team",
         sub_agents=[
-            get_skeptic_agent(api_key=api_key),
+            skeptic(api_key=api_key),
             get_advocate_agent(api_key=api_key)
         ]
     )
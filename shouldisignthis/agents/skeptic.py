@@ -1,21 +1,12 @@
-from google.adk.agents import LlmAgent
-from ..config import get_worker_model
+import json
+from typing import Dict, Optional
 
-def get_skeptic_agent(api_key=None):
-    """
-    Creates the Skeptic agent.
-    Generic Version: Designed to work across NDA, MSA, Employment, and Freelance contracts.
-
-    Args:
-        api_key (str, optional): Google API Key for the model.
+from google.adk.agents import LlmAgent, ParallelAgent
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from ..config import get_worker_model
 
-    Returns:
-        LlmAgent: Configured Skeptic agent.
-    """
-    return LlmAgent(
-        name="Skeptic",
-        model=get_worker_model(api_key=api_key),
-        instruction="""
+SKEPTIC_INSTRUCTION = """
         ROLE: Legal Risk Advisor (Advocate for the Service Provider/Employee)
         
         GOAL: Identify contract terms that expose the User (Provider/Employee) to unnecessary risk or unfair burdens.
@@ -54,10 +45,117 @@ def get_skeptic_agent(api_key=None):
               "page": <int>,
               "risk_type": "UNFAVORABLE_TERM" | "MISSING_CLAUSE" | "AMBIGUOUS",
               "deviation_type": "UNFAVORABLE" | "NON_STANDARD",
+              "clause": "The FACT SHEET key this risk is about (e.g. 'liability_cap', 'financial_terms[1]'), or 'general'",
               "explanation": "Clear reasoning why this specific term hurts the Service Provider."
             }
           ]
         }
-        """,
+        """
+
+# Category specialists of the sharded Skeptic (`debate.sharded_skeptic`): each reads only its fact sheet fields
+SKEPTIC_SHARDS = {
+    "financial": {"label": "Payment & Financial Terms", "fields": ["payment_terms", "financial_terms"]},
+    "ip": {"label": "Intellectual Property", "fields": ["intellectual_property"]},
+    "liability": {"label": "Liability, Indemnity & Obligations", "fields": ["liability_cap", "key_obligations"]},
+    "termination": {"label": "Term & Termination", "fields": ["termination_clause", "effective_date"]},
+    "non_compete": {"label": "Non-Compete & Restrictive Covenants", "fields": ["non_compete_clause"]},
+    "dispute": {"label": "Dispute Resolution", "fields": ["dispute_resolution"]},
+}
+# Takes the fields no specialist claims
+DEFAULT_SHARD = "liability"
+# Given to every specialist as context only
+CONTEXT_FIELDS = ("parties",)
+
+
+def get_skeptic_agent(api_key=None):
+    """
+    Creates the Skeptic agent.
+    Generic Version: Designed to work across NDA, MSA, Employment, and Freelance contracts.
+
+    Args:
+        api_key (str, optional): Google API Key for the model.
+
+    Returns:
+        LlmAgent: Configured Skeptic agent.
+    """
+    return LlmAgent(
+        name="Skeptic",
+        model=get_worker_model(api_key=api_key),
+        instruction=SKEPTIC_INSTRUCTION,
         output_key="skeptic_risks"
-    )
\ No newline at end of file
+    )
+
+
+def shard_facts(fact_sheet: Optional[Dict], shard: str) -> Dict:
+    """
+    Returns the part of a fact sheet a Skeptic specialist reviews (keys may be clause ids like 'financial_terms[2]').
+
+    Args:
+        fact_sheet (Optional[Dict]): The fact sheet given to the Debate Team.
+        shard (str): A key of SKEPTIC_SHARDS.
+
+    Returns:
+        Dict: The specialist's fields plus the context fields; empty if none of its fields are present.
+    """
+    claimed = {field for spec in SKEPTIC_SHARDS.values() for field in spec["fields"]}
+    facts, context = {}, {}
+    for key, fact in (fact_sheet or {}).items():
+        field = key.split("[", 1)[0]
+        if field in CONTEXT_FIELDS:
+            context[key] = fact
+        elif field in SKEPTIC_SHARDS[shard]["fields"] or (shard == DEFAULT_SHARD and field not in claimed):
+            facts[key] = fact
+    return {**context, **facts} if facts else {}
+
+
+def _shard_instruction(shard: str):
+    label = SKEPTIC_SHARDS[shard]["label"]
+
+    def instruction(ctx) -> str:
+        facts = shard_facts(ctx.state.get("auditor_output"), shard)
+        return SKEPTIC_INSTRUCTION.replace(
+            "INPUT:\n        {{auditor_output}}",
+            f"SPECIALTY: {label}\n        Review ONLY these terms; {', '.join(CONTEXT_FIELDS)} is context, not a risk.\n\n"
+            f"        INPUT:\n        {json.dumps(facts, indent=2)}"
+        )
+    return instruction
+
+
+def _shard_request(shard: str):
+    def before_model(callback_context, llm_request):
+        if not shard_facts(callback_context.state.get("auditor_output"), shard):
+            # Nothing in this category: no model call
+            return LlmResponse(content=types.Content(role="model", parts=[types.Part(text='{"risks": []}')]))
+        # The specialist's terms are in its instruction; the whole fact sheet in the user message is left out,
+        # but not the note on the clauses the clause cache answered
+        message = "\n".join(part.text or "" for content in llm_request.contents if content.role == "user" for part in content.parts or [])
+        notes = [line.strip() for line in message.splitlines() if line.strip().startswith("ALREADY REVIEWED")]
+        llm_request.contents = [types.Content(role="user", parts=[types.Part(text="\n".join([*notes, "Analyze these contract terms."]))])]
+        return None
+    return before_model
+
+
+def get_sharded_skeptic_agent(api_key=None):
+    """
+    Creates the sharded Skeptic: one specialist per SKEPTIC_SHARDS category, run in parallel.
+    Each writes its risks to 'skeptic_risks_<category>'; the orchestrator merges them into 'skeptic_risks'.
+
+    Args:
+        api_key (str, optional): Google API Key for the models.
+
+    Returns:
+        ParallelAgent: Configured Skeptic panel.
+    """
+    return ParallelAgent(
+        name="Skeptic_Panel",
+        sub_agents=[
+            LlmAgent(
+                name=f"Skeptic_{shard}",
+                model=get_worker_model(api_key=api_key),
+                instruction=_shard_instruction(shard),
+                before_model_callback=_shard_request(shard),
+                output_key=f"skeptic_risks_{shard}"
+            )
+            for shard in SKEPTIC_SHARDS
+        ]
+    )
@@ -5,27 +5,44 @@ import sys
 # --- PATH FIX ---
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from shouldisignthis.config import configure_logging
+from shouldisignthis.config import APP_CONFIG, configure_logging
+from shouldisignthis.observability.metrics import get_metrics_settings, start_metrics_server
+from shouldisignthis.warmup import is_ready, start_warmup
 from shouldisignthis.ui.single_mode import render_single_mode
 from shouldisignthis.ui.compare_mode import render_compare_mode
+from shouldisignthis.ui.admin_mode import render_admin_mode
 
 # --- SETUP ---
 st.set_page_config(page_title="ShouldISignThis?", page_icon="⚖️", layout="wide")
 configure_logging()
 
+metrics_cfg = APP_CONFIG.get("metrics", {}) or {}
+if get_metrics_settings(metrics_cfg)["enabled"]:
+    start_metrics_server()
+# No-op when launched through shouldisignthis.serve (already warm)
+start_warmup()
+
 # --- SIDEBAR NAVIGATION ---
 with st.sidebar:
     st.title("⚖️ ShouldISignThis?")
     st.markdown("The AI Consensus Engine for Contract Review")
+    if not is_ready():
+        st.caption("⏳ Warming up the agents...")
     
     # --- MODE SWITCH LOGIC ---
     if "nav_mode" not in st.session_state:
         st.session_state.nav_mode = "Should I Sign This?"
 
+    modes = ["Should I Sign This?", "Which One Should I Sign?"]
+    if metrics_cfg.get("admin_page", True):
+        modes.append("Admin: Metrics")
+    if st.session_state.nav_mode not in modes:
+        st.session_state.nav_mode = modes[0]
+
     mode = st.radio(
         "Select Mode",
-        ["Should I Sign This?", "Which One Should I Sign?"],
-        index=0 if st.session_state.nav_mode == "Should I Sign This?" else 1,
+        modes,
+        index=modes.index(st.session_state.nav_mode),
         key="nav_mode",
         disabled=st.session_state.get("analyzing", False)
     )
@@ -50,7 +67,7 @@ with st.sidebar:
         - **Stage 3**: Judge (Tool Use)
         - **Stage 4**: Drafter (Action)
         """)
-    else:
+    elif st.session_state.nav_mode == "Which One Should I Sign?":
         st.info("Architecture: Nested Parallelism")
         st.markdown("""
         - **Parallel Pipelines**: Run full analysis on two contracts simultaneously.
@@ -65,11 +82,16 @@ try:
         Renders the Single Contract Analysis mode.
         """
         render_single_mode(api_key)
-    else:
+    elif st.session_state.nav_mode == "Which One Should I Sign?":
         """
         Renders the Contract Comparison mode.
         """
         render_compare_mode(api_key)
+    else:
+        """
+        Renders the Admin (Metrics) mode.
+        """
+        render_admin_mode()
 except Exception as e:
     import logging
     logging.exception("Critical Application Error")
@@ -0,0 +1,288 @@
+"""
+Clause Analysis Cache
+
+Contracts built from the same templates repeat the same indemnity,
+confidentiality and governing-law clauses. This SQLite store keeps the Skeptic's
+risks and the Advocate's counters per clause, keyed by a fingerprint of the
+normalized clause, so Stage 2 only debates the clauses it has not seen before
+and merges the cached findings back in.
+
+A clause is one field of the Auditor's fact sheet (list items count separately,
+e.g. `financial_terms[2]`): that is what the Debate Team reads. The Skeptic and
+Advocate tag each finding with its clause; a run is only cached when every
+finding is attributed. Findings tagged 'general' are not tied to one clause:
+they are cached under a fingerprint of the whole sheet (sheet_fingerprint), so
+a sheet whose clauses were all seen before, but never together, still gets a
+Debate Team pass for its general findings.
+
+Fingerprints include the worker model and CLAUSE_ANALYSIS_VERSION; bump the
+version when the Skeptic or Advocate instructions change.
+
+The cache stores findings derived from customer contracts, so it is off unless
+`clause_cache.enabled` (or SHOULDISIGNTHIS_CLAUSE_CACHE=1) is set.
+Lookups are counted in `shouldisignthis_cache_lookups_total{cache="clause"}`.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from shouldisignthis.observability.metrics import CACHE_LOOKUPS
+
+CLAUSE_ANALYSIS_VERSION = 1
+GENERAL_CLAUSE = "general"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS clause_analyses (
+    fingerprint TEXT PRIMARY KEY,
+    field TEXT NOT NULL,
+    risks TEXT NOT NULL,
+    counters TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL
+);
+"""
+
+# Leading clause numbering: "12.3", "(a)", "iv.", "Section 4:"
+_NUMBERING = re.compile(r"^\s*(section|article|clause)?\s*(\(?[0-9ivxlc]+(\.[0-9]+)*[.):]?\)?\s+|\(?[a-z]\)\s+)+", re.IGNORECASE)
+_QUOTES = str.maketrans({"‘": "'", "’": "'", "“": '"', "”": '"', "–": "-", "—": "-"})
+
+
+def normalize_clause(text: str) -> str:
+    """
+    Reduces a clause to the wording that matters: case, whitespace, typographic quotes and
+    dashes, leading numbering and trailing punctuation are ignored (amounts and dates are not).
+
+    Args:
+        text (str): The clause text.
+
+    Returns:
+        str: The normalized clause.
+    """
+    text = unicodedata.normalize("NFKC", text or "").translate(_QUOTES).lower()
+    text = _NUMBERING.sub("", text)
+    return re.sub(r"\s+", " ", text).strip().rstrip(".;,")
+
+
+def split_clauses(fact_sheet: Dict) -> Dict[str, Dict]:
+    """
+    Returns the clauses of a fact sheet by clause id ('liability_cap', 'financial_terms[0]', ...).
+
+    Args:
+        fact_sheet (Dict): The Auditor's fact sheet.
+
+    Returns:
+        Dict[str, Dict]: Fact field ({"value", "page", "confidence"}) per clause id.
+    """
+    clauses = {}
+    for field, value in (fact_sheet or {}).items():
+        if isinstance(value, list):
+            for index, item in enumerate(value):
+                if isinstance(item, dict):
+                    clauses[f"{field}[{index}]"] = item
+        elif isinstance(value, dict):
+            clauses[field] = value
+    return clauses
+
+
+def clause_field(clause_id: str) -> str:
+    """Returns the fact sheet field of a clause id ('financial_terms[2]' -> 'financial_terms')."""
+    return clause_id.split("[", 1)[0]
+
+
+def clause_fingerprint(clause_id: str, fact: Dict, namespace: str) -> str:
+    """
+    Fingerprints a clause: its field, its normalized text and the analysis namespace.
+
+    Args:
+        clause_id (str): The clause id.
+        fact (Dict): Its fact field.
+        namespace (str): From analysis_namespace().
+
+    Returns:
+        str: A sha256 hex digest.
+    """
+    payload = f"{namespace}\n{clause_field(clause_id)}\n{normalize_clause(str(fact.get('value', '')))}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def sheet_fingerprint(fingerprints: List[str]) -> str:
+    """
+    Fingerprints a whole fact sheet (for its 'general' findings) from its clause fingerprints.
+
+    Args:
+        fingerprints (List[str]): The clause fingerprints of the sheet (order does not matter).
+
+    Returns:
+        str: A sha256 hex digest.
+    """
+    payload = f"{GENERAL_CLAUSE}\n" + "\n".join(sorted(fingerprints))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def analysis_namespace() -> str:
+    """Returns what cached analyses depend on besides the clause: the worker model and the analysis version."""
+    from shouldisignthis.config import models_cfg
+    return f"{(models_cfg or {}).get('worker', '')}:v{CLAUSE_ANALYSIS_VERSION}"
+
+
+class ClauseCache:
+    """
+    Cached Debate Team findings per clause fingerprint, stored in a single SQLite file.
+
+    Each method opens its own short-lived connection, so one instance can be shared between threads.
+    """
+
+    def __init__(self, path: str, max_age_days: Optional[float] = None):
+        """
+        Args:
+            path (str): Path to the SQLite cache file.
+            max_age_days (Optional[float], optional): Entries older than this are ignored. Defaults to None (no expiry).
+        """
+        self.path = path
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        cache_dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=30000")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, fingerprints: List[str]) -> Dict[str, Dict]:
+        """
+        Looks clauses up (and counts the lookups).
+
+        Args:
+            fingerprints (List[str]): Clause fingerprints.
+
+        Returns:
+            Dict[str, Dict]: {"risks": [...], "counters": [...]} per fingerprint found.
+        """
+        unique = sorted(set(fingerprints))
+        if not unique:
+            return {}
+        now = time.time()
+        placeholders = ",".join("?" * len(unique))
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT fingerprint, risks, counters, created_at FROM clause_analyses WHERE fingerprint IN ({placeholders})", unique).fetchall()
+            found = {
+                row["fingerprint"]: {"risks": json.loads(row["risks"]), "counters": json.loads(row["counters"])}
+                for row in rows
+                if self.max_age_seconds is None or now - row["created_at"] <= self.max_age_seconds
+            }
+            if found:
+                conn.execute(
+                    f"UPDATE clause_analyses SET hits = hits + 1, used_at = ? WHERE fingerprint IN ({','.join('?' * len(found))})",
+                    [now, *found],
+                )
+        for fingerprint in fingerprints:
+            CACHE_LOOKUPS.inc(cache="clause", result="hit" if fingerprint in found else "miss")
+        return found
+
+    def put_many(self, entries: Dict[str, Tuple[str, Dict]]) -> None:
+        """
+        Stores the findings of newly analyzed clauses.
+
+        Args:
+            entries (Dict[str, Tuple[str, Dict]]): (field, {"risks", "counters"}) per fingerprint.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO clause_analyses (fingerprint, field, risks, counters, hits, created_at, used_at) VALUES (?, ?, ?, ?, 0, ?, ?)",
+                [(fp, field, json.dumps(findings["risks"]), json.dumps(findings["counters"]), now, now) for fp, (field, findings) in entries.items()],
+            )
+
+    def stats(self) -> Dict:
+        """Returns {"entries", "hits"}: cached clauses and how often they were reused."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS hits FROM clause_analyses").fetchone()
+        return {"entries": row["entries"], "hits": row["hits"]}
+
+
+def get_clause_cache_settings(cache_cfg: Dict) -> Dict:
+    """
+    Reads the clause cache settings from the 'clause_cache' config section (env vars take priority).
+    SHOULDISIGNTHIS_CLAUSE_CACHE=1 enables the cache, =0 disables it.
+
+    Args:
+        cache_cfg (Dict): The 'clause_cache' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "path": str, "max_age_days": Optional[float]}.
+    """
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_CLAUSE_CACHE")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(cache_cfg.get("enabled", False))
+    max_age_days = cache_cfg.get("max_age_days")
+    return {
+        "enabled": enabled,
+        "path": os.environ.get("SHOULDISIGNTHIS_CLAUSE_CACHE_PATH") or cache_cfg.get("path", "clause_cache.db"),
+        "max_age_days": float(max_age_days) if max_age_days else None,
+    }
+
+
+_caches: Dict[str, ClauseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def clause_cache_settings() -> Dict:
+    """Returns the clause cache settings of the app config."""
+    from shouldisignthis.config import APP_CONFIG
+    return get_clause_cache_settings(APP_CONFIG.get("clause_cache", {}) or {})
+
+
+def get_clause_cache() -> Optional[ClauseCache]:
+    """Returns the process-wide clause cache, or None when it is disabled."""
+    settings = clause_cache_settings()
+    if not settings["enabled"]:
+        return None
+    with _caches_lock:
+        cache = _caches.get(settings["path"])
+        if cache is None:
+            cache = _caches[settings["path"]] = ClauseCache(settings["path"], settings["max_age_days"])
+        return cache
+
+
+def attribute_findings(risks: List[Dict], counters: List[Dict], clause_ids: List[str]) -> Optional[Dict[str, Dict]]:
+    """
+    Groups new findings by the clause they are tagged with.
+
+    Args:
+        risks (List[Dict]): The Skeptic's risks.
+        counters (List[Dict]): The Advocate's counters.
+        clause_ids (List[str]): The clauses that were analyzed.
+
+    Returns:
+        Optional[Dict[str, Dict]]: {"risks", "counters"} per analyzed clause and for GENERAL_CLAUSE (empty
+        lists = nothing to report), or None if a finding names no known clause (the run cannot be cached safely).
+    """
+    known = set(clause_ids) | {GENERAL_CLAUSE}
+    grouped = {clause_id: {"risks": [], "counters": []} for clause_id in known}
+    for key, findings in (("risks", risks), ("counters", counters)):
+        for finding in findings:
+            clause_id = finding.get("clause") if isinstance(finding, dict) else None
+            if clause_id not in known:
+                return None
+            grouped[clause_id][key].append(finding)
+    return grouped
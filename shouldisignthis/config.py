@@ -1,39 +1,107 @@
 import os
 import sys
 import logging
+import threading
 import yaml
-from google.genai import types
-from google.adk.models.google_llm import Gemini
+
+# google.genai / google.adk are imported where they are used and the config file
+# is read on first access, so importing this module stays cheap (app cold start).
 
 # 0. LOAD CONFIG
 CONFIG_PATH = os.environ.get("SHOULDISIGNTHIS_CONFIG_PATH") or os.path.join(os.path.dirname(__file__), "config.yaml")
-try:
-    with open(CONFIG_PATH, "r") as f:
-        APP_CONFIG = yaml.safe_load(f)
-except FileNotFoundError:
-    print(f"⚠️ Config file not found at {CONFIG_PATH}. Using defaults.")
-    APP_CONFIG = {}
-
-# 1. AUTH
-# Priority: Env Var > Config File
-if "GOOGLE_API_KEY" not in os.environ:
-    cfg_key = APP_CONFIG.get("api", {}).get("google_api_key")
-    if cfg_key and cfg_key != "YOUR_API_KEY_HERE":
-        os.environ["GOOGLE_API_KEY"] = cfg_key
-
-if "GOOGLE_API_KEY" not in os.environ:
-    print("⚠️ WARNING: GOOGLE_API_KEY not found in environment variables or config.yaml.")
 
-# 2. LOGGING SETUP
+# Module attributes derived from the config file, set by load_config()
+_CONFIG_NAMES = ("APP_CONFIG", "SAFE_CONTRACT_SETTINGS", "retry_cfg", "app_cfg", "DEMO_MODE", "models_cfg")
+_config_lock = threading.Lock()
+
+def load_config():
+    """
+    Reads the config file and applies it (API key, safety settings, model definitions).
+    Runs once per process; later calls return the loaded config.
+
+    Returns:
+        dict: The app config (APP_CONFIG).
+    """
+    if "APP_CONFIG" in globals():
+        return globals()["APP_CONFIG"]
+    with _config_lock:
+        if "APP_CONFIG" in globals():
+            return globals()["APP_CONFIG"]
+        try:
+            with open(CONFIG_PATH, "r") as f:
+                app_config = yaml.safe_load(f)
+        except FileNotFoundError:
+            print(f"⚠️ Config file not found at {CONFIG_PATH}. Using defaults.")
+            app_config = {}
+
+        # 1. AUTH
+        # Priority: Env Var > Config File
+        if "GOOGLE_API_KEY" not in os.environ:
+            cfg_key = app_config.get("api", {}).get("google_api_key")
+            if cfg_key and cfg_key != "YOUR_API_KEY_HERE":
+                os.environ["GOOGLE_API_KEY"] = cfg_key
+
+        if "GOOGLE_API_KEY" not in os.environ:
+            print("⚠️ WARNING: GOOGLE_API_KEY not found in environment variables or config.yaml.")
+
+        # 3. SAFETY SETTINGS, 5. CONFIGURATION CONSTANTS, 6. MODEL DEFINITIONS
+        app_cfg = app_config.get("app_config", {})
+        globals().update(
+            SAFE_CONTRACT_SETTINGS=app_config.get("safety_settings", {
+                'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_ONLY_HIGH',
+                'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_ONLY_HIGH',
+                'HARM_CATEGORY_HARASSMENT': 'BLOCK_ONLY_HIGH',
+                'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_ONLY_HIGH',
+            }),
+            retry_cfg=app_config.get("retry_policy", {}),
+            app_cfg=app_cfg,
+            DEMO_MODE=app_cfg.get("demo_mode", False),
+            models_cfg=app_config.get("models", {}),
+        )
+        # Set last: its presence marks the config as loaded
+        globals()["APP_CONFIG"] = app_config
+        return app_config
+
+# 4. RETRY POLICY
+def _build_retry_policy(retry_cfg):
+    from google.genai import types
+    return types.HttpRetryOptions(
+        attempts=retry_cfg.get("attempts", 5),
+        exp_base=retry_cfg.get("exp_base", 2),
+        initial_delay=retry_cfg.get("initial_delay", 1),
+        max_delay=retry_cfg.get("max_delay", 60),
+        http_status_codes=retry_cfg.get("http_status_codes", [429, 500, 503])
+    )
+
+def __getattr__(name):
+    """
+    Resolves the config-derived module attributes (APP_CONFIG, models_cfg, RETRY_POLICY, ...)
+    on first access, e.g. `from shouldisignthis.config import APP_CONFIG`.
+    """
+    if name == "RETRY_POLICY":
+        globals()[name] = _build_retry_policy(_setting("retry_cfg"))
+        return globals()[name]
+    if name in _CONFIG_NAMES:
+        load_config()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def _setting(name):
+    # Code inside this module reads globals directly, bypassing __getattr__.
+    # Values assigned from outside (e.g. tests swapping models_cfg) win.
+    return globals()[name] if name in globals() else __getattr__(name)
+
 # 2. LOGGING SETUP
 def configure_logging(log_file_override=None, log_level_override=None):
     """
     Configures the application-wide logging settings.
 
     Sets up logging to both stdout and a file as specified in the configuration.
-    Creates the log directory if it doesn't exist.
+    Creates the log directory if it doesn't exist. With `logging.async` (default)
+    the stdout/file I/O runs on a background listener thread; messages longer than
+    `logging.max_message_chars` are truncated.
     """
-    log_cfg = APP_CONFIG.get("logging", {})
+    log_cfg = load_config().get("logging", {})
     log_dir = log_cfg.get("log_dir", "logs")
     log_file = log_file_override or log_cfg.get("log_file", "contract_audit.log")
     
@@ -48,41 +116,102 @@ def configure_logging(log_file_override=None, log_level_override=None):
         
     log_path = os.path.join(log_dir, log_file)
     
+    from shouldisignthis.observability.log_pipeline import TruncatingFilter, start_log_listener, stop_log_listener
+    log_format = '%(asctime)s - [ShouldISignThis_Trace] - %(levelname)s - %(message)s'
+    handlers = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler(log_path)
+    ]
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(log_format))
+    if log_cfg.get("async", True):
+        handlers = [start_log_listener(handlers)]
+    else:
+        stop_log_listener()
+    for handler in handlers:
+        handler.addFilter(TruncatingFilter(log_cfg.get("max_message_chars", 4000)))
+
     logging.basicConfig(
         level=log_level,
-        format='%(asctime)s - [ShouldISignThis_Trace] - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler(log_path)
-        ],
+        handlers=handlers,
         force=True
     )
     print(f"📝 Logging to: {log_path}")
 
-# 3. SAFETY SETTINGS
-SAFE_CONTRACT_SETTINGS = APP_CONFIG.get("safety_settings", {
-    'HARM_CATEGORY_HATE_SPEECH': 'BLOCK_ONLY_HIGH',
-    'HARM_CATEGORY_DANGEROUS_CONTENT': 'BLOCK_ONLY_HIGH',
-    'HARM_CATEGORY_HARASSMENT': 'BLOCK_ONLY_HIGH',
-    'HARM_CATEGORY_SEXUALLY_EXPLICIT': 'BLOCK_ONLY_HIGH',
-})
-
-# 4. RETRY POLICY
-retry_cfg = APP_CONFIG.get("retry_policy", {})
-RETRY_POLICY = types.HttpRetryOptions(
-    attempts=retry_cfg.get("attempts", 5),
-    exp_base=retry_cfg.get("exp_base", 2),
-    initial_delay=retry_cfg.get("initial_delay", 1),
-    http_status_codes=retry_cfg.get("http_status_codes", [429, 500, 503])
-)
-
-# 5. CONFIGURATION CONSTANTS
-app_cfg = APP_CONFIG.get("app_config", {})
-DEMO_MODE = app_cfg.get("demo_mode", False)
+# 6. MODELS
+def get_model_backend():
+    """
+    Returns the configured model backend: 'gemini' (live API) or 'replay' (offline recordings).
+    The SHOULDISIGNTHIS_MODEL_BACKEND env var overrides `models.backend` in config.yaml.
+    """
+    return os.environ.get("SHOULDISIGNTHIS_MODEL_BACKEND") or _setting("models_cfg").get("backend", "gemini")
 
+def _build_live_model(model_name, api_key=None):
+    """
+    Builds a Gemini model (on the API key pool when enabled), retried per RETRY_POLICY
+    with jitter and a retry budget.
+    """
+    from shouldisignthis.llm.clients import PooledGemini
+    from shouldisignthis.llm.key_pool import KeyPoolLlm, get_key_pool, get_key_pool_settings, key_label
+    from shouldisignthis.llm.retry import NO_SDK_RETRIES, RetryingLlm, get_retry_budget, get_retry_settings
+    pool_settings = get_key_pool_settings(_setting("models_cfg"))
+    # Retries happen in RetryingLlm (jitter, Retry-After, budget), not in the SDK
+    gemini_args = {"model": model_name, "retry_options": NO_SDK_RETRIES, "safety_settings": _setting("SAFE_CONTRACT_SETTINGS")}
+    # A key brought by the user runs on that key alone; the default key is replaced by the pool
+    if pool_settings["enabled"] and api_key in (None, os.environ.get("GOOGLE_API_KEY")):
+        models = {key_label(key): PooledGemini(api_key=key, **gemini_args) for key in pool_settings["keys"]}
+        model = KeyPoolLlm(
+            model=model_name,
+            inner=next(iter(models.values())),
+            models=models,
+            pool=get_key_pool(model_name, pool_settings)
+        )
+    else:
+        model = PooledGemini(api_key=api_key, **gemini_args)
+    return RetryingLlm.wrap(
+        model,
+        policy=_setting("RETRY_POLICY"),
+        budget=get_retry_budget(),
+        max_retry_after=get_retry_settings(_setting("retry_cfg"))["max_retry_after"]
+    )
 
-# 6. MODEL DEFINITIONS
-models_cfg = APP_CONFIG.get("models", {})
+def _build_model(tier, api_key=None):
+    """
+    Builds the model object for a tier ('auditor', 'worker' or 'judge') on the configured backend,
+    behind a circuit breaker with a fallback model when `models.circuit_breaker` covers the tier
+    (live API), hedged when `models.hedging` covers the tier, and wrapped in a record/replay cassette when
+    `models.cassette.mode` is not 'off'.
+    """
+    models_cfg = _setting("models_cfg")
+    if get_model_backend() == "replay":
+        from shouldisignthis.llm.replay import ReplayLlm, get_replay_settings
+        settings = get_replay_settings(models_cfg)
+        model = ReplayLlm(
+            model=models_cfg[tier],
+            tier=tier,
+            latency=settings["latency"].get(tier),
+            latency_scale=settings["latency_scale"]
+        )
+    else:
+        model = _build_live_model(models_cfg[tier], api_key)
+        from shouldisignthis.llm.circuit import CircuitBreakerLlm, get_circuit_breaker, get_circuit_breaker_settings
+        breaker_settings = get_circuit_breaker_settings(models_cfg)
+        fallback = breaker_settings["fallbacks"].get(tier)
+        if breaker_settings["enabled"] and fallback:
+            # A fallback may name another tier ('worker') or a model
+            fallback_model = _build_live_model(models_cfg.get(fallback, fallback), api_key)
+            model = CircuitBreakerLlm.wrap(model, fallback=fallback_model, breaker=get_circuit_breaker(tier, breaker_settings))
+
+    from shouldisignthis.llm.hedging import HedgedLlm, get_hedge_policy, get_hedging_settings
+    hedging_settings = get_hedging_settings(models_cfg)
+    if hedging_settings["enabled"] and tier in hedging_settings["tiers"]:
+        model = HedgedLlm.wrap(model, policy=get_hedge_policy(models_cfg[tier], hedging_settings))
+
+    from shouldisignthis.llm.cassette import CassetteLlm, get_cassette, get_cassette_settings
+    cassette_settings = get_cassette_settings(models_cfg)
+    if cassette_settings["mode"] != "off":
+        model = CassetteLlm.wrap(model, cassette=get_cassette(cassette_settings["path"], cassette_settings["mode"]))
+    return model
 
 def get_auditor_model(api_key=None):
     """
@@ -92,14 +221,9 @@ def get_auditor_model(api_key=None):
         api_key (str, optional): The Google API key to use. Defaults to None.
 
     Returns:
-        Gemini: An instance of the Gemini model configured for the Auditor.
+        Gemini: An instance of the Gemini model configured for the Auditor (ReplayLlm on the replay backend).
     """
-    return Gemini(
-        model=models_cfg["auditor"],
-        api_key=api_key,
-        retry_options=RETRY_POLICY,
-        safety_settings=SAFE_CONTRACT_SETTINGS
-    )
+    return _build_model("auditor", api_key=api_key)
 
 def get_worker_model(api_key=None):
     """
@@ -109,14 +233,9 @@ def get_worker_model(api_key=None):
         api_key (str, optional): The Google API key to use. Defaults to None.
 
     Returns:
-        Gemini: An instance of the Gemini model configured for workers.
+        Gemini: An instance of the Gemini model configured for workers (ReplayLlm on the replay backend).
     """
-    return Gemini(
-        model=models_cfg["worker"],
-        api_key=api_key,
-        retry_options=RETRY_POLICY,
-        safety_settings=SAFE_CONTRACT_SETTINGS
-    )
+    return _build_model("worker", api_key=api_key)
 
 def get_judge_model(api_key=None):
     """
@@ -127,12 +246,7 @@ def get_judge_model(api_key=None):
         api_key (str, optional): The Google API key to use. Defaults to None.
 
     Returns:
-        Gemini: An instance of the Gemini model configured for the Judge.
+        Gemini: An instance of the Gemini model configured for the Judge (ReplayLlm on the replay backend).
     """
-    return Gemini(
-        model=models_cfg["judge"],
-        api_key=api_key,
-        retry_options=RETRY_POLICY,
-        safety_settings=SAFE_CONTRACT_SETTINGS
-    )
+    return _build_model("judge", api_key=api_key)
 
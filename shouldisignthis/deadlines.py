@@ -0,0 +1,127 @@
+"""
+Stage and Pipeline Deadlines
+
+Every stage run by the orchestrator gets a time budget: `app_config.timeout_seconds`
+(or its `stage_timeouts` override, by agent name), capped by what is left of the
+pipeline deadline (`app_config.pipeline_timeout_seconds`) when one is active.
+A stage over budget is cancelled (its in-flight model and tool calls with it)
+and raises StageTimeoutError, counted by the orchestrator in `shouldisignthis_stage_timeouts_total`.
+
+The orchestrator degrades instead of failing where a partial result is still
+sound: a late Bailiff leaves the evidence unverified, a late Advocate leaves
+the Judge with the Skeptic's risks only.
+
+Usage:
+    with pipeline_deadline():      # run_pipeline, or around the stages in the UI
+        ...                        # every stage inside shares the deadline
+"""
+
+import asyncio
+import contextvars
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# Absolute time.monotonic() deadline of the running pipeline (None = no pipeline deadline)
+_pipeline_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("pipeline_deadline", default=None)
+
+
+class StageTimeoutError(asyncio.TimeoutError):
+    """
+    A stage ran past its deadline and was cancelled.
+
+    Attributes:
+        stage: Name of the stage's root agent.
+        timeout: The budget it had, in seconds.
+        deadline: 'stage' or 'pipeline' (which deadline cut it off).
+        session: The session as the stage left it (partial state), if any.
+    """
+
+    def __init__(self, stage: str, timeout: float, deadline: str = "stage", session: Any = None):
+        super().__init__(f"{stage} timed out after {timeout:.1f}s ({deadline} deadline)")
+        self.stage = stage
+        self.timeout = timeout
+        self.deadline = deadline
+        self.session = session
+
+
+def _seconds(value) -> Optional[float]:
+    # 0 / None / "" disable a deadline
+    return float(value) if value not in (None, "") and float(value) > 0 else None
+
+
+def get_timeout_settings(app_cfg: Dict) -> Dict:
+    """
+    Reads the deadline settings from the 'app_config' section (env vars take priority).
+
+    Args:
+        app_cfg (Dict): The 'app_config' section of the app config.
+
+    Returns:
+        Dict: {"stage_seconds": Optional[float], "stages": Dict[str, Optional[float]],
+        "pipeline_seconds": Optional[float]}; None means no deadline.
+    """
+    env_stage = os.environ.get("SHOULDISIGNTHIS_STAGE_TIMEOUT")
+    env_pipeline = os.environ.get("SHOULDISIGNTHIS_PIPELINE_TIMEOUT")
+    return {
+        "stage_seconds": _seconds(env_stage if env_stage is not None else app_cfg.get("timeout_seconds", 30)),
+        "stages": {name: _seconds(seconds) for name, seconds in (app_cfg.get("stage_timeouts") or {}).items()},
+        "pipeline_seconds": _seconds(env_pipeline if env_pipeline is not None else app_cfg.get("pipeline_timeout_seconds")),
+    }
+
+
+def _settings() -> Dict:
+    from shouldisignthis.config import app_cfg
+    return get_timeout_settings(app_cfg or {})
+
+
+def get_stage_timeout(stage: str) -> Optional[float]:
+    """Returns the configured budget of a stage (by root agent name), ignoring the pipeline deadline."""
+    settings = _settings()
+    return settings["stages"].get(stage, settings["stage_seconds"])
+
+
+@contextmanager
+def pipeline_deadline(seconds: Optional[float] = None) -> Iterator[Optional[float]]:
+    """
+    Starts a pipeline deadline for the stages run inside the block (nested blocks keep the earliest).
+
+    Args:
+        seconds (Optional[float], optional): Budget. Defaults to `app_config.pipeline_timeout_seconds`.
+
+    Yields:
+        Optional[float]: The absolute monotonic deadline (None = no deadline).
+    """
+    seconds = seconds if seconds is not None else _settings()["pipeline_seconds"]
+    current = _pipeline_deadline.get()
+    deadline = time.monotonic() + seconds if seconds else None
+    if current is not None and (deadline is None or current < deadline):
+        deadline = current
+    token = _pipeline_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _pipeline_deadline.reset(token)
+
+
+def stage_budget(stage: str, reserve_seconds: float = 0.0) -> Tuple[Optional[float], str]:
+    """
+    Returns the time a stage may take now.
+
+    Args:
+        stage (str): Root agent name of the stage.
+        reserve_seconds (float, optional): Pipeline time to keep for later stages. Defaults to 0.
+
+    Returns:
+        Tuple[Optional[float], str]: (seconds or None for no limit, 'stage' or 'pipeline' = the deadline that applies).
+    """
+    timeout = get_stage_timeout(stage)
+    deadline = _pipeline_deadline.get()
+    if deadline is None:
+        return timeout, "stage"
+    remaining = deadline - time.monotonic() - reserve_seconds
+    if timeout is None or remaining < timeout:
+        return max(0.0, remaining), "pipeline"
+    return timeout, "stage"
+
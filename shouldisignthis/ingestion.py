@@ -0,0 +1,257 @@
+"""
+Upload Ingestion
+
+Keeps large uploads (contract bundles with exhibits, up to `ingestion.max_upload_mb`)
+out of process memory. An upload is spooled in chunks to an unnamed temp file
+(removed by the OS when closed) and PDFs are read through a memory map, so pages
+are parsed only when a batch needs them.
+
+Stage 1 sends a long PDF to the Auditor in batches of `ingestion.pages_per_batch`
+pages, each a small standalone PDF, instead of as one payload; peak memory then
+depends on the batch size (times `ingestion.max_parallel_batches`, the batches
+audited at once), not on the document size. A PDF larger than
+`ingestion.max_batch_mb` is batched even when it is short, and a batch over that
+size is split further: files go to Gemini inline, and a request over ~20 MB
+(base64 included) is rejected.
+
+Usage:
+    with spool_upload(uploaded_file, uploaded_file.type) as upload:
+        auditor_out = await run_stage_1(upload, upload.mime_type, ...)
+"""
+
+import io
+import mmap
+import os
+import tempfile
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from pypdf import PdfReader, PdfWriter
+
+CHUNK_BYTES = 1024 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """The upload is larger than `ingestion.max_upload_mb`."""
+
+
+class SpooledUpload:
+    """
+    An uploaded file held in a temp file (or an in-memory buffer for bytes), read on demand.
+
+    Attributes:
+        mime_type: The MIME type of the upload.
+        size: Its size in bytes.
+    """
+
+    def __init__(self, file: BinaryIO, size: int, mime_type: str):
+        """
+        Args:
+            file (BinaryIO): Seekable file holding the upload.
+            size (int): Its size in bytes.
+            mime_type (str): Its MIME type.
+        """
+        self._file = file
+        self._mmap: Optional[mmap.mmap] = None
+        self._reader: Optional[PdfReader] = None
+        self.size = size
+        self.mime_type = mime_type
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mime_type: str) -> "SpooledUpload":
+        """Wraps bytes that are already in memory (batch jobs, tests) without copying them to disk."""
+        return cls(io.BytesIO(data), len(data), mime_type)
+
+    @property
+    def is_pdf(self) -> bool:
+        return self.mime_type == "application/pdf"
+
+    def _view(self) -> BinaryIO:
+        # A memory map lets the OS page the file in and out instead of holding it on the heap
+        if self._mmap is None and self.size and hasattr(self._file, "fileno"):
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError, io.UnsupportedOperation):
+                pass
+        view = self._mmap if self._mmap is not None else self._file
+        view.seek(0)
+        return view
+
+    def read_bytes(self) -> bytes:
+        """Returns the whole file (for uploads small enough to send in one request)."""
+        return self._view().read()
+
+    def _pdf(self) -> PdfReader:
+        if self._reader is None:
+            self._reader = PdfReader(self._view())
+        return self._reader
+
+    def page_count(self) -> Optional[int]:
+        """Returns the number of pages of a PDF (None for other files or an unreadable PDF)."""
+        if not self.is_pdf:
+            return None
+        try:
+            return len(self._pdf().pages)
+        except Exception:
+            return None
+
+    def extract_pages(self) -> Optional[List[str]]:
+        """
+        Returns the text layer of a PDF, one string per page (no model call).
+
+        Returns:
+            Optional[List[str]]: The page texts, or None for other files, unreadable PDFs and scans without a text layer.
+        """
+        if not self.is_pdf:
+            return None
+        try:
+            pages = [page.extract_text() or "" for page in self._pdf().pages]
+        except Exception:
+            return None
+        return pages if any(text.strip() for text in pages) else None
+
+    def extract_text(self) -> Optional[str]:
+        """
+        Returns the text layer of a PDF (no model call).
+
+        Returns:
+            Optional[str]: The text, or None for other files, unreadable PDFs and scans without a text layer.
+        """
+        pages = self.extract_pages()
+        return "\n".join(pages) if pages is not None else None
+
+    def iter_page_batches(self, pages_per_batch: int, max_batch_bytes: Optional[int] = None) -> Iterator[Tuple[int, int, bytes]]:
+        """
+        Splits a PDF into standalone PDFs of consecutive pages, built one at a time.
+
+        Args:
+            pages_per_batch (int): Pages per batch.
+            max_batch_bytes (Optional[int], optional): Size limit per batch (see page_ranges). Defaults to None.
+
+        Yields:
+            Tuple[int, int, bytes]: (first page, last page, PDF bytes); pages are 1-indexed.
+        """
+        for first, last in self.page_ranges(pages_per_batch, max_batch_bytes):
+            yield first, last, self.page_range(first, last)
+
+    def page_ranges(self, pages_per_batch: int, max_batch_bytes: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Plans the page batches of a PDF: at most pages_per_batch pages each and, when the upload is
+        over max_batch_bytes, at most max_batch_bytes each (a batch over the limit is halved until it
+        fits or is down to one page). Batches of an upload under the limit are not measured.
+
+        Args:
+            pages_per_batch (int): Pages per batch.
+            max_batch_bytes (Optional[int], optional): Size limit per batch PDF. Defaults to None (no limit).
+
+        Returns:
+            List[Tuple[int, int]]: (first page, last page) of each batch, in page order; pages are 1-indexed.
+        """
+        total = len(self._pdf().pages)
+        pending = [(start + 1, min(start + pages_per_batch, total)) for start in range(0, total, pages_per_batch)]
+        if not max_batch_bytes or self.size <= max_batch_bytes:
+            return pending
+        ranges = []
+        while pending:
+            first, last = pending.pop(0)
+            if first < last and len(self.page_range(first, last)) > max_batch_bytes:
+                middle = (first + last) // 2
+                pending[:0] = [(first, middle), (middle + 1, last)]
+            else:
+                ranges.append((first, last))
+        return ranges
+
+    def page_range(self, first: int, last: int) -> bytes:
+        """
+        Returns pages first..last (1-indexed, inclusive) of a PDF as a standalone PDF.
+
+        Args:
+            first (int): First page.
+            last (int): Last page.
+
+        Returns:
+            bytes: The PDF.
+        """
+        reader = self._pdf()
+        writer = PdfWriter()
+        for index in range(first - 1, last):
+            writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def close(self) -> None:
+        """Releases the memory map and deletes the temp file."""
+        self._reader = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def spool_upload(source: Union[bytes, BinaryIO], mime_type: str, max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Copies an upload to a temp file in chunks.
+
+    Args:
+        source (Union[bytes, BinaryIO]): The upload (e.g. a Streamlit UploadedFile) or its bytes.
+        mime_type (str): Its MIME type.
+        max_bytes (Optional[int], optional): Size limit. Defaults to `ingestion.max_upload_mb`.
+
+    Returns:
+        SpooledUpload: The spooled upload (close it, or use it as a context manager).
+
+    Raises:
+        UploadTooLargeError: The upload is over the limit.
+    """
+    max_bytes = max_bytes if max_bytes is not None else _settings()["max_upload_bytes"]
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    source.seek(0)
+    spool = tempfile.TemporaryFile(prefix="shouldisignthis-upload-", dir=_settings()["spool_dir"])
+    try:
+        size = 0
+        while True:
+            chunk = source.read(CHUNK_BYTES)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes and size > max_bytes:
+                raise UploadTooLargeError(f"Upload is larger than {max_bytes / (1024 * 1024):.0f} MB")
+            spool.write(chunk)
+        spool.flush()
+    except BaseException:
+        spool.close()
+        raise
+    return SpooledUpload(spool, size, mime_type)
+
+
+def get_ingestion_settings(ingestion_cfg: Dict) -> Dict:
+    """
+    Reads the ingestion settings from the 'ingestion' config section (env vars take priority).
+
+    Args:
+        ingestion_cfg (Dict): The 'ingestion' section of the app config.
+
+    Returns:
+        Dict: {"max_upload_bytes": int, "pages_per_batch": int, "max_batch_bytes": int,
+        "max_parallel_batches": int, "spool_dir": Optional[str]}.
+    """
+    max_upload_mb = float(os.environ.get("SHOULDISIGNTHIS_MAX_UPLOAD_MB") or ingestion_cfg.get("max_upload_mb", 100))
+    return {
+        "max_upload_bytes": int(max_upload_mb * 1024 * 1024),
+        "pages_per_batch": max(1, int(ingestion_cfg.get("pages_per_batch", 20))),
+        "max_batch_bytes": int(float(ingestion_cfg.get("max_batch_mb", 14)) * 1024 * 1024),
+        "max_parallel_batches": max(1, int(ingestion_cfg.get("max_parallel_batches", 4))),
+        "spool_dir": os.environ.get("SHOULDISIGNTHIS_SPOOL_DIR") or ingestion_cfg.get("spool_dir") or None,
+    }
+
+
+def _settings() -> Dict:
+    from shouldisignthis.config import APP_CONFIG
+    return get_ingestion_settings(APP_CONFIG.get("ingestion", {}) or {})
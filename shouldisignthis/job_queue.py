@@ -0,0 +1,272 @@
+"""
+Durable Job Queue
+
+SQLite-backed job table used by the batch worker pool. Jobs are claimed with a
+time-limited lease that the owning worker keeps alive with heartbeats; if a
+worker dies, its lease expires and another worker picks the job up again.
+
+Any process (on any node) that can open the same queue file can enqueue or
+work jobs.
+"""
+
+import json
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+from shouldisignthis.config import APP_CONFIG
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    filename TEXT,
+    mime_type TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    options TEXT,
+    result TEXT,
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    heartbeat_at REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+"""
+
+# Job lifecycle: QUEUED -> RUNNING -> DONE | FAILED (RUNNING -> QUEUED on retryable failure)
+QUEUED = "QUEUED"
+RUNNING = "RUNNING"
+DONE = "DONE"
+FAILED = "FAILED"
+
+
+def get_worker_config() -> Dict:
+    """
+    Returns the 'worker' section of the app config with defaults applied.
+
+    Returns:
+        Dict: Worker pool settings (queue path, lease and heartbeat timings, etc.).
+    """
+    cfg = APP_CONFIG.get("worker", {})
+    return {
+        "queue_path": cfg.get("queue_path", "jobs.db"),
+        "num_workers": cfg.get("num_workers", 2),
+        "lease_seconds": cfg.get("lease_seconds", 120),
+        "heartbeat_seconds": cfg.get("heartbeat_seconds", 30),
+        "poll_interval_seconds": cfg.get("poll_interval_seconds", 1.0),
+        "max_attempts": cfg.get("max_attempts", 3),
+    }
+
+
+class JobQueue:
+    """
+    A durable, lease-based job queue stored in a single SQLite file.
+
+    Each method opens its own short-lived connection, so one instance can be
+    shared between threads (e.g. a worker loop and its heartbeat thread).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path (str, optional): Path to the SQLite queue file. Defaults to worker.queue_path from config.
+        """
+        self.path = path or get_worker_config()["queue_path"]
+        queue_dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(queue_dir):
+            os.makedirs(queue_dir)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=30000")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def enqueue(self, file_bytes: bytes, mime_type: str, filename: Optional[str] = None, options: Optional[Dict] = None, max_attempts: Optional[int] = None) -> str:
+        """
+        Adds a contract to the queue.
+
+        Args:
+            file_bytes (bytes): The raw file content.
+            mime_type (str): The MIME type of the file.
+            filename (str, optional): Original file name, kept for reporting.
+            options (Dict, optional): Extra pipeline options (e.g. {"tone": "Professional"}).
+            max_attempts (int, optional): Attempts before the job is marked FAILED.
+
+        Returns:
+            str: The new job ID.
+        """
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, filename, mime_type, payload, options, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, filename, mime_type, file_bytes, json.dumps(options or {}),
+                 max_attempts or get_worker_config()["max_attempts"], now, now)
+            )
+        return job_id
+
+    def claim(self, worker_id: str, lease_seconds: Optional[float] = None) -> Optional[Dict]:
+        """
+        Atomically leases the oldest runnable job to a worker.
+
+        A job is runnable if it is QUEUED, or RUNNING with an expired lease
+        (its previous owner stopped heartbeating).
+
+        Args:
+            worker_id (str): Unique ID of the claiming worker.
+            lease_seconds (float, optional): Lease duration. Defaults to worker.lease_seconds.
+
+        Returns:
+            Optional[Dict]: The claimed job (including 'payload' bytes), or None if the queue is empty.
+        """
+        lease_seconds = lease_seconds or get_worker_config()["lease_seconds"]
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Jobs whose worker died on the final attempt are not retried again.
+                conn.execute(
+                    "UPDATE jobs SET status = ?, error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ? "
+                    "WHERE status = ? AND lease_expires_at < ? AND attempts >= max_attempts",
+                    (FAILED, "Lease expired on final attempt", now, RUNNING, now)
+                )
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? OR (status = ? AND lease_expires_at < ?) "
+                    "ORDER BY created_at LIMIT 1",
+                    (QUEUED, RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute(
+                    "UPDATE jobs SET status = ?, lease_owner = ?, lease_expires_at = ?, heartbeat_at = ?, "
+                    "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (RUNNING, worker_id, now + lease_seconds, now, now, row["id"])
+                )
+                job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        job = dict(job)
+        job["options"] = json.loads(job["options"] or "{}")
+        return job
+
+    def heartbeat(self, job_id: str, worker_id: str, lease_seconds: Optional[float] = None) -> bool:
+        """
+        Extends the lease on a running job.
+
+        Args:
+            job_id (str): The job being worked.
+            worker_id (str): The worker holding the lease.
+            lease_seconds (float, optional): New lease duration from now.
+
+        Returns:
+            bool: False if the lease was lost (expired and re-claimed by another worker).
+        """
+        lease_seconds = lease_seconds or get_worker_config()["lease_seconds"]
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, heartbeat_at = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (now + lease_seconds, now, now, job_id, worker_id, RUNNING)
+            )
+            return cur.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict) -> bool:
+        """
+        Marks a job DONE and stores its result.
+
+        Args:
+            job_id (str): The job being completed.
+            worker_id (str): The worker holding the lease.
+            result (Dict): JSON-serialisable pipeline output.
+
+        Returns:
+            bool: False if the worker no longer owns the job (result discarded).
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL, lease_expires_at = NULL, "
+                "payload = X'', updated_at = ? WHERE id = ? AND lease_owner = ? AND status = ?",
+                (DONE, json.dumps(result), now, job_id, worker_id, RUNNING)
+            )
+            return cur.rowcount == 1
+
+    def fail(self, job_id: str, worker_id: str, error: str) -> bool:
+        """
+        Records a failed attempt. The job is re-queued until it runs out of attempts.
+
+        Args:
+            job_id (str): The job that failed.
+            worker_id (str): The worker holding the lease.
+            error (str): Error description.
+
+        Returns:
+            bool: False if the worker no longer owns the job.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            cur = conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END, "
+                "error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = ?",
+                (FAILED, QUEUED, error, now, job_id, worker_id, RUNNING)
+            )
+            return cur.rowcount == 1
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Fetches a job's status and result (without the payload).
+
+        Args:
+            job_id (str): The job ID.
+
+        Returns:
+            Optional[Dict]: The job record, with 'result' parsed from JSON, or None if unknown.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, status, filename, mime_type, options, result, error, attempts, max_attempts, "
+                "lease_owner, lease_expires_at, heartbeat_at, created_at, updated_at FROM jobs WHERE id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["options"] = json.loads(job["options"] or "{}")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Counts jobs per status.
+
+        Returns:
+            Dict[str, int]: e.g. {"QUEUED": 3, "RUNNING": 2, "DONE": 10, "FAILED": 0}.
+        """
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        with self._connect() as conn:
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status"):
+                counts[row["status"]] = row["n"]
+        return counts
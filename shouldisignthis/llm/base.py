@@ -0,0 +1,109 @@
+"""
+Delegating Model Base
+
+Common base for model wrappers (cassette, retries, hedging, ...) that sit
+between an agent and its real model. A wrapper reports the wrapped model's
+name, so ADK treats it exactly like the model it wraps.
+"""
+
+import re
+from typing import AsyncGenerator, Optional
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+# A protobuf Duration in JSON: seconds with an 's' suffix
+_DURATION = re.compile(r"\s*([0-9]+(?:\.[0-9]+)?)s\s*")
+
+
+class DelegatingLlm(BaseLlm):
+    """
+    A model that forwards every call to an inner model.
+
+    Attributes:
+        inner: The wrapped model (Gemini, ReplayLlm or another wrapper).
+    """
+
+    inner: BaseLlm
+
+    @classmethod
+    def wrap(cls, inner: BaseLlm, **kwargs) -> "DelegatingLlm":
+        """
+        Wraps a model, inheriting its model name.
+
+        Args:
+            inner (BaseLlm): The model to wrap.
+            **kwargs: Wrapper-specific fields.
+
+        Returns:
+            DelegatingLlm: The wrapper.
+        """
+        return cls(model=inner.model, inner=inner, **kwargs)
+
+    @property
+    def innermost(self) -> BaseLlm:
+        """The model at the bottom of the wrapper chain."""
+        model = self.inner
+        while isinstance(model, DelegatingLlm):
+            model = model.inner
+        return model
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            yield response
+
+    def connect(self, llm_request: LlmRequest):
+        return self.inner.connect(llm_request)
+
+
+def error_status(error: BaseException) -> Optional[int]:
+    """
+    Returns the HTTP status of a model API error (google.genai APIError.code), if any.
+
+    Args:
+        error (BaseException): The error raised by a model call.
+
+    Returns:
+        Optional[int]: e.g. 429, or None for non-HTTP errors.
+    """
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """
+    Returns the server's retry hint (seconds) from a model API error, if present.
+
+    The Gemini API sends it as a google.rpc.RetryInfo detail in the error body
+    (`"retryDelay": "37s"`); the Retry-After header is the fallback.
+
+    Args:
+        error (BaseException): The error raised by a model call.
+
+    Returns:
+        Optional[float]: Seconds to wait, or None.
+    """
+    delay = _retry_info_delay(getattr(error, "details", None))
+    if delay is not None:
+        return delay
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    try:
+        return max(0.0, float(value)) if value is not None else None
+    except (TypeError, ValueError):
+        return None  # HTTP-date form is not used by the Gemini API
+
+
+def _retry_info_delay(details) -> Optional[float]:
+    """Returns the RetryInfo retryDelay ("37s", "1.5s") of an APIError body, if any."""
+    error = details.get("error") if isinstance(details, dict) else None
+    entries = error.get("details") if isinstance(error, dict) else None
+    for entry in entries if isinstance(entries, list) else []:
+        match = _DURATION.fullmatch(str(entry.get("retryDelay", ""))) if isinstance(entry, dict) else None
+        if match:
+            return max(0.0, float(match.group(1)))
+    return None
@@ -0,0 +1,204 @@
+"""
+Model Call Cassettes
+
+Record/replay layer around the model objects built in config.py. Each request
+is reduced to a stable hash of (model, system instruction, contents, tools,
+response schema) and the responses are stored in a gzip-compressed JSON
+cassette on disk.
+
+Modes (models.cassette.mode or SHOULDISIGNTHIS_CASSETTE_MODE):
+    off     - no cassette (default)
+    record  - always call the model and (re)record the response
+    replay  - serve from the cassette only; a miss raises CassetteMissError
+    auto    - serve hits from the cassette, call the model and record on a miss
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from typing import AsyncGenerator, Dict, List, Optional
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from shouldisignthis.llm.base import DelegatingLlm
+from shouldisignthis.observability.metrics import CACHE_LOOKUPS
+
+CASSETTE_MODES = ("off", "record", "replay", "auto")
+
+# Session IDs and other UUIDs change on every run (e.g. "CASE FILE: <session_id>")
+# and must not affect the request hash.
+_UUID_RE = re.compile(r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}")
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request has no recorded response."""
+
+
+def request_key(llm_request: LlmRequest) -> str:
+    """
+    Computes the cassette key of a request.
+
+    Args:
+        llm_request (LlmRequest): The model request.
+
+    Returns:
+        str: SHA-256 hex digest of the canonicalised request.
+    """
+    config = llm_request.config
+    tools = []
+    for tool in (config.tools or []) if config else []:
+        tools.append(tool.model_dump(mode="json", exclude_none=True))
+    response_schema = None
+    if config and config.response_schema is not None:
+        schema = config.response_schema
+        response_schema = schema.model_json_schema() if hasattr(schema, "model_json_schema") else str(schema)
+
+    canonical = {
+        "model": llm_request.model,
+        "system_instruction": str(config.system_instruction or "") if config else "",
+        "contents": [c.model_dump(mode="json", exclude_none=True) for c in llm_request.contents or []],
+        "tools": tools,
+        "response_schema": response_schema,
+    }
+    # Function call IDs are generated client-side per run
+    payload = json.dumps(canonical, sort_keys=True, default=str)
+    payload = re.sub(r'"id": "[^"]*"', '"id": ""', payload)
+    payload = _UUID_RE.sub("<uuid>", payload)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class Cassette:
+    """
+    A compressed on-disk store of recorded model responses, keyed by request hash.
+    """
+
+    def __init__(self, path: str, mode: str = "auto"):
+        """
+        Args:
+            path (str): Path of the .json.gz cassette file.
+            mode (str, optional): One of CASSETTE_MODES. Defaults to 'auto'.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Unknown cassette mode '{mode}'. Expected one of {CASSETTE_MODES}.")
+        self.path = path
+        self.mode = mode
+        self.interactions: Dict[str, List[Dict]] = {}
+        self.stats = {"hits": 0, "misses": 0, "recorded": 0}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self.interactions = json.load(f).get("interactions", {})
+
+    def get(self, key: str) -> Optional[List[LlmResponse]]:
+        """Returns the recorded responses for a key (and counts the hit/miss)."""
+        with self._lock:
+            recorded = self.interactions.get(key)
+            self.stats["hits" if recorded is not None else "misses"] += 1
+        CACHE_LOOKUPS.inc(cache="cassette", result="hit" if recorded is not None else "miss")
+        if recorded is None:
+            return None
+        return [LlmResponse.model_validate(r) for r in recorded]
+
+    def put(self, key: str, responses: List[LlmResponse]) -> None:
+        """Records the responses for a key and persists the cassette."""
+        with self._lock:
+            self.interactions[key] = [r.model_dump(mode="json", exclude_none=True) for r in responses]
+            self.stats["recorded"] += 1
+            self._save()
+
+    def _save(self) -> None:
+        cassette_dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(cassette_dir):
+            os.makedirs(cassette_dir)
+        tmp_path = f"{self.path}.tmp"
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump({"version": 1, "interactions": self.interactions}, f)
+        os.replace(tmp_path, self.path)
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cassette."""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / lookups if lookups else 0.0
+
+
+class CassetteLlm(DelegatingLlm):
+    """
+    Serves model calls from a cassette and records misses, according to the cassette mode.
+
+    Attributes:
+        cassette: The shared cassette.
+    """
+
+    cassette: Cassette
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        key = request_key(llm_request)
+
+        if self.cassette.mode in ("replay", "auto"):
+            recorded = self.cassette.get(key)
+            if recorded is not None:
+                logging.debug(f"📼 Cassette hit {key[:12]} ({self.model})")
+                for response in recorded:
+                    response.custom_metadata = {**(response.custom_metadata or {}), "cache_hit": "cassette"}
+                    yield response
+                return
+            if self.cassette.mode == "replay":
+                raise CassetteMissError(f"No cassette entry for request {key[:12]} ({self.model}) in {self.cassette.path}")
+
+        responses = []
+        async for response in self.inner.generate_content_async(llm_request, stream=stream):
+            responses.append(response)
+            yield response
+        logging.debug(f"📼 Cassette record {key[:12]} ({self.model})")
+        self.cassette.put(key, responses)
+
+
+# --- CASSETTE REGISTRY ---
+_cassettes: Dict[str, Cassette] = {}
+_registry_lock = threading.Lock()
+
+
+def get_cassette_settings(models_cfg: Dict) -> Dict:
+    """
+    Reads the cassette settings from the 'models' config section (env vars take priority).
+
+    Args:
+        models_cfg (Dict): The 'models' section of the app config.
+
+    Returns:
+        Dict: {"mode": str, "path": str}.
+    """
+    cassette_cfg = models_cfg.get("cassette", {}) or {}
+    return {
+        "mode": os.environ.get("SHOULDISIGNTHIS_CASSETTE_MODE") or cassette_cfg.get("mode", "off"),
+        "path": os.environ.get("SHOULDISIGNTHIS_CASSETTE_PATH") or cassette_cfg.get("path", "cassettes/default.json.gz"),
+    }
+
+
+def get_cassette(path: str, mode: str) -> Cassette:
+    """Returns the process-wide cassette for a path (loaded once)."""
+    with _registry_lock:
+        cassette = _cassettes.get(path)
+        if cassette is None or cassette.mode != mode:
+            cassette = Cassette(path, mode)
+            _cassettes[path] = cassette
+        return cassette
+
+
+def get_cassette_stats() -> Dict[str, Dict]:
+    """
+    Returns hit/miss/record counts for every cassette used in this process.
+
+    Returns:
+        Dict[str, Dict]: {path: {"mode", "hits", "misses", "recorded", "hit_rate", "entries"}}.
+    """
+    with _registry_lock:
+        return {
+            path: {"mode": c.mode, **c.stats, "hit_rate": round(c.hit_rate(), 3), "entries": len(c.interactions)}
+            for path, c in _cassettes.items()
+        }
@@ -0,0 +1,274 @@
+"""
+Circuit Breaker with Fallback Model
+
+Guards a model tier (the `models.circuit_breaker` config section, by default
+the Pro model of `auditor` and `judge`). The breaker watches the last calls of
+the tier's model and trips when too many of them failed (server errors, 429s
+and timeouts, after retries) or were too slow. While open, calls go straight
+to the tier's fallback model (e.g. the worker model) instead of stalling
+through retries. After `open_seconds` the breaker lets a few trial calls
+through (half-open): if they succeed it closes, otherwise it opens again.
+
+A call whose primary attempt fails is also answered by the fallback. Responses
+served by the fallback carry `custom_metadata["fallback_for"]`, so usage
+tracking can report which model produced each agent's output.
+"""
+
+import collections
+import logging
+import os
+import threading
+import time
+from typing import AsyncGenerator, Callable, Deque, Dict
+
+import httpx
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from shouldisignthis.llm.base import DelegatingLlm, error_status
+from shouldisignthis.observability.metrics import CIRCUIT_STATE, CIRCUIT_TRANSITIONS, FALLBACK_CALLS
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+def is_degradation(error: BaseException) -> bool:
+    """Returns True for errors that mean the model is unhealthy (5xx, 429, timeouts), not a bad request."""
+    status = error_status(error)
+    if status is not None:
+        return status >= 500 or status == 429
+    return isinstance(error, (httpx.TimeoutException, httpx.ConnectError))
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open state of one model tier, from its recent call outcomes.
+    """
+
+    def __init__(self, name: str, window: int = 20, min_calls: int = 5, failure_rate: float = 0.5,
+                 slow_call_seconds: float = 60.0, slow_call_rate: float = 0.5, open_seconds: float = 30.0,
+                 half_open_calls: int = 2, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name (str): The tier (metrics label).
+            window (int, optional): Recent calls the rates are computed over. Defaults to 20.
+            min_calls (int, optional): Calls needed before the breaker may trip. Defaults to 5.
+            failure_rate (float, optional): Failed share of the window that trips it. Defaults to 0.5.
+            slow_call_seconds (float, optional): A call slower than this counts as slow. Defaults to 60.
+            slow_call_rate (float, optional): Slow share of the window that trips it. Defaults to 0.5.
+            open_seconds (float, optional): Time open before trial calls. Defaults to 30.
+            half_open_calls (int, optional): Successful trial calls needed to close. Defaults to 2.
+            clock (Callable[[], float], optional): Time source. Defaults to time.monotonic.
+        """
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.clock = clock
+        self._lock = threading.Lock()
+        # (failed, slow) per recent call
+        self._outcomes: Deque[tuple] = collections.deque(maxlen=window)
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._trials_started = 0
+        self._trials_passed = 0
+        CIRCUIT_STATE.set(_STATE_VALUES[CLOSED], tier=name)
+
+    def _transition(self, state: str) -> None:
+        self.state = state
+        CIRCUIT_STATE.set(_STATE_VALUES[state], tier=self.name)
+        CIRCUIT_TRANSITIONS.inc(tier=self.name, state=state)
+        if state == OPEN:
+            self._opened_at = self.clock()
+        if state == HALF_OPEN:
+            self._trials_started = self._trials_passed = 0
+        if state == CLOSED:
+            self._outcomes.clear()
+        log = logging.warning if state == OPEN else logging.info
+        log(f"🔌 Circuit breaker '{self.name}' is now {state.replace('_', '-')}")
+
+    def allow_request(self) -> bool:
+        """True if the call may go to the primary model (closed, or a half-open trial slot)."""
+        with self._lock:
+            if self.state == OPEN and self.clock() - self._opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and self._trials_started < self.half_open_calls:
+                self._trials_started += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        """Gives back the trial slot of an allowed call that ended without an outcome (e.g. it was cancelled)."""
+        with self._lock:
+            if self.state == HALF_OPEN and self._trials_started > self._trials_passed:
+                self._trials_started -= 1
+
+    def record(self, failed: bool, latency: float) -> None:
+        """
+        Records the outcome of a call that went to the primary model.
+
+        Args:
+            failed (bool): It failed with a degradation error.
+            latency (float): Its wall time in seconds.
+        """
+        slow = latency >= self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._transition(OPEN)
+                else:
+                    self._trials_passed += 1
+                    if self._trials_passed >= self.half_open_calls:
+                        self._transition(CLOSED)
+                return
+            if self.state != CLOSED:
+                return
+            self._outcomes.append((failed, slow))
+            calls = len(self._outcomes)
+            if calls < self.min_calls:
+                return
+            failures = sum(1 for f, _ in self._outcomes if f)
+            slow_calls = sum(1 for _, s in self._outcomes if s)
+            if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+                self._transition(OPEN)
+
+
+def _detached_copy(llm_request: LlmRequest) -> LlmRequest:
+    """
+    Copies a request so that in-place edits of it (contents, parts, config) do not reach the copy.
+    File payloads are shared, not copied: bytes are immutable, and a deep copy of an Auditor
+    request would double the memory its PDF takes.
+
+    Args:
+        llm_request (LlmRequest): The request.
+
+    Returns:
+        LlmRequest: The copy.
+    """
+    contents = [
+        content.model_copy(update={"parts": [part.model_copy() for part in content.parts]}) if content.parts else content.model_copy()
+        for content in llm_request.contents or []
+    ]
+    config = llm_request.config.model_copy(deep=True) if llm_request.config else None
+    return llm_request.model_copy(update={"contents": contents, "config": config})
+
+
+class CircuitBreakerLlm(DelegatingLlm):
+    """
+    Sends calls to the inner model while its breaker allows, and to the fallback model otherwise.
+
+    Attributes:
+        fallback: The model that answers while the breaker is open.
+        breaker: The tier's circuit breaker.
+    """
+
+    fallback: BaseLlm
+    breaker: CircuitBreaker
+
+    async def _from_fallback(self, llm_request: LlmRequest, stream: bool) -> AsyncGenerator[LlmResponse, None]:
+        FALLBACK_CALLS.inc(tier=self.breaker.name, model=self.fallback.model)
+        async for response in self.fallback.generate_content_async(llm_request, stream=stream):
+            response.model_version = response.model_version or self.fallback.model
+            response.custom_metadata = {**(response.custom_metadata or {}), "fallback_for": self.model}
+            yield response
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        if not self.breaker.allow_request():
+            async for response in self._from_fallback(llm_request, stream):
+                yield response
+            return
+
+        # The primary model may adjust the request in place; the fallback gets the original
+        fallback_request = _detached_copy(llm_request)
+        start = time.perf_counter()
+        yielded = recorded = False
+        try:
+            async for response in self.inner.generate_content_async(llm_request, stream=stream):
+                yielded = True
+                yield response
+        except Exception as e:
+            degraded = is_degradation(e)
+            recorded = True
+            self.breaker.record(failed=degraded, latency=time.perf_counter() - start)
+            if not degraded or yielded:
+                raise
+            logging.warning(f"↪️ {self.model} failed ({error_status(e) or type(e).__name__}); answering with {self.fallback.model}")
+        else:
+            recorded = True
+            self.breaker.record(failed=False, latency=time.perf_counter() - start)
+            return
+        finally:
+            if not recorded:
+                # Cancelled (or closed early): no outcome, so a half-open trial slot must not stay taken
+                self.breaker.release()
+        async for response in self._from_fallback(fallback_request, stream):
+            yield response
+
+
+def get_circuit_breaker_settings(models_cfg: Dict) -> Dict:
+    """
+    Reads the circuit breaker settings from the 'models' config section (env vars take priority).
+    SHOULDISIGNTHIS_CIRCUIT_BREAKER=0 disables the breakers, =1 enables them.
+
+    Args:
+        models_cfg (Dict): The 'models' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "fallbacks": {tier: fallback tier or model name}, "breaker": Dict}
+        (breaker = CircuitBreaker arguments).
+    """
+    breaker_cfg = models_cfg.get("circuit_breaker", {}) or {}
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_CIRCUIT_BREAKER")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(breaker_cfg.get("enabled", True))
+    return {
+        "enabled": enabled,
+        "fallbacks": dict(breaker_cfg.get("fallbacks", {"auditor": "worker", "judge": "worker"}) or {}),
+        "breaker": {
+            "window": int(breaker_cfg.get("window", 20)),
+            "min_calls": int(breaker_cfg.get("min_calls", 5)),
+            "failure_rate": float(breaker_cfg.get("failure_rate", 0.5)),
+            "slow_call_seconds": float(breaker_cfg.get("slow_call_seconds", 60)),
+            "slow_call_rate": float(breaker_cfg.get("slow_call_rate", 0.5)),
+            "open_seconds": float(breaker_cfg.get("open_seconds", 30)),
+            "half_open_calls": int(breaker_cfg.get("half_open_calls", 2)),
+        },
+    }
+
+
+# --- BREAKER REGISTRY ---
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(tier: str, settings: Dict) -> CircuitBreaker:
+    """
+    Returns the process-wide breaker of a tier (created on first use), shared by every
+    agent built for that tier.
+
+    Args:
+        tier (str): The model tier ('auditor', 'judge', ...).
+        settings (Dict): From get_circuit_breaker_settings().
+
+    Returns:
+        CircuitBreaker: The breaker.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(tier)
+        if breaker is None:
+            breaker = _breakers[tier] = CircuitBreaker(tier, **settings["breaker"])
+        return breaker
+
+
+def get_circuit_breakers() -> Dict[str, CircuitBreaker]:
+    """Returns all breakers created in this process, by tier."""
+    with _breakers_lock:
+        return dict(_breakers)
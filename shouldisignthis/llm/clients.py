@@ -0,0 +1,158 @@
+"""
+Shared GenAI Clients
+
+Every agent factory builds new Gemini model objects, and each one would open
+its own google.genai Client (HTTP client, connection pool, TLS sessions) on
+first use. PooledGemini takes its client from a process-wide registry
+instead, so all models using the same API key share one client and its
+connection pool.
+
+The registry is an LRU keyed by API key (users can bring their own key in
+the sidebar), bounded by `models.client_pool.max_keys`. Async connections
+belong to the event loop that opened them, so each key holds one client per
+running event loop: everything inside one `asyncio.run` (a stage in the
+Streamlit UI, a whole pipeline in a worker, both pipelines of a face-off)
+shares a client, and a client is dropped once its loop is gone.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from google.adk.models.google_llm import Gemini
+from google.genai import Client
+from pydantic import Field
+
+from shouldisignthis.observability.metrics import CACHE_LOOKUPS
+
+
+class _NoLoop:
+    """Cache key for clients used outside an event loop (weak-referenceable, lives forever)."""
+
+
+_NO_LOOP = _NoLoop()
+
+
+class ClientRegistry:
+    """
+    LRU of genai Clients keyed by API key, with one client per event loop per key.
+    """
+
+    def __init__(self, max_keys: int = 8):
+        """
+        Args:
+            max_keys (int, optional): API keys kept before the least recently used is evicted. Defaults to 8.
+        """
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._clients: "OrderedDict[Optional[str], weakref.WeakKeyDictionary]" = OrderedDict()
+        self.created = 0
+        self.evicted = 0
+
+    def get(self, api_key: Optional[str], build: Callable[[], Client]) -> Client:
+        """
+        Returns the client for an API key in the running event loop, building it on a miss.
+
+        Args:
+            api_key (Optional[str]): The API key (None = the GOOGLE_API_KEY default).
+            build (Callable[[], Client]): Builds a new client for this key.
+
+        Returns:
+            Client: The shared client.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = _NO_LOOP
+        with self._lock:
+            per_loop = self._clients.get(api_key)
+            if per_loop is None:
+                per_loop = weakref.WeakKeyDictionary()
+                self._clients[api_key] = per_loop
+                while len(self._clients) > self.max_keys:
+                    self._clients.popitem(last=False)
+                    self.evicted += 1
+            self._clients.move_to_end(api_key)
+            client = per_loop.get(loop)
+            if client is not None:
+                CACHE_LOOKUPS.inc(cache="genai_client", result="hit")
+                return client
+            # A closed loop that is still referenced elsewhere keeps its entry alive
+            for stale in [l for l in per_loop.keys() if l is not _NO_LOOP and l.is_closed()]:
+                del per_loop[stale]
+            CACHE_LOOKUPS.inc(cache="genai_client", result="miss")
+            client = build()
+            per_loop[loop] = client
+            self.created += 1
+            logging.debug(f"🔌 New genai client for key {_fingerprint(api_key)} ({self.created} created)")
+            return client
+
+    def stats(self) -> Dict[str, int]:
+        """Returns {"keys", "clients", "created", "evicted"}."""
+        with self._lock:
+            return {
+                "keys": len(self._clients),
+                "clients": sum(len(per_loop) for per_loop in self._clients.values()),
+                "created": self.created,
+                "evicted": self.evicted,
+            }
+
+
+def _fingerprint(api_key: Optional[str]) -> str:
+    # Never log keys
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8] if api_key else "default"
+
+
+def get_client_pool_settings(models_cfg: Dict) -> Dict:
+    """
+    Reads the client pool settings from the 'models' config section (env vars take priority).
+
+    Args:
+        models_cfg (Dict): The 'models' section of the app config.
+
+    Returns:
+        Dict: {"max_keys": int}.
+    """
+    pool_cfg = models_cfg.get("client_pool", {}) or {}
+    return {"max_keys": int(os.environ.get("SHOULDISIGNTHIS_CLIENT_POOL_MAX_KEYS") or pool_cfg.get("max_keys", 8))}
+
+
+_registry: Optional[ClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> ClientRegistry:
+    """Returns the process-wide client registry (sized from config on first use)."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            from shouldisignthis.config import models_cfg
+            _registry = ClientRegistry(**get_client_pool_settings(models_cfg))
+        return _registry
+
+
+class PooledGemini(Gemini):
+    """
+    Gemini model whose API client comes from the shared ClientRegistry.
+
+    Attributes:
+        api_key: The API key for this model (None = GOOGLE_API_KEY).
+    """
+
+    api_key: Optional[str] = Field(default=None, exclude=True, repr=False)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        if self.api_key:
+            # Gemini itself has no api_key field; the key reaches the Client through client_kwargs
+            self.client_kwargs = {**(self.client_kwargs or {}), "api_key": self.api_key}
+
+    @property
+    def api_client(self) -> Client:
+        # Gemini.api_client builds the client (headers, retry options, base URL); only the caching differs
+        return get_client_registry().get(self.api_key, lambda: Gemini.api_client.func(self))
@@ -0,0 +1,222 @@
+"""
+Hedged Model Requests
+
+Cuts the tail latency of cheap model calls (the worker tier: Skeptic,
+Advocate, Bailiff, Clerk, Drafter). When a call has not answered within the
+policy's delay (the configured percentile of recent latencies for that
+model), an identical second request is sent; the first to succeed is used
+and the other is cancelled.
+
+Hedges are capped at `max_hedge_rate` of recent calls so a slow API does not
+double the load. A small random control group (`control_rate`) is never
+hedged: comparing its latency histogram with the hedged one gives the p99
+improvement, and `shouldisignthis_hedge_calls_total` the hedge rate (the
+extra requests paid for it).
+
+Enable with `models.hedging.enabled` or SHOULDISIGNTHIS_HEDGING=1.
+"""
+
+import asyncio
+import collections
+import logging
+import math
+import os
+import random
+import threading
+import time
+from typing import AsyncGenerator, Callable, Deque, Dict, List
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from shouldisignthis.llm.base import DelegatingLlm
+from shouldisignthis.observability.metrics import HEDGE_CALLS, HEDGE_LATENCY
+
+
+class HedgePolicy:
+    """
+    Hedge delay and hedge budget for one model, learned from its recent latencies.
+    """
+
+    def __init__(self, model: str, percentile: float = 0.95, window: int = 500, min_samples: int = 20,
+                 initial_delay_seconds: float = 8.0, min_delay_seconds: float = 0.5, max_hedge_rate: float = 0.1,
+                 control_rate: float = 0.05, rng: Callable[[], float] = random.random):
+        """
+        Args:
+            model (str): The model name (metrics label).
+            percentile (float, optional): Latency percentile after which a hedge is sent. Defaults to 0.95.
+            window (int, optional): Recent calls the percentile and hedge rate are computed over. Defaults to 500.
+            min_samples (int, optional): Calls needed before the percentile is trusted. Defaults to 20.
+            initial_delay_seconds (float, optional): Delay used until then. Defaults to 8.
+            min_delay_seconds (float, optional): Lower bound of the delay. Defaults to 0.5.
+            max_hedge_rate (float, optional): Max share of calls that get a hedge. Defaults to 0.1.
+            control_rate (float, optional): Share of calls never hedged (baseline). Defaults to 0.05.
+            rng (Callable[[], float], optional): Random source for the control group. Defaults to random.random.
+        """
+        self.model = model
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay_seconds = initial_delay_seconds
+        self.min_delay_seconds = min_delay_seconds
+        self.max_hedge_rate = max_hedge_rate
+        self.control_rate = control_rate
+        self.rng = rng
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = collections.deque(maxlen=window)
+        self._hedged: Deque[bool] = collections.deque(maxlen=window)
+
+    def in_control_group(self) -> bool:
+        return self.rng() < self.control_rate
+
+    def delay(self) -> float:
+        """Seconds to wait for the first request before hedging."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay_seconds
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)
+        return max(self.min_delay_seconds, ordered[index])
+
+    def allow_hedge(self) -> bool:
+        """True while hedges stay under max_hedge_rate of recent calls."""
+        with self._lock:
+            return sum(self._hedged) < self.max_hedge_rate * max(len(self._hedged), self.min_samples)
+
+    def record(self, first_latency: float, hedged: bool) -> None:
+        """
+        Records a finished call.
+
+        Args:
+            first_latency (float): Latency of the first request (when it lost to the hedge, the time it
+                was cancelled at; that is still above the delay, so the percentile is not pulled down).
+            hedged (bool): Whether a hedge was sent.
+        """
+        with self._lock:
+            self._latencies.append(first_latency)
+            self._hedged.append(hedged)
+
+    def stats(self) -> Dict:
+        """Returns {"calls", "hedge_rate", "delay_seconds"} over the window."""
+        with self._lock:
+            calls, hedges = len(self._hedged), sum(self._hedged)
+        return {"calls": calls, "hedge_rate": hedges / calls if calls else 0.0, "delay_seconds": self.delay()}
+
+
+class HedgedLlm(DelegatingLlm):
+    """
+    Sends a second, identical request when the first is slower than the policy's delay.
+
+    Attributes:
+        policy: The hedge policy of this model.
+    """
+
+    policy: HedgePolicy
+
+    async def _collect(self, llm_request: LlmRequest) -> List[LlmResponse]:
+        return [response async for response in self.inner.generate_content_async(llm_request, stream=False)]
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        # A streamed response cannot be swapped for another one halfway through
+        if stream:
+            async for response in self.inner.generate_content_async(llm_request, stream=True):
+                yield response
+            return
+
+        start = time.perf_counter()
+        if self.policy.in_control_group():
+            responses = await self._collect(llm_request)
+            HEDGE_CALLS.inc(model=self.model, outcome="control")
+            HEDGE_LATENCY.observe(time.perf_counter() - start, model=self.model, group="control")
+            self.policy.record(time.perf_counter() - start, hedged=False)
+            for response in responses:
+                yield response
+            return
+
+        # The model may adjust the request in place; the hedge gets its own copy
+        hedge_request = llm_request.model_copy(deep=True)
+        first = asyncio.ensure_future(self._collect(llm_request))
+        tasks = [first]
+        winner = None
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.policy.delay())
+            if not done and self.policy.allow_hedge():
+                logging.debug(f"🏇 Hedging {self.model} after {time.perf_counter() - start:.2f}s")
+                tasks.append(asyncio.ensure_future(self._collect(hedge_request)))
+            pending = set(tasks)
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer the first request if both finished together; a failed one waits for the other
+                for task in sorted(done, key=tasks.index):
+                    if task.exception() is None and winner is None:
+                        winner = task
+            if winner is None:
+                first.result()  # Every request failed: surface the first one's error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        elapsed = time.perf_counter() - start
+        hedged = len(tasks) > 1
+        outcome = "unhedged" if not hedged else ("primary_won" if winner is first else "hedge_won")
+        HEDGE_CALLS.inc(model=self.model, outcome=outcome)
+        HEDGE_LATENCY.observe(elapsed, model=self.model, group="hedged")
+        self.policy.record(elapsed, hedged=hedged)
+        for response in winner.result():
+            yield response
+
+
+def get_hedging_settings(models_cfg: Dict) -> Dict:
+    """
+    Reads the hedging settings from the 'models' config section (env vars take priority).
+    SHOULDISIGNTHIS_HEDGING=1 enables hedging, =0 disables it.
+
+    Args:
+        models_cfg (Dict): The 'models' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "tiers": List[str], "policy": Dict} (policy = HedgePolicy arguments).
+    """
+    hedging_cfg = models_cfg.get("hedging", {}) or {}
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_HEDGING")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(hedging_cfg.get("enabled", False))
+    return {
+        "enabled": enabled,
+        "tiers": list(hedging_cfg.get("tiers", ["worker"])),
+        "policy": {
+            "percentile": float(hedging_cfg.get("percentile", 0.95)),
+            "window": int(hedging_cfg.get("window", 500)),
+            "min_samples": int(hedging_cfg.get("min_samples", 20)),
+            "initial_delay_seconds": float(hedging_cfg.get("initial_delay_seconds", 8.0)),
+            "min_delay_seconds": float(hedging_cfg.get("min_delay_seconds", 0.5)),
+            "max_hedge_rate": float(hedging_cfg.get("max_hedge_rate", 0.1)),
+            "control_rate": float(hedging_cfg.get("control_rate", 0.05)),
+        },
+    }
+
+
+# --- POLICY REGISTRY ---
+_policies: Dict[str, HedgePolicy] = {}
+_policies_lock = threading.Lock()
+
+
+def get_hedge_policy(model: str, settings: Dict) -> HedgePolicy:
+    """
+    Returns the process-wide hedge policy of a model (created on first use), so the
+    latency history survives the per-stage agent rebuilds.
+
+    Args:
+        model (str): The model name.
+        settings (Dict): From get_hedging_settings().
+
+    Returns:
+        HedgePolicy: The policy.
+    """
+    with _policies_lock:
+        policy = _policies.get(model)
+        if policy is None:
+            policy = _policies[model] = HedgePolicy(model, **settings["policy"])
+        return policy
@@ -0,0 +1,353 @@
+"""
+API Key Pool
+
+Spreads model calls across several API keys (the `models.key_pool` config
+section) so batch throughput is no longer capped by one key's quota.
+
+Each key's usage is tracked over a sliding one-minute window per model
+(requests and tokens, as Gemini quotas are per key and model). Every call
+goes to the key with the most RPM/TPM headroom; when all keys are at their
+quota the call waits for the window to free up. A 429 takes the key out of
+rotation for a cooldown (Retry-After if the server sent one, otherwise
+exponential from `cooldown_seconds`) and the call moves to another key.
+
+Utilization per key is exported as metrics (key = hash prefix, never the key).
+Quotas are per process; the worker pool gives each worker process an equal
+share (SHOULDISIGNTHIS_KEY_POOL_SHARE).
+"""
+
+import asyncio
+import collections
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import AsyncGenerator, Callable, Deque, Dict, List, Optional, Tuple
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+
+from shouldisignthis.llm.base import DelegatingLlm, error_status, retry_after_seconds
+from shouldisignthis.observability.metrics import API_KEY_REQUESTS, API_KEY_THROTTLES, API_KEY_UTILIZATION
+
+WINDOW_SECONDS = 60.0
+CHARS_PER_TOKEN = 4
+TOKENS_PER_BLOB = 258
+
+
+def key_label(api_key: str) -> str:
+    """Returns a short, non-reversible label for an API key (for logs and metrics)."""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:8]
+
+
+def estimate_request_tokens(llm_request: LlmRequest) -> int:
+    """
+    Roughly estimates the input tokens of a request (~4 characters per token, 258 per file part).
+
+    Args:
+        llm_request (LlmRequest): The request.
+
+    Returns:
+        int: Estimated tokens.
+    """
+    tokens = 0
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            if part.text:
+                tokens += len(part.text) // CHARS_PER_TOKEN
+            elif part.inline_data is not None:
+                tokens += TOKENS_PER_BLOB
+    instruction = llm_request.config.system_instruction if llm_request.config else None
+    if isinstance(instruction, str):
+        tokens += len(instruction) // CHARS_PER_TOKEN
+    return max(1, tokens)
+
+
+class KeyState:
+    """
+    Usage of one API key for one model over the sliding window.
+    """
+
+    def __init__(self, api_key: str, rpm: float, tpm: float):
+        self.api_key = api_key
+        self.label = key_label(api_key)
+        self.rpm = rpm
+        self.tpm = tpm
+        # [timestamp, tokens] per call in the window (tokens are settled after the call)
+        self.window: Deque[List[float]] = collections.deque()
+        self.cooldown_until = 0.0
+        self.consecutive_throttles = 0
+        self.requests = 0
+        self.tokens = 0
+        self.throttled = 0
+
+    def prune(self, now: float) -> None:
+        while self.window and self.window[0][0] <= now - WINDOW_SECONDS:
+            self.window.popleft()
+
+    def used(self) -> Tuple[int, float]:
+        """Returns (requests, tokens) in the current window."""
+        return len(self.window), sum(tokens for _, tokens in self.window)
+
+    def headroom(self, tokens: float) -> float:
+        """Fraction of the tighter quota left after a call of `tokens` (negative = over quota)."""
+        requests, used_tokens = self.used()
+        return min(1 - (requests + 1) / self.rpm, 1 - (used_tokens + tokens) / self.tpm)
+
+
+class KeyPool:
+    """
+    Quota-aware selection among API keys for one model.
+    """
+
+    def __init__(self, model: str, api_keys: List[str], rpm: float, tpm: float, cooldown_seconds: float = 30.0,
+                 max_cooldown_seconds: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            model (str): The model name the quotas apply to.
+            api_keys (List[str]): The keys to rotate through.
+            rpm (float): Requests per minute allowed per key.
+            tpm (float): Tokens per minute allowed per key.
+            cooldown_seconds (float, optional): First cooldown after a 429 (doubles on consecutive 429s). Defaults to 30.
+            max_cooldown_seconds (float, optional): Cooldown cap. Defaults to 300.
+            clock (Callable[[], float], optional): Time source. Defaults to time.monotonic.
+        """
+        self.model = model
+        self.states = [KeyState(key, rpm, tpm) for key in dict.fromkeys(api_keys)]
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        for state in self.states:
+            for quota in ("rpm", "tpm"):
+                API_KEY_UTILIZATION.set_function(
+                    lambda state=state, quota=quota: self._utilization(state, quota),
+                    key=state.label, model=model, quota=quota
+                )
+
+    def _utilization(self, state: KeyState, quota: str) -> float:
+        with self._lock:
+            state.prune(self.clock())
+            requests, tokens = state.used()
+        return requests / state.rpm if quota == "rpm" else tokens / state.tpm
+
+    def try_reserve(self, tokens: float) -> Optional[Tuple[KeyState, List[float]]]:
+        """
+        Reserves a call on the key with the most headroom.
+
+        Args:
+            tokens (float): Estimated tokens of the call.
+
+        Returns:
+            Optional[Tuple[KeyState, List[float]]]: (key, reservation), or None if every key is at quota or cooling down.
+        """
+        with self._lock:
+            now = self.clock()
+            best, best_headroom = None, None
+            for state in self.states:
+                state.prune(now)
+                if state.cooldown_until > now:
+                    continue
+                headroom = state.headroom(tokens)
+                # An oversized request still goes through on an idle key
+                if headroom < 0 and state.window:
+                    continue
+                if best is None or headroom > best_headroom:
+                    best, best_headroom = state, headroom
+            if best is None:
+                return None
+            reservation = [now, float(tokens)]
+            best.window.append(reservation)
+            best.requests += 1
+        API_KEY_REQUESTS.inc(key=best.label, model=self.model)
+        return best, reservation
+
+    def wait_time(self) -> float:
+        """Seconds until some key may have capacity again."""
+        with self._lock:
+            now = self.clock()
+            waits = []
+            for state in self.states:
+                if state.cooldown_until > now:
+                    waits.append(state.cooldown_until - now)
+                elif state.window:
+                    waits.append(state.window[0][0] + WINDOW_SECONDS - now)
+                else:
+                    waits.append(0.0)
+        return max(0.05, min(waits))
+
+    async def acquire(self, tokens: float) -> Tuple[KeyState, List[float]]:
+        """
+        Reserves a call, waiting while every key is at quota or cooling down.
+
+        Args:
+            tokens (float): Estimated tokens of the call.
+
+        Returns:
+            Tuple[KeyState, List[float]]: The chosen key and its reservation (pass to settle()).
+        """
+        while True:
+            reserved = self.try_reserve(tokens)
+            if reserved is not None:
+                return reserved
+            await asyncio.sleep(self.wait_time())
+
+    def settle(self, state: KeyState, reservation: List[float], tokens: float) -> None:
+        """Replaces a reservation's estimate with the tokens actually used."""
+        with self._lock:
+            reservation[1] = float(tokens)
+            state.tokens += int(tokens)
+
+    def report_success(self, state: KeyState) -> None:
+        with self._lock:
+            state.consecutive_throttles = 0
+
+    def report_throttled(self, state: KeyState, retry_after: Optional[float] = None) -> float:
+        """
+        Takes a key out of rotation after a 429.
+
+        Args:
+            state (KeyState): The throttled key.
+            retry_after (float, optional): Server's Retry-After hint in seconds.
+
+        Returns:
+            float: The cooldown applied, in seconds.
+        """
+        with self._lock:
+            state.consecutive_throttles += 1
+            state.throttled += 1
+            cooldown = retry_after if retry_after is not None else min(
+                self.cooldown_seconds * 2 ** (state.consecutive_throttles - 1), self.max_cooldown_seconds
+            )
+            state.cooldown_until = self.clock() + cooldown
+        API_KEY_THROTTLES.inc(key=state.label, model=self.model)
+        logging.warning(f"🔑 Key {state.label} throttled on {self.model}; out of rotation for {cooldown:.0f}s")
+        return cooldown
+
+    def utilization(self) -> List[Dict]:
+        """
+        Returns per-key usage over the current window and since start.
+
+        Returns:
+            List[Dict]: One dict per key with 'key', 'rpm_used', 'tpm_used', 'rpm_utilization',
+            'tpm_utilization', 'requests', 'tokens', 'throttled' and 'cooling_down'.
+        """
+        with self._lock:
+            now = self.clock()
+            rows = []
+            for state in self.states:
+                state.prune(now)
+                requests, tokens = state.used()
+                rows.append({
+                    "key": state.label,
+                    "rpm_used": requests,
+                    "tpm_used": int(tokens),
+                    "rpm_utilization": round(requests / state.rpm, 3),
+                    "tpm_utilization": round(tokens / state.tpm, 3),
+                    "requests": state.requests,
+                    "tokens": state.tokens,
+                    "throttled": state.throttled,
+                    "cooling_down": state.cooldown_until > now,
+                })
+            return rows
+
+
+class KeyPoolLlm(DelegatingLlm):
+    """
+    Routes each call to one of several per-key models, chosen by the KeyPool.
+
+    Attributes:
+        pool: The key pool for this model.
+        models: The model to use for each API key, keyed by key_label (never the key itself).
+    """
+
+    pool: KeyPool
+    models: Dict[str, BaseLlm]
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        estimate = estimate_request_tokens(llm_request)
+        attempts = len(self.models)
+        for attempt in range(attempts):
+            state, reservation = await self.pool.acquire(estimate)
+            yielded = False
+            try:
+                async for response in self.models[state.label].generate_content_async(llm_request, stream=stream):
+                    yielded = True
+                    usage = response.usage_metadata
+                    if not response.partial and usage and usage.total_token_count:
+                        self.pool.settle(state, reservation, usage.total_token_count)
+                    yield response
+                self.pool.report_success(state)
+                return
+            except Exception as e:
+                if error_status(e) != 429:
+                    raise
+                self.pool.report_throttled(state, retry_after_seconds(e))
+                # A response already streamed cannot be taken back
+                if yielded or attempt == attempts - 1:
+                    raise
+
+
+def get_key_pool_settings(models_cfg: Dict) -> Dict:
+    """
+    Reads the key pool settings from the 'models' config section (env vars take priority).
+    SHOULDISIGNTHIS_API_KEYS (comma-separated) sets the keys and enables the pool.
+
+    Args:
+        models_cfg (Dict): The 'models' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "keys": List[str], "rpm": float, "tpm": float, "limits": Dict[str, Dict],
+        "cooldown_seconds": float, "share": float}.
+    """
+    pool_cfg = models_cfg.get("key_pool", {}) or {}
+    env_keys = os.environ.get("SHOULDISIGNTHIS_API_KEYS")
+    keys = [k.strip() for k in env_keys.split(",") if k.strip()] if env_keys else list(pool_cfg.get("keys") or [])
+    return {
+        "enabled": bool(keys) and (bool(env_keys) or bool(pool_cfg.get("enabled", False))),
+        "keys": keys,
+        "rpm": float(pool_cfg.get("rpm", 15)),
+        "tpm": float(pool_cfg.get("tpm", 1_000_000)),
+        "limits": pool_cfg.get("limits", {}) or {},
+        "cooldown_seconds": float(pool_cfg.get("cooldown_seconds", 30)),
+        "share": float(os.environ.get("SHOULDISIGNTHIS_KEY_POOL_SHARE") or pool_cfg.get("share", 1.0)),
+    }
+
+
+# --- POOL REGISTRY ---
+_pools: Dict[str, KeyPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_key_pool(model: str, settings: Dict) -> KeyPool:
+    """
+    Returns the process-wide pool for a model (created on first use).
+
+    Args:
+        model (str): The model name.
+        settings (Dict): From get_key_pool_settings().
+
+    Returns:
+        KeyPool: The pool; quotas are `limits[model]` (or the defaults) times `share`.
+    """
+    with _pools_lock:
+        pool = _pools.get(model)
+        if pool is None:
+            limits = settings["limits"].get(model, {})
+            pool = KeyPool(
+                model,
+                settings["keys"],
+                rpm=float(limits.get("rpm", settings["rpm"])) * settings["share"],
+                tpm=float(limits.get("tpm", settings["tpm"])) * settings["share"],
+                cooldown_seconds=settings["cooldown_seconds"],
+            )
+            _pools[model] = pool
+        return pool
+
+
+def get_key_pools() -> Dict[str, KeyPool]:
+    """Returns all pools created in this process, by model."""
+    with _pools_lock:
+        return dict(_pools)
@@ -0,0 +1,443 @@
+"""
+Replay Model Backend
+
+An offline stand-in for the Gemini models, selected with `models.backend: replay`
+in config.yaml (or SHOULDISIGNTHIS_MODEL_BACKEND=replay).
+
+It answers every agent from the recorded stage outputs shipped with the repo
+(tests/ground_truth/<contract>/*.json and sample_test_outputs/*.json), or from
+synthesized schema-valid outputs when no recording exists, after sleeping for
+a latency drawn from a configurable per-tier distribution (plus an optional
+time per output token). Tool-using agents (Judge, Clerk, and the Advocate's
+industry norms lookups) go through a real function-call round trip, so the whole
+pipeline runs offline for load tests and profiling. An Advocate that may search
+the web answers with search grounding metadata for the references it cites.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+from pathlib import Path
+from typing import AsyncGenerator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from shouldisignthis.preprocessing import preprocess_bytes
+
+PACKAGE_DIR = Path(__file__).parent.parent
+GROUND_TRUTH_DIR = PACKAGE_DIR / "tests" / "ground_truth"
+SAMPLE_CONTRACTS_DIR = PACKAGE_DIR / "tests" / "sample_contracts"
+SAMPLE_OUTPUTS_DIR = PACKAGE_DIR.parent / "sample_test_outputs"
+
+# Agents are recognised by the ROLE line of their instruction.
+ROLE_MARKERS = {
+    "ROLE: Senior Contract Auditor": "auditor",
+    "ROLE: Fact Extraction Specialist": "field_extractor",
+    "ROLE: Legal Risk Advisor": "skeptic",
+    "ROLE: Business Deal Strategist": "advocate",
+    "ROLE: Court Bailiff": "bailiff",
+    "ROLE: Court Clerk": "clerk",
+    "ROLE: Presiding Judge": "judge",
+    "ROLE: Professional Legal Correspondent": "drafter",
+    "ROLE: Chief Legal Arbiter": "arbiter",
+    "ROLE: Regression Test Validator": "validator",
+}
+
+# Default latency per model tier (lognormal: median * e^(sigma * N(0,1))).
+# A profile may add "seconds_per_output_token" (decoding time; none by default).
+DEFAULT_LATENCY = {
+    "auditor": {"median_seconds": 8.0, "sigma": 0.35},
+    "worker": {"median_seconds": 2.0, "sigma": 0.5},
+    "judge": {"median_seconds": 6.0, "sigma": 0.35},
+}
+
+# Rough token estimate for text (Gemini averages ~4 characters per token).
+CHARS_PER_TOKEN = 4
+TOKENS_PER_DOCUMENT_PAGE = 258
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the token count of a text.
+
+    Args:
+        text (str): Any text.
+
+    Returns:
+        int: Approximate number of tokens.
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+
+def detect_role(llm_request: LlmRequest) -> Optional[str]:
+    """
+    Identifies which agent issued a request from its system instruction.
+
+    Args:
+        llm_request (LlmRequest): The request being served.
+
+    Returns:
+        Optional[str]: Role key (e.g. 'auditor', 'judge'), or None if unknown.
+    """
+    instruction = request_instruction(llm_request)
+    for marker, role in ROLE_MARKERS.items():
+        if marker in instruction:
+            return role
+    return None
+
+
+def request_text(llm_request: LlmRequest) -> str:
+    """Concatenates all text parts of the request contents."""
+    return "\n".join(
+        part.text for content in llm_request.contents or [] for part in content.parts or [] if part.text
+    )
+
+
+def request_instruction(llm_request: LlmRequest) -> str:
+    """Returns the system instruction of the request."""
+    return str(llm_request.config.system_instruction or "") if llm_request.config else ""
+
+
+def request_blobs(llm_request: LlmRequest) -> List[bytes]:
+    """Returns all inline file payloads of the request contents."""
+    return [
+        part.inline_data.data for content in llm_request.contents or [] for part in content.parts or []
+        if part.inline_data and part.inline_data.data
+    ]
+
+
+def last_function_response(llm_request: LlmRequest) -> Optional[types.FunctionResponse]:
+    """Returns the function response if the latest turn is a tool result."""
+    if not llm_request.contents:
+        return None
+    for part in llm_request.contents[-1].parts or []:
+        if part.function_response:
+            return part.function_response
+    return None
+
+
+def request_can_search(llm_request: LlmRequest) -> bool:
+    """True if the requesting agent may search the web (built-in Google Search or the search sub-agent)."""
+    tools = (llm_request.config.tools if llm_request.config else None) or []
+    return "google_search_agent" in (llm_request.tools_dict or {}) or any(getattr(tool, "google_search", None) for tool in tools)
+
+
+def search_grounding(content: types.Content) -> Optional[types.GroundingMetadata]:
+    """
+    Builds the search grounding metadata of an Advocate answer: one web chunk per reference it cites.
+
+    Args:
+        content (types.Content): The Advocate's model turn.
+
+    Returns:
+        Optional[types.GroundingMetadata]: None if the turn cites no references.
+    """
+    try:
+        body = json.loads("".join(part.text or "" for part in content.parts or []))
+    except json.JSONDecodeError:
+        return None
+    references = dict.fromkeys(
+        ref for counter in body.get("counters") or [] for ref in counter.get("references") or [] if isinstance(ref, str)
+    )
+    if not references:
+        return None
+    return types.GroundingMetadata(grounding_chunks=[
+        types.GroundingChunk(web=types.GroundingChunkWeb(uri=ref, domain=urlparse(ref).netloc, title=urlparse(ref).netloc))
+        for ref in references
+    ])
+
+
+class ReplayLibrary:
+    """
+    Index of recorded stage outputs, grouped by contract.
+    """
+
+    def __init__(self, ground_truth_dir: Path = GROUND_TRUTH_DIR, samples_dir: Path = SAMPLE_CONTRACTS_DIR, outputs_dir: Path = SAMPLE_OUTPUTS_DIR):
+        self.contracts: Dict[str, Dict] = {}
+        self.pdf_hashes: Dict[str, str] = {}
+        self.shared: Dict[str, Dict] = {}
+
+        if ground_truth_dir.exists():
+            for contract_dir in sorted(ground_truth_dir.iterdir()):
+                if not contract_dir.is_dir():
+                    continue
+                self.contracts[contract_dir.name] = {
+                    f.stem: json.loads(f.read_text()) for f in contract_dir.glob("*.json")
+                }
+
+        if samples_dir.exists():
+            for pdf in samples_dir.glob("*.pdf"):
+                data = pdf.read_bytes()
+                self.pdf_hashes[hashlib.sha256(data).hexdigest()] = pdf.stem
+                # Stage 1 sends the preprocessed file
+                slimmed = preprocess_bytes(data, "application/pdf")[0]
+                self.pdf_hashes[hashlib.sha256(slimmed).hexdigest()] = pdf.stem
+
+        # Stage outputs that are not contract specific
+        if (outputs_dir / "drafter_output.json").exists():
+            self.shared["drafter"] = json.loads((outputs_dir / "drafter_output.json").read_text()).get("drafted_email")
+        if (outputs_dir / "comparator_integration_output.json").exists():
+            self.shared["arbiter"] = json.loads((outputs_dir / "comparator_integration_output.json").read_text())
+
+    def match(self, llm_request: LlmRequest) -> Optional[str]:
+        """
+        Finds the recorded contract a request is about.
+
+        Uploaded files are matched by content hash; text requests by looking
+        for the recorded parties / opening text. Anything else maps to a
+        recording deterministically by hashing the request text.
+
+        Args:
+            llm_request (LlmRequest): The request being served.
+
+        Returns:
+            Optional[str]: Contract name, or None if the library is empty.
+        """
+        if not self.contracts:
+            return None
+        for blob in request_blobs(llm_request):
+            name = self.pdf_hashes.get(hashlib.sha256(blob).hexdigest())
+            if name in self.contracts:
+                return name
+
+        text = request_text(llm_request)
+        # Agents that get the facts in their instruction (Skeptic specialists) are matched by it
+        searched = request_instruction(llm_request) + "\n" + text
+        for name, recording in self.contracts.items():
+            auditor = recording.get("auditor_output") or {}
+            parties = ((auditor.get("fact_sheet") or {}).get("parties") or {}).get("value")
+            if parties == "NOT FOUND":
+                # Found in most fact sheets
+                parties = None
+            opening = (auditor.get("full_text") or "")[:120]
+            if (parties and parties in searched) or (opening and opening in searched):
+                return name
+
+        seed = text or "".join(hashlib.sha256(b).hexdigest() for b in request_blobs(llm_request))
+        names = sorted(self.contracts)
+        return names[int(hashlib.sha256(seed.encode()).hexdigest(), 16) % len(names)]
+
+
+_library: Optional[ReplayLibrary] = None
+
+
+def get_replay_library() -> ReplayLibrary:
+    """Returns the process-wide recording index (loaded on first use)."""
+    global _library
+    if _library is None:
+        _library = ReplayLibrary()
+    return _library
+
+
+def synthesize_output(role: str) -> Dict:
+    """
+    Builds a minimal, schema-valid output for a role without a recording.
+
+    Args:
+        role (str): Role key from ROLE_MARKERS.
+
+    Returns:
+        Dict: Output in the shape the orchestrator expects for that stage.
+    """
+    fact = {"value": "NOT FOUND", "page": 1, "confidence": "LOW"}
+    synthesized = {
+        "auditor": {
+            "is_contract": True, "contract_type": "Service Agreement", "is_safe": True, "safety_reason": None,
+            "full_text": "SERVICE AGREEMENT\n1. Services: Provider shall provide services.\n2. Payment: Net 30.",
+            "fact_sheet": {"parties": {"value": "Client and Provider", "page": 1, "confidence": "HIGH"},
+                           "payment_terms": {"value": "Net 30", "page": 1, "confidence": "HIGH"},
+                           "liability_cap": fact, "key_obligations": [], "financial_terms": []}
+        },
+        "field_extractor": {"fields": []},
+        "skeptic": {"risks": [{"risk": "Missing Liability Cap", "severity": "MEDIUM", "page": 1,
+                               "risk_type": "MISSING_CLAUSE", "deviation_type": "NON_STANDARD",
+                               "explanation": "No limitation of liability was found."}]},
+        "advocate": {"counters": [{"topic": "Payment", "counter": "Net 30 is standard.", "confidence": "HIGH",
+                                   "industry_context": "Net 30 is the most common invoice term.", "references": []}]},
+        "judge": {"verdict": "CAUTION", "risk_score": 70, "confidence": 85, "summary": "Replayed verdict.",
+                  "key_factors": ["Missing liability cap"], "negotiation_points": ["Add a liability cap"]},
+        "drafter": {"strategy_notes": "Lead with the liability cap.", "email_subject": "Contract Review",
+                    "email_body": "Hello,\n\nPlease add a liability cap.\n\n[Your Name]"},
+        "arbiter": {"better_risk_score": "Contract A", "comparison_summary": "Replayed comparison.",
+                    "key_differences": [{"category": "Liability", "contract_a_observation": "Capped.",
+                                         "contract_b_observation": "Uncapped.",
+                                         "risk_assessment": "Contract B carries higher risk."}]},
+        "validator": {"decision": "APPROVE", "reason": "Replay backend.", "deviation_summary": "", "suggested_fix": "",
+                      "critical_changes": [], "score_analysis": {"ground_truth_score": None, "new_output_score": None,
+                                                                 "difference": None, "acceptable": True}},
+    }
+    return synthesized.get(role, {})
+
+
+def skeptic_shard(instruction: str) -> Optional[tuple]:
+    """
+    Identifies a Skeptic category specialist by the SPECIALTY line of its instruction.
+
+    Args:
+        instruction (str): The request's system instruction.
+
+    Returns:
+        Optional[tuple]: (index, count) of the specialist among SKEPTIC_SHARDS, or None for the single Skeptic.
+    """
+    if "SPECIALTY: " not in instruction:
+        return None
+    from shouldisignthis.agents.skeptic import SKEPTIC_SHARDS
+    label = instruction.split("SPECIALTY: ", 1)[1].splitlines()[0].strip()
+    labels = [spec["label"] for spec in SKEPTIC_SHARDS.values()]
+    return (labels.index(label), len(labels)) if label in labels else None
+
+
+class ReplayLlm(BaseLlm):
+    """
+    Offline model that replays recorded stage outputs with simulated latency.
+
+    Attributes:
+        model: Name of the model being impersonated (reported in responses).
+        tier: Model tier ('auditor', 'worker' or 'judge'), selects the latency profile.
+        latency: Latency profile override ({"median_seconds": float, "sigma": float}).
+        latency_scale: Multiplier applied to all sampled latencies (0 disables sleeping).
+    """
+
+    tier: str = "worker"
+    latency: Optional[Dict] = None
+    latency_scale: float = 1.0
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return []
+
+    def sample_latency(self) -> float:
+        """Draws a latency (seconds) from the tier's lognormal distribution."""
+        profile = self.latency or DEFAULT_LATENCY.get(self.tier, DEFAULT_LATENCY["worker"])
+        median = profile.get("median_seconds", 1.0)
+        sigma = profile.get("sigma", 0.0)
+        return median * math.exp(sigma * random.gauss(0, 1)) * self.latency_scale
+
+    def decode_latency(self, output_tokens: int) -> float:
+        """Returns the time (seconds) spent generating the output tokens."""
+        profile = self.latency or DEFAULT_LATENCY.get(self.tier, DEFAULT_LATENCY["worker"])
+        return output_tokens * profile.get("seconds_per_output_token", 0.0) * self.latency_scale
+
+    def _respond(self, llm_request: LlmRequest) -> types.Content:
+        """Builds the model turn for a request."""
+        role = detect_role(llm_request)
+        library = get_replay_library()
+        contract = library.match(llm_request)
+        recording = library.contracts.get(contract, {}) if contract else {}
+
+        def output(key: str, role_key: str) -> Dict:
+            return recording.get(key) or library.shared.get(role_key) or synthesize_output(role_key)
+
+        tool_result = last_function_response(llm_request)
+
+        if role == "judge" and tool_result is None and "assess_contract_risk" in (llm_request.tools_dict or {}):
+            evidence = output("validated_evidence", "bailiff")
+            call = types.FunctionCall(name="assess_contract_risk", args={
+                "risks_json": json.dumps(evidence.get("risks", [])),
+                "counters_json": json.dumps(evidence.get("counters", [])),
+            })
+            return types.Content(role="model", parts=[types.Part(function_call=call)])
+
+        if role == "advocate" and tool_result is None and "lookup_industry_norms" in (llm_request.tools_dict or {}):
+            # One industry norms lookup per recorded counter topic
+            topics = dict.fromkeys(c.get("topic") for c in output("advocate_defense", "advocate").get("counters") or [] if c.get("topic"))
+            if topics:
+                return types.Content(role="model", parts=[
+                    types.Part(function_call=types.FunctionCall(name="lookup_industry_norms", args={"topic": topic})) for topic in topics
+                ])
+
+        if role == "clerk":
+            if tool_result is None and "approve_evidence" in (llm_request.tools_dict or {}):
+                return types.Content(role="model", parts=[types.Part(function_call=types.FunctionCall(name="approve_evidence", args={}))])
+            return types.Content(role="model", parts=[types.Part(text="EVIDENCE_APPROVED")])
+
+        if role == "bailiff":
+            evidence = output("validated_evidence", "bailiff")
+            body = {"status": "CLEAN", "corrections_needed": [], "verified_arguments": evidence}
+        elif role == "auditor":
+            body = output("auditor_output", "auditor")
+        elif role == "skeptic":
+            body = output("skeptic_risks", "skeptic")
+            shard = skeptic_shard(request_instruction(llm_request))
+            if shard is not None:
+                # A category specialist answers with its share of the recorded risks
+                index, count = shard
+                body = {**body, "risks": list(body.get("risks") or [])[index::count]}
+        elif role == "advocate":
+            body = output("advocate_defense", "advocate")
+        elif role == "judge":
+            body = output("final_verdict", "judge")
+        elif role in ("drafter", "arbiter"):
+            body = library.shared.get(role) or synthesize_output(role)
+        else:
+            body = synthesize_output(role) if role else {}
+        return types.Content(role="model", parts=[types.Part(text=json.dumps(body, indent=2))])
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        """
+        Serves a request from the replay library.
+
+        Args:
+            llm_request (LlmRequest): The request to answer.
+            stream (bool, optional): Ignored; a single complete response is yielded.
+
+        Yields:
+            LlmResponse: The replayed model turn with estimated token usage.
+        """
+        content = self._respond(llm_request)
+        instruction = request_instruction(llm_request)
+        prompt_tokens = estimate_tokens(instruction + request_text(llm_request)) + TOKENS_PER_DOCUMENT_PAGE * len(request_blobs(llm_request))
+        output_text = "".join(p.text or "" for p in content.parts) + "".join(
+            json.dumps(p.function_call.args) for p in content.parts if p.function_call
+        )
+        output_tokens = estimate_tokens(output_text)
+        delay = self.sample_latency() + self.decode_latency(output_tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        role = detect_role(llm_request)
+        logging.debug(f"🎞️ Replay [{self.tier}/{role}] {delay:.2f}s, {prompt_tokens}+{output_tokens} tokens")
+        # As if the Advocate had searched for what it cites
+        searched = role == "advocate" and request_can_search(llm_request) and not any(p.function_call for p in content.parts)
+
+        yield LlmResponse(
+            content=content,
+            model_version=self.model,
+            grounding_metadata=search_grounding(content) if searched else None,
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+
+def get_replay_settings(models_cfg: Dict) -> Dict:
+    """
+    Reads the replay backend settings from the 'models' config section.
+
+    Args:
+        models_cfg (Dict): The 'models' section of the app config.
+
+    Returns:
+        Dict: {"latency": {tier: profile}, "latency_scale": float}. SHOULDISIGNTHIS_REPLAY_SECONDS_PER_TOKEN
+        sets every tier's "seconds_per_output_token".
+    """
+    replay_cfg = models_cfg.get("replay", {}) or {}
+    latency = dict(DEFAULT_LATENCY)
+    latency.update(replay_cfg.get("latency", {}) or {})
+    per_token = os.environ.get("SHOULDISIGNTHIS_REPLAY_SECONDS_PER_TOKEN")
+    if per_token is not None:
+        latency = {tier: {**profile, "seconds_per_output_token": float(per_token)} for tier, profile in latency.items()}
+    scale = os.environ.get("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE")
+    return {
+        "latency": latency,
+        "latency_scale": float(scale) if scale is not None else replay_cfg.get("latency_scale", 1.0),
+    }
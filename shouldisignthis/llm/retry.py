@@ -0,0 +1,200 @@
+"""
+Model Call Retries
+
+Retries failed model calls (the `retry_policy` config section) in place of the
+google.genai SDK's built-in retries, which back off on a fixed exponential
+schedule: when a quota window resets, every waiting pipeline retried at the
+same moment and hit 429 again.
+
+- Full jitter: attempt n sleeps uniform(0, min(max_delay, initial_delay * exp_base^n)).
+- Retry-After: a server hint is honored (plus up to initial_delay of jitter);
+  a hint beyond `max_retry_after` surfaces the error instead of parking the call.
+- Retry budget: retries may be at most `budget.ratio` of the model calls in the
+  last `budget.window_seconds` (process-wide, with a floor of `min_retries`),
+  so an overloaded period does not multiply the request volume.
+"""
+
+import asyncio
+import collections
+import logging
+import os
+import random
+import threading
+import time
+from typing import AsyncGenerator, Callable, Deque, Dict, Optional
+
+import httpx
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from shouldisignthis.llm.base import DelegatingLlm, error_status, retry_after_seconds
+from shouldisignthis.observability.metrics import RETRY_BUDGET_UTILIZATION, RETRIES_DENIED
+from shouldisignthis.observability.usage import record_retry
+
+# Passed to the SDK so it does not retry underneath this layer
+NO_SDK_RETRIES = types.HttpRetryOptions(attempts=1)
+
+_TRANSIENT_ERRORS = (httpx.TimeoutException, httpx.ConnectError)
+
+
+class RetryBudget:
+    """
+    Caps retries at a fraction of recent model calls.
+    """
+
+    def __init__(self, ratio: float = 0.1, window_seconds: float = 60.0, min_retries: int = 10,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ratio (float, optional): Max retries per call in the window. Defaults to 0.1.
+            window_seconds (float, optional): Sliding window length. Defaults to 60.
+            min_retries (int, optional): Retries always allowed per window (low traffic). Defaults to 10.
+            clock (Callable[[], float], optional): Time source. Defaults to time.monotonic.
+        """
+        self.ratio = ratio
+        self.window_seconds = window_seconds
+        self.min_retries = min_retries
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._calls: Deque[float] = collections.deque()
+        self._retries: Deque[float] = collections.deque()
+
+    def _prune(self, now: float) -> None:
+        for events in (self._calls, self._retries):
+            while events and events[0] <= now - self.window_seconds:
+                events.popleft()
+
+    def _allowed(self) -> float:
+        return max(self.min_retries, self.ratio * len(self._calls))
+
+    def record_call(self) -> None:
+        """Counts a first attempt."""
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            self._calls.append(now)
+
+    def try_acquire(self) -> bool:
+        """Takes one retry from the budget; False when it is spent."""
+        with self._lock:
+            now = self.clock()
+            self._prune(now)
+            if len(self._retries) >= self._allowed():
+                return False
+            self._retries.append(now)
+            return True
+
+    def utilization(self) -> float:
+        """Retries in the window as a share of the allowed retries."""
+        with self._lock:
+            self._prune(self.clock())
+            return len(self._retries) / self._allowed()
+
+
+def is_retryable(error: BaseException, policy: types.HttpRetryOptions) -> bool:
+    """Returns True for transient errors: the policy's HTTP statuses, timeouts and connection failures."""
+    status = error_status(error)
+    if status is not None:
+        return status in (policy.http_status_codes or [429, 500, 503])
+    return isinstance(error, _TRANSIENT_ERRORS)
+
+
+def backoff_seconds(attempt: int, policy: types.HttpRetryOptions, retry_after: Optional[float] = None,
+                    rng: Callable[[], float] = random.random) -> float:
+    """
+    Returns the sleep before retry number `attempt` (0-based).
+
+    Args:
+        attempt (int): Retries already made for this call.
+        policy (types.HttpRetryOptions): initial_delay, exp_base and max_delay.
+        retry_after (Optional[float], optional): Server hint in seconds. Defaults to None.
+        rng (Callable[[], float], optional): Random source in [0, 1). Defaults to random.random.
+
+    Returns:
+        float: Seconds to sleep.
+    """
+    initial = policy.initial_delay if policy.initial_delay is not None else 1.0
+    if retry_after is not None:
+        # Everyone told to come back at the same time must not come back at the same instant
+        return retry_after + rng() * initial
+    ceiling = min(policy.max_delay or 60.0, initial * (policy.exp_base or 2) ** attempt)
+    return rng() * ceiling
+
+
+class RetryingLlm(DelegatingLlm):
+    """
+    Retries transient model errors with full-jitter backoff, within the retry budget.
+
+    Attributes:
+        policy: Attempts, delays and retryable HTTP statuses (config.RETRY_POLICY).
+        budget: The process-wide retry budget.
+        max_retry_after: Longest Retry-After hint worth waiting for, in seconds.
+    """
+
+    policy: types.HttpRetryOptions
+    budget: RetryBudget
+    max_retry_after: float = 60.0
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream: bool = False) -> AsyncGenerator[LlmResponse, None]:
+        attempts = max(1, self.policy.attempts or 5)
+        self.budget.record_call()
+        for attempt in range(attempts):
+            yielded = False
+            try:
+                async for response in self.inner.generate_content_async(llm_request, stream=stream):
+                    yielded = True
+                    yield response
+                return
+            except Exception as e:
+                # A partly streamed answer cannot be retried
+                if yielded or attempt == attempts - 1 or not is_retryable(e, self.policy):
+                    raise
+                retry_after = retry_after_seconds(e)
+                if retry_after is not None and retry_after > self.max_retry_after:
+                    logging.warning(f"⏳ {self.model}: server asks to retry after {retry_after:.0f}s; giving up")
+                    raise
+                if not self.budget.try_acquire():
+                    RETRIES_DENIED.inc(model=self.model)
+                    logging.warning(f"🪫 {self.model}: retry budget spent, not retrying {type(e).__name__}")
+                    raise
+                delay = backoff_seconds(attempt, self.policy, retry_after)
+                record_retry(self.model)
+                logging.info(f"🔁 {self.model}: {error_status(e) or type(e).__name__}, retry {attempt + 1}/{attempts - 1} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def get_retry_settings(retry_cfg: Dict) -> Dict:
+    """
+    Reads the retry layer settings from the 'retry_policy' config section (env vars take priority).
+
+    Args:
+        retry_cfg (Dict): The 'retry_policy' section of the app config.
+
+    Returns:
+        Dict: {"max_retry_after": float, "budget": {"ratio", "window_seconds", "min_retries"}}.
+    """
+    budget_cfg = retry_cfg.get("budget", {}) or {}
+    return {
+        "max_retry_after": float(retry_cfg.get("max_retry_after", 60)),
+        "budget": {
+            "ratio": float(os.environ.get("SHOULDISIGNTHIS_RETRY_BUDGET_RATIO") or budget_cfg.get("ratio", 0.1)),
+            "window_seconds": float(budget_cfg.get("window_seconds", 60)),
+            "min_retries": int(budget_cfg.get("min_retries", 10)),
+        },
+    }
+
+
+_budget: Optional[RetryBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_retry_budget() -> RetryBudget:
+    """Returns the process-wide retry budget (sized from config on first use)."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            from shouldisignthis.config import retry_cfg
+            _budget = RetryBudget(**get_retry_settings(retry_cfg or {})["budget"])
+            RETRY_BUDGET_UTILIZATION.set_function(_budget.utilization)
+        return _budget
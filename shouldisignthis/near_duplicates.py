@@ -0,0 +1,372 @@
+"""
+Near-Duplicate Contract Index
+
+Re-scans, re-exports and new versions of an already analyzed contract differ
+from it by a date or a party name, so a byte-hash cache misses them. This index
+keeps a 64-bit SimHash of each analyzed contract's text (word 3-gram shingles);
+two texts that share most shingles differ in only a few fingerprint bits.
+
+Lookup is by banding: the 64 bits are split into 4 bands of 16 bits, and a
+fingerprint within `max_distance` bits of a stored one is within
+`max_distance // 4` bits of it in at least one band (pigeonhole). Each band is
+a dict probed at those few neighbouring values, so a lookup touches a handful of
+candidates however many contracts are stored.
+
+The text is the PDF's own text layer (no model call), so a match can skip the
+whole Auditor -> Judge pipeline. Scans without a text layer are not indexed.
+With `mode: offer` the UI offers the prior verdict together with the changed
+spans; with `mode: auto` it (and run_pipeline) applies it directly, but only
+when the texts differ in nothing but dates and party names (is_cosmetic_change);
+any other change falls back to the offer.
+
+The index stores contract text and verdicts, so it is off unless
+`near_duplicates.enabled` (or SHOULDISIGNTHIS_NEAR_DUPLICATES=1) is set.
+"""
+
+import collections
+import difflib
+import hashlib
+import itertools
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from shouldisignthis.observability.metrics import CACHE_LOOKUPS
+
+FINGERPRINT_BITS = 64
+SHINGLE_WORDS = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contracts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    simhash INTEGER NOT NULL,
+    text BLOB NOT NULL,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORD.findall((text or "").lower())
+
+
+def simhash(text: str, shingle_words: int = SHINGLE_WORDS) -> int:
+    """
+    Returns the 64-bit SimHash of a text, over its word shingles weighted by count.
+
+    Args:
+        text (str): The contract text.
+        shingle_words (int, optional): Words per shingle. Defaults to 3.
+
+    Returns:
+        int: The fingerprint (unsigned).
+    """
+    words = _words(text)
+    shingles = collections.Counter(
+        " ".join(words[i:i + shingle_words]) for i in range(max(1, len(words) - shingle_words + 1))
+    )
+    weights = [0] * FINGERPRINT_BITS
+    for shingle, count in shingles.items():
+        value = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        for bit in range(FINGERPRINT_BITS):
+            weights[bit] += count if value >> bit & 1 else -count
+    return sum(1 << bit for bit, weight in enumerate(weights) if weight > 0)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class SimHashIndex:
+    """
+    In-memory banded index of fingerprints for lookups within `max_distance` bits.
+    """
+
+    BANDS = 4
+
+    def __init__(self, max_distance: int = 6):
+        """
+        Args:
+            max_distance (int, optional): Largest Hamming distance that counts as a match. Defaults to 6.
+        """
+        self.max_distance = max_distance
+        self.band_bits = FINGERPRINT_BITS // self.BANDS
+        # A match within max_distance differs in at most this many bits in one of the bands (pigeonhole),
+        # so probing each band's neighbours within that radius finds it
+        radius = max_distance // self.BANDS
+        self._probes = [0] + [
+            sum(1 << bit for bit in bits)
+            for r in range(1, radius + 1)
+            for bits in itertools.combinations(range(self.band_bits), r)
+        ]
+        self._tables: List[Dict[int, List[int]]] = [collections.defaultdict(list) for _ in range(self.BANDS)]
+        self._fingerprints: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._fingerprints)
+
+    def _band_values(self, fingerprint: int) -> Iterator[Tuple[Dict[int, List[int]], int]]:
+        mask = (1 << self.band_bits) - 1
+        for band, table in enumerate(self._tables):
+            yield table, fingerprint >> (band * self.band_bits) & mask
+
+    def add(self, key: int, fingerprint: int) -> None:
+        self._fingerprints[key] = fingerprint
+        for table, value in self._band_values(fingerprint):
+            table[value].append(key)
+
+    def query(self, fingerprint: int) -> List[Tuple[int, int]]:
+        """
+        Returns the stored keys within max_distance bits.
+
+        Args:
+            fingerprint (int): The fingerprint to look up.
+
+        Returns:
+            List[Tuple[int, int]]: (key, distance), nearest first (newest key first among equals).
+        """
+        matches = {}
+        for table, value in self._band_values(fingerprint):
+            for probe in self._probes:
+                for key in table.get(value ^ probe, ()):
+                    if key not in matches:
+                        distance = hamming_distance(fingerprint, self._fingerprints[key])
+                        if distance <= self.max_distance:
+                            matches[key] = distance
+        return sorted(matches.items(), key=lambda item: (item[1], -item[0]))
+
+
+def changed_spans(old_text: str, new_text: str, limit: int = 20) -> List[Dict[str, str]]:
+    """
+    Returns the word spans that differ between two versions of a contract.
+
+    Args:
+        old_text (str): The analyzed version.
+        new_text (str): The new upload.
+        limit (int, optional): Most spans to return. Defaults to 20.
+
+    Returns:
+        List[Dict[str, str]]: {"before", "after"} per changed span, in document order.
+    """
+    old_words, new_words = (old_text or "").split(), (new_text or "").split()
+    spans = []
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_words, new_words, autojunk=False).get_opcodes():
+        if tag != "equal":
+            spans.append({"before": " ".join(old_words[i1:i2]), "after": " ".join(new_words[j1:j2])})
+            if len(spans) >= limit:
+                break
+    return spans
+
+
+_MONTHS = frozenset(
+    "january february march april may june july august september october november december "
+    "jan feb mar apr jun jul aug sep sept oct nov dec".split()
+)
+_DATE_TOKEN = re.compile(r"\d{1,2}(st|nd|rd|th)?|\d{4}|\d{1,4}[/.-]\d{1,2}[/.-]\d{1,4}|of|day")
+_FULL_DATE = re.compile(r"\d{4}-\d{1,2}-\d{1,2}|\d{1,2}[/.]\d{1,2}[/.]\d{2,4}")
+_NAME_CONNECTORS = frozenset({"&", "and", "of", "the", "de", "van", "von"})
+# Party names are only taken for cosmetic in the opening recital ("... between X and Y ...")
+PREAMBLE_WORDS = 60
+MAX_NAME_WORDS = 6
+
+
+def _bare(word: str) -> str:
+    return word.strip(",.;:()[]\"'").lower()
+
+
+def _is_date_change(before: List[str], after: List[str], context: List[str]) -> bool:
+    # Only date tokens changed, and they belong to a date (a month name or a full numeric date nearby),
+    # so "30 days" -> "60 days" is not one
+    if not before or not after or not all(_DATE_TOKEN.fullmatch(_bare(word)) or _bare(word) in _MONTHS for word in before + after):
+        return False
+    return any(_bare(word) in _MONTHS or _FULL_DATE.fullmatch(_bare(word)) for word in context)
+
+
+def _is_name(words: List[str]) -> bool:
+    return 0 < len(words) <= MAX_NAME_WORDS and words[0][:1].isupper() and all(
+        word[:1].isupper() or _bare(word) in _NAME_CONNECTORS for word in words
+    )
+
+
+def is_cosmetic_change(old_text: str, new_text: str, parties: Optional[str] = None) -> bool:
+    """
+    Tells whether two versions of a contract differ only in dates and party names, so the
+    analysis of one holds for the other.
+
+    A changed span counts as a date when its words are day, month, year or numeric-date tokens next to
+    a month name or a full date; as a party name when both sides are short runs of capitalized words and
+    it is in the opening recital (or its old words are part of the analyzed 'parties' fact).
+
+    Args:
+        old_text (str): The analyzed version.
+        new_text (str): The new upload.
+        parties (Optional[str], optional): The analyzed version's 'parties' fact value. Defaults to None.
+
+    Returns:
+        bool: True if no other word changed.
+    """
+    old_words, new_words = (old_text or "").split(), (new_text or "").split()
+    party_words = {_bare(word) for word in (parties or "").split()}
+    for tag, i1, i2, j1, j2 in difflib.SequenceMatcher(None, old_words, new_words, autojunk=False).get_opcodes():
+        if tag == "equal":
+            continue
+        before, after = old_words[i1:i2], new_words[j1:j2]
+        if _is_date_change(before, after, old_words[max(0, i1 - 3):i2 + 3] + new_words[max(0, j1 - 3):j2 + 3]):
+            continue
+        if _is_name(before) and _is_name(after) and (i1 < PREAMBLE_WORDS or all(_bare(word) in party_words for word in before)):
+            continue
+        return False
+    return True
+
+
+def _signed(fingerprint: int) -> int:
+    # SQLite integers are signed 64-bit
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+class NearDuplicateStore:
+    """
+    Analyzed contracts (text and pipeline result) in a SQLite file, with their fingerprints indexed in memory.
+    """
+
+    def __init__(self, path: str, max_distance: int = 6):
+        """
+        Args:
+            path (str): Path to the SQLite file.
+            max_distance (int, optional): Largest Hamming distance (of 64 bits) that counts as a near duplicate. Defaults to 6.
+        """
+        self.path = path
+        self.index = SimHashIndex(max_distance)
+        self._lock = threading.Lock()
+        store_dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            for row in conn.execute("SELECT id, simhash FROM contracts"):
+                self.index.add(row["id"], row["simhash"] & ((1 << 64) - 1))
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=30000")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def find(self, text: str) -> Optional[Dict]:
+        """
+        Looks for an analyzed contract whose text is a near duplicate of this one.
+
+        Args:
+            text (str): The new contract's text.
+
+        Returns:
+            Optional[Dict]: {"id", "distance", "similarity", "result", "changed_spans", "cosmetic"} of the nearest
+            match ('cosmetic': only dates and party names changed, see is_cosmetic_change), or None.
+        """
+        fingerprint = simhash(text)
+        with self._lock:
+            matches = self.index.query(fingerprint)
+        CACHE_LOOKUPS.inc(cache="near_duplicate", result="hit" if matches else "miss")
+        if not matches:
+            return None
+        key, distance = matches[0]
+        with self._connect() as conn:
+            row = conn.execute("SELECT text, result FROM contracts WHERE id = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        old_text = zlib.decompress(row["text"]).decode("utf-8")
+        result = json.loads(row["result"])
+        parties = (((result.get("auditor") or {}).get("fact_sheet") or {}).get("parties") or {}).get("value")
+        return {
+            "id": key,
+            "distance": distance,
+            "similarity": 1 - distance / FINGERPRINT_BITS,
+            "result": result,
+            "changed_spans": changed_spans(old_text, text),
+            "cosmetic": is_cosmetic_change(old_text, text, parties if isinstance(parties, str) else None),
+        }
+
+    def add(self, text: str, result: Dict) -> int:
+        """
+        Stores an analyzed contract.
+
+        Args:
+            text (str): Its text.
+            result (Dict): Its pipeline result (run_pipeline format).
+
+        Returns:
+            int: Its id.
+        """
+        fingerprint = simhash(text)
+        with self._connect() as conn:
+            key = conn.execute(
+                "INSERT INTO contracts (simhash, text, result, created_at) VALUES (?, ?, ?, ?)",
+                (_signed(fingerprint), zlib.compress(text.encode("utf-8")), json.dumps(result, default=str), time.time()),
+            ).lastrowid
+        with self._lock:
+            self.index.add(key, fingerprint)
+        logging.info(f"🧬 Contract #{key} added to the near-duplicate index ({len(self.index)} contracts)")
+        return key
+
+
+def get_near_duplicate_settings(near_cfg: Dict) -> Dict:
+    """
+    Reads the near-duplicate settings from the 'near_duplicates' config section (env vars take priority).
+    SHOULDISIGNTHIS_NEAR_DUPLICATES=1 enables the index, =0 disables it.
+
+    Args:
+        near_cfg (Dict): The 'near_duplicates' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "path": str, "max_distance": int, "mode": 'offer' | 'auto'}.
+    """
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_NEAR_DUPLICATES")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(near_cfg.get("enabled", False))
+    mode = os.environ.get("SHOULDISIGNTHIS_NEAR_DUPLICATES_MODE") or near_cfg.get("mode", "offer")
+    if mode not in ("offer", "auto"):
+        raise ValueError(f"near_duplicates.mode must be 'offer' or 'auto', not {mode!r}")
+    return {
+        "enabled": enabled,
+        "path": os.environ.get("SHOULDISIGNTHIS_NEAR_DUPLICATES_PATH") or near_cfg.get("path", "near_duplicates.db"),
+        "max_distance": int(near_cfg.get("max_distance", 6)),
+        "mode": mode,
+    }
+
+
+def near_duplicate_settings() -> Dict:
+    """Returns the near-duplicate settings of the app config."""
+    from shouldisignthis.config import APP_CONFIG
+    return get_near_duplicate_settings(APP_CONFIG.get("near_duplicates", {}) or {})
+
+
+_stores: Dict[str, NearDuplicateStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_near_duplicate_store() -> Optional[NearDuplicateStore]:
+    """Returns the process-wide near-duplicate store, or None when it is disabled."""
+    settings = near_duplicate_settings()
+    if not settings["enabled"]:
+        return None
+    with _stores_lock:
+        store = _stores.get(settings["path"])
+        if store is None:
+            store = _stores[settings["path"]] = NearDuplicateStore(settings["path"], settings["max_distance"])
+        return store
@@ -0,0 +1,353 @@
+"""
+Industry Norms Knowledge Base
+
+The Advocate backs its counters with what is standard in the industry
+("standard liability cap for freelance design"), and contracts keep raising the
+same questions. Each live Google Search adds grounding latency and its answer is
+thrown away. This SQLite store keeps the norms the Advocate found, one topic ->
+statement -> source URLs row per counter, learned from Bailiff-verified
+Advocate counters. Only sources the Advocate was actually grounded on are kept:
+the URLs and domains of its Google Search grounding chunks and the sources of
+norms the store served it (see grounding_sources()); URLs the model merely
+wrote into its JSON are not. (The Bailiff checks what a counter says about the
+contract, not its references.)
+
+The Advocate gets the store as the `lookup_industry_norms` function tool
+(tools/norms_tools.py) and searches the web only when it finds nothing. Topics
+are matched by their words (stopwords like "standard" or "clause" dropped,
+Jaccard similarity >= `min_similarity`) through an in-memory word index, so a
+lookup is a few dict probes. Norms older than `max_age_days` are not served;
+serving or re-learning a norm does not make it younger. A lookup that finds
+nothing first indexes the norms other worker processes added since.
+
+Lookups are counted in `shouldisignthis_cache_lookups_total{cache="norms"}`,
+and each hit in `shouldisignthis_searches_avoided_total`. The store only
+holds public sources, but it is off unless `norms.enabled` (or
+SHOULDISIGNTHIS_NORMS=1) is set, because it changes what the Advocate cites.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set
+from urllib.parse import urlparse
+
+from shouldisignthis.observability.metrics import CACHE_LOOKUPS, SEARCHES_AVOIDED
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS norms (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic TEXT NOT NULL,
+    topic_key TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    sources TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    used_at REAL NOT NULL,
+    UNIQUE (topic_key, statement)
+);
+"""
+_WORD = re.compile(r"[a-z][a-z'-]+")
+# Words that say nothing about which norm is meant
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "for", "in", "is", "of", "on", "or", "the", "to", "what", "with",
+    "standard", "typical", "common", "usual", "normal", "industry", "norm", "norms", "clause", "term", "terms",
+    "contract", "contracts", "agreement", "agreements",
+})
+LEARNED_CONFIDENCE = ("HIGH", "MEDIUM")
+
+
+def topic_words(text: str) -> FrozenSet[str]:
+    """
+    Returns the words of a topic that identify it (lowercased and singular, stopwords and numbers dropped).
+
+    Args:
+        text (str): A topic or search query, e.g. "Standard liability cap for freelance design 2025".
+
+    Returns:
+        FrozenSet[str]: e.g. {"liability", "cap", "freelance", "design"}.
+    """
+    words = (word for word in _WORD.findall((text or "").lower()) if word not in _STOPWORDS)
+    # "caps" and "cap" are the same topic
+    return frozenset(word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word for word in words)
+
+
+def _sources(references) -> List[str]:
+    return [ref for ref in references or [] if isinstance(ref, str) and ref.startswith(("http://", "https://"))]
+
+
+def _host(url: str) -> str:
+    host = urlparse(url).netloc.lower() if url.startswith(("http://", "https://")) else url.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def grounding_sources(event: Any) -> List[str]:
+    """
+    Returns the web sources an agent event was grounded on: the URIs and domains of its Google Search
+    grounding chunks, and the sources of the norms a `lookup_industry_norms` call returned.
+
+    Args:
+        event (Any): An ADK event (or any LlmResponse-like object).
+
+    Returns:
+        List[str]: Source URLs and domains.
+    """
+    sources = []
+    metadata = getattr(event, "grounding_metadata", None)
+    for chunk in getattr(metadata, "grounding_chunks", None) or []:
+        web = getattr(chunk, "web", None)
+        if web is not None:
+            sources.extend(value for value in (web.uri, web.domain, web.title) if value)
+    content = getattr(event, "content", None)
+    for part in getattr(content, "parts", None) or []:
+        response = part.function_response
+        if response is not None and response.name == "lookup_industry_norms":
+            for norm in (response.response or {}).get("norms") or []:
+                sources.extend(_sources(norm.get("sources")))
+    return sources
+
+
+def grounded_references(references, grounded: Iterable[str]) -> List[str]:
+    """
+    Returns the reference URLs that are grounded sources, by URL or by domain.
+
+    Args:
+        references: A counter's references.
+        grounded (Iterable[str]): From grounding_sources().
+
+    Returns:
+        List[str]: The grounded reference URLs.
+    """
+    grounded = set(grounded)
+    # Grounding chunk URIs are usually search redirects; their domain (or title) names the site
+    hosts = {_host(source) for source in grounded if not source.startswith(("http://", "https://"))}
+    return [ref for ref in _sources(references) if ref in grounded or _host(ref) in hosts]
+
+
+class NormsStore:
+    """
+    Industry norms (topic, statement, source URLs) in a SQLite file, with their topic words indexed in memory.
+    """
+
+    def __init__(self, path: str, min_similarity: float = 0.5, max_age_days: Optional[float] = None, max_per_topic: int = 5):
+        """
+        Args:
+            path (str): Path to the SQLite file.
+            min_similarity (float, optional): Least Jaccard similarity of topic words for a match. Defaults to 0.5.
+            max_age_days (Optional[float], optional): Norms older than this are not served. Defaults to None (no limit).
+            max_per_topic (int, optional): Most recently used norms kept per topic. Defaults to 5.
+        """
+        self.path = path
+        self.min_similarity = min_similarity
+        self.max_age_seconds = max_age_days * 86400 if max_age_days else None
+        self.max_per_topic = max_per_topic
+        self._lock = threading.Lock()
+        self._topics: Dict[int, FrozenSet[str]] = {}
+        self._by_word: Dict[str, Set[int]] = {}
+        self._last_id = 0
+        store_dir = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(store_dir):
+            os.makedirs(store_dir)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._index_new_rows()
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=30000")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _index(self, key: int, topic: str) -> None:
+        self._last_id = max(self._last_id, key)
+        words = topic_words(topic)
+        self._topics[key] = words
+        for word in words:
+            self._by_word.setdefault(word, set()).add(key)
+
+    def _unindex(self, key: int) -> None:
+        for word in self._topics.pop(key, ()):
+            self._by_word.get(word, set()).discard(key)
+
+    def _index_new_rows(self) -> None:
+        # Norms added since the last read, by this process or another worker
+        with self._connect() as conn:
+            rows = conn.execute("SELECT id, topic FROM norms WHERE id > ? ORDER BY id", (self._last_id,)).fetchall()
+        with self._lock:
+            for row in rows:
+                if row["id"] not in self._topics:
+                    self._index(row["id"], row["topic"])
+
+    def _match(self, words: FrozenSet[str]) -> Dict[int, float]:
+        with self._lock:
+            candidates = {key for word in words for key in self._by_word.get(word, ())}
+            scored = {
+                key: len(words & self._topics[key]) / len(words | self._topics[key])
+                for key in candidates
+            }
+        return {key: similarity for key, similarity in scored.items() if similarity >= self.min_similarity}
+
+    def lookup(self, topic: str, industry: str = "", limit: int = 3) -> List[Dict]:
+        """
+        Finds the stored norms for a topic (and counts the lookup).
+
+        Args:
+            topic (str): The contract term, e.g. "liability cap".
+            industry (str, optional): The kind of work; norms mentioning it rank first. Defaults to "".
+            limit (int, optional): Most norms to return. Defaults to 3.
+
+        Returns:
+            List[Dict]: {"topic", "statement", "sources"} per matching norm, best match first.
+        """
+        words = topic_words(topic)
+        scored = self._match(words)
+        if not scored:
+            # Another worker may have learned it since
+            self._index_new_rows()
+            scored = self._match(words)
+        keys = list(scored)
+        rows = []
+        if keys:
+            with self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT id, topic, statement, sources, created_at FROM norms WHERE id IN ({','.join('?' * len(keys))})", keys
+                ).fetchall()
+        now = time.time()
+        rows = [row for row in rows if self.max_age_seconds is None or now - row["created_at"] <= self.max_age_seconds]
+        industry_words = topic_words(industry)
+        rows.sort(key=lambda row: (
+            -scored[row["id"]],
+            -len(industry_words & topic_words(row["statement"] + " " + row["topic"])),
+            -row["created_at"],
+        ))
+        rows = rows[:limit]
+
+        CACHE_LOOKUPS.inc(cache="norms", result="hit" if rows else "miss")
+        if not rows:
+            return []
+        SEARCHES_AVOIDED.inc()
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE norms SET hits = hits + 1, used_at = ? WHERE id IN ({','.join('?' * len(rows))})",
+                [now, *(row["id"] for row in rows)],
+            )
+        return [{"topic": row["topic"], "statement": row["statement"], "sources": json.loads(row["sources"])} for row in rows]
+
+    def learn(self, counters: List[Dict], grounded: Iterable[str]) -> int:
+        """
+        Stores the norms of verified Advocate counters that cite grounded sources.
+
+        Args:
+            counters (List[Dict]): Counters ({"topic", "counter", "industry_context", "confidence", "references"}).
+            grounded (Iterable[str]): The sources the Advocate was grounded on (see grounding_sources());
+                only references among them are stored.
+
+        Returns:
+            int: Norms added.
+        """
+        grounded = set(grounded)
+        now = time.time()
+        added = 0
+        with self._connect() as conn:
+            for counter in counters or []:
+                if not isinstance(counter, dict):
+                    continue
+                topic, sources = counter.get("topic") or "", grounded_references(counter.get("references"), grounded)
+                statement = counter.get("industry_context") or counter.get("counter")
+                if not topic_words(topic) or not sources or not statement or counter.get("confidence") not in LEARNED_CONFIDENCE:
+                    continue
+                topic_key = " ".join(sorted(topic_words(topic)))
+                existing = conn.execute("SELECT id FROM norms WHERE topic_key = ? AND statement = ?", (topic_key, statement)).fetchone()
+                if existing:
+                    # Seen again: it stays as old as it was first learned (max_age_days still applies)
+                    conn.execute("UPDATE norms SET sources = ?, used_at = ? WHERE id = ?", (json.dumps(sources), now, existing["id"]))
+                else:
+                    cursor = conn.execute(
+                        "INSERT OR IGNORE INTO norms (topic, topic_key, statement, sources, hits, created_at, used_at) VALUES (?, ?, ?, ?, 0, ?, ?)",
+                        (topic, topic_key, statement, json.dumps(sources), now, now),
+                    )
+                    if cursor.rowcount:
+                        with self._lock:
+                            self._index(cursor.lastrowid, topic)
+                        added += 1
+                # Only the most recently used norms of a topic are kept
+                stale = [row["id"] for row in conn.execute(
+                    "SELECT id FROM norms WHERE topic_key = ? ORDER BY used_at DESC, id DESC LIMIT -1 OFFSET ?",
+                    (topic_key, self.max_per_topic),
+                )]
+                if stale:
+                    conn.execute(f"DELETE FROM norms WHERE id IN ({','.join('?' * len(stale))})", stale)
+                    with self._lock:
+                        for key in stale:
+                            self._unindex(key)
+        if added:
+            logging.info(f"📚 Learned {added} industry norms ({len(self._topics)} stored)")
+        return added
+
+    def stats(self) -> Dict:
+        """Returns {"entries", "hits"}: stored norms and how often they were served."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT COUNT(*) AS entries, COALESCE(SUM(hits), 0) AS hits FROM norms").fetchone()
+        return {"entries": row["entries"], "hits": row["hits"]}
+
+
+def get_norms_settings(norms_cfg: Dict) -> Dict:
+    """
+    Reads the industry norms settings from the 'norms' config section (env vars take priority).
+    SHOULDISIGNTHIS_NORMS=1 enables the store, =0 disables it.
+
+    Args:
+        norms_cfg (Dict): The 'norms' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "path": str, "min_similarity": float, "max_age_days": Optional[float],
+        "max_per_topic": int, "max_results": int}.
+    """
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_NORMS")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(norms_cfg.get("enabled", False))
+    max_age_days = norms_cfg.get("max_age_days")
+    return {
+        "enabled": enabled,
+        "path": os.environ.get("SHOULDISIGNTHIS_NORMS_PATH") or norms_cfg.get("path", "norms.db"),
+        "min_similarity": float(norms_cfg.get("min_similarity", 0.5)),
+        "max_age_days": float(max_age_days) if max_age_days else None,
+        "max_per_topic": int(norms_cfg.get("max_per_topic", 5)),
+        "max_results": int(norms_cfg.get("max_results", 3)),
+    }
+
+
+def norms_settings() -> Dict:
+    """Returns the industry norms settings of the app config."""
+    from shouldisignthis.config import APP_CONFIG
+    return get_norms_settings(APP_CONFIG.get("norms", {}) or {})
+
+
+_stores: Dict[str, NormsStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_norms_store() -> Optional[NormsStore]:
+    """Returns the process-wide industry norms store, or None when it is disabled."""
+    settings = norms_settings()
+    if not settings["enabled"]:
+        return None
+    with _stores_lock:
+        store = _stores.get(settings["path"])
+        if store is None:
+            store = _stores[settings["path"]] = NormsStore(
+                settings["path"], settings["min_similarity"], settings["max_age_days"], settings["max_per_topic"]
+            )
+        return store
@@ -0,0 +1,105 @@
+"""
+Non-Blocking Log Pipeline
+
+`configure_logging` routes every record through a QueueHandler; a
+QueueListener thread does the formatting and the file/stdout I/O, so the
+event loop thread only renders the message and pays for an in-memory queue
+put. Oversized messages are truncated before they are queued.
+
+The SampledLoggingPlugin (see plugins.py) replaces ADK's LoggingPlugin (which prints every
+callback synchronously to stdout). It writes through `logging` at a
+configurable level, samples each ADK event type at its own rate and skips all
+formatting work when the level is disabled.
+"""
+
+import atexit
+import copy
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import List, Optional
+
+
+DEFAULT_SAMPLE_RATES = {
+    "user_message": 1.0,
+    "run": 1.0,
+    "agent": 1.0,
+    "model_request": 1.0,
+    "model_response": 1.0,
+    "tool": 1.0,
+    "event": 1.0,
+}
+
+
+class TruncatingFilter(logging.Filter):
+    """
+    Caps the rendered message length of each record (the traceback is kept).
+    """
+
+    def __init__(self, max_chars: int):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            record.msg = f"{message[:self.max_chars]}... [truncated {len(message) - self.max_chars} chars]"
+            record.args = None
+        return True
+
+
+class DeferredFormatQueueHandler(QueueHandler):
+    """
+    Queues records with only the message rendered; timestamps, level names and
+    tracebacks are formatted by the listener thread's handlers.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            # Tracebacks reference live frames; render them now
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+# --- LISTENER SINGLETON ---
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def stop_log_listener() -> None:
+    """Drains the queue, stops the listener thread and closes its handlers."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+def start_log_listener(handlers: List[logging.Handler]) -> QueueHandler:
+    """
+    Starts a listener thread writing to `handlers` (replacing any previous one).
+
+    Args:
+        handlers (List[logging.Handler]): The handlers doing the actual I/O.
+
+    Returns:
+        QueueHandler: The handler to install on the root logger.
+    """
+    global _listener
+    stop_log_listener()
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    with _listener_lock:
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+    return DeferredFormatQueueHandler(records)
+
+
+atexit.register(stop_log_listener)
@@ -0,0 +1,383 @@
+"""
+Metrics Registry
+
+A small in-process metrics registry (counters, gauges, histograms with
+labels) rendered in the Prometheus text exposition format. Updates are a dict
+lookup and an add under a lock, so the metrics stay on in production.
+
+The app metrics are module-level objects below. They are fed by the
+MetricsPlugin (model/tool calls, tokens, retries), the orchestrator (stage
+latency, in-flight pipelines, parse failures) and the caches (hit/miss).
+
+Serve them with `start_metrics_server()` (the `metrics` config section) and
+scrape http://<host>:<port>/metrics. The same server answers the readiness
+probe at /ready (see warmup.py).
+"""
+
+import bisect
+import logging
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from shouldisignthis.config import APP_CONFIG
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    """Base class: a named metric family with a fixed set of label names."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Returns (sample name, rendered labels, value) tuples."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples()]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A monotonically increasing value per label set."""
+
+    type_name = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def get(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            return dict(self._values)
+
+    def samples(self):
+        return [(self.name, _format_labels(self.labelnames, key), v) for key, v in sorted(self.values().items())]
+
+
+class Gauge(_Metric):
+    """A value that goes up and down per label set; may be computed at scrape time."""
+
+    type_name = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        """Computes the value by calling `fn` at scrape time."""
+        key = self._key(labels)
+        with self._lock:
+            self._functions[key] = fn
+
+    @contextmanager
+    def track_inprogress(self, **labels) -> Iterator[None]:
+        """Increments the gauge while the enclosed code runs."""
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def get(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            fn = self._functions.get(key)
+            value = self._values.get(key, 0.0)
+        return fn() if fn else value
+
+    def values(self) -> Dict[Tuple[str, ...], float]:
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                values[key] = fn()
+            except Exception as e:
+                logging.warning(f"⚠️ Metric {self.name} callback failed: {e}")
+        return values
+
+    def samples(self):
+        return [(self.name, _format_labels(self.labelnames, key), v) for key, v in sorted(self.values().items())]
+
+
+class Histogram(_Metric):
+    """Cumulative bucket counts, sum and count of observations per label set."""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum]
+        self._values: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observes the wall time of the enclosed code."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[Tuple[str, ...], Dict]:
+        """
+        Returns {label values: {"buckets": [(upper bound, cumulative count)], "sum", "count"}}.
+        """
+        with self._lock:
+            raw = {key: ([*counts], total) for key, (counts, total) in self._values.items()}
+        result = {}
+        for key, (counts, total) in raw.items():
+            cumulative, running = [], 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                running += count
+                cumulative.append((bound, running))
+            result[key] = {"buckets": cumulative, "sum": total, "count": running}
+        return result
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Estimates a quantile by linear interpolation within buckets (as PromQL histogram_quantile)."""
+        state = self.snapshot().get(self._key(labels))
+        if not state or not state["count"]:
+            return None
+        rank = q * state["count"]
+        lower_bound, lower_count = 0.0, 0
+        for bound, count in state["buckets"]:
+            if count >= rank:
+                if math.isinf(bound):
+                    return lower_bound
+                return lower_bound + (bound - lower_bound) * (rank - lower_count) / max(1, count - lower_count)
+            lower_bound, lower_count = bound, count
+        return lower_bound
+
+    def samples(self):
+        samples = []
+        for key, state in sorted(self.snapshot().items()):
+            for bound, count in state["buckets"]:
+                samples.append((f"{self.name}_bucket", _format_labels(self.labelnames, key, ("le", _format_value(bound))), count))
+            samples.append((f"{self.name}_sum", _format_labels(self.labelnames, key), state["sum"]))
+            samples.append((f"{self.name}_count", _format_labels(self.labelnames, key), state["count"]))
+        return samples
+
+
+class MetricsRegistry:
+    """
+    Holds metric families and renders them in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(m.render() for m in metrics) + "\n"
+
+
+# --- APP METRICS ---
+REGISTRY = MetricsRegistry()
+
+STAGE_LATENCY = REGISTRY.histogram("shouldisignthis_stage_duration_seconds", "Wall time of each pipeline stage.", ["stage"])
+STAGE_TIMEOUTS = REGISTRY.counter("shouldisignthis_stage_timeouts_total", "Stages cancelled at their deadline (deadline = stage or pipeline).", ["stage", "deadline"])
+PIPELINES_IN_FLIGHT = REGISTRY.gauge("shouldisignthis_pipelines_in_flight", "Pipelines currently running in this process.")
+MODEL_CALLS = REGISTRY.counter("shouldisignthis_model_calls_total", "Completed model calls.", ["model", "agent"])
+MODEL_TOKENS = REGISTRY.counter("shouldisignthis_model_tokens_total", "Model tokens spent.", ["model", "direction"])
+MODEL_ERRORS = REGISTRY.counter("shouldisignthis_model_errors_total", "Failed model attempts (retried or surfaced).", ["model"])
+MODEL_RETRIES = REGISTRY.counter("shouldisignthis_model_retries_total", "Model call retries.", ["model"])
+RETRIES_DENIED = REGISTRY.counter("shouldisignthis_model_retries_denied_total", "Retries not made because the retry budget was spent.", ["model"])
+RETRY_BUDGET_UTILIZATION = REGISTRY.gauge("shouldisignthis_retry_budget_utilization", "Retries in the budget window as a share of the retries allowed.")
+TOOL_CALLS = REGISTRY.counter("shouldisignthis_tool_calls_total", "Tool calls made by agents.", ["tool"])
+PARSE_FAILURES = REGISTRY.counter("shouldisignthis_parse_failures_total", "Agent outputs that could not be parsed as JSON.")
+CACHE_LOOKUPS = REGISTRY.counter("shouldisignthis_cache_lookups_total", "Cache lookups by cache and result (hit/miss).", ["cache", "result"])
+SEARCHES_AVOIDED = REGISTRY.counter("shouldisignthis_searches_avoided_total", "Advocate web searches answered by the local industry norms store.")
+QUEUE_JOBS = REGISTRY.gauge("shouldisignthis_queue_jobs", "Jobs in the batch queue by status.", ["status"])
+API_KEY_REQUESTS = REGISTRY.counter("shouldisignthis_api_key_requests_total", "Model calls per pooled API key (key = hash prefix).", ["key", "model"])
+API_KEY_THROTTLES = REGISTRY.counter("shouldisignthis_api_key_throttled_total", "429 responses per pooled API key.", ["key", "model"])
+API_KEY_UTILIZATION = REGISTRY.gauge("shouldisignthis_api_key_utilization", "Share of the per-minute quota (rpm/tpm) in use per pooled API key.", ["key", "model", "quota"])
+CIRCUIT_STATE = REGISTRY.gauge("shouldisignthis_circuit_state", "Circuit breaker state per model tier (0 closed, 1 half-open, 2 open).", ["tier"])
+CIRCUIT_TRANSITIONS = REGISTRY.counter("shouldisignthis_circuit_transitions_total", "Circuit breaker state changes per model tier.", ["tier", "state"])
+FALLBACK_CALLS = REGISTRY.counter("shouldisignthis_fallback_calls_total", "Model calls answered by a tier's fallback model.", ["tier", "model"])
+HEDGE_CALLS = REGISTRY.counter("shouldisignthis_hedge_calls_total", "Hedging-eligible model calls by outcome (control, unhedged, primary_won, hedge_won).", ["model", "outcome"])
+HEDGE_LATENCY = REGISTRY.histogram(
+    "shouldisignthis_hedge_call_duration_seconds", "Latency of hedging-eligible model calls, hedged vs never-hedged control group.",
+    ["model", "group"], buckets=(0.25, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 6.0, 8.0, 10.0, 15.0, 20.0, 30.0, 60.0)
+)
+UPLOAD_BYTES_SAVED = REGISTRY.counter("shouldisignthis_upload_bytes_saved_total", "Bytes removed from uploads by preprocessing.", ["kind"])
+UPLOAD_TOKENS_SAVED = REGISTRY.counter("shouldisignthis_upload_tokens_saved_total", "Estimated model input tokens saved by upload preprocessing.", ["kind"])
+FACT_REFINEMENTS = REGISTRY.counter("shouldisignthis_fact_refinements_total", "Fact fields re-extracted after Stage 1, by outcome (improved/kept).", ["result"])
+UPLOAD_PREPROCESS_LATENCY = REGISTRY.histogram("shouldisignthis_upload_preprocess_duration_seconds", "Wall time of upload preprocessing.", ["kind"])
+APP_READY = REGISTRY.gauge("shouldisignthis_ready", "1 once start-up warm-up has completed (see /ready).")
+WARMUP_DURATION = REGISTRY.gauge("shouldisignthis_warmup_duration_seconds", "Wall time of the start-up warm-up.")
+
+
+def cache_hit_ratio(cache: str) -> Optional[float]:
+    """Returns hits / lookups for a cache, or None if it has not been used."""
+    hits = CACHE_LOOKUPS.get(cache=cache, result="hit")
+    misses = CACHE_LOOKUPS.get(cache=cache, result="miss")
+    return hits / (hits + misses) if hits + misses else None
+
+
+# --- HTTP ENDPOINT ---
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/ready":
+            # Readiness probe: 503 until warm-up has completed
+            ready = APP_READY.get() >= 1
+            self._send(200 if ready else 503, b"ready\n" if ready else b"warming up\n", "text/plain; charset=utf-8")
+            return
+        if path not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        self._send(200, REGISTRY.render().encode("utf-8"), CONTENT_TYPE)
+
+    def _send(self, status: int, body: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Scrapes would flood the application log
+
+
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def get_metrics_settings(metrics_cfg: Dict) -> Dict:
+    """
+    Reads the metrics endpoint settings from the 'metrics' config section (env vars take priority).
+    Setting SHOULDISIGNTHIS_METRICS_PORT enables the endpoint on that port.
+
+    Args:
+        metrics_cfg (Dict): The 'metrics' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "host": str, "port": int}.
+    """
+    env_port = os.environ.get("SHOULDISIGNTHIS_METRICS_PORT")
+    return {
+        "enabled": bool(env_port) or bool(metrics_cfg.get("enabled", False)),
+        "host": metrics_cfg.get("host", "127.0.0.1"),
+        "port": int(env_port or metrics_cfg.get("port", 9464)),
+    }
+
+
+def start_metrics_server(host: Optional[str] = None, port: Optional[int] = None) -> Optional[ThreadingHTTPServer]:
+    """
+    Starts the /metrics endpoint in a daemon thread (once per process).
+
+    Args:
+        host (str, optional): Bind address. Defaults to `metrics.host`.
+        port (int, optional): Port (0 = any free port). Defaults to `metrics.port`.
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The running server, or None if the port is unavailable.
+    """
+    global _server
+    settings = get_metrics_settings(APP_CONFIG.get("metrics", {}) or {})
+    with _server_lock:
+        if _server is not None:
+            return _server
+        host = host if host is not None else settings["host"]
+        port = port if port is not None else settings["port"]
+        try:
+            _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            logging.warning(f"⚠️ Metrics endpoint not started on {host}:{port}: {e}")
+            return None
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        logging.info(f"📈 Metrics served at http://{host}:{_server.server_address[1]}/metrics")
+        return _server
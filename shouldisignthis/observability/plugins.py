@@ -0,0 +1,265 @@
+"""
+ADK Plugins
+
+The callbacks feeding ADK agent/model/tool events into the observability
+modules. Kept apart from them so that the metrics, usage, tracing and log
+pipeline modules can be imported (by the UI, the worker, `configure_logging`)
+without loading google.adk.
+
+    UsagePlugin          -> usage.UsageTracker (active trackers)
+    MetricsPlugin        -> metrics (model/tool calls, tokens, errors)
+    TracingPlugin        -> tracing (agent, model-call and tool-call spans)
+    SampledLoggingPlugin -> logging, sampled per event type
+"""
+
+import logging
+import random
+from typing import Dict, List, Optional, Tuple
+
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.plugins.logging_plugin import LoggingPlugin
+from opentelemetry import trace
+
+from shouldisignthis.observability.log_pipeline import DEFAULT_SAMPLE_RATES
+from shouldisignthis.observability.metrics import MODEL_CALLS, MODEL_ERRORS, MODEL_TOKENS, TOOL_CALLS
+from shouldisignthis.observability.tracing import _current_span, _parent_context, get_tracer
+from shouldisignthis.observability.usage import _active_trackers
+
+
+class UsagePlugin(BasePlugin):
+    """
+    Feeds model/tool usage from ADK callbacks into the active UsageTrackers.
+    """
+
+    def __init__(self, name: str = "usage_plugin"):
+        super().__init__(name)
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        # Streaming partials carry running totals; only count complete turns
+        if llm_response.partial:
+            return None
+        usage = llm_response.usage_metadata
+        input_tokens = (usage.prompt_token_count or 0) if usage else 0
+        output_tokens = (usage.candidates_token_count or 0) if usage else 0
+        # Set by caching model wrappers (e.g. the cassette) on responses they served
+        cache_hit = bool(llm_response.custom_metadata and llm_response.custom_metadata.get("cache_hit"))
+        # Set by the circuit breaker on responses from a tier's fallback model
+        fallback = bool(llm_response.custom_metadata and llm_response.custom_metadata.get("fallback_for"))
+        for tracker in _active_trackers.get():
+            tracker.add_model_call(
+                llm_response.model_version, input_tokens, output_tokens,
+                cache_hit=cache_hit, agent=callback_context.agent_name, fallback=fallback
+            )
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        # A call that failed for good; its retries were counted by the retrying model (record_retry)
+        for tracker in _active_trackers.get():
+            tracker.add_model_error()
+        return None
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+        for tracker in _active_trackers.get():
+            tracker.add_tool_call()
+        return None
+
+
+class MetricsPlugin(BasePlugin):
+    """
+    Feeds model/tool call counts, token spend and model errors into the app metrics.
+    """
+
+    def __init__(self, name: str = "metrics_plugin"):
+        super().__init__(name)
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        if llm_response.partial:
+            return None
+        model = llm_response.model_version or "unknown"
+        MODEL_CALLS.inc(model=model, agent=callback_context.agent_name)
+        usage = llm_response.usage_metadata
+        if usage:
+            MODEL_TOKENS.inc(usage.prompt_token_count or 0, model=model, direction="input")
+            MODEL_TOKENS.inc(usage.candidates_token_count or 0, model=model, direction="output")
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        MODEL_ERRORS.inc(model=llm_request.model or "unknown")
+        return None
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+        TOOL_CALLS.inc(tool=tool.name)
+        return None
+
+
+class TracingPlugin(BasePlugin):
+    """
+    Emits agent, model-call and tool-call spans under the current stage span.
+    """
+
+    def __init__(self, name: str = "tracing_plugin"):
+        super().__init__(name)
+        self._tracer = get_tracer()
+        self._agent_spans: Dict[Tuple[str, str], trace.Span] = {}
+        self._model_spans: Dict[Tuple[str, str], trace.Span] = {}
+        self._tool_spans: Dict[str, trace.Span] = {}
+
+    def _end(self, spans: Dict, key, error: Optional[BaseException] = None) -> None:
+        span = spans.pop(key, None)
+        if span is None:
+            return
+        if error is not None:
+            span.record_exception(error)
+            span.set_status(trace.StatusCode.ERROR, str(error))
+        span.end()
+
+    async def before_agent_callback(self, *, agent, callback_context):
+        parent = None
+        if agent.parent_agent is not None:
+            parent = self._agent_spans.get((callback_context.invocation_id, agent.parent_agent.name))
+        span = self._tracer.start_span(
+            f"agent {agent.name}",
+            context=_parent_context(parent or _current_span.get()),
+            attributes={"agent.name": agent.name, "invocation_id": callback_context.invocation_id},
+        )
+        self._agent_spans[(callback_context.invocation_id, agent.name)] = span
+        return None
+
+    async def after_agent_callback(self, *, agent, callback_context):
+        self._end(self._agent_spans, (callback_context.invocation_id, agent.name))
+        return None
+
+    async def on_agent_error_callback(self, *, agent, callback_context, error):
+        self._end(self._agent_spans, (callback_context.invocation_id, agent.name), error)
+
+    async def before_model_callback(self, *, callback_context, llm_request):
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        span = self._tracer.start_span(
+            "model_call",
+            context=_parent_context(self._agent_spans.get(key) or _current_span.get()),
+            attributes={"agent.name": callback_context.agent_name, "gen_ai.request.model": llm_request.model or ""},
+        )
+        self._model_spans[key] = span
+        return None
+
+    async def after_model_callback(self, *, callback_context, llm_response):
+        if llm_response.partial:
+            return None
+        key = (callback_context.invocation_id, callback_context.agent_name)
+        span = self._model_spans.get(key)
+        if span is not None:
+            usage = llm_response.usage_metadata
+            span.set_attribute("gen_ai.usage.input_tokens", (usage.prompt_token_count or 0) if usage else 0)
+            span.set_attribute("gen_ai.usage.output_tokens", (usage.candidates_token_count or 0) if usage else 0)
+            if llm_response.model_version:
+                span.set_attribute("gen_ai.response.model", llm_response.model_version)
+            if llm_response.custom_metadata and llm_response.custom_metadata.get("cache_hit"):
+                span.set_attribute("cache_hit", llm_response.custom_metadata["cache_hit"])
+        self._end(self._model_spans, key)
+        return None
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        self._end(self._model_spans, (callback_context.invocation_id, callback_context.agent_name), error)
+        return None
+
+    async def before_tool_callback(self, *, tool, tool_args, tool_context):
+        parent = self._agent_spans.get((tool_context.invocation_id, tool_context.agent_name))
+        span = self._tracer.start_span(
+            f"tool_call {tool.name}",
+            context=_parent_context(parent or _current_span.get()),
+            attributes={"agent.name": tool_context.agent_name, "tool.name": tool.name},
+        )
+        self._tool_spans[tool_context.function_call_id] = span
+        return None
+
+    async def after_tool_callback(self, *, tool, tool_args, tool_context, result):
+        self._end(self._tool_spans, tool_context.function_call_id)
+        return None
+
+    async def on_tool_error_callback(self, *, tool, tool_args, tool_context, error):
+        self._end(self._tool_spans, tool_context.function_call_id, error)
+        return None
+
+
+class SampledLoggingPlugin(LoggingPlugin):
+    """
+    ADK LoggingPlugin writing through `logging`, with per-event-type sampling.
+
+    Each callback's lines are emitted as a single record. Errors are always logged. Event types are the keys of DEFAULT_SAMPLE_RATES.
+    """
+
+    def __init__(self, name: str = "logging_plugin", level: int = logging.DEBUG, sample_rates: Optional[Dict[str, float]] = None):
+        """
+        Args:
+            name (str, optional): Plugin name. Defaults to 'logging_plugin'.
+            level (int, optional): Level of the emitted records. Defaults to DEBUG.
+            sample_rates (Dict[str, float], optional): Fraction of each event type to log (missing types: 1.0).
+        """
+        super().__init__(name)
+        self.logger = logging.getLogger("shouldisignthis.adk")
+        self.level = level
+        self.sample_rates = {**DEFAULT_SAMPLE_RATES, **(sample_rates or {})}
+        self._lines: Optional[List[str]] = None
+
+    def _sampled(self, event_type: str) -> bool:
+        if not self.logger.isEnabledFor(self.level):
+            return False
+        rate = self.sample_rates.get(event_type, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+    def _log(self, message: str) -> None:
+        if self._lines is not None:
+            self._lines.append(message)
+        else:
+            self.logger.log(self.level, f"[{self.name}] {message}")
+
+    async def _logged(self, event_type: str, callback, kwargs: Dict):
+        """Runs a parent callback if sampled, emitting its lines as one record."""
+        if not self._sampled(event_type):
+            return None
+        # The parent callbacks never await, so concurrent agents cannot interleave here
+        self._lines = []
+        try:
+            return await callback(**kwargs)
+        finally:
+            lines, self._lines = self._lines, None
+            if lines:
+                self.logger.log(self.level, f"[{self.name}] " + "\n".join(lines))
+
+    async def on_user_message_callback(self, **kwargs):
+        return await self._logged("user_message", super().on_user_message_callback, kwargs)
+
+    async def before_run_callback(self, **kwargs):
+        return await self._logged("run", super().before_run_callback, kwargs)
+
+    async def after_run_callback(self, **kwargs):
+        return await self._logged("run", super().after_run_callback, kwargs)
+
+    async def on_event_callback(self, **kwargs):
+        return await self._logged("event", super().on_event_callback, kwargs)
+
+    async def before_agent_callback(self, **kwargs):
+        return await self._logged("agent", super().before_agent_callback, kwargs)
+
+    async def after_agent_callback(self, **kwargs):
+        return await self._logged("agent", super().after_agent_callback, kwargs)
+
+    async def before_model_callback(self, **kwargs):
+        return await self._logged("model_request", super().before_model_callback, kwargs)
+
+    async def after_model_callback(self, **kwargs):
+        return await self._logged("model_response", super().after_model_callback, kwargs)
+
+    async def before_tool_callback(self, **kwargs):
+        return await self._logged("tool", super().before_tool_callback, kwargs)
+
+    async def after_tool_callback(self, **kwargs):
+        return await self._logged("tool", super().after_tool_callback, kwargs)
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error):
+        self.logger.warning(f"[{self.name}] 🧠 LLM ERROR - Agent: {callback_context.agent_name} - Error: {error}")
+        return None
+
+    async def on_tool_error_callback(self, *, tool, tool_args, tool_context, error):
+        self.logger.warning(f"[{self.name}] 🔧 TOOL ERROR - Tool: {tool.name} - Agent: {tool_context.agent_name} - Error: {error}")
+        return None
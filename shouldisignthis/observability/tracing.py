@@ -0,0 +1,165 @@
+"""
+Pipeline Tracing
+
+Nested OpenTelemetry spans for pipeline -> stage -> agent -> model/tool call,
+exported as one JSON span per line to a local file (the `tracing` config
+section). Pipeline and stage spans are opened with `trace_span()` and carry
+the model calls, tokens, tool calls, retries and cache hits of everything
+inside them; agent, model-call and tool-call spans come from the
+TracingPlugin (see plugins.py) installed on every App.
+
+A private TracerProvider is used so ADK's own global tracing is unaffected.
+When tracing is disabled, spans are no-ops.
+
+Usage:
+    with trace_span("pipeline", session_id=session_id):
+        await run_stage_1(...)
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+from opentelemetry import trace
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from shouldisignthis.config import APP_CONFIG
+from shouldisignthis.observability.usage import track_usage
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    Appends finished spans to a file, one JSON object per line.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        trace_dir = os.path.dirname(os.path.abspath(path))
+        if not os.path.exists(trace_dir):
+            os.makedirs(trace_dir)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = []
+        for span in spans:
+            record = json.loads(span.to_json(indent=None))
+            record["duration_ms"] = round((span.end_time - span.start_time) / 1e6, 3)
+            lines.append(json.dumps(record))
+        try:
+            with self._lock, open(self.path, "a") as f:
+                f.write("\n".join(lines) + "\n")
+        except OSError as e:
+            logging.warning(f"⚠️ Could not write traces to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def get_tracing_settings(tracing_cfg: Dict) -> Dict:
+    """
+    Reads the tracing settings from the 'tracing' config section (env vars take priority).
+    Setting SHOULDISIGNTHIS_TRACE_PATH enables tracing to that file.
+
+    Args:
+        tracing_cfg (Dict): The 'tracing' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "path": str}.
+    """
+    env_path = os.environ.get("SHOULDISIGNTHIS_TRACE_PATH")
+    return {
+        "enabled": bool(env_path) or bool(tracing_cfg.get("enabled", False)),
+        "path": env_path or tracing_cfg.get("path", "logs/traces.jsonl"),
+    }
+
+
+# --- TRACER SINGLETON ---
+_provider: Optional[TracerProvider] = None
+_provider_path: Optional[str] = None
+_provider_lock = threading.Lock()
+
+# The innermost open pipeline/stage span. Kept separate from the OpenTelemetry
+# context because ADK sets its own (non-recording) spans there.
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_trace_span", default=None)
+
+
+def tracing_enabled() -> bool:
+    """Returns True if spans are being exported."""
+    return get_tracing_settings(APP_CONFIG.get("tracing", {}) or {})["enabled"]
+
+
+def get_tracer() -> trace.Tracer:
+    """
+    Returns the tracer for the configured sink, or a no-op tracer when tracing is disabled.
+
+    Returns:
+        trace.Tracer: The tracer.
+    """
+    global _provider, _provider_path
+    settings = get_tracing_settings(APP_CONFIG.get("tracing", {}) or {})
+    if not settings["enabled"]:
+        return trace.NoOpTracer()
+    with _provider_lock:
+        if _provider is None or _provider_path != settings["path"]:
+            if _provider is not None:
+                _provider.shutdown()
+            _provider = TracerProvider(resource=Resource.create({"service.name": "shouldisignthis"}))
+            _provider.add_span_processor(BatchSpanProcessor(JsonlSpanExporter(settings["path"])))
+            _provider_path = settings["path"]
+            logging.info(f"🔭 Tracing to: {settings['path']}")
+        return _provider.get_tracer("shouldisignthis")
+
+
+def flush_traces() -> None:
+    """Writes all pending spans to the sink."""
+    with _provider_lock:
+        if _provider is not None:
+            _provider.force_flush()
+
+
+def _parent_context(parent) -> Optional[object]:
+    return trace.set_span_in_context(parent) if parent is not None else None
+
+
+@contextmanager
+def trace_span(name: str, **attributes) -> Iterator[trace.Span]:
+    """
+    Opens a pipeline/stage span as a child of the current one and attaches the
+    usage (model calls, tokens, tool calls, retries, cache hits) of the enclosed code.
+
+    Args:
+        name (str): The span name (e.g. 'pipeline', 'stage Judge').
+        **attributes: Span attributes (None values are dropped).
+
+    Yields:
+        trace.Span: The span.
+    """
+    tracer = get_tracer()
+    span = tracer.start_span(
+        name,
+        context=_parent_context(_current_span.get()),
+        attributes={k: v for k, v in attributes.items() if v is not None},
+    )
+    token = _current_span.set(span)
+    try:
+        with track_usage() as usage:
+            yield span
+    except BaseException as e:
+        span.record_exception(e)
+        span.set_status(trace.StatusCode.ERROR, str(e))
+        raise
+    finally:
+        _current_span.reset(token)
+        if span.is_recording():
+            for key, value in usage.as_dict().items():
+                if not isinstance(value, dict):
+                    span.set_attribute(f"usage.{key}", value)
+        span.end()
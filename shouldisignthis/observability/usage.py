@@ -0,0 +1,111 @@
+"""
+Model Usage Tracking
+
+Counts model calls, tokens, tool calls, cache hits, retried model attempts and
+failed model calls, attributing them to whichever UsageTracker is active in the
+current async context. Fed by the UsagePlugin (see plugins.py) installed on every App by
+the orchestrator.
+
+Usage:
+    with track_usage() as usage:
+        await run_stage_1(...)
+    print(usage.as_dict())
+"""
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from shouldisignthis.observability.metrics import MODEL_RETRIES
+
+
+class UsageTracker:
+    """
+    Accumulates model and tool usage for a unit of work (a stage, a pipeline, a benchmark run).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.model_calls = 0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.tool_calls = 0
+        self.retries = 0
+        self.model_errors = 0
+        self.cache_hits = 0
+        self.models: Dict[str, int] = {}
+        # Agent -> model that produced its latest response ("<model> (fallback)" when a circuit breaker rerouted it)
+        self.served_by: Dict[str, str] = {}
+
+    def add_model_call(self, model: Optional[str], input_tokens: int, output_tokens: int, cache_hit: bool = False,
+                       agent: Optional[str] = None, fallback: bool = False) -> None:
+        with self._lock:
+            if agent and model:
+                self.served_by[agent] = f"{model} (fallback)" if fallback else model
+            self.model_calls += 1
+            if cache_hit:
+                self.cache_hits += 1
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            if model:
+                self.models[model] = self.models.get(model, 0) + 1
+
+    def add_tool_call(self) -> None:
+        with self._lock:
+            self.tool_calls += 1
+
+    def add_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def add_model_error(self) -> None:
+        with self._lock:
+            self.model_errors += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Returns the counters as a plain dict."""
+        with self._lock:
+            return {
+                "model_calls": self.model_calls,
+                "input_tokens": self.input_tokens,
+                "output_tokens": self.output_tokens,
+                "tool_calls": self.tool_calls,
+                "retries": self.retries,
+                "model_errors": self.model_errors,
+                "cache_hits": self.cache_hits,
+                "models": dict(self.models),
+                "served_by": dict(self.served_by),
+            }
+
+
+# Trackers are nestable (pipeline -> stage); every active tracker sees each event.
+_active_trackers: contextvars.ContextVar[tuple] = contextvars.ContextVar("usage_trackers", default=())
+
+
+@contextmanager
+def track_usage() -> Iterator[UsageTracker]:
+    """
+    Activates a new UsageTracker for the enclosed code (and the asyncio tasks it spawns).
+
+    Yields:
+        UsageTracker: The tracker collecting usage.
+    """
+    tracker = UsageTracker()
+    token = _active_trackers.set(_active_trackers.get() + (tracker,))
+    try:
+        yield tracker
+    finally:
+        _active_trackers.reset(token)
+
+
+def record_retry(model: Optional[str] = None) -> None:
+    """
+    Counts a retried model attempt against all active trackers and the retry metric.
+
+    Args:
+        model (str, optional): The model being retried.
+    """
+    MODEL_RETRIES.inc(model=model or "unknown")
+    for tracker in _active_trackers.get():
+        tracker.add_retry()
@@ -2,17 +2,40 @@ import asyncio
 import json
 import time
 import logging
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 from google.adk.apps.app import App
 from google.adk.runners import Runner
-from google.adk.plugins.logging_plugin import LoggingPlugin
 from google.genai import types
 
+from shouldisignthis.clause_cache import (
+    GENERAL_CLAUSE,
+    ClauseCache,
+    analysis_namespace,
+    attribute_findings,
+    clause_field,
+    clause_fingerprint,
+    get_clause_cache,
+    sheet_fingerprint,
+    split_clauses,
+)
+from shouldisignthis.config import APP_CONFIG
 from shouldisignthis.database import get_session_service
+from shouldisignthis.deadlines import StageTimeoutError, get_stage_timeout, pipeline_deadline, stage_budget
+from shouldisignthis.observability.metrics import FACT_REFINEMENTS, PARSE_FAILURES, PIPELINES_IN_FLIGHT, STAGE_LATENCY, STAGE_TIMEOUTS
+from shouldisignthis.observability.plugins import MetricsPlugin, SampledLoggingPlugin, TracingPlugin, UsagePlugin
+from shouldisignthis.observability.tracing import trace_span, tracing_enabled
+from shouldisignthis.observability.usage import track_usage
+from shouldisignthis.ingestion import SpooledUpload, get_ingestion_settings
+from shouldisignthis.near_duplicates import get_near_duplicate_store, near_duplicate_settings
+from shouldisignthis.norms import get_norms_store, grounding_sources
+from shouldisignthis.preprocessing import preprocess_upload
+from shouldisignthis.refinement import NOT_FOUND, apply_refinements, fields_to_refine, get_refinement_settings, page_window
+from shouldisignthis.revisions import diff_versions, format_changes, get_revision_settings, merge_fact_sheets, reusable_findings, stale_clauses
 from shouldisignthis.agents.drafter import get_drafter_agent, get_comparison_drafter_agent
-from shouldisignthis.agents.auditor import get_auditor_agent
-from shouldisignthis.agents.debate_team import get_debate_team
+from shouldisignthis.agents.auditor import FactSheet, get_auditor_agent, get_field_extractor_agent
+from shouldisignthis.agents.debate_team import debate_settings, get_debate_team
+from shouldisignthis.agents.skeptic import SKEPTIC_SHARDS
 from shouldisignthis.agents.bailiff import get_citation_loop
 from shouldisignthis.agents.judge import get_judge_agent
 from shouldisignthis.agents.arbiter import get_arbiter_agent
@@ -115,10 +138,48 @@ def parse_json(raw: Union[str, Any]) -> Union[Dict, list, Any]:
             except Exception:
                 pass
             
+            PARSE_FAILURES.inc()
             logging.error(f"❌ JSON Parse Error: Could not parse JSON from string. Raw (truncated): {raw[:500]!r}")
             return {} # Return empty dict to prevent AttributeError
     return raw if raw is not None else {}
 
+def _judge_reserve() -> float:
+    # Stages that can degrade leave the Judge its own budget under a pipeline deadline
+    return get_stage_timeout("Judge") or 0.0
+
+def get_plugins() -> list:
+    """
+    Returns the ADK plugins installed on every App run by the orchestrator.
+
+    Returns:
+        list: Plugin instances (logging, usage accounting, metrics and, when enabled, tracing).
+    """
+    events_cfg = APP_CONFIG.get("logging", {}).get("adk_events", {}) or {}
+    logging_plugin = SampledLoggingPlugin(
+        level=getattr(logging, events_cfg.get("level", "DEBUG").upper(), logging.DEBUG),
+        sample_rates=events_cfg.get("sample_rates")
+    )
+    plugins = [logging_plugin, UsagePlugin(), MetricsPlugin()]
+    if tracing_enabled():
+        plugins.append(TracingPlugin())
+    return plugins
+
+def build_runner(agent_factory, app_name: str, api_key: Optional[str] = None) -> Runner:
+    """
+    Builds the agent tree of a stage and a Runner for it.
+
+    Args:
+        agent_factory (callable): Function that returns an Agent instance.
+        app_name (str): Name of the application.
+        api_key (Optional[str], optional): Google API Key. Defaults to None.
+
+    Returns:
+        Runner: A runner using the shared session service and the orchestrator plugins.
+    """
+    root_agent = agent_factory(api_key=api_key)
+    app = App(name=app_name, root_agent=root_agent, plugins=get_plugins())
+    return Runner(app=app, session_service=get_session_service())
+
 async def _run_agent(
     agent_factory, 
     app_name: str, 
@@ -127,11 +188,15 @@ async def _run_agent(
     message: types.Content, 
     initial_state: Optional[Dict] = None,
     delete_existing_session: bool = False,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    reserve_seconds: float = 0.0,
+    on_event: Optional[Callable[[Any], None]] = None
 ) -> Any:
     """
     Generic helper function to initialize and run an ADK agent.
 
+    The run is cancelled when the stage deadline (see shouldisignthis.deadlines) passes.
+
     Args:
         agent_factory (callable): Function that returns an Agent instance.
         app_name (str): Name of the application.
@@ -141,9 +206,14 @@ async def _run_agent(
         initial_state (Optional[Dict], optional): Initial state for the session. Defaults to None.
         delete_existing_session (bool, optional): Whether to clear previous session data. Defaults to False.
         api_key (Optional[str], optional): Google API Key. Defaults to None.
+        reserve_seconds (float, optional): Pipeline time to leave for later stages. Defaults to 0.
+        on_event (Optional[Callable[[Any], None]], optional): Called with each event as the agent runs. Defaults to None.
 
     Returns:
         Any: The final session object after execution.
+
+    Raises:
+        StageTimeoutError: The stage ran out of time; carries the partial session.
     """
     if delete_existing_session:
         await get_session_service().delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
@@ -157,36 +227,103 @@ async def _run_agent(
         except Exception:
             pass
 
-    app = App(name=app_name, root_agent=agent_factory(api_key=api_key), plugins=[LoggingPlugin()])
-    runner = Runner(app=app, session_service=get_session_service())
-    
-    async for event in runner.run_async(user_id=user_id, session_id=session_id, new_message=message):
-        pass # Logs handled by plugin
+    runner = build_runner(agent_factory, app_name, api_key=api_key)
+    root_agent = runner.agent
+    timeout, deadline = stage_budget(root_agent.name, reserve_seconds)
+
+    async def run():
+        events = runner.run_async(user_id=user_id, session_id=session_id, new_message=message)
+        try:
+            async for event in events:
+                # Logs handled by plugin
+                if on_event is not None:
+                    on_event(event)
+        finally:
+            await events.aclose()
+
+    timed_out = False
+    with trace_span(f"stage {root_agent.name}", app_name=app_name, session_id=session_id) as span, STAGE_LATENCY.time(stage=root_agent.name):
+        try:
+            if timeout is not None and timeout <= 0:
+                raise asyncio.TimeoutError()
+            # Cancels the run (and its in-flight model/tool calls) at the deadline
+            await asyncio.wait_for(run(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            span.set_attribute("timed_out", True)
         
     session = await get_session_service().get_session(app_name=app_name, user_id=user_id, session_id=session_id)
+    if timed_out:
+        STAGE_TIMEOUTS.inc(stage=root_agent.name, deadline=deadline)
+        logging.warning(f"⏰ {root_agent.name} cancelled after {timeout:.1f}s ({deadline} deadline)")
+        raise StageTimeoutError(root_agent.name, timeout, deadline, session)
     return session
 
 # --- STAGE RUNNERS ---
 
-async def run_stage_1(file_bytes: bytes, mime_type: str, user_id: str, session_id: str, api_key: Optional[str] = None) -> Dict:
+_CONFIDENCE_RANK = {"HIGH": 3, "MEDIUM": 2, "LOW": 1}
+
+
+def _offset_pages(value: Any, offset: int) -> Any:
+    # Fact fields cite pages of their batch; shift them to pages of the document
+    if isinstance(value, list):
+        return [_offset_pages(item, offset) for item in value]
+    if isinstance(value, dict) and isinstance(value.get("page"), int):
+        return {**value, "page": value["page"] + offset}
+    return value
+
+
+def _original_pages(value: Any, page_map: list) -> Any:
+    # Preprocessing dropped pages; cite pages of the file as uploaded (page_map[i - 1] = original page of page i)
+    if isinstance(value, list):
+        return [_original_pages(item, page_map) for item in value]
+    if isinstance(value, dict) and isinstance(value.get("page"), int) and 1 <= value["page"] <= len(page_map):
+        return {**value, "page": page_map[value["page"] - 1]}
+    return value
+
+
+def _merge_auditor_batches(batches: list) -> Dict:
     """
-    Runs Stage 1: Auditor. Ingests the contract, extracts text, and performs safety checks.
+    Combines the Auditor outputs of consecutive page batches into one output.
 
     Args:
-        file_bytes (bytes): The raw file content.
-        mime_type (str): The MIME type of the file (e.g., 'application/pdf').
-        user_id (str): The ID of the user.
-        session_id (str): The unique session ID.
-        api_key (Optional[str], optional): Google API Key. Defaults to None.
+        batches (list): (first page, Auditor output) per batch, in page order.
 
     Returns:
-        Dict: The Auditor's output, including fact sheet and safety status.
+        Dict: One Auditor output: the full text in page order, each fact field from the batch that
+        found it with the highest confidence (earliest wins ties), and the list fields concatenated.
     """
+    merged = dict(batches[0][1])
+    merged["is_safe"] = all(out.get("is_safe") is not False for _, out in batches)
+    merged["safety_reason"] = next((out.get("safety_reason") for _, out in batches if out.get("is_safe") is False), merged.get("safety_reason"))
+    merged["full_text"] = "\n\n".join(out.get("full_text") or "" for _, out in batches).strip()
+
+    fact_sheet: Dict = {}
+    for first_page, out in batches:
+        for name, value in (out.get("fact_sheet") or {}).items():
+            value = _offset_pages(value, first_page - 1)
+            if isinstance(value, list):
+                fact_sheet.setdefault(name, []).extend(value)
+                continue
+            current = fact_sheet.get(name)
+            found = isinstance(value, dict) and value.get("value") not in (None, "", "NOT FOUND")
+            current_found = isinstance(current, dict) and current.get("value") not in (None, "", "NOT FOUND")
+            if current is None or (found and not current_found) or (
+                found and _CONFIDENCE_RANK.get(value.get("confidence"), 0) > _CONFIDENCE_RANK.get(current.get("confidence"), 0)
+            ):
+                fact_sheet[name] = value
+    merged["fact_sheet"] = fact_sheet
+    return merged
+
+
+async def _audit_file(file_bytes: bytes, mime_type: str, prompt: str, user_id: str, session_id: str, api_key: Optional[str]) -> tuple[Any, Dict]:
+    # Downscaled images / slimmed PDFs: fewer bytes to upload and fewer image tokens
+    file_bytes, mime_type, upload_stats = await preprocess_upload(file_bytes, mime_type)
     audit_msg = types.Content(
         role="user", 
         parts=[
             types.Part.from_bytes(data=file_bytes, mime_type=mime_type),
-            types.Part(text="Analyze this contract. Extract full text and facts.")
+            types.Part(text=prompt)
         ]
     )
     
@@ -201,45 +338,405 @@ async def run_stage_1(file_bytes: bytes, mime_type: str, user_id: str, session_i
         delete_existing_session=True,
         api_key=api_key
     )
-    return parse_json(session.state.get('auditor_output'))
+    auditor_out = parse_json(session.state.get('auditor_output'))
+    page_map = upload_stats.pop("page_map", None)
+    if page_map and upload_stats.get("pages_dropped") and isinstance(auditor_out, dict) and isinstance(auditor_out.get("fact_sheet"), dict):
+        auditor_out["fact_sheet"] = {name: _original_pages(value, page_map) for name, value in auditor_out["fact_sheet"].items()}
+    return auditor_out, upload_stats
+
 
-async def run_stage_2(user_id: str, session_id: str, fact_sheet: Dict, api_key: Optional[str] = None) -> tuple[Dict, float]:
+async def run_stage_1(file: Union[bytes, SpooledUpload], mime_type: str, user_id: str, session_id: str, api_key: Optional[str] = None) -> Dict:
+    """
+    Runs Stage 1: Auditor. Ingests the contract, extracts text, and performs safety checks.
+
+    A PDF longer than `ingestion.pages_per_batch` pages, or larger than `ingestion.max_batch_mb`,
+    is audited in page batches (each within both limits), read lazily from the (spooled) file,
+    and the batch outputs are merged. The first batch decides
+    whether the document is a contract; the others then run in parallel
+    (`ingestion.max_parallel_batches`), each with the Auditor's stage deadline. A batch that
+    times out is left out of the merged output, which lists its pages under 'timed_out_pages'.
+
+    Args:
+        file (Union[bytes, SpooledUpload]): The raw file content, or the upload spooled to disk.
+        mime_type (str): The MIME type of the file (e.g., 'application/pdf').
+        user_id (str): The ID of the user.
+        session_id (str): The unique session ID.
+        api_key (Optional[str], optional): Google API Key. Defaults to None.
+
+    Returns:
+        Dict: The Auditor's output, including fact sheet and safety status, and under 'upload'
+        what preprocessing saved (bytes/tokens before and after, pages dropped) and the batch count.
+
+    Raises:
+        StageTimeoutError: The Auditor ran out of time (on every batch of a long PDF).
+    """
+    upload = file if isinstance(file, SpooledUpload) else SpooledUpload.from_bytes(file, mime_type)
+    settings = get_ingestion_settings(APP_CONFIG.get("ingestion", {}) or {})
+    pages_per_batch = settings["pages_per_batch"]
+    pages = upload.page_count()
+    prompt = "Analyze this contract. Extract full text and facts."
+
+    if pages is None or (pages <= pages_per_batch and upload.size <= settings["max_batch_bytes"]):
+        auditor_out, upload_stats = await _audit_file(upload.read_bytes(), mime_type, prompt, user_id, session_id, api_key)
+        if isinstance(auditor_out, dict):
+            auditor_out["upload"] = {**upload_stats, "batches": 1}
+        return auditor_out
+
+    semaphore = asyncio.Semaphore(settings["max_parallel_batches"])
+    rejected = False
+    timeouts: list = []
+
+    async def audit_batch(first_page: int, last_page: int) -> Optional[tuple]:
+        nonlocal rejected
+        async with semaphore:
+            # A rejected document is not read further
+            if rejected:
+                return None
+            logging.info(f"📑 Auditing pages {first_page}-{last_page} of {pages}")
+            batch_prompt = (
+                f"{prompt} This file holds pages {first_page}-{last_page} of a {pages}-page document; "
+                f"cite page numbers within this file (its first page is page 1)."
+            )
+            batch_session = f"{session_id}:pages:{first_page}-{last_page}"
+            try:
+                auditor_out, upload_stats = await _audit_file(
+                    upload.page_range(first_page, last_page), mime_type, batch_prompt, user_id, batch_session, api_key
+                )
+            except StageTimeoutError as e:
+                logging.warning(f"⏰ Auditor timed out on pages {first_page}-{last_page}; continuing without them")
+                timeouts.append(((first_page, last_page), e))
+                return None
+            finally:
+                await get_session_service().delete_session(app_name="Auditor_App", user_id=user_id, session_id=batch_session)
+        if not isinstance(auditor_out, dict):
+            # An unreadable batch leaves the result without it rather than failing the contract
+            logging.warning(f"⚠️ Auditor output for pages {first_page}-{last_page} could not be parsed; skipping them")
+            return None
+        if auditor_out.get("is_safe") is False:
+            rejected = True
+        return first_page, auditor_out, upload_stats
+
+    ranges = upload.page_ranges(pages_per_batch, settings["max_batch_bytes"])
+    first = await audit_batch(*ranges[0])
+    # The first pages decide whether this is a contract
+    if first is not None and not first[1].get("is_contract"):
+        rejected = True
+    rest = await asyncio.gather(*(audit_batch(*page_range) for page_range in ranges[1:]))
+    audited = [batch for batch in [first, *rest] if batch is not None]
+
+    if not audited:
+        if timeouts:
+            raise timeouts[-1][1]
+        return None
+    totals = {"bytes_before": 0, "bytes_after": 0, "tokens_before": 0, "tokens_after": 0, "pages_dropped": 0}
+    for _, _, upload_stats in audited:
+        for key in totals:
+            totals[key] += upload_stats.get(key) or 0
+    merged = _merge_auditor_batches([(first_page, auditor_out) for first_page, auditor_out, _ in audited])
+    merged["upload"] = {"kind": "pdf", **totals, "pages": pages, "batches": len(audited)}
+    if timeouts:
+        merged["timed_out_pages"] = sorted([first_page, last_page] for (first_page, last_page), _ in timeouts)
+    return merged
+
+async def _extract_fields(file_bytes: bytes, mime_type: str, requested: Dict[str, Optional[Dict]], pages_note: str, user_id: str, session_id: str, api_key: Optional[str]) -> Dict[str, Dict]:
+    listing = "\n".join(f"- {clause_id}: {json.dumps((fact or {}).get('value', NOT_FOUND))}" for clause_id, fact in requested.items())
+    prompt = f"""
+    RE-EXTRACT THESE FIELDS (value extracted earlier in quotes):
+    {listing}
+    {pages_note}
+    """
+    msg = types.Content(role="user", parts=[types.Part.from_bytes(data=file_bytes, mime_type=mime_type), types.Part(text=prompt)])
+    try:
+        session = await _run_agent(
+            agent_factory=get_field_extractor_agent,
+            app_name="Auditor_App",
+            user_id=user_id,
+            session_id=session_id,
+            message=msg,
+            initial_state={},
+            delete_existing_session=True,
+            api_key=api_key
+        )
+    finally:
+        await get_session_service().delete_session(app_name="Auditor_App", user_id=user_id, session_id=session_id)
+    refined = parse_json(session.state.get('refined_fields'))
+    entries = refined.get("fields", []) if isinstance(refined, dict) else []
+    return {entry["field"]: entry for entry in entries if isinstance(entry, dict) and entry.get("field") in requested}
+
+
+async def run_stage_1_5(file: Union[bytes, SpooledUpload], mime_type: str, auditor_out: Dict, user_id: str, session_id: str, api_key: Optional[str] = None) -> Dict:
+    """
+    Runs Stage 1.5: Refinement. Re-extracts the fact fields the Auditor was unsure of (see shouldisignthis.refinement).
+
+    Each low-confidence field is re-read from the pages around the page it cites (fields sharing pages
+    share a call); when too few fields were found, the missing ones are looked for in the whole document.
+    The calls run in parallel (`refinement.max_parallel`).
+
+    Args:
+        file (Union[bytes, SpooledUpload]): The raw file content, or the upload spooled to disk.
+        mime_type (str): The MIME type of the file (e.g., 'application/pdf').
+        auditor_out (Dict): The Auditor's output from Stage 1 (its fact sheet is patched in place).
+        user_id (str): The ID of the user.
+        session_id (str): The unique session ID.
+        api_key (Optional[str], optional): Google API Key. Defaults to None.
+
+    Returns:
+        Dict: The Auditor's output, with 'refinement' = {"requested", "improved"} (clause ids) when fields were re-extracted.
+    """
+    settings = get_refinement_settings(APP_CONFIG.get("refinement", {}) or {}, APP_CONFIG.get("app_config", {}) or {})
+    fact_sheet = (auditor_out or {}).get("fact_sheet")
+    if not settings["enabled"] or not isinstance(fact_sheet, dict):
+        return auditor_out
+    scalar_fields = [name for name, field in FactSheet.model_fields.items() if "list" not in str(field.annotation)]
+    low, missing = fields_to_refine(fact_sheet, scalar_fields, settings["min_confidence"], settings["min_found_rate"])
+    if not low and not missing:
+        return auditor_out
+
+    upload = file if isinstance(file, SpooledUpload) else SpooledUpload.from_bytes(file, mime_type)
+    pages = upload.page_count()
+    clauses = split_clauses(fact_sheet)
+    # Fields are grouped by the pages they are looked for in: (first, last) -> {clause id: current fact}
+    groups: Dict[tuple, Dict[str, Optional[Dict]]] = {}
+    for clause_id in low:
+        window = page_window(clauses[clause_id].get("page"), pages, settings["page_window"]) if pages else (1, 1)
+        groups.setdefault(window, {})[clause_id] = clauses[clause_id]
+    if missing and (pages or 1) <= settings["max_missing_pages"]:
+        groups.setdefault((1, pages or 1), {}).update({field: fact_sheet.get(field) for field in missing})
+    elif missing:
+        logging.info(f"🔎 Not looking for {len(missing)} missing fields in a {pages}-page document")
+    requested = [clause_id for group in groups.values() for clause_id in group]
+    if not requested:
+        return auditor_out
+
+    semaphore = asyncio.Semaphore(settings["max_parallel"])
+
+    async def refine(window: tuple, group: Dict[str, Optional[Dict]]) -> Dict[str, Dict]:
+        first, last = window
+        whole = pages is None or (first, last) == (1, pages)
+        pages_note = "The file is the whole contract." if whole else (
+            f"This file holds pages {first}-{last} of a {pages}-page contract; cite pages within this file (its first page is page 1)."
+        )
+        async with semaphore:
+            try:
+                found = await _extract_fields(
+                    upload.read_bytes() if whole else upload.page_range(first, last),
+                    mime_type if whole else "application/pdf",
+                    group, pages_note, user_id, f"{session_id}:refine:{first}-{last}", api_key
+                )
+            except StageTimeoutError:
+                logging.warning(f"⏰ Refinement of pages {first}-{last} timed out; keeping the Auditor's fields")
+                return {}
+        return {clause_id: _offset_pages(fact, first - 1) for clause_id, fact in found.items()}
+
+    start = time.time()
+    refined: Dict[str, Dict] = {}
+    for found in await asyncio.gather(*(refine(window, group) for window, group in groups.items())):
+        refined.update(found)
+    _, improved = apply_refinements(fact_sheet, refined, settings["min_confidence"])
+    FACT_REFINEMENTS.inc(len(improved), result="improved")
+    FACT_REFINEMENTS.inc(len(requested) - len(improved), result="kept")
+    logging.info(f"🔎 Refined {len(improved)} of {len(requested)} fact fields in {len(groups)} call(s), {time.time() - start:.1f}s")
+    auditor_out["refinement"] = {"requested": requested, "improved": improved}
+    return auditor_out
+
+def _findings(raw: Any, key: str) -> list:
+    parsed = parse_json(raw) if raw else {}
+    return list(parsed.get(key) or []) if isinstance(parsed, dict) else []
+
+
+def _debate_outputs(sharded: bool) -> list:
+    # (agent name, state key) of each Debate Team output
+    if sharded:
+        skeptics = [(f"Skeptic_{shard}", f"skeptic_risks_{shard}") for shard in SKEPTIC_SHARDS]
+    else:
+        skeptics = [("Skeptic", 'skeptic_risks')]
+    return skeptics + [("Advocate", 'advocate_defense')]
+
+
+def _merge_skeptic_shards(state: Dict) -> Dict:
+    """
+    Combines the risks of the finished Skeptic specialists into 'skeptic_risks' (the single Skeptic's shape).
+
+    Args:
+        state (Dict): The Debate Team's session state.
+
+    Returns:
+        Dict: The state with 'skeptic_risks' = {"risks": [...]}, unless no specialist finished.
+    """
+    state = dict(state)
+    outputs = [state.get(f"skeptic_risks_{shard}") for shard in SKEPTIC_SHARDS]
+    if any(outputs):
+        state['skeptic_risks'] = {"risks": [risk for raw in outputs for risk in _findings(raw, 'risks')]}
+    return state
+
+
+def _merge_cached_clauses(state: Dict, clauses: Dict, cached: Dict, fingerprints: Dict, cache: Optional[ClauseCache]) -> Dict:
+    """
+    Stores the Debate Team's findings for the clauses it analyzed and merges in the cached ones.
+
+    Args:
+        state (Dict): The Debate Team's session state (empty if every clause was cached).
+        clauses (Dict): Fact field per clause id.
+        cached (Dict): Cached (or previous version's) {"risks", "counters"} per clause id, and the
+            sheet's cached general findings under GENERAL_CLAUSE when the Debate Team was skipped.
+        fingerprints (Dict): Fingerprint per clause id, and the sheet fingerprint under GENERAL_CLAUSE
+            when the cache is enabled.
+        cache (Optional[ClauseCache]): The clause cache, or None when it is disabled.
+
+    Returns:
+        Dict: The state with all risks and counters, and with the clause cache 'clause_cache' = {"hits", "misses"}.
+    """
+    state = dict(state)
+    risks = _findings(state.get('skeptic_risks'), 'risks')
+    counters = _findings(state.get('advocate_defense'), 'counters')
+    analyzed = [clause_id for clause_id in clauses if clause_id not in cached]
+    debated = analyzed + [GENERAL_CLAUSE] if GENERAL_CLAUSE in fingerprints and GENERAL_CLAUSE not in cached else analyzed
+
+    if cache is not None and debated and not state.get('timed_out'):
+        grouped = attribute_findings(risks, counters, analyzed)
+        if grouped is None:
+            logging.warning("⚠️ Debate findings are not tagged with known clauses; not caching them")
+        else:
+            cache.put_many({fingerprints[clause_id]: (clause_field(clause_id), grouped[clause_id]) for clause_id in debated})
+
+    if cached:
+        for clause_id, findings in cached.items():
+            if clause_id == GENERAL_CLAUSE:
+                risks.extend(findings["risks"])
+                counters.extend(findings["counters"])
+                continue
+            # Cached findings come from another contract: cite this contract's page
+            page = {"page": clauses[clause_id]["page"]} if clauses[clause_id].get("page") is not None else {}
+            risks.extend({**risk, "clause": clause_id, **page} for risk in findings["risks"])
+            counters.extend({**counter, "clause": clause_id} for counter in findings["counters"])
+        state['skeptic_risks'] = {"risks": risks}
+        state['advocate_defense'] = {"counters": counters}
+    if cache is not None:
+        state['clause_cache'] = {"hits": len(cached) - (GENERAL_CLAUSE in cached), "misses": len(analyzed)}
+    return state
+
+
+async def run_stage_2(user_id: str, session_id: str, fact_sheet: Dict, api_key: Optional[str] = None, known_findings: Optional[Dict[str, Dict]] = None, on_skeptic_risks: Optional[Callable[[list], None]] = None) -> tuple[Dict, float]:
     """
     Runs Stage 2: Debate Team. The Skeptic and Advocate analyze the fact sheet in parallel.
+    With `debate.sharded_skeptic`, the Skeptic's category specialists run in parallel too and their
+    risks are merged into 'skeptic_risks'.
+
+    With the clause cache enabled (or known_findings given), only clauses without a cached analysis
+    are debated and the cached findings are merged back in (see shouldisignthis.clause_cache).
 
     Args:
         user_id (str): The ID of the user.
         session_id (str): The unique session ID.
         fact_sheet (Dict): The extracted facts from Stage 1.
         api_key (Optional[str], optional): Google API Key. Defaults to None.
+        known_findings (Optional[Dict[str, Dict]], optional): {"risks", "counters"} per clause fingerprint
+            that need no new debate (a previous version's, see shouldisignthis.revisions). Defaults to None.
+        on_skeptic_risks (Optional[Callable[[list], None]], optional): Called with the Skeptic's risks as soon as
+            they are filed, while the Advocate may still be working (not called if the Skeptic runs late). Defaults to None.
 
     Returns:
         tuple[Dict, float]: A tuple containing the session state (with arguments) and execution duration.
+        If the Advocate runs out of time, the state has no 'advocate_defense' and lists it under 'timed_out'.
+        With the clause cache, 'clause_cache' holds the clause hits and misses. 'grounded_sources' lists
+        the web sources the Advocate's answers were grounded on (see shouldisignthis.norms.grounding_sources).
+
+    Raises:
+        StageTimeoutError: The Skeptic (or every specialist) did not finish in time (there is nothing to judge).
     """
-    prompt = f"""
-    FACT SHEET:
-    {json.dumps(fact_sheet, indent=2)}
+    cache = get_clause_cache()
+    reuse = cache is not None or known_findings is not None
+    debate_sheet, note = fact_sheet, ""
+    if reuse:
+        clauses = split_clauses(fact_sheet)
+        namespace = analysis_namespace()
+        fingerprints = {clause_id: clause_fingerprint(clause_id, fact, namespace) for clause_id, fact in clauses.items()}
+        if cache is not None:
+            # General findings depend on the whole sheet, not on one clause
+            fingerprints[GENERAL_CLAUSE] = sheet_fingerprint(list(fingerprints.values()))
+        # Known findings first; the cache is asked about the rest
+        found = {fp: (known_findings or {})[fp] for fp in fingerprints.values() if fp in (known_findings or {})}
+        if cache is not None:
+            found.update(cache.get_many([fp for fp in fingerprints.values() if fp not in found]))
+        cached = {clause_id: found[fp] for clause_id, fp in fingerprints.items() if fp in found}
+        # The Debate Team sees the clauses by id, without the ones already analyzed
+        debate_sheet = {clause_id: fact for clause_id, fact in clauses.items() if clause_id not in cached}
+        reviewed = [clause_id for clause_id in cached if clause_id != GENERAL_CLAUSE]
+        if debate_sheet:
+            # A debate files its own general findings
+            cached.pop(GENERAL_CLAUSE, None)
+        elif GENERAL_CLAUSE in fingerprints and GENERAL_CLAUSE not in cached:
+            # Every clause was seen before, but never this sheet: debate it whole for its general findings
+            debate_sheet, reviewed = clauses, []
+        if reviewed:
+            note = f"ALREADY REVIEWED (omitted here; do not report them as missing): {', '.join(reviewed)}"
 
+    start_time = time.time()
+    if reuse and not debate_sheet:
+        logging.info(f"♻️ All {len(cached) - (GENERAL_CLAUSE in cached)} clauses analyzed before; skipping the Debate Team")
+        state = {}
+    else:
+        prompt = f"""
+    FACT SHEET:
+    {json.dumps(debate_sheet, indent=2)}
+    {note}
     Analyze these contract terms.
     """
-    msg = types.Content(role="user", parts=[types.Part(text=prompt)])
-    
-    start_time = time.time()
-    session = await _run_agent(
-        agent_factory=get_debate_team,
-        app_name="Debate_App",
-        user_id=user_id,
-        session_id=session_id,
-        message=msg,
-        initial_state={'auditor_output': fact_sheet},
-        delete_existing_session=True,
-        api_key=api_key
-    )
+        msg = types.Content(role="user", parts=[types.Part(text=prompt)])
+        sharded = debate_settings()["sharded_skeptic"]
+        skeptic_keys = [key for _, key in _debate_outputs(sharded) if key != 'advocate_defense']
+        filed = {}
+        grounded: list = []
+
+        def watch(event):
+            grounded.extend(grounding_sources(event))
+            if on_skeptic_risks is None:
+                return
+            delta = event.actions.state_delta if event.actions else None
+            if not delta or filed.get('reported'):
+                return
+            filed.update(delta)
+            if all(filed.get(key) for key in skeptic_keys):
+                filed['reported'] = True
+                outputs = _merge_skeptic_shards(filed) if sharded else filed
+                on_skeptic_risks(_findings(outputs.get('skeptic_risks'), 'risks'))
+
+        try:
+            session = await _run_agent(
+                agent_factory=get_debate_team,
+                app_name="Debate_App",
+                user_id=user_id,
+                session_id=session_id,
+                message=msg,
+                initial_state={'auditor_output': debate_sheet},
+                delete_existing_session=True,
+                api_key=api_key,
+                reserve_seconds=_judge_reserve(),
+                on_event=watch
+            )
+            state = _merge_skeptic_shards(session.state) if sharded else session.state
+        except StageTimeoutError as e:
+            state = dict(e.session.state) if e.session else {}
+            if sharded:
+                state = _merge_skeptic_shards(state)
+            if not state.get('skeptic_risks'):
+                raise
+            # The Judge can rule on the Skeptic's risks alone (or on the specialists that finished)
+            state['timed_out'] = [name for name, key in _debate_outputs(sharded) if not state.get(key)]
+            logging.warning(f"⏰ Debate cut short; continuing without: {', '.join(state['timed_out'])}")
+        if grounded:
+            state['grounded_sources'] = sorted(set(grounded))
+        if reuse and all(clause_id in cached for clause_id in debate_sheet):
+            # A general pass: the clause findings are the cached ones
+            state['skeptic_risks'] = {"risks": [risk for risk in _findings(state.get('skeptic_risks'), 'risks') if isinstance(risk, dict) and risk.get('clause') == GENERAL_CLAUSE]}
+            state['advocate_defense'] = {"counters": [counter for counter in _findings(state.get('advocate_defense'), 'counters') if isinstance(counter, dict) and counter.get('clause') == GENERAL_CLAUSE]}
+    if reuse:
+        state = _merge_cached_clauses(state, clauses, cached, fingerprints, cache)
     duration = time.time() - start_time
     
-    return session.state, duration
+    return state, duration
 
-async def run_stage_2_5(user_id: str, session_id: str, risks: list, counters: list, full_text: str, api_key: Optional[str] = None) -> Dict:
+async def run_stage_2_5(user_id: str, session_id: str, risks: list, counters: list, full_text: str, api_key: Optional[str] = None, grounded_sources: Optional[list] = None) -> Dict:
     """
     Runs Stage 2.5: Bailiff Loop. Verifies the arguments against the full contract text.
 
@@ -250,9 +747,12 @@ async def run_stage_2_5(user_id: str, session_id: str, risks: list, counters: li
         counters (list): List of counters identified by the Advocate.
         full_text (str): The full text of the contract.
         api_key (Optional[str], optional): Google API Key. Defaults to None.
+        grounded_sources (Optional[list], optional): The Stage 2 state's 'grounded_sources'. Defaults to None.
 
     Returns:
-        Dict: The verified arguments (risks and counters).
+        Dict: The verified arguments (risks and counters). If the Bailiff runs out of time, the
+        unverified arguments with 'unverified': True. With the industry norms store, the verified
+        counters citing grounded sources are added to it.
     """
     new_state = {
         'current_arguments': {"risks": risks, "counters": counters},
@@ -261,16 +761,22 @@ async def run_stage_2_5(user_id: str, session_id: str, risks: list, counters: li
     
     msg = types.Content(role="user", parts=[types.Part(text="Verify these arguments.")])
     
-    session = await _run_agent(
-        agent_factory=get_citation_loop,
-        app_name="Auditor_App", 
-        user_id=user_id,
-        session_id=session_id,
-        message=msg,
-        initial_state=new_state,
-        delete_existing_session=True,
-        api_key=api_key
-    )
+    try:
+        session = await _run_agent(
+            agent_factory=get_citation_loop,
+            app_name="Auditor_App", 
+            user_id=user_id,
+            session_id=session_id,
+            message=msg,
+            initial_state=new_state,
+            delete_existing_session=True,
+            api_key=api_key,
+            reserve_seconds=_judge_reserve()
+        )
+    except StageTimeoutError:
+        # A half-finished verification round is not trustworthy; pass the arguments on as filed
+        logging.warning("⏰ Bailiff timed out; the Judge gets unverified evidence")
+        return {"risks": risks, "counters": counters, "unverified": True}
     
     # Logic to pick best evidence
     bailiff_verdict = parse_json(session.state.get('bailiff_verdict'))
@@ -293,9 +799,93 @@ async def run_stage_2_5(user_id: str, session_id: str, risks: list, counters: li
     if not final_args or (isinstance(final_args, dict) and 
                           (not final_args.get("risks") and not final_args.get("counters"))):
         final_args = {"risks": risks, "counters": counters} # Fallback
+    else:
+        # Verified counters with grounded sources answer later Advocate lookups
+        norms = get_norms_store()
+        if norms is not None and counters and grounded_sources:
+            norms.learn(final_args.get("counters") or [], grounded_sources)
         
     return final_args
 
+def _merge_evidence(risks_half: Optional[Dict], rest: Optional[Dict]) -> Dict:
+    # Each verification round only contributes the arguments it was given
+    evidence = {
+        "risks": (risks_half or {}).get("risks", []) + (rest or {}).get("risks", []),
+        "counters": (rest or {}).get("counters", []),
+    }
+    if (risks_half or {}).get("unverified") or (rest or {}).get("unverified"):
+        evidence["unverified"] = True
+    return evidence
+
+
+async def run_debate_and_verification(user_id: str, session_id: str, fact_sheet: Dict, full_text: str, api_key: Optional[str] = None) -> tuple[Dict, Dict, Dict]:
+    """
+    Runs Stage 2 (Debate Team) and Stage 2.5 (Bailiff Loop).
+
+    With `debate.pipelined_bailiff`, the Bailiff starts verifying the Skeptic's risks as soon as they are
+    filed, while the Advocate is still searching for industry norms; the counters (and any risks filed
+    later, e.g. cached clauses) are verified when the debate ends, and the two verified halves are merged.
+
+    Args:
+        user_id (str): The ID of the user.
+        session_id (str): The unique session ID.
+        fact_sheet (Dict): The extracted facts from Stage 1.
+        full_text (str): The full text of the contract.
+        api_key (Optional[str], optional): Google API Key. Defaults to None.
+
+    Returns:
+        tuple[Dict, Dict, Dict]: The Stage 2 session state (see run_stage_2), the verified evidence (see
+        run_stage_2_5) and the timings {"stage_2", "stage_2_5"}; 'stage_2_5' is the verification time
+        after the debate ended.
+    """
+    if not debate_settings()["pipelined_bailiff"]:
+        state, duration = await run_stage_2(user_id, session_id, fact_sheet, api_key=api_key)
+        start = time.time()
+        risks = _findings(state.get('skeptic_risks'), 'risks')
+        counters = _findings(state.get('advocate_defense'), 'counters')
+        evidence = await run_stage_2_5(user_id, session_id, risks, counters, full_text, api_key=api_key, grounded_sources=state.get('grounded_sources'))
+        return state, evidence, {"stage_2": duration, "stage_2_5": time.time() - start}
+
+    early = {}
+    risks_session, rest_session = f"{session_id}:bailiff_risks", f"{session_id}:bailiff_rest"
+
+    def verify_risks(risks: list):
+        if not risks:
+            return
+        logging.info(f"🕵️ Verifying {len(risks)} risks while the Advocate works")
+        early["risks"] = risks
+        early["task"] = asyncio.create_task(run_stage_2_5(user_id, risks_session, risks, [], full_text, api_key=api_key))
+
+    try:
+        try:
+            state, duration = await run_stage_2(user_id, session_id, fact_sheet, api_key=api_key, on_skeptic_risks=verify_risks)
+        except BaseException:
+            if "task" in early:
+                early["task"].cancel()
+            raise
+        start = time.time()
+        risks = _findings(state.get('skeptic_risks'), 'risks')
+        counters = _findings(state.get('advocate_defense'), 'counters')
+        if "task" not in early:
+            evidence = await run_stage_2_5(user_id, session_id, risks, counters, full_text, api_key=api_key, grounded_sources=state.get('grounded_sources'))
+            return state, evidence, {"stage_2": duration, "stage_2_5": time.time() - start}
+
+        late_risks = [risk for risk in risks if risk not in early["risks"]]
+        rest = None
+        if late_risks or counters:
+            rest_task = run_stage_2_5(user_id, rest_session, late_risks, counters, full_text, api_key=api_key, grounded_sources=state.get('grounded_sources'))
+            risks_half, rest = await asyncio.gather(early["task"], rest_task)
+            if not late_risks:
+                rest = {**rest, "risks": []}
+        else:
+            risks_half = await early["task"]
+        evidence = _merge_evidence(risks_half, rest)
+        return state, evidence, {"stage_2": duration, "stage_2_5": time.time() - start}
+    finally:
+        for verification_session in (risks_session, rest_session):
+            await get_session_service().delete_session(app_name="Auditor_App", user_id=user_id, session_id=verification_session)
+
+
 async def run_stage_3(user_id: str, session_id: str, fact_sheet: Dict, evidence: Dict, api_key: Optional[str] = None) -> Dict:
     """
     Runs Stage 3: Judge. Reviews the evidence and issues a final verdict and risk score.
@@ -319,7 +909,7 @@ async def run_stage_3(user_id: str, session_id: str, fact_sheet: Dict, evidence:
     --- EVIDENCE FOR REVIEW ---
     RISKS: {json.dumps(evidence.get('risks', []), indent=2)}
     COUNTERS: {json.dumps(evidence.get('counters', []), indent=2)}
-    
+    {"NOTE: The Bailiff could not verify this evidence against the contract text in time. Weigh unsupported claims accordingly." if evidence.get('unverified') else ""}
     Review the evidence and issue your verdict.
     """
     msg = types.Content(role="user", parts=[types.Part(text=context_msg)])
@@ -373,3 +963,249 @@ async def run_stage_4(user_id: str, session_id: str, verdict_data: Dict, tone: s
         api_key=api_key
     )
     return parse_json(session.state.get('drafted_email'))
+
+# --- FULL PIPELINE (Headless) ---
+async def run_pipeline(file_bytes: Union[bytes, SpooledUpload], mime_type: str, user_id: str, session_id: str, api_key: Optional[str] = None, tone: Optional[str] = None) -> Dict:
+    """
+    Runs Stages 1-3 (with the Stage 1.5 refinement, and optionally Stage 4) end-to-end without any UI.
+
+    Used by the batch worker pool and the benchmark scripts. Mirrors the stage
+    sequencing of the Streamlit single mode.
+
+    Args:
+        file_bytes (Union[bytes, SpooledUpload]): The raw file content, or the upload spooled to disk.
+        mime_type (str): The MIME type of the file (e.g., 'application/pdf').
+        user_id (str): The ID of the user.
+        session_id (str): The unique session ID.
+        api_key (Optional[str], optional): Google API Key. Defaults to None.
+        tone (Optional[str], optional): If set, also runs the Drafter with this tone. Defaults to None.
+
+    Returns:
+        Dict: The per-stage outputs, a 'status' ('COMPLETE' or 'REJECTED'), per-stage 'timings' in seconds,
+        the agents that timed out and were left out ('degraded') and the model that answered each agent
+        ('served_by', e.g. {"Judge": "gemini-2.0-flash (fallback)"}); with the clause cache, its hits and misses ('clause_cache').
+        With the near-duplicate index, a match is reported under 'near_duplicate' ({"id", "similarity",
+        "changed_spans"}); in 'auto' mode, when only dates and party names changed, the stored analysis is
+        returned instead, marked 'reused_from'.
+
+    Raises:
+        StageTimeoutError: A stage that cannot be skipped ran past its (or the pipeline's) deadline.
+    """
+    with trace_span("pipeline", user_id=user_id, session_id=session_id) as span, PIPELINES_IN_FLIGHT.track_inprogress(), pipeline_deadline():
+        with track_usage() as usage:
+            result = await _run_pipeline_stages(file_bytes, mime_type, user_id, session_id, api_key, tone)
+        result["served_by"] = usage.served_by
+        span.set_attribute("status", result["status"])
+    return result
+
+async def _run_pipeline_stages(file_bytes: Union[bytes, SpooledUpload], mime_type: str, user_id: str, session_id: str, api_key: Optional[str], tone: Optional[str]) -> Dict:
+    result = {"status": "COMPLETE", "timings": {}, "degraded": []}
+
+    # A near duplicate of an analyzed contract (by its PDF text layer) can reuse that analysis
+    upload = file_bytes if isinstance(file_bytes, SpooledUpload) else SpooledUpload.from_bytes(file_bytes, mime_type)
+    store = get_near_duplicate_store()
+    text = upload.extract_text() if store is not None else None
+    if text:
+        match = store.find(text)
+        if match:
+            near_duplicate = {key: match[key] for key in ("id", "similarity", "changed_spans")}
+            if near_duplicate_settings()["mode"] == "auto" and (not tone or match["result"].get("toolkit")):
+                if match["cosmetic"]:
+                    logging.info(f"🧬 Near duplicate of contract #{match['id']} ({match['similarity']:.0%}); reusing its analysis")
+                    return {**match["result"], "timings": {}, "degraded": [], "reused_from": near_duplicate}
+                logging.info(f"🧬 Near duplicate of contract #{match['id']} changes more than dates and party names; analyzing it")
+            result["near_duplicate"] = near_duplicate
+
+    start = time.time()
+    auditor_out = await run_stage_1(upload, mime_type, user_id, session_id, api_key=api_key)
+    result["timings"]["stage_1"] = time.time() - start
+    result["auditor"] = auditor_out
+
+    if not auditor_out or not auditor_out.get("is_contract") or auditor_out.get("is_safe") is False:
+        result["status"] = "REJECTED"
+        return result
+    if auditor_out.get("timed_out_pages"):
+        result["degraded"].append("Auditor")
+
+    start = time.time()
+    auditor_out = await run_stage_1_5(upload, mime_type, auditor_out, user_id, session_id, api_key=api_key)
+    result["timings"]["stage_1_5"] = time.time() - start
+
+    fact_sheet = auditor_out.get("fact_sheet")
+    full_text = auditor_out.get("full_text")
+
+    stage2_state, result["evidence"], timings = await run_debate_and_verification(user_id, session_id, fact_sheet, full_text, api_key=api_key)
+    result["timings"].update(timings)
+    result["skeptic"] = parse_json(stage2_state.get('skeptic_risks'))
+    result["advocate"] = parse_json(stage2_state.get('advocate_defense'))
+    result["degraded"].extend(stage2_state.get('timed_out', []))
+    if stage2_state.get('clause_cache'):
+        result["clause_cache"] = stage2_state['clause_cache']
+    if result["evidence"].get("unverified"):
+        result["degraded"].append("Bailiff")
+
+    start = time.time()
+    result["verdict"] = await run_stage_3(user_id, session_id, fact_sheet, result["evidence"], api_key=api_key)
+    result["timings"]["stage_3"] = time.time() - start
+
+    if tone:
+        start = time.time()
+        result["toolkit"] = await run_stage_4(user_id, session_id, result["verdict"], tone, api_key=api_key)
+        result["timings"]["stage_4"] = time.time() - start
+
+    # Only complete analyses are offered for reuse
+    if text and result["verdict"] and not result["degraded"]:
+        store.add(text, {key: value for key, value in result.items() if key not in ("timings", "degraded", "near_duplicate")})
+    return result
+
+# --- REVISION (Incremental re-analysis of a redlined version) ---
+async def _audit_changes(changes: str, user_id: str, session_id: str, api_key: Optional[str]) -> Dict:
+    prompt = f"""
+    REVISED CONTRACT: CHANGED PASSAGES ONLY
+    This contract was audited before. Below are only the passages of the new version that were added
+    or reworded, each marked with the page it is on. Treat the document as a contract, run the safety
+    check on these passages, leave full_text empty and extract only the facts these passages state
+    (value="NOT FOUND" for every other field). Cite the page markers.
+
+    {changes}
+    """
+    msg = types.Content(role="user", parts=[types.Part(text=prompt)])
+    session = await _run_agent(
+        agent_factory=get_auditor_agent,
+        app_name="Auditor_App",
+        user_id=user_id,
+        session_id=session_id,
+        message=msg,
+        initial_state={},
+        delete_existing_session=True,
+        api_key=api_key
+    )
+    auditor_out = parse_json(session.state.get('auditor_output'))
+    return auditor_out if isinstance(auditor_out, dict) else {}
+
+
+def _full_analysis_reason(previous: Dict, pages: Optional[list]) -> Optional[str]:
+    if not (previous or {}).get("verdict") or not ((previous or {}).get("auditor") or {}).get("full_text"):
+        return "the previous analysis is incomplete"
+    if pages is None:
+        return "the new version has no text layer"
+    return None
+
+
+async def run_revision(file: Union[bytes, SpooledUpload], mime_type: str, previous: Dict, user_id: str, session_id: str, api_key: Optional[str] = None, tone: Optional[str] = None) -> Dict:
+    """
+    Re-analyzes a revised version of a contract, re-running the stages only on what the redline changed.
+
+    The new version's text layer is diffed against the previous version (see shouldisignthis.revisions):
+    the Auditor reads the changed passages, the Debate Team and Bailiff handle the changed clauses and
+    the Judge (and Drafter) rule on the merged record. Without a text layer, without a complete previous
+    analysis, or when more than `revisions.max_changed_ratio` of the passages changed, the version is
+    analyzed in full with run_pipeline.
+
+    Args:
+        file (Union[bytes, SpooledUpload]): The new version, raw or spooled to disk.
+        mime_type (str): The MIME type of the file (e.g., 'application/pdf').
+        previous (Dict): The previous version's result (run_pipeline or run_revision format).
+        user_id (str): The ID of the user.
+        session_id (str): The unique session ID.
+        api_key (Optional[str], optional): Google API Key. Defaults to None.
+        tone (Optional[str], optional): If set, also runs the Drafter with this tone. Defaults to None.
+
+    Returns:
+        Dict: The run_pipeline result of the new version, with 'revision' = {"version", "passages",
+        "changed_passages", "changed_ratio", "reanalyzed_clauses", "reused_clauses", "changes"}
+        ('changes': [{"page", "before", "after"}]), or {"version", "full": True, "reason"} for a full analysis.
+    """
+    upload = file if isinstance(file, SpooledUpload) else SpooledUpload.from_bytes(file, mime_type)
+    version = ((previous or {}).get("revision") or {}).get("version", 1) + 1
+    pages = upload.extract_pages()
+    reason = _full_analysis_reason(previous, pages)
+    if reason is None:
+        diff = diff_versions(previous["auditor"]["full_text"], pages)
+        max_changed_ratio = get_revision_settings(APP_CONFIG.get("revisions", {}) or {})["max_changed_ratio"]
+        if diff["changed_ratio"] > max_changed_ratio:
+            reason = f"{diff['changed_ratio']:.0%} of the passages changed"
+    if reason:
+        logging.info(f"📝 Revision {version} analyzed in full: {reason}")
+        result = await run_pipeline(upload, mime_type, user_id, session_id, api_key=api_key, tone=tone)
+        result["revision"] = {"version": version, "full": True, "reason": reason}
+        return result
+
+    revision = {"version": version, **{key: diff[key] for key in ("passages", "changed_passages", "changed_ratio")}}
+    if not diff["hunks"]:
+        logging.info(f"📝 Revision {version} has no textual changes; keeping the previous analysis")
+        return {**previous, "timings": {}, "degraded": [], "revision": {**revision, "reanalyzed_clauses": [], "reused_clauses": len(split_clauses(previous["auditor"].get("fact_sheet") or {})), "changes": []}}
+
+    logging.info(f"📝 Revision {version}: {diff['changed_passages']} of {diff['passages']} passages changed")
+    with trace_span("revision", user_id=user_id, session_id=session_id) as span, PIPELINES_IN_FLIGHT.track_inprogress(), pipeline_deadline():
+        with track_usage() as usage:
+            result = await _run_revision_stages(pages, diff, previous, user_id, session_id, api_key, tone)
+        result["served_by"] = usage.served_by
+        result["revision"] = {**revision, **result["revision"]}
+        span.set_attribute("status", result["status"])
+    return result
+
+async def _run_revision_stages(pages: list, diff: Dict, previous: Dict, user_id: str, session_id: str, api_key: Optional[str], tone: Optional[str]) -> Dict:
+    result = {"status": "COMPLETE", "timings": {}, "degraded": [], "revision": {"changes": diff["hunks"][:20]}}
+    previous_auditor = {key: value for key, value in previous["auditor"].items() if key != "upload"}
+    previous_sheet = previous_auditor.get("fact_sheet") or {}
+    full_text = "\n".join(pages)
+
+    # STAGE 1: only the changed passages
+    start = time.time()
+    changed_text = format_changes(diff["hunks"])
+    # A redline that only deletes passages leaves nothing to read
+    changes = await _audit_changes(changed_text, user_id, session_id, api_key) if changed_text else {}
+    result["timings"]["stage_1"] = time.time() - start
+    fact_sheet = merge_fact_sheets(previous_sheet, changes.get("fact_sheet"), stale_clauses(previous_sheet, diff["hunks"]))
+    result["auditor"] = {**previous_auditor, "fact_sheet": fact_sheet, "full_text": full_text}
+    if changes.get("is_safe") is False:
+        result["auditor"].update(is_safe=False, safety_reason=changes.get("safety_reason"))
+        result["status"] = "REJECTED"
+        return result
+
+    # STAGE 2: the previous findings of unchanged clauses are reused
+    namespace = analysis_namespace()
+    previous_evidence = previous.get("evidence") or {}
+    known, unattributed = reusable_findings(previous_sheet, previous_evidence, namespace)
+    clauses = split_clauses(fact_sheet)
+    reused = {clause_id for clause_id, fact in clauses.items() if clause_fingerprint(clause_id, fact, namespace) in known}
+    result["revision"]["reanalyzed_clauses"] = sorted(set(clauses) - reused)
+    result["revision"]["reused_clauses"] = len(reused)
+
+    stage2_state, duration = await run_stage_2(user_id, session_id, fact_sheet, api_key=api_key, known_findings=known)
+    result["timings"]["stage_2"] = duration
+    risks = _findings(stage2_state.get('skeptic_risks'), 'risks')
+    counters = _findings(stage2_state.get('advocate_defense'), 'counters')
+    result["skeptic"] = {"risks": risks + unattributed["risks"]}
+    result["advocate"] = {"counters": counters + unattributed["counters"]}
+    result["degraded"].extend(stage2_state.get('timed_out', []))
+    if stage2_state.get('clause_cache'):
+        result["clause_cache"] = stage2_state['clause_cache']
+
+    # STAGE 2.5: the Bailiff verifies the new findings (all of them if the previous evidence was unverified)
+    verified_before = set() if previous_evidence.get("unverified") else reused
+    kept = {key: [f for f in items if isinstance(f, dict) and f.get("clause") in verified_before] for key, items in (("risks", risks), ("counters", counters))}
+    to_verify = {
+        key: [f for f in items if not (isinstance(f, dict) and f.get("clause") in verified_before)] + unattributed[key]
+        for key, items in (("risks", risks), ("counters", counters))
+    }
+    start = time.time()
+    evidence = {"risks": [], "counters": []}
+    if to_verify["risks"] or to_verify["counters"]:
+        evidence = await run_stage_2_5(user_id, session_id, to_verify["risks"], to_verify["counters"], full_text, api_key=api_key, grounded_sources=stage2_state.get('grounded_sources'))
+    result["timings"]["stage_2_5"] = time.time() - start
+    result["evidence"] = {**evidence, "risks": kept["risks"] + evidence.get("risks", []), "counters": kept["counters"] + evidence.get("counters", [])}
+    if result["evidence"].get("unverified"):
+        result["degraded"].append("Bailiff")
+
+    # STAGE 3 (and 4): the whole record
+    start = time.time()
+    result["verdict"] = await run_stage_3(user_id, session_id, fact_sheet, result["evidence"], api_key=api_key)
+    result["timings"]["stage_3"] = time.time() - start
+
+    if tone:
+        start = time.time()
+        result["toolkit"] = await run_stage_4(user_id, session_id, result["verdict"], tone, api_key=api_key)
+        result["timings"]["stage_4"] = time.time() - start
+    return result
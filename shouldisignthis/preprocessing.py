@@ -0,0 +1,303 @@
+"""
+Upload Preprocessing
+
+Slims an uploaded contract before Stage 1 sends it to the Auditor (the
+`preprocessing` config section). Phone photos and scanned PDFs are far larger
+than the model needs to read them, which costs upload time and image tokens.
+
+- Images: orientation fixed (EXIF), converted to grayscale, downscaled so the
+  longest side is at most `max_image_side` (an OCR-adequate resolution that
+  fits Gemini's 768px image tiles), re-encoded as PNG or JPEG, whichever is smaller.
+- PDFs: metadata and embedded font programs removed, oversized page images
+  downscaled the same way, blank and duplicate pages dropped. The stats map each
+  page sent to its page in the upload ("page_map"), so page citations can be
+  translated back.
+
+The slimmed file is only used when it is smaller than the original (or had pages
+dropped), and any failure passes the original through unchanged. The work is
+CPU-bound, so it runs in a small thread pool instead of the event loop.
+The bytes and tokens saved are reported per upload and in the
+`shouldisignthis_upload_*_saved_total` metrics.
+"""
+
+import asyncio
+import concurrent.futures
+import hashlib
+import io
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+from pypdf import PdfReader, PdfWriter
+from pypdf.generic import ContentStream, NameObject
+
+from shouldisignthis.observability.metrics import UPLOAD_BYTES_SAVED, UPLOAD_PREPROCESS_LATENCY, UPLOAD_TOKENS_SAVED
+
+# Gemini bills an image by 768x768 tiles (258 tokens each), or one tile when both sides are at most 384px
+IMAGE_TILE_PIXELS = 768
+SMALL_IMAGE_PIXELS = 384
+TOKENS_PER_TILE = 258
+# and a PDF page as one image
+TOKENS_PER_PDF_PAGE = 258
+
+# Content stream operators that put something on the page: text (also text pypdf cannot extract,
+# e.g. CID or Type3 fonts without a ToUnicode map), images, shadings and painted paths
+_PAINT_OPERATORS = {
+    b"Tj", b"TJ", b"'", b'"',
+    b"Do", b"BI", b"sh", b"S", b"s", b"f", b"F", b"f*", b"B", b"B*", b"b", b"b*",
+}
+_FONT_FILE_KEYS = ("/FontFile", "/FontFile2", "/FontFile3")
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Returns the input tokens of an image of this size."""
+    if width <= SMALL_IMAGE_PIXELS and height <= SMALL_IMAGE_PIXELS:
+        return TOKENS_PER_TILE
+    return math.ceil(width / IMAGE_TILE_PIXELS) * math.ceil(height / IMAGE_TILE_PIXELS) * TOKENS_PER_TILE
+
+
+def _shrink(image: Image.Image, settings: Dict) -> Image.Image:
+    image = ImageOps.exif_transpose(image)
+    if settings["grayscale"] and image.mode != "L":
+        image = image.convert("L")
+    elif image.mode not in ("L", "RGB"):
+        image = image.convert("RGB")
+    if max(image.size) > settings["max_image_side"]:
+        image.thumbnail((settings["max_image_side"], settings["max_image_side"]), Image.Resampling.LANCZOS)
+    return image
+
+
+def slim_image(data: bytes, settings: Dict) -> Tuple[bytes, str, Dict]:
+    """
+    Downscales and re-encodes an image upload.
+
+    Args:
+        data (bytes): The image file.
+        settings (Dict): From get_preprocessing_settings().
+
+    Returns:
+        Tuple[bytes, str, Dict]: (image bytes, MIME type, {"tokens_before", "tokens_after"}).
+    """
+    with Image.open(io.BytesIO(data)) as original:
+        tokens_before = estimate_image_tokens(*original.size)
+        image = _shrink(original, settings)
+    encoded = []
+    for fmt, mime_type, options in (("PNG", "image/png", {"optimize": True}), ("JPEG", "image/jpeg", {"quality": settings["jpeg_quality"], "optimize": True})):
+        buffer = io.BytesIO()
+        image.save(buffer, fmt, **options)
+        encoded.append((len(buffer.getvalue()), buffer.getvalue(), mime_type))
+    _, slimmed, mime_type = min(encoded)
+    return slimmed, mime_type, {"tokens_before": tokens_before, "tokens_after": estimate_image_tokens(*image.size)}
+
+
+def _is_blank(page) -> bool:
+    if (page.extract_text() or "").strip():
+        return False
+    contents = page.get_contents()
+    if contents is None:
+        return True
+    operations = ContentStream(contents, page.pdf).operations
+    return not any(operator in _PAINT_OPERATORS for _, operator in operations)
+
+
+def _page_fingerprint(page) -> str:
+    # Scanned pages share the same content stream ("draw /Im0"), so the images are part of the fingerprint
+    digest = hashlib.sha256()
+    contents = page.get_contents()
+    digest.update(contents.get_data() if contents is not None else b"")
+    xobjects = (page.get("/Resources") or {}).get("/XObject") or {}
+    for name in sorted(xobjects):
+        digest.update(xobjects[name].get_object().get_data())
+    return digest.hexdigest()
+
+
+def _strip_fonts(page) -> None:
+    fonts = (page.get("/Resources") or {}).get("/Font") or {}
+    for font_ref in fonts.values():
+        font = font_ref.get_object()
+        # Type0 fonts keep their descriptor on the descendant font
+        for candidate in [font] + [f.get_object() for f in font.get("/DescendantFonts") or []]:
+            descriptor = candidate.get("/FontDescriptor")
+            if descriptor is None:
+                continue
+            descriptor = descriptor.get_object()
+            for key in _FONT_FILE_KEYS:
+                if key in descriptor:
+                    del descriptor[NameObject(key)]
+
+
+def slim_pdf(data: bytes, settings: Dict) -> Tuple[bytes, Dict]:
+    """
+    Removes what the model does not need from a PDF upload.
+
+    Args:
+        data (bytes): The PDF file.
+        settings (Dict): From get_preprocessing_settings().
+
+    Returns:
+        Tuple[bytes, Dict]: (PDF bytes, {"tokens_before", "tokens_after", "pages", "pages_dropped", "page_map"});
+        page_map[i - 1] is the original number of page i of the slimmed PDF.
+    """
+    reader = PdfReader(io.BytesIO(data))
+    writer = PdfWriter()
+    seen = set()
+    dropped = 0
+    page_map = []
+    for number, page in enumerate(reader.pages, start=1):
+        if settings["drop_blank_pages"] and _is_blank(page):
+            dropped += 1
+            continue
+        if settings["drop_duplicate_pages"]:
+            fingerprint = _page_fingerprint(page)
+            if fingerprint in seen:
+                dropped += 1
+                continue
+            seen.add(fingerprint)
+        writer.add_page(page)
+        page_map.append(number)
+
+    for page in writer.pages:
+        for key in ("/Metadata", "/PieceInfo"):
+            if key in page:
+                del page[NameObject(key)]
+        if settings["strip_pdf_fonts"]:
+            _strip_fonts(page)
+        for image_file in page.images:
+            image = image_file.image
+            if image is not None and max(image.size) > settings["max_image_side"]:
+                image_file.replace(_shrink(image, settings), quality=settings["jpeg_quality"])
+        page.compress_content_streams()
+    writer.compress_identical_objects()
+    writer.metadata = None
+
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    pages = len(reader.pages)
+    return buffer.getvalue(), {
+        "tokens_before": pages * TOKENS_PER_PDF_PAGE,
+        "tokens_after": (pages - dropped) * TOKENS_PER_PDF_PAGE,
+        "pages": pages,
+        "pages_dropped": dropped,
+        "page_map": page_map,
+    }
+
+
+def preprocess_bytes(data: bytes, mime_type: str, settings: Optional[Dict] = None) -> Tuple[bytes, str, Dict]:
+    """
+    Slims an upload (synchronous; see preprocess_upload).
+
+    Args:
+        data (bytes): The uploaded file.
+        mime_type (str): Its MIME type.
+        settings (Optional[Dict], optional): From get_preprocessing_settings(). Defaults to the app config.
+
+    Returns:
+        Tuple[bytes, str, Dict]: (bytes, MIME type, stats) to send to the model. stats holds
+        "bytes_before", "bytes_after", "tokens_before", "tokens_after" and, for PDFs, "pages_dropped"
+        and "page_map" (the original page number of each page sent; see slim_pdf).
+    """
+    settings = settings or _settings()
+    kind = "pdf" if mime_type == "application/pdf" else "image" if mime_type.startswith("image/") else None
+    stats = {"kind": kind, "bytes_before": len(data), "bytes_after": len(data), "tokens_before": None, "tokens_after": None, "pages_dropped": 0}
+    if kind is None or not settings["enabled"]:
+        return data, mime_type, stats
+
+    try:
+        if kind == "pdf":
+            slimmed, slim_stats = slim_pdf(data, settings)
+            slimmed_mime = mime_type
+        else:
+            slimmed, slimmed_mime, slim_stats = slim_image(data, settings)
+    except Exception as e:
+        logging.warning(f"⚠️ Upload preprocessing failed ({type(e).__name__}: {e}); sending the original file")
+        return data, mime_type, stats
+
+    stats.update(slim_stats)
+    if len(slimmed) >= len(data) and not stats["pages_dropped"]:
+        # Nothing gained (e.g. an already small image): keep the file as uploaded
+        stats["tokens_after"] = stats["tokens_before"]
+        stats.pop("page_map", None)
+        return data, mime_type, stats
+    stats["bytes_after"] = len(slimmed)
+    return slimmed, slimmed_mime, stats
+
+
+_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = concurrent.futures.ThreadPoolExecutor(max_workers=_settings()["workers"], thread_name_prefix="preprocess")
+        return _executor
+
+
+async def preprocess_upload(data: bytes, mime_type: str) -> Tuple[bytes, str, Dict]:
+    """
+    Slims an upload in the preprocessing thread pool (see preprocess_bytes).
+
+    Args:
+        data (bytes): The uploaded file.
+        mime_type (str): Its MIME type.
+
+    Returns:
+        Tuple[bytes, str, Dict]: (bytes, MIME type, stats) to send to the model.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    data, mime_type, stats = await loop.run_in_executor(_get_executor(), preprocess_bytes, data, mime_type)
+    if stats["kind"] is None:
+        return data, mime_type, stats
+
+    UPLOAD_PREPROCESS_LATENCY.observe(time.perf_counter() - start, kind=stats["kind"])
+    bytes_saved = stats["bytes_before"] - stats["bytes_after"]
+    tokens_saved = (stats["tokens_before"] or 0) - (stats["tokens_after"] or 0)
+    UPLOAD_BYTES_SAVED.inc(bytes_saved, kind=stats["kind"])
+    UPLOAD_TOKENS_SAVED.inc(tokens_saved, kind=stats["kind"])
+    if bytes_saved or tokens_saved:
+        logging.info(
+            f"🗜️ Upload slimmed: {stats['bytes_before'] / 1024:.0f} KB → {stats['bytes_after'] / 1024:.0f} KB, "
+            f"~{tokens_saved} tokens saved"
+            + (f", {stats['pages_dropped']} blank/duplicate page(s) dropped" if stats["pages_dropped"] else "")
+        )
+    return data, mime_type, stats
+
+
+def get_preprocessing_settings(preprocessing_cfg: Dict) -> Dict:
+    """
+    Reads the upload preprocessing settings from the 'preprocessing' config section (env vars take priority).
+    SHOULDISIGNTHIS_PREPROCESSING=0 sends uploads unchanged.
+
+    Args:
+        preprocessing_cfg (Dict): The 'preprocessing' section of the app config.
+
+    Returns:
+        Dict: {"enabled", "max_image_side", "grayscale", "jpeg_quality", "strip_pdf_fonts",
+        "drop_blank_pages", "drop_duplicate_pages", "workers"}.
+    """
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_PREPROCESSING")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(preprocessing_cfg.get("enabled", True))
+    return {
+        "enabled": enabled,
+        "max_image_side": int(preprocessing_cfg.get("max_image_side", 1536)),
+        "grayscale": bool(preprocessing_cfg.get("grayscale", True)),
+        "jpeg_quality": int(preprocessing_cfg.get("jpeg_quality", 80)),
+        "strip_pdf_fonts": bool(preprocessing_cfg.get("strip_pdf_fonts", True)),
+        "drop_blank_pages": bool(preprocessing_cfg.get("drop_blank_pages", True)),
+        "drop_duplicate_pages": bool(preprocessing_cfg.get("drop_duplicate_pages", True)),
+        "workers": int(preprocessing_cfg.get("workers", 2)),
+    }
+
+
+def _settings() -> Dict:
+    from shouldisignthis.config import APP_CONFIG
+    return get_preprocessing_settings(APP_CONFIG.get("preprocessing", {}) or {})
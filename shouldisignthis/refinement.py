@@ -0,0 +1,115 @@
+"""
+Fact Sheet Refinement
+
+After Stage 1, fact fields the Auditor extracted with a confidence below
+`app_config.extraction_min_confidence` are re-extracted by the Field Extractor
+from a few pages around the page they cite, instead of re-running the whole
+audit. When fewer than `app_config.extraction_min_rate` of the single-value
+fields were found at all, the missing ones are looked for as well (in the whole
+document, in one call). Queries run in parallel and the fact sheet is patched
+in place; a field is only replaced by a confident answer that is at least as
+confident as the one it replaces.
+
+Confidence labels are scored HIGH 0.9, MEDIUM 0.6, LOW 0.3, so the default
+extraction_min_confidence of 0.4 refines the LOW fields.
+"""
+
+import os
+from typing import Dict, List, Optional, Tuple
+
+from shouldisignthis.clause_cache import split_clauses
+
+NOT_FOUND = "NOT FOUND"
+CONFIDENCE_SCORES = {"HIGH": 0.9, "MEDIUM": 0.6, "LOW": 0.3}
+
+
+def confidence_score(fact: Optional[Dict]) -> float:
+    """Returns the score of a fact field's confidence label (0 for a missing field)."""
+    if not is_found(fact):
+        return 0.0
+    return CONFIDENCE_SCORES.get(str(fact.get("confidence", "")).upper(), 0.0)
+
+
+def is_found(fact: Optional[Dict]) -> bool:
+    return isinstance(fact, dict) and fact.get("value") not in (None, "", NOT_FOUND)
+
+
+def fields_to_refine(fact_sheet: Dict, scalar_fields: List[str], min_confidence: float, min_found_rate: float) -> Tuple[List[str], List[str]]:
+    """
+    Picks the fact fields worth a second look.
+
+    Args:
+        fact_sheet (Dict): The Auditor's fact sheet.
+        scalar_fields (List[str]): The single-value fields of the FactSheet schema.
+        min_confidence (float): Fields scored below this are re-extracted.
+        min_found_rate (float): Below this share of found single-value fields, missing ones are looked for too.
+
+    Returns:
+        Tuple[List[str], List[str]]: (clause ids of found fields below min_confidence, missing single-value fields).
+    """
+    low = [clause_id for clause_id, fact in split_clauses(fact_sheet).items() if is_found(fact) and confidence_score(fact) < min_confidence]
+    missing = [field for field in scalar_fields if not is_found(fact_sheet.get(field))]
+    found_rate = 1 - len(missing) / len(scalar_fields) if scalar_fields else 1.0
+    return low, missing if found_rate < min_found_rate else []
+
+
+def page_window(page: Optional[int], pages: int, window: int) -> Tuple[int, int]:
+    """Returns the pages (first, last) within `window` pages of a cited page, clamped to the document."""
+    if not isinstance(page, int) or not 1 <= page <= pages:
+        return 1, pages
+    return max(1, page - window), min(pages, page + window)
+
+
+def apply_refinements(fact_sheet: Dict, refined: Dict[str, Dict], min_confidence: float) -> Tuple[Dict, List[str]]:
+    """
+    Patches the re-extracted fields into the fact sheet.
+
+    Args:
+        fact_sheet (Dict): The Auditor's fact sheet (updated in place).
+        refined (Dict[str, Dict]): Re-extracted fact field per clause id, pages already in document numbering.
+        min_confidence (float): A re-extracted field scored below this is ignored.
+
+    Returns:
+        Tuple[Dict, List[str]]: The fact sheet and the clause ids that were replaced.
+    """
+    improved = []
+    for clause_id, new in refined.items():
+        field, _, index = clause_id.partition("[")
+        current = fact_sheet[field][int(index[:-1])] if index else fact_sheet.get(field)
+        if confidence_score(new) < min_confidence or confidence_score(new) < confidence_score(current):
+            continue
+        fact = {"value": new["value"], "page": new.get("page"), "confidence": new["confidence"]}
+        if index:
+            fact_sheet[field][int(index[:-1])] = fact
+        else:
+            fact_sheet[field] = fact
+        improved.append(clause_id)
+    return fact_sheet, improved
+
+
+def get_refinement_settings(refinement_cfg: Dict, app_cfg: Dict) -> Dict:
+    """
+    Reads the refinement settings from the 'refinement' and 'app_config' config sections (env vars take priority).
+    SHOULDISIGNTHIS_REFINEMENT=0 disables the refinement pass.
+
+    Args:
+        refinement_cfg (Dict): The 'refinement' section of the app config.
+        app_cfg (Dict): The 'app_config' section (extraction_min_confidence, extraction_min_rate).
+
+    Returns:
+        Dict: {"enabled": bool, "min_confidence": float, "min_found_rate": float, "page_window": int,
+        "max_parallel": int, "max_missing_pages": int}.
+    """
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_REFINEMENT")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(refinement_cfg.get("enabled", True))
+    return {
+        "enabled": enabled,
+        "min_confidence": float(app_cfg.get("extraction_min_confidence", 0.4)),
+        "min_found_rate": float(app_cfg.get("extraction_min_rate", 0.5)),
+        "page_window": int(refinement_cfg.get("page_window", 1)),
+        "max_parallel": max(1, int(refinement_cfg.get("max_parallel", 4))),
+        "max_missing_pages": int(refinement_cfg.get("max_missing_pages", 20)),
+    }
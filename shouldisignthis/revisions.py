@@ -0,0 +1,200 @@
+"""
+Incremental Revision Analysis
+
+During a negotiation the same contract comes back several times with small
+redlines. Instead of rerunning every stage on the whole document, a revision
+is analyzed against the previous version's result (see
+orchestrator.run_revision):
+
+1. The new version's text (the PDF's own text layer, no model call) is diffed
+   against the previous version's `full_text`, passage by passage (sentences,
+   normalized like clause_cache.normalize_clause), into changed hunks.
+2. The Auditor reads only the changed passages. Fact sheet fields taken from a
+   removed or rewritten passage are replaced by what it extracts (or marked
+   NOT FOUND); every other field is kept.
+3. The Debate Team reuses the previous findings of every unchanged clause
+   (matched by clause fingerprint) and debates the rest; the Bailiff verifies
+   only the new findings and the ones not tied to a clause.
+4. The Judge (and Drafter) rule on the whole merged record.
+
+A redline that touches more than `revisions.max_changed_ratio` of the passages
+is analyzed in full instead, as are scans without a text layer.
+"""
+
+import difflib
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+from shouldisignthis.clause_cache import GENERAL_CLAUSE, clause_fingerprint, normalize_clause, split_clauses
+
+NOT_FOUND = "NOT FOUND"
+
+# A passage ends at sentence punctuation followed by whitespace
+_PASSAGE_END = re.compile(r"(?<=[.;!?])\s+")
+_LETTER = re.compile(r"[^\W\d_]")
+_TOKEN = re.compile(r"\w+")
+
+
+def split_passages(text: str) -> List[str]:
+    """
+    Splits contract text into passages (roughly sentences), independent of line breaks.
+
+    Args:
+        text (str): The contract text.
+
+    Returns:
+        List[str]: The passages in order; bare clause numbers ("12.") are kept with the passage they number.
+    """
+    passages, prefix = [], ""
+    for piece in _PASSAGE_END.split(" ".join((text or "").split())):
+        if not _LETTER.search(piece):
+            prefix += piece + " "
+            continue
+        passages.append(prefix + piece)
+        prefix = ""
+    if prefix.strip():
+        passages.append(prefix.strip())
+    return passages
+
+
+def diff_versions(old_text: str, new_pages: List[str]) -> Dict:
+    """
+    Diffs the previous version of a contract against the pages of the new one.
+
+    Args:
+        old_text (str): The previous version's text.
+        new_pages (List[str]): The new version's text, page by page.
+
+    Returns:
+        Dict: {"hunks": [{"page", "before", "after"}], "passages": int, "changed_passages": int,
+        "changed_ratio": float}. 'page' is the new version's page the hunk is on.
+    """
+    old = split_passages(old_text)
+    new = [(page, passage) for page, text in enumerate(new_pages, start=1) for passage in split_passages(text)]
+    matcher = difflib.SequenceMatcher(
+        None, [normalize_clause(p) for p in old], [normalize_clause(p) for _, p in new], autojunk=False
+    )
+    hunks, changed = [], 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        changed += max(i2 - i1, j2 - j1)
+        page = new[min(j1, len(new) - 1)][0] if new else 1
+        hunks.append({"page": page, "before": " ".join(old[i1:i2]), "after": " ".join(p for _, p in new[j1:j2])})
+    passages = max(len(old), len(new))
+    return {
+        "hunks": hunks,
+        "passages": passages,
+        "changed_passages": changed,
+        "changed_ratio": changed / passages if passages else 0.0,
+    }
+
+
+def _is_found(fact) -> bool:
+    return isinstance(fact, dict) and fact.get("value") not in (None, "", NOT_FOUND)
+
+
+def _taken_from(value: str, passage: str) -> bool:
+    # Facts are usually quoted, sometimes trimmed ("$150 per hour" from "paid $150 per hour, net 30")
+    value_norm, passage_norm = normalize_clause(value), normalize_clause(passage)
+    if value_norm and value_norm in passage_norm:
+        return True
+    tokens = _TOKEN.findall(value_norm)
+    if len(tokens) < 3:
+        return False
+    passage_tokens = set(_TOKEN.findall(passage_norm))
+    return sum(token in passage_tokens for token in tokens) / len(tokens) >= 0.8
+
+
+def stale_clauses(fact_sheet: Dict, hunks: List[Dict]) -> Set[str]:
+    """
+    Returns the clauses of the previous fact sheet that were taken from a removed or rewritten passage.
+
+    Args:
+        fact_sheet (Dict): The previous version's fact sheet.
+        hunks (List[Dict]): From diff_versions().
+
+    Returns:
+        Set[str]: Clause ids (see clause_cache.split_clauses).
+    """
+    removed = [hunk["before"] for hunk in hunks if hunk["before"]]
+    return {
+        clause_id
+        for clause_id, fact in split_clauses(fact_sheet).items()
+        if _is_found(fact) and any(_taken_from(str(fact["value"]), passage) for passage in removed)
+    }
+
+
+def merge_fact_sheets(previous: Dict, changes: Optional[Dict], stale: Set[str]) -> Dict:
+    """
+    Builds the new version's fact sheet from the previous one and the facts of the changed passages.
+
+    Args:
+        previous (Dict): The previous version's fact sheet.
+        changes (Optional[Dict]): The Auditor's fact sheet of the changed passages.
+        stale (Set[str]): From stale_clauses().
+
+    Returns:
+        Dict: Fields found in the changed passages replace the previous ones; stale fields that were not
+        found again are NOT FOUND; list fields keep their current items and gain the new ones.
+    """
+    changes = changes or {}
+    merged = {}
+    for field in dict.fromkeys([*previous, *changes]):
+        old, new = previous.get(field), changes.get(field)
+        if isinstance(old, list) or isinstance(new, list):
+            kept = [item for index, item in enumerate(old or []) if f"{field}[{index}]" not in stale]
+            merged[field] = kept + [item for item in new or [] if _is_found(item)]
+        elif _is_found(new):
+            merged[field] = new
+        elif field in stale:
+            merged[field] = {**old, "value": NOT_FOUND}
+        elif old is not None or new is not None:
+            merged[field] = old if old is not None else new
+    return merged
+
+
+def format_changes(hunks: List[Dict]) -> str:
+    """Returns the changed passages of the new version, each marked with its page, for the Auditor."""
+    return "\n\n".join(f"[page {hunk['page']}] {hunk['after']}" for hunk in hunks if hunk["after"])
+
+
+def reusable_findings(fact_sheet: Dict, evidence: Dict, namespace: str) -> Tuple[Dict[str, Dict], Dict]:
+    """
+    Groups the previous version's verified findings by clause fingerprint.
+
+    Args:
+        fact_sheet (Dict): The previous version's fact sheet.
+        evidence (Dict): Its verified evidence ({"risks", "counters"}).
+        namespace (str): From clause_cache.analysis_namespace().
+
+    Returns:
+        Tuple[Dict[str, Dict], Dict]: ({"risks", "counters"} per clause fingerprint, {"risks", "counters"}
+        not tied to a known clause, which have to be verified again against the new text).
+    """
+    clauses = split_clauses(fact_sheet)
+    grouped = {clause_id: {"risks": [], "counters": []} for clause_id in clauses}
+    unattributed = {"risks": [], "counters": []}
+    for key in ("risks", "counters"):
+        for finding in evidence.get(key) or []:
+            clause_id = finding.get("clause") if isinstance(finding, dict) else None
+            if clause_id in grouped and clause_id != GENERAL_CLAUSE:
+                grouped[clause_id][key].append(finding)
+            else:
+                unattributed[key].append(finding)
+    findings = {clause_fingerprint(clause_id, clauses[clause_id], namespace): group for clause_id, group in grouped.items()}
+    return findings, unattributed
+
+
+def get_revision_settings(revisions_cfg: Dict) -> Dict:
+    """
+    Reads the revision settings from the 'revisions' config section.
+
+    Args:
+        revisions_cfg (Dict): The 'revisions' section of the app config.
+
+    Returns:
+        Dict: {"max_changed_ratio": float}: above this share of changed passages the revision is analyzed in full.
+    """
+    return {"max_changed_ratio": float(revisions_cfg.get("max_changed_ratio", 0.5))}
+
@@ -0,0 +1,54 @@
+"""
+Streamlit Launcher with Warm-up
+
+Runs the start-up warm-up in this process, then starts the Streamlit server
+on shouldisignthis/app.py. Streamlit executes app.py in the same process, so
+the agents, model clients and caches warmed here are reused by the first
+session. The port only opens once warm-up is done, which is when Cloud Run's
+default (TCP) startup probe starts routing traffic.
+
+Usage:
+    python -m shouldisignthis.serve --server.port=8080 --server.address=0.0.0.0
+"""
+
+import os
+import sys
+
+# Add repo root to path (streamlit imports app.py as a script)
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from shouldisignthis.config import APP_CONFIG, configure_logging
+from shouldisignthis.observability.metrics import get_metrics_settings, start_metrics_server
+from shouldisignthis.warmup import get_warmup_settings, mark_ready, warm_up
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def main(argv=None) -> int:
+    """
+    Warms up, then runs `streamlit run app.py` with the given Streamlit options.
+
+    Args:
+        argv (list, optional): Streamlit CLI options (e.g. ['--server.port=8080']). Defaults to sys.argv[1:].
+
+    Returns:
+        int: The Streamlit exit code.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    configure_logging()
+    if get_metrics_settings(APP_CONFIG.get("metrics", {}) or {})["enabled"]:
+        start_metrics_server()  # /ready answers 503 until warm-up is done
+
+    if get_warmup_settings(APP_CONFIG.get("warmup", {}) or {})["enabled"]:
+        result = warm_up()
+        mark_ready(result["total_seconds"])
+    else:
+        mark_ready()
+
+    from streamlit.web import cli as streamlit_cli
+    sys.argv = ["streamlit", "run", APP_PATH, *argv]
+    return streamlit_cli.main()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -14,3 +14,16 @@ def setup_test_logging():
         log_file_override="tests.log",
         log_level_override=logging.DEBUG
     )
+
+def pytest_terminal_summary(terminalreporter):
+    """Reports model cassette hit/miss stats when a cassette was used."""
+    from shouldisignthis.llm.cassette import get_cassette_stats
+    stats = get_cassette_stats()
+    if not stats:
+        return
+    terminalreporter.section("model cassettes")
+    for path, s in stats.items():
+        terminalreporter.write_line(
+            f"📼 {path} [{s['mode']}]: {s['hits']} hits, {s['misses']} misses, "
+            f"{s['recorded']} recorded, hit rate {s['hit_rate']:.0%}, {s['entries']} entries"
+        )
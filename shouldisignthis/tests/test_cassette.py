@@ -0,0 +1,69 @@
+import os
+import sys
+import uuid
+import pytest
+from google.genai import types
+from google.adk.models.llm_request import LlmRequest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.llm.cassette import Cassette, CassetteLlm, CassetteMissError, get_cassette, request_key
+from shouldisignthis.llm.replay import ReplayLlm
+from shouldisignthis.orchestrator import run_pipeline
+
+SAMPLE_CONTRACT_PATH = os.path.join(os.path.dirname(__file__), "sample_contracts", "sample_contract.pdf")
+
+
+def make_request(text):
+    return LlmRequest(
+        model="gemini-2.0-flash",
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])],
+        config=types.GenerateContentConfig(system_instruction="ROLE: Presiding Judge."),
+    )
+
+
+def test_request_key_ignores_session_ids():
+    a = make_request(f"CASE FILE: {uuid.uuid4()}\nRISKS: []")
+    b = make_request(f"CASE FILE: {uuid.uuid4()}\nRISKS: []")
+    c = make_request(f"CASE FILE: {uuid.uuid4()}\nRISKS: [1]")
+    assert request_key(a) == request_key(b)
+    assert request_key(a) != request_key(c)
+
+
+@pytest.mark.asyncio
+async def test_record_then_replay(tmp_path):
+    path = str(tmp_path / "cassette.json.gz")
+    request = make_request("RISKS: []")
+
+    recorder = CassetteLlm.wrap(ReplayLlm(model="gemini-2.0-flash", latency_scale=0), cassette=Cassette(path, "record"))
+    recorded = [r async for r in recorder.generate_content_async(request)]
+
+    # A fresh cassette loaded from disk serves the same response without calling the inner model
+    player = CassetteLlm.wrap(ReplayLlm(model="gemini-2.0-flash", latency_scale=0), cassette=Cassette(path, "replay"))
+    replayed = [r async for r in player.generate_content_async(request)]
+    assert replayed[0].content == recorded[0].content
+    assert player.cassette.stats == {"hits": 1, "misses": 0, "recorded": 0}
+
+    with pytest.raises(CassetteMissError):
+        [r async for r in player.generate_content_async(make_request("something else"))]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_replays_from_cassette(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setenv("SHOULDISIGNTHIS_CASSETTE_PATH", str(tmp_path / "pipeline.json.gz"))
+    with open(SAMPLE_CONTRACT_PATH, "rb") as f:
+        pdf_bytes = f.read()
+
+    monkeypatch.setenv("SHOULDISIGNTHIS_CASSETTE_MODE", "record")
+    first = await run_pipeline(pdf_bytes, "application/pdf", "cassette_tester", str(uuid.uuid4()))
+
+    monkeypatch.setenv("SHOULDISIGNTHIS_CASSETTE_MODE", "replay")
+    second = await run_pipeline(pdf_bytes, "application/pdf", "cassette_tester", str(uuid.uuid4()))
+
+    cassette = get_cassette(str(tmp_path / "pipeline.json.gz"), "replay")
+    assert cassette.stats["misses"] == 0
+    assert cassette.stats["hits"] > 0
+    assert second["verdict"] == first["verdict"]
@@ -0,0 +1,169 @@
+import asyncio
+import os
+import sys
+
+import httpx
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from shouldisignthis.llm.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitBreakerLlm
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class StatusLlm(BaseLlm):
+    """Answers with its model name, or raises the HTTP `status` when set."""
+
+    status: int = 0
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        if self.status:
+            response = httpx.Response(self.status, request=httpx.Request("POST", "https://example.invalid"))
+            errors.APIError.raise_error(self.status, {"error": {"code": self.status, "message": "failed"}}, response)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=self.model)]), model_version=self.model)
+
+
+async def _call(llm) -> LlmResponse:
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="Judge this.")])])
+    return [r async for r in llm.generate_content_async(request)][-1]
+
+
+def test_breaker_trips_probes_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test-tier", window=10, min_calls=4, failure_rate=0.5, open_seconds=30, half_open_calls=2, clock=clock)
+
+    for failed in (False, True, False):
+        breaker.record(failed=failed, latency=1.0)
+    assert breaker.state == CLOSED  # Below min_calls
+    breaker.record(failed=True, latency=1.0)
+    assert breaker.state == OPEN  # 2 of 4 failed
+    assert not breaker.allow_request()
+
+    clock.now += 31
+    assert breaker.allow_request() and breaker.allow_request()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow_request()  # Only two trial calls
+    breaker.record(failed=True, latency=1.0)
+    assert breaker.state == OPEN  # A failed trial reopens
+
+    clock.now += 31
+    assert breaker.allow_request() and breaker.allow_request()
+    breaker.record(failed=False, latency=1.0)
+    breaker.record(failed=False, latency=1.0)
+    assert breaker.state == CLOSED
+
+
+def test_breaker_trips_on_slow_calls():
+    breaker = CircuitBreaker("test-tier", window=4, min_calls=4, slow_call_seconds=10, slow_call_rate=0.75)
+    for latency in (12, 15, 3, 11):
+        breaker.record(failed=False, latency=latency)
+    assert breaker.state == OPEN
+
+
+def test_failing_primary_is_answered_by_fallback_then_skipped():
+    primary = StatusLlm(model="gemini-pro-test", status=503)
+    fallback = StatusLlm(model="gemini-flash-test")
+    llm = CircuitBreakerLlm.wrap(primary, fallback=fallback, breaker=CircuitBreaker("test-judge", window=4, min_calls=2))
+
+    response = asyncio.run(_call(llm))
+    assert response.content.parts[0].text == "gemini-flash-test"
+    assert response.custom_metadata["fallback_for"] == "gemini-pro-test"
+
+    asyncio.run(_call(llm))
+    assert llm.breaker.state == OPEN
+    asyncio.run(_call(llm))
+    assert primary.calls == 2  # Open: the primary is not called any more
+    assert fallback.calls == 3
+
+
+def test_client_errors_do_not_fall_back():
+    primary = StatusLlm(model="gemini-pro-test", status=400)
+    llm = CircuitBreakerLlm.wrap(primary, fallback=StatusLlm(model="gemini-flash-test"), breaker=CircuitBreaker("test-judge"))
+    try:
+        asyncio.run(_call(llm))
+        raise AssertionError("expected ClientError")
+    except errors.ClientError:
+        pass
+    assert llm.fallback.calls == 0
+
+
+class HangingLlm(BaseLlm):
+    """Never answers (a call cancelled by a stage deadline)."""
+
+    async def generate_content_async(self, llm_request, stream=False):
+        await asyncio.sleep(60)
+        yield LlmResponse()
+
+
+def test_cancelled_half_open_trial_frees_its_slot():
+    clock = FakeClock()
+    breaker = CircuitBreaker("test-judge", min_calls=1, open_seconds=30, half_open_calls=1, clock=clock)
+    breaker.record(failed=True, latency=1.0)
+    clock.now += 31
+    llm = CircuitBreakerLlm.wrap(HangingLlm(model="gemini-pro-test"), fallback=StatusLlm(model="gemini-flash-test"), breaker=breaker)
+
+    async def cancelled_trial():
+        task = asyncio.create_task(_call(llm))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(cancelled_trial())
+    assert breaker.state == HALF_OPEN
+    # The slot is free again: the next call is a trial, and its success closes the breaker
+    assert breaker.allow_request()
+    breaker.record(failed=False, latency=1.0)
+    assert breaker.state == CLOSED
+
+
+class EditingLlm(StatusLlm):
+    """Edits the request in place (as the Gemini model does) before failing."""
+
+    async def generate_content_async(self, llm_request, stream=False):
+        llm_request.contents[0].parts = [types.Part(text="edited")]
+        async for response in super().generate_content_async(llm_request, stream):
+            yield response
+
+
+class EchoLlm(BaseLlm):
+    """Answers with the request it got."""
+
+    seen: list = []
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.seen.append(llm_request)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="ok")]))
+
+
+def test_fallback_gets_the_original_request_sharing_its_files():
+    pdf = b"%PDF-1.7 " + b"x" * 1024
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part.from_bytes(data=pdf, mime_type="application/pdf"), types.Part(text="Audit this.")])])
+    fallback = EchoLlm(model="gemini-flash-test", seen=[])
+    llm = CircuitBreakerLlm.wrap(EditingLlm(model="gemini-pro-test", status=503), fallback=fallback, breaker=CircuitBreaker("test-auditor"))
+
+    asyncio.run(_drain(llm, request))
+
+    parts = fallback.seen[0].contents[0].parts
+    assert parts[1].text == "Audit this."
+    assert parts[0].inline_data.data is pdf
+
+
+async def _drain(llm, request):
+    return [r async for r in llm.generate_content_async(request)]
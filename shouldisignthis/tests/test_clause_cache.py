@@ -0,0 +1,87 @@
+import asyncio
+import json
+import os
+import sys
+import types as pytypes
+import uuid
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import orchestrator
+from shouldisignthis.clause_cache import ClauseCache, attribute_findings, clause_fingerprint, normalize_clause
+from shouldisignthis.observability.metrics import cache_hit_ratio
+
+INDEMNITY = {"value": "12.1 The Consultant shall indemnify the Client against all claims.", "page": 3, "confidence": "HIGH"}
+GOVERNING_LAW = {"value": "This Agreement is governed by the laws of Delaware.", "page": 4, "confidence": "HIGH"}
+
+
+def test_normalization_ignores_layout_not_terms():
+    assert normalize_clause("12.1  The Consultant’s  fee is $500.") == normalize_clause("the consultant's fee is $500")
+    assert normalize_clause("(a) Payment within 30 days;") == "payment within 30 days"
+    fact = {"value": "Payment within 30 days"}
+    assert clause_fingerprint("payment_terms", fact, "m:v1") != clause_fingerprint("payment_terms", {"value": "Payment within 90 days"}, "m:v1")
+    assert clause_fingerprint("financial_terms[0]", fact, "m:v1") == clause_fingerprint("financial_terms[3]", fact, "m:v1")
+
+
+def test_untagged_findings_are_not_attributed():
+    risks = [{"risk": "Uncapped indemnity", "clause": "key_obligations[0]"}, {"risk": "No cap", "clause": "general"}]
+    grouped = attribute_findings(risks, [], ["key_obligations[0]", "dispute_resolution"])
+    assert grouped["key_obligations[0]"]["risks"] == risks[:1]
+    assert grouped["dispute_resolution"] == {"risks": [], "counters": []}
+    assert grouped["general"]["risks"] == risks[1:]
+    assert attribute_findings([{"risk": "Vague"}], [], ["dispute_resolution"]) is None
+
+
+def test_stage_2_debates_only_new_clauses(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE_PATH", str(tmp_path / "clauses.db"))
+    debated = []
+
+    async def fake_run_agent(agent_factory, app_name, user_id, session_id, message, initial_state=None, **kwargs):
+        sheet = initial_state["auditor_output"]
+        debated.append(sorted(sheet))
+        risks = [{"risk": f"Risk in {clause_id}", "severity": "HIGH", "page": fact["page"], "clause": clause_id} for clause_id, fact in sheet.items()]
+        risks.append({"risk": f"No termination right ({len(debated)})", "severity": "MEDIUM", "clause": "general"})
+        counters = [{"topic": clause_id, "counter": "Standard.", "clause": clause_id} for clause_id in sheet]
+        state = {"skeptic_risks": json.dumps({"risks": risks}), "advocate_defense": json.dumps({"counters": counters})}
+        return pytypes.SimpleNamespace(state=state)
+
+    monkeypatch.setattr(orchestrator, "_run_agent", fake_run_agent)
+
+    def stage_2(fact_sheet):
+        return asyncio.run(orchestrator.run_stage_2("clause_tester", str(uuid.uuid4()), fact_sheet))[0]
+
+    stage_2({"parties": {"value": "Acme / Bob", "page": 1, "confidence": "HIGH"}, "key_obligations": [INDEMNITY], "dispute_resolution": GOVERNING_LAW})
+    # Same template, new parties; the indemnity clause moved to page 5
+    state = stage_2({"parties": {"value": "Acme / Carol", "page": 1, "confidence": "HIGH"}, "key_obligations": [{**INDEMNITY, "page": 5}], "dispute_resolution": GOVERNING_LAW})
+
+    assert debated == [["dispute_resolution", "key_obligations[0]", "parties"], ["parties"]]
+    assert state["clause_cache"] == {"hits": 2, "misses": 1}
+    risks = {risk["clause"]: risk for risk in orchestrator.parse_json(state["skeptic_risks"])["risks"]}
+    assert sorted(risks) == ["dispute_resolution", "general", "key_obligations[0]", "parties"]
+    assert risks["key_obligations[0]"]["page"] == 5
+    assert len(orchestrator.parse_json(state["advocate_defense"])["counters"]) == 3
+    assert cache_hit_ratio("clause") is not None
+
+    # Nothing new: the Debate Team is not called at all, and the sheet's general findings come back too
+    again = stage_2({"parties": {"value": "Acme / Carol", "page": 1, "confidence": "HIGH"}, "key_obligations": [{**INDEMNITY, "page": 5}], "dispute_resolution": GOVERNING_LAW})
+    assert len(debated) == 2 and again["clause_cache"] == {"hits": 3, "misses": 0}
+    texts = lambda result: sorted(risk["risk"] for risk in orchestrator.parse_json(result["skeptic_risks"])["risks"])
+    assert texts(again) == texts(state) and "No termination right (2)" in texts(again)
+
+    # Every clause seen before, but never this sheet: one general pass, clause findings from the cache
+    state = stage_2({"dispute_resolution": GOVERNING_LAW})
+    assert debated[-1] == ["dispute_resolution"] and state["clause_cache"] == {"hits": 1, "misses": 0}
+    assert texts(state) == ["No termination right (3)", "Risk in dispute_resolution"]
+    state = stage_2({"dispute_resolution": GOVERNING_LAW})
+    assert len(debated) == 3 and len(orchestrator.parse_json(state["skeptic_risks"])["risks"]) == 2
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    cache = ClauseCache(str(tmp_path / "clauses.db"), max_age_days=1)
+    cache.put_many({"fp": ("liability_cap", {"risks": [], "counters": []})})
+    assert "fp" in cache.get_many(["fp"])
+    cache.max_age_seconds = -1
+    assert cache.get_many(["fp"]) == {}
+    assert cache.stats() == {"entries": 1, "hits": 1}
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import sys
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.llm.clients import ClientRegistry, PooledGemini
+
+
+def test_registry_shares_per_key_and_loop():
+    registry = ClientRegistry(max_keys=2)
+    built = []
+
+    def build():
+        built.append(object())
+        return built[-1]
+
+    assert registry.get("key-a", build) is registry.get("key-a", build)
+    assert registry.get("key-b", build) is not registry.get("key-a", build)
+
+    async def in_loop():
+        # All models in one event loop share a client; a new loop gets its own
+        return registry.get("key-a", build), registry.get("key-a", build)
+
+    first, second = asyncio.run(in_loop())
+    assert first is second
+    assert first is not registry.get("key-a", build)
+    assert len(built) == 3
+
+
+def test_registry_evicts_least_recently_used_key():
+    registry = ClientRegistry(max_keys=2)
+    a = registry.get("key-a", object)
+    registry.get("key-b", object)
+    registry.get("key-a", object)  # key-b is now least recently used
+    registry.get("key-c", object)
+    assert registry.stats()["keys"] == 2
+    assert registry.stats()["evicted"] == 1
+    assert registry.get("key-a", object) is a
+
+
+def test_pooled_gemini_uses_its_api_key_and_shares_client():
+    model_a = PooledGemini(model="gemini-2.0-flash", api_key="test-key-1")
+    model_b = PooledGemini(model="gemini-2.5-pro", api_key="test-key-1")
+    model_c = PooledGemini(model="gemini-2.0-flash", api_key="test-key-2")
+
+    assert model_a.api_client is model_b.api_client
+    assert model_a.api_client is not model_c.api_client
+    assert model_c.api_client._api_client.api_key == "test-key-2"
+    assert "test-key-1" not in repr(model_a)
@@ -0,0 +1,99 @@
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from google.adk.agents import LlmAgent, ParallelAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from shouldisignthis import orchestrator
+from shouldisignthis.config import app_cfg
+from shouldisignthis.deadlines import StageTimeoutError, pipeline_deadline, stage_budget
+from shouldisignthis.observability.metrics import STAGE_TIMEOUTS
+
+
+class ScriptedLlm(BaseLlm):
+    """Answers with fixed text after a delay; records whether it was cancelled."""
+
+    text: str = "{}"
+    delay: float = 0.0
+    cancelled: bool = False
+
+    async def generate_content_async(self, llm_request, stream=False):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=self.text)]))
+
+
+@pytest.fixture
+def short_timeouts(monkeypatch):
+    monkeypatch.setitem(app_cfg["stage_timeouts"], "Citation_Loop", 0.3)
+    monkeypatch.setitem(app_cfg["stage_timeouts"], "Debate_Team", 0.3)
+
+
+def test_stage_budget_respects_pipeline_deadline():
+    stage, _ = stage_budget("Judge")
+    assert stage == app_cfg["stage_timeouts"]["Judge"]
+
+    with pipeline_deadline(10):
+        budget, deadline = stage_budget("Judge")
+        assert deadline == "pipeline" and 9 < budget <= 10
+        # Degradable stages leave time for the Judge
+        budget, _ = stage_budget("Citation_Loop", reserve_seconds=8)
+        assert budget <= 2
+        with pipeline_deadline(1000):  # Nested deadlines keep the earliest
+            assert stage_budget("Judge")[0] <= 10
+    assert stage_budget("Judge") == (stage, "stage")
+
+
+@pytest.mark.asyncio
+async def test_bailiff_timeout_falls_back_to_unverified_evidence(monkeypatch, short_timeouts):
+    slow = ScriptedLlm(model="slow", delay=30)
+    monkeypatch.setattr(orchestrator, "get_citation_loop", lambda api_key=None: LlmAgent(name="Citation_Loop", model=slow, output_key="bailiff_verdict"))
+    before = STAGE_TIMEOUTS.get(stage="Citation_Loop", deadline="stage")
+
+    start = time.monotonic()
+    risks, counters = [{"id": "R1"}], [{"id": "C1"}]
+    evidence = await orchestrator.run_stage_2_5("deadline_tester", str(uuid.uuid4()), risks, counters, "Full text.")
+
+    assert time.monotonic() - start < 5
+    assert evidence == {"risks": risks, "counters": counters, "unverified": True}
+    assert slow.cancelled  # The in-flight model call was cancelled, not left running
+    assert STAGE_TIMEOUTS.get(stage="Citation_Loop", deadline="stage") == before + 1
+
+
+@pytest.mark.asyncio
+async def test_debate_timeout_continues_without_advocate(monkeypatch, short_timeouts):
+    def debate_team(api_key=None):
+        return ParallelAgent(name="Debate_Team", sub_agents=[
+            LlmAgent(name="Skeptic", model=ScriptedLlm(model="fast", text='{"risks": [{"id": "R1"}]}'), output_key="skeptic_risks"),
+            LlmAgent(name="Advocate", model=ScriptedLlm(model="slow", delay=30), output_key="advocate_defense"),
+        ])
+
+    monkeypatch.setattr(orchestrator, "get_debate_team", debate_team)
+    state, _ = await orchestrator.run_stage_2("deadline_tester", str(uuid.uuid4()), {"parties": []})
+
+    assert orchestrator.parse_json(state["skeptic_risks"])["risks"] == [{"id": "R1"}]
+    assert not state.get("advocate_defense")
+    assert state["timed_out"] == ["Advocate"]
+
+
+@pytest.mark.asyncio
+async def test_debate_timeout_without_skeptic_fails(monkeypatch, short_timeouts):
+    monkeypatch.setattr(orchestrator, "get_debate_team", lambda api_key=None: ParallelAgent(name="Debate_Team", sub_agents=[
+        LlmAgent(name="Skeptic", model=ScriptedLlm(model="slow", delay=30), output_key="skeptic_risks"),
+    ]))
+    with pytest.raises(StageTimeoutError) as error:
+        await orchestrator.run_stage_2("deadline_tester", str(uuid.uuid4()), {"parties": []})
+    assert error.value.stage == "Debate_Team"
@@ -0,0 +1,100 @@
+import asyncio
+import os
+import sys
+from typing import List
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+from shouldisignthis.llm.hedging import HedgedLlm, HedgePolicy
+from shouldisignthis.observability.metrics import HEDGE_CALLS
+
+
+class SequencedLlm(BaseLlm):
+    """Answers call N after delays[N] seconds (raises instead for calls in `failures`); counts cancellations."""
+
+    delays: List[float] = []
+    failures: List[int] = []
+    calls: int = 0
+    cancelled: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        number = self.calls
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delays[number % len(self.delays)])
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if number in self.failures:
+            raise RuntimeError(f"call {number} failed")
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text=f"call {number}")]))
+
+
+def _request() -> LlmRequest:
+    return LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="Analyze.")])])
+
+
+async def _call(llm: HedgedLlm) -> str:
+    return [r async for r in llm.generate_content_async(_request())][0].content.parts[0].text
+
+
+def _policy(**kwargs) -> HedgePolicy:
+    settings = {"initial_delay_seconds": 0.05, "max_hedge_rate": 1.0, "control_rate": 0.0}
+    return HedgePolicy("hedge-test", **{**settings, **kwargs})
+
+
+def test_slow_call_is_hedged_and_loser_cancelled():
+    inner = SequencedLlm(model="hedge-test", delays=[5.0, 0.01])
+    llm = HedgedLlm.wrap(inner, policy=_policy())
+    before = HEDGE_CALLS.get(model="hedge-test", outcome="hedge_won")
+
+    assert asyncio.run(_call(llm)) == "call 1"
+    assert inner.calls == 2
+    assert inner.cancelled == 1
+    assert HEDGE_CALLS.get(model="hedge-test", outcome="hedge_won") == before + 1
+
+
+def test_fast_call_and_control_group_are_not_hedged():
+    inner = SequencedLlm(model="hedge-test", delays=[0.0])
+    assert asyncio.run(_call(HedgedLlm.wrap(inner, policy=_policy()))) == "call 0"
+    assert inner.calls == 1
+
+    slow = SequencedLlm(model="hedge-test", delays=[0.2])
+    control = HedgedLlm.wrap(slow, policy=_policy(control_rate=1.0))
+    assert asyncio.run(_call(control)) == "call 0"
+    assert slow.calls == 1
+
+
+def test_failure_waits_for_the_other_request():
+    # The first request fails after the hedge was sent: the hedge's answer is used
+    inner = SequencedLlm(model="hedge-test", delays=[0.1, 0.2], failures=[0])
+    assert asyncio.run(_call(HedgedLlm.wrap(inner, policy=_policy()))) == "call 1"
+
+    # Failing before the delay raises without hedging
+    broken = SequencedLlm(model="hedge-test", delays=[0.0], failures=[0])
+    with pytest.raises(RuntimeError):
+        asyncio.run(_call(HedgedLlm.wrap(broken, policy=_policy(initial_delay_seconds=1.0))))
+    assert broken.calls == 1
+
+
+def test_policy_delay_and_budget():
+    policy = HedgePolicy("hedge-test", percentile=0.9, min_samples=10, initial_delay_seconds=8.0, min_delay_seconds=0.1, max_hedge_rate=0.2)
+    assert policy.delay() == 8.0  # Not enough samples yet
+    for latency in range(1, 11):
+        policy.record(latency / 10, hedged=False)
+    assert policy.delay() == pytest.approx(0.9)
+
+    # Hedges are capped at 20% of recent calls
+    assert policy.allow_hedge()
+    policy.record(1.0, hedged=True)
+    policy.record(1.0, hedged=True)
+    policy.record(1.0, hedged=True)
+    assert not policy.allow_hedge()
@@ -0,0 +1,161 @@
+import asyncio
+import io
+import os
+import sys
+import types
+import uuid
+
+import pytest
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import orchestrator
+from shouldisignthis.deadlines import StageTimeoutError
+from shouldisignthis.ingestion import SpooledUpload, UploadTooLargeError, spool_upload
+
+
+def _pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(1, pages + 1):
+        pdf.drawString(72, 720, f"Section {page}. The parties agree to term {page}.")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_spooled_pdf_is_read_in_page_batches():
+    data = _pdf(7)
+    with spool_upload(io.BytesIO(data), "application/pdf", max_bytes=len(data)) as upload:
+        assert upload.size == len(data) and upload.page_count() == 7
+        batches = list(upload.iter_page_batches(3))
+
+    assert [(first, last) for first, last, _ in batches] == [(1, 3), (4, 6), (7, 7)]
+    last_batch = PdfReader(io.BytesIO(batches[-1][2]))
+    assert len(last_batch.pages) == 1
+    assert "Section 7." in last_batch.pages[0].extract_text()
+
+
+def test_upload_over_the_limit_is_rejected():
+    with pytest.raises(UploadTooLargeError):
+        spool_upload(b"x" * 4096, "application/pdf", max_bytes=1024)
+
+
+def test_batch_outputs_are_merged_with_document_page_numbers():
+    first = {
+        "is_contract": True, "is_safe": True, "full_text": "Pages one to three.",
+        "fact_sheet": {
+            "parties": {"value": "Acme / Bob", "page": 1, "confidence": "HIGH"},
+            "liability_cap": {"value": "NOT FOUND", "page": 1, "confidence": "LOW"},
+            "payment_terms": {"value": "Net 60", "page": 2, "confidence": "LOW"},
+            "financial_terms": [{"value": "$100/hr", "page": 2, "confidence": "HIGH"}],
+        },
+    }
+    second = {
+        "is_contract": True, "is_safe": True, "full_text": "Exhibit A.",
+        "fact_sheet": {
+            "parties": {"value": "Acme", "page": 1, "confidence": "MEDIUM"},
+            "liability_cap": {"value": "$1M", "page": 2, "confidence": "MEDIUM"},
+            "payment_terms": {"value": "Net 30", "page": 1, "confidence": "HIGH"},
+            "financial_terms": [{"value": "Late fee 2%", "page": 3, "confidence": "HIGH"}],
+        },
+    }
+    merged = orchestrator._merge_auditor_batches([(1, first), (4, second)])
+    facts = merged["fact_sheet"]
+
+    assert merged["full_text"] == "Pages one to three.\n\nExhibit A."
+    assert facts["parties"]["value"] == "Acme / Bob"
+    assert (facts["liability_cap"]["value"], facts["liability_cap"]["page"]) == ("$1M", 5)
+    assert (facts["payment_terms"]["value"], facts["payment_terms"]["page"]) == ("Net 30", 4)
+    assert [(item["value"], item["page"]) for item in facts["financial_terms"]] == [("$100/hr", 2), ("Late fee 2%", 6)]
+
+
+def test_long_pdf_is_audited_in_batches(monkeypatch):
+    calls = []
+
+    async def fake_audit_file(file_bytes, mime_type, prompt, user_id, session_id, api_key):
+        pages = len(PdfReader(io.BytesIO(file_bytes)).pages)
+        calls.append(pages)
+        out = {"is_contract": True, "is_safe": True, "full_text": f"{pages} pages", "fact_sheet": {}}
+        return out, {"bytes_before": len(file_bytes), "bytes_after": len(file_bytes), "tokens_before": 258 * pages, "tokens_after": 258 * pages}
+
+    monkeypatch.setattr(orchestrator, "_audit_file", fake_audit_file)
+    monkeypatch.setitem(orchestrator.APP_CONFIG, "ingestion", {"pages_per_batch": 4})
+
+    result = asyncio.run(orchestrator.run_stage_1(SpooledUpload.from_bytes(_pdf(10), "application/pdf"), "application/pdf", "ingest_tester", str(uuid.uuid4())))
+
+    assert calls == [4, 4, 2]
+    assert result["upload"]["batches"] == 3 and result["upload"]["pages"] == 10
+    assert result["full_text"] == "4 pages\n\n4 pages\n\n2 pages"
+
+
+def test_short_pdf_over_the_batch_size_is_split_by_bytes(monkeypatch):
+    calls = []
+
+    async def fake_audit_file(file_bytes, mime_type, prompt, user_id, session_id, api_key):
+        calls.append((len(PdfReader(io.BytesIO(file_bytes)).pages), len(file_bytes)))
+        return {"is_contract": True, "is_safe": True, "full_text": "text", "fact_sheet": {}}, {}
+
+    data = _pdf(6)
+    limit = len(data) * 2 // 3
+    monkeypatch.setattr(orchestrator, "_audit_file", fake_audit_file)
+    monkeypatch.setitem(orchestrator.APP_CONFIG, "ingestion", {"pages_per_batch": 20, "max_batch_mb": limit / (1024 * 1024)})
+
+    result = asyncio.run(orchestrator.run_stage_1(data, "application/pdf", "ingest_tester", str(uuid.uuid4())))
+
+    # Six pages fit the page cap, but not the byte cap: the PDF is halved
+    assert [pages for pages, _ in calls] == [3, 3]
+    assert all(size <= limit for _, size in calls)
+    assert result["upload"]["batches"] == 2 and result["upload"]["pages"] == 6
+
+
+def test_batch_that_times_out_is_left_out(monkeypatch):
+    running, peak = [0], [0]
+
+    async def fake_audit_file(file_bytes, mime_type, prompt, user_id, session_id, api_key):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.01)
+        running[0] -= 1
+        if "pages 5-6" in prompt:
+            raise StageTimeoutError("Auditor", 120)
+        pages = len(PdfReader(io.BytesIO(file_bytes)).pages)
+        return {"is_contract": True, "is_safe": True, "full_text": f"{pages} pages", "fact_sheet": {}}, {}
+
+    monkeypatch.setattr(orchestrator, "_audit_file", fake_audit_file)
+    monkeypatch.setitem(orchestrator.APP_CONFIG, "ingestion", {"pages_per_batch": 2, "max_parallel_batches": 2})
+
+    result = asyncio.run(orchestrator.run_stage_1(_pdf(9), "application/pdf", "ingest_tester", str(uuid.uuid4())))
+
+    assert result["timed_out_pages"] == [[5, 6]]
+    assert result["upload"]["batches"] == 4
+    assert result["full_text"] == "2 pages\n\n2 pages\n\n2 pages\n\n1 pages"
+    assert peak[0] == 2
+
+
+def test_citations_point_at_uploaded_pages_after_pages_are_dropped(monkeypatch):
+    # Page 2 is blank and page 4 repeats page 3: the Auditor sees 3 pages
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for text in ("1. Rent is due monthly.", None, "2. Deposit is refundable.", "2. Deposit is refundable.", "3. Governed by Ohio law."):
+        if text:
+            pdf.drawString(72, 720, text)
+        pdf.showPage()
+    pdf.save()
+
+    async def fake_run_agent(agent_factory, app_name, user_id, session_id, message, **kwargs):
+        sent = PdfReader(io.BytesIO(message.parts[0].inline_data.data))
+        assert len(sent.pages) == 3
+        facts = {"governing_law": {"value": "Ohio", "page": 3, "confidence": "HIGH"}, "financial_terms": [{"value": "Deposit", "page": 2, "confidence": "HIGH"}]}
+        return types.SimpleNamespace(state={"auditor_output": {"is_contract": True, "is_safe": True, "full_text": "", "fact_sheet": facts}})
+
+    monkeypatch.setattr(orchestrator, "_run_agent", fake_run_agent)
+    result = asyncio.run(orchestrator.run_stage_1(buffer.getvalue(), "application/pdf", "ingest_tester", str(uuid.uuid4())))
+
+    assert result["fact_sheet"]["governing_law"]["page"] == 5
+    assert result["fact_sheet"]["financial_terms"][0]["page"] == 3
+    assert "page_map" not in result["upload"]
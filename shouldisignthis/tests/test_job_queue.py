@@ -0,0 +1,98 @@
+import logging
+import os
+import sys
+import threading
+import time
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import worker
+from shouldisignthis.job_queue import JobQueue, QUEUED, RUNNING, DONE, FAILED
+from shouldisignthis.worker import process_job
+
+
+def test_enqueue_claim_complete(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.enqueue(b"%PDF-1.4 test", "application/pdf", "test.pdf", options={"tone": "Professional"})
+
+    job = queue.claim("worker-1", lease_seconds=60)
+    assert job["id"] == job_id
+    assert job["payload"] == b"%PDF-1.4 test"
+    assert job["options"] == {"tone": "Professional"}
+    assert queue.claim("worker-2") is None  # Leased, not claimable
+
+    assert queue.heartbeat(job_id, "worker-1", lease_seconds=60)
+    assert queue.complete(job_id, "worker-1", {"status": "COMPLETE"})
+
+    record = queue.get(job_id)
+    assert record["status"] == DONE
+    assert record["result"] == {"status": "COMPLETE"}
+    assert queue.stats() == {QUEUED: 0, RUNNING: 0, DONE: 1, FAILED: 0}
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.enqueue(b"data", "application/pdf", max_attempts=3)
+
+    queue.claim("dead-worker", lease_seconds=0.05)
+    time.sleep(0.1)
+
+    job = queue.claim("worker-2", lease_seconds=60)
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+    # The dead worker can no longer touch the job
+    assert not queue.heartbeat(job_id, "dead-worker")
+    assert not queue.complete(job_id, "dead-worker", {})
+
+
+def test_fail_requeues_until_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.enqueue(b"data", "application/pdf", max_attempts=2)
+
+    queue.claim("w")
+    queue.fail(job_id, "w", "boom")
+    assert queue.get(job_id)["status"] == QUEUED
+
+    queue.claim("w")
+    queue.fail(job_id, "w", "boom again")
+    record = queue.get(job_id)
+    assert record["status"] == FAILED
+    assert record["error"] == "boom again"
+
+
+def test_job_finished_after_losing_its_lease_is_not_reported_done(tmp_path, caplog):
+    queue = JobQueue(str(tmp_path / "jobs.db"))
+    job_id = queue.enqueue(b"data", "application/pdf", max_attempts=3)
+    job = queue.claim("slow-worker", lease_seconds=0.05)
+
+    async def slow_pipeline(payload, mime_type, user_id, session_id, api_key=None, tone=None):
+        time.sleep(0.1)
+        # Meanwhile the lease expired and another worker took the job
+        queue.claim("worker-2", lease_seconds=60)
+        return {"status": "COMPLETE"}
+
+    with caplog.at_level(logging.INFO):
+        assert not process_job(queue, job, "slow-worker", slow_pipeline)
+    assert "Lost lease on job" in caplog.text and "done in" not in caplog.text
+    assert queue.get(job_id)["status"] == RUNNING
+
+
+def test_pool_is_ready_only_after_a_worker_warmed_up(monkeypatch):
+    class FakeProcess:
+        def __init__(self, alive):
+            self.alive = alive
+
+        def is_alive(self):
+            return self.alive
+
+    marked = []
+    monkeypatch.setattr(worker, "mark_ready", marked.append)
+    ready_event = threading.Event()
+    threading.Timer(0.05, ready_event.set).start()
+    assert worker._await_first_warmup(ready_event, [FakeProcess(True)], time.perf_counter(), poll_seconds=0.01)
+    assert len(marked) == 1 and marked[0] >= 0.05
+
+    # Every worker died during warm-up: never ready
+    assert not worker._await_first_warmup(threading.Event(), [FakeProcess(False)], time.perf_counter(), poll_seconds=0.01)
+    assert len(marked) == 1
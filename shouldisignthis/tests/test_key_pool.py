@@ -0,0 +1,107 @@
+import asyncio
+import os
+import sys
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+import httpx
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from shouldisignthis.llm.key_pool import KeyPool, KeyPoolLlm, get_key_pool_settings, key_label
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeKeyModel(BaseLlm):
+    """Answers with a fixed usage, or raises a 429 when throttled."""
+
+    throttled: bool = False
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        if self.throttled:
+            response = httpx.Response(429, headers={"retry-after": "7"}, request=httpx.Request("POST", "https://example.invalid"))
+            raise errors.ClientError(429, {"error": {"code": 429, "message": "quota", "status": "RESOURCE_EXHAUSTED"}}, response)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text="ok")]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(total_token_count=100),
+        )
+
+
+def test_pool_picks_key_with_most_headroom_and_waits_at_quota():
+    clock = FakeClock()
+    pool = KeyPool("test-model", ["key-a", "key-b"], rpm=2, tpm=10_000, clock=clock)
+
+    first, _ = pool.try_reserve(10)
+    second, _ = pool.try_reserve(10)
+    assert first is not second  # Spread across keys
+    pool.try_reserve(10)
+    pool.try_reserve(10)
+    assert pool.try_reserve(10) is None  # 2 keys x 2 RPM used up
+    assert 59 < pool.wait_time() <= 60
+
+    clock.now += 61
+    assert pool.try_reserve(10) is not None
+    assert sorted(row["requests"] for row in pool.utilization()) == [2, 3]
+
+
+def test_throttled_key_cools_down():
+    clock = FakeClock()
+    pool = KeyPool("test-model", ["key-a", "key-b"], rpm=100, tpm=1_000_000, cooldown_seconds=10, clock=clock)
+    state_a = pool.states[0]
+
+    assert pool.report_throttled(state_a) == 10
+    assert pool.report_throttled(state_a) == 20  # Doubles on repeats
+    assert pool.report_throttled(state_a, retry_after=3) == 3  # Retry-After wins
+    for _ in range(5):
+        state, _ = pool.try_reserve(10)
+        assert state is pool.states[1]
+
+    clock.now += 4
+    pool.report_success(state_a)
+    assert state_a.consecutive_throttles == 0
+    assert any(pool.try_reserve(10)[0] is state_a for _ in range(3))
+
+
+def test_key_pool_llm_switches_key_on_429():
+    pool = KeyPool("test-model", ["key-a", "key-b"], rpm=100, tpm=1_000_000)
+    model_a, model_b = FakeKeyModel(model="test-model", throttled=True), FakeKeyModel(model="test-model")
+    models = {key_label("key-a"): model_a, key_label("key-b"): model_b}
+    llm = KeyPoolLlm(model="test-model", inner=model_a, models=models, pool=pool)
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hello " * 100)])])
+
+    async def call():
+        return [r async for r in llm.generate_content_async(request)]
+
+    for _ in range(3):
+        responses = asyncio.run(call())
+        assert responses[0].content.parts[0].text == "ok"
+
+    # key-a was tried once, then left out for its 7s Retry-After cooldown
+    assert model_a.calls == 1
+    assert model_b.calls == 3
+    assert pool.states[0].throttled == 1
+    assert pool.states[1].tokens == 300
+    # The secret never shows up in the wrapper's repr or dump
+    assert "key-a" not in repr(llm) and "key-a" not in str(llm.model_dump())
+
+
+def test_key_pool_settings_from_env(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_API_KEYS", "k1, k2,,k3")
+    monkeypatch.setenv("SHOULDISIGNTHIS_KEY_POOL_SHARE", "0.25")
+    settings = get_key_pool_settings({"key_pool": {"enabled": False, "rpm": 20}})
+    assert settings["enabled"]
+    assert settings["keys"] == ["k1", "k2", "k3"]
+    assert settings["rpm"] == 20
+    assert settings["share"] == 0.25
@@ -0,0 +1,52 @@
+import os
+import sys
+import logging
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.observability.log_pipeline import TruncatingFilter
+from shouldisignthis.observability.plugins import SampledLoggingPlugin
+
+
+class FakeAgent:
+    name = "Skeptic"
+
+
+class FakeCallbackContext:
+    agent_name = "Skeptic"
+    invocation_id = "e-123"
+
+    class _invocation_context:
+        branch = None
+
+
+def test_truncating_filter():
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "%s", ("x" * 100,), None)
+    TruncatingFilter(10).filter(record)
+    assert record.getMessage() == "x" * 10 + "... [truncated 90 chars]"
+
+
+@pytest.mark.asyncio
+async def test_sampled_plugin_batches_and_samples(caplog):
+    plugin = SampledLoggingPlugin(level=logging.INFO, sample_rates={"agent": 0.0})
+    with caplog.at_level(logging.INFO, logger="shouldisignthis.adk"):
+        await plugin.before_agent_callback(agent=FakeAgent(), callback_context=FakeCallbackContext())
+        assert caplog.records == []
+
+        plugin.sample_rates["agent"] = 1.0
+        await plugin.before_agent_callback(agent=FakeAgent(), callback_context=FakeCallbackContext())
+
+    # All lines of one callback arrive as a single record
+    assert len(caplog.records) == 1
+    assert "AGENT STARTING" in caplog.records[0].getMessage()
+    assert "Agent Name: Skeptic" in caplog.records[0].getMessage()
+
+
+@pytest.mark.asyncio
+async def test_sampled_plugin_skips_disabled_level(caplog):
+    plugin = SampledLoggingPlugin(level=logging.DEBUG)
+    with caplog.at_level(logging.INFO, logger="shouldisignthis.adk"):
+        await plugin.before_agent_callback(agent=FakeAgent(), callback_context=FakeCallbackContext())
+    assert caplog.records == []
@@ -0,0 +1,65 @@
+import os
+import sys
+import uuid
+import urllib.request
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.observability.metrics import (
+    MetricsRegistry,
+    MODEL_CALLS,
+    PIPELINES_IN_FLIGHT,
+    STAGE_LATENCY,
+    start_metrics_server,
+)
+from shouldisignthis.orchestrator import run_pipeline
+
+SAMPLE_CONTRACT_PATH = os.path.join(os.path.dirname(__file__), "sample_contracts", "sample_contract.pdf")
+
+
+def test_prometheus_text_format():
+    registry = MetricsRegistry()
+    calls = registry.counter("calls_total", "Calls.", ["model"])
+    latency = registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=(1.0, 5.0))
+    calls.inc(model='gemini "pro"')
+    calls.inc(2, model='gemini "pro"')
+    latency.observe(0.5, stage="judge")
+    latency.observe(3.0, stage="judge")
+    latency.observe(10.0, stage="judge")
+
+    text = registry.render()
+    assert "# TYPE calls_total counter" in text
+    assert 'calls_total{model="gemini \\"pro\\""} 3' in text
+    assert 'latency_seconds_bucket{stage="judge",le="1"} 1' in text
+    assert 'latency_seconds_bucket{stage="judge",le="5"} 2' in text
+    assert 'latency_seconds_bucket{stage="judge",le="+Inf"} 3' in text
+    assert 'latency_seconds_count{stage="judge"} 3' in text
+    assert latency.quantile(0.5, stage="judge") == pytest.approx(3.0)
+
+    with pytest.raises(ValueError):
+        calls.inc(tier="worker")
+
+
+@pytest.mark.asyncio
+async def test_pipeline_metrics_are_scrapeable(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    with open(SAMPLE_CONTRACT_PATH, "rb") as f:
+        pdf_bytes = f.read()
+
+    judge_runs = STAGE_LATENCY.snapshot().get(("Judge",), {}).get("count", 0)
+    await run_pipeline(pdf_bytes, "application/pdf", "metrics_tester", str(uuid.uuid4()))
+
+    assert STAGE_LATENCY.snapshot()[("Judge",)]["count"] == judge_runs + 1
+    assert PIPELINES_IN_FLIGHT.get() == 0
+    assert sum(MODEL_CALLS.values().values()) > 0
+
+    server = start_metrics_server(host="127.0.0.1", port=0)
+    port = server.server_address[1]
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+        body = response.read().decode("utf-8")
+    assert response.headers["Content-Type"].startswith("text/plain")
+    assert 'shouldisignthis_stage_duration_seconds_count{stage="Judge"}' in body
+    assert "shouldisignthis_model_tokens_total" in body
@@ -0,0 +1,133 @@
+import io
+import os
+import random
+import sys
+import uuid
+
+import pytest
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.ingestion import SpooledUpload
+from shouldisignthis.near_duplicates import NearDuplicateStore, SimHashIndex, hamming_distance, is_cosmetic_change, simhash
+from shouldisignthis.orchestrator import run_pipeline
+
+CLAUSES = [
+    "The Consultant shall provide the services described in Exhibit A with reasonable skill and care.",
+    "The Client shall pay each invoice within thirty days of receipt by bank transfer.",
+    "Either party may terminate this Agreement on sixty days written notice to the other party.",
+    "The Consultant's total liability under this Agreement is limited to the fees paid in the prior twelve months.",
+    "All work product created under this Agreement is assigned to the Client upon full payment.",
+    "Each party shall keep the other party's confidential information secret for three years after termination.",
+    "The Consultant is an independent contractor and is responsible for its own taxes and insurance.",
+    "Any dispute shall be resolved by arbitration in the city where the Consultant has its principal office.",
+    "This Agreement is governed by the laws of the State of Delaware without regard to conflict of laws rules.",
+    "Neither party may assign this Agreement without the prior written consent of the other party.",
+]
+
+
+def _contract(party: str, date: str) -> str:
+    return f"CONSULTING AGREEMENT dated {date} between {party} and Jordan Lee (the Consultant).\n" + "\n".join(
+        f"{number}. {clause}" for number, clause in enumerate(CLAUSES * 3, start=1)
+    )
+
+
+def _pdf(text: str) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = 750
+    for line in text.splitlines():
+        pdf.drawString(40, y, line[:110])
+        y -= 14
+        if y < 60:
+            pdf.showPage()
+            y = 750
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_versions_are_near_and_other_contracts_far():
+    original = simhash(_contract("Acme Corp", "January 5, 2025"))
+    assert hamming_distance(original, simhash(_contract("Globex Inc", "March 1, 2025"))) <= 6
+    unrelated = " ".join(reversed(CLAUSES)).replace("Consultant", "Tenant").replace("Client", "Landlord")
+    assert hamming_distance(original, simhash(unrelated)) > 6
+
+
+def test_index_finds_every_fingerprint_within_max_distance():
+    rng = random.Random(7)
+    index = SimHashIndex(max_distance=6)
+    stored = [rng.getrandbits(64) for _ in range(5000)]
+    for key, fingerprint in enumerate(stored):
+        index.add(key, fingerprint)
+
+    for key in rng.sample(range(len(stored)), 200):
+        query = stored[key]
+        for bit in rng.sample(range(64), rng.randint(0, 6)):
+            query ^= 1 << bit
+        assert key in dict(index.query(query))
+    assert all(distance <= 6 for _, distance in index.query(rng.getrandbits(64)))
+
+
+def test_store_reloads_and_reports_changed_spans(tmp_path):
+    path = str(tmp_path / "near.db")
+    NearDuplicateStore(path).add(_contract("Acme Corp", "January 5, 2025"), {"verdict": {"verdict": "CAUTION"}})
+
+    match = NearDuplicateStore(path).find(_contract("Acme Corp", "February 9, 2025"))
+    assert match["result"] == {"verdict": {"verdict": "CAUTION"}}
+    assert match["similarity"] > 0.9
+    assert match["changed_spans"] == [{"before": "January 5,", "after": "February 9,"}]
+    assert match["cosmetic"]
+    assert NearDuplicateStore(path).find(" ".join(CLAUSES[:3])) is None
+
+
+def test_only_date_and_party_name_changes_are_cosmetic():
+    original = _contract("Acme Corp", "January 5, 2025")
+    assert is_cosmetic_change(original, _contract("Globex Holdings Inc", "5th March 2025"))
+    assert is_cosmetic_change(original, original.replace("January 5, 2025", "2025-03-01"))
+    # Terms are not cosmetic, even when they look like a number or a proper noun
+    assert not is_cosmetic_change(original, original.replace("thirty days", "ninety days"))
+    assert not is_cosmetic_change(original, original.replace("twelve months", "12 months"))
+    assert not is_cosmetic_change(original, original.replace("State of Delaware", "State of Texas"))
+    assert not is_cosmetic_change(original, original.replace("with reasonable skill", "with skill"))
+    # A party named again later in the text counts when the analyzed 'parties' fact names it
+    later = original + "\nSigned for Acme Corp."
+    renamed = later.replace("Acme Corp", "Globex Inc")
+    assert not is_cosmetic_change(later, renamed)
+    assert is_cosmetic_change(later, renamed, parties="Acme Corp (Client) and Jordan Lee (Consultant)")
+
+
+@pytest.mark.asyncio
+async def test_auto_mode_offers_a_near_duplicate_whose_terms_changed(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES_MODE", "auto")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES_PATH", str(tmp_path / "near.db"))
+    original = _contract("Acme Corp", "January 5, 2025")
+    analyzed = SpooledUpload.from_bytes(_pdf(original), "application/pdf").extract_text()
+    NearDuplicateStore(str(tmp_path / "near.db")).add(analyzed, {"status": "COMPLETE", "verdict": {"verdict": "ACCEPT"}})
+
+    result = await run_pipeline(_pdf(original.replace("thirty days", "ninety days", 1)), "application/pdf", "near_tester", str(uuid.uuid4()))
+
+    assert "reused_from" not in result and result["timings"]
+    assert result["near_duplicate"]["changed_spans"] == [{"before": "thirty", "after": "ninety"}]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reuses_analysis_of_near_duplicate(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES_MODE", "auto")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES_PATH", str(tmp_path / "near.db"))
+
+    first = await run_pipeline(_pdf(_contract("Acme Corp", "January 5, 2025")), "application/pdf", "near_tester", str(uuid.uuid4()))
+    assert first["status"] == "COMPLETE" and "reused_from" not in first
+
+    second = await run_pipeline(_pdf(_contract("Globex Inc", "January 5, 2025")), "application/pdf", "near_tester", str(uuid.uuid4()))
+    assert second["reused_from"]["changed_spans"] == [{"before": "Acme Corp", "after": "Globex Inc"}]
+    assert second["verdict"] == first["verdict"]
+    assert second["timings"] == {}
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import sys
+import uuid
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.norms import NormsStore, get_norms_store
+from shouldisignthis.observability.metrics import CACHE_LOOKUPS, SEARCHES_AVOIDED
+from shouldisignthis.orchestrator import run_pipeline
+from shouldisignthis.tools.norms_tools import lookup_industry_norms
+
+SAMPLE_CONTRACT_PATH = os.path.join(os.path.dirname(__file__), "sample_contracts", "balanced_contract.pdf")
+
+
+def _counter(topic, context, references, confidence="HIGH"):
+    return {"topic": topic, "counter": "Within range.", "industry_context": context, "confidence": confidence, "references": references}
+
+
+def test_norms_are_learned_from_sourced_counters_and_matched_by_topic_words(tmp_path):
+    store = NormsStore(str(tmp_path / "norms.db"), max_per_topic=2)
+    grounded = ["https://example.com/design-caps", "example.com", "https://example.com/nc"]
+    added = store.learn([
+        _counter("Liability Cap", "Freelance design contracts usually cap liability at the fees paid.", ["https://example.com/design-caps"]),
+        _counter("Liability Cap", "Software consultants commonly cap liability at 12 months of fees.", ["https://www.example.com/software-caps"]),
+        _counter("Payment Terms", "Net 30 is the most common invoice term.", []),
+        _counter("Non-Compete", "Non-competes over 12 months are rarely enforced.", ["https://example.com/nc"], confidence="LOW"),
+    ], grounded)
+    assert added == 2
+
+    hits = store.lookup("Standard liability cap for freelance design 2025", industry="graphic design")
+    assert [norm["sources"] for norm in hits] == [["https://example.com/design-caps"], ["https://www.example.com/software-caps"]]
+    # Unsourced and low-confidence counters are not norms
+    assert store.lookup("payment terms") == []
+    assert store.lookup("non-compete duration") == []
+
+    # Re-learning a norm refreshes it; only the most recently used norms per topic are kept
+    assert store.learn([_counter("liability caps", "Agencies cap liability at twice the fees.", ["https://example.com/agency"])], grounded) == 1
+    assert store.learn([_counter("Liability Cap", "Agencies cap liability at twice the fees.", ["https://example.com/agency"])], grounded) == 0
+    reopened = NormsStore(str(tmp_path / "norms.db"))
+    assert reopened.stats()["entries"] == 2
+    assert [norm["sources"] for norm in reopened.lookup("liability cap")] == [["https://example.com/agency"], ["https://www.example.com/software-caps"]]
+
+
+def test_only_grounded_sources_are_learned_and_relearning_keeps_the_age(tmp_path):
+    path = str(tmp_path / "norms.db")
+    store = NormsStore(path, max_age_days=1)
+    # The model cited a page it was not grounded on
+    assert store.learn([_counter("Payment Terms", "Net 30 is the most common invoice term.", ["https://made-up.example/net30"])], ["https://invoices.example/net30"]) == 0
+    assert store.learn([_counter("Payment Terms", "Net 30 is the most common invoice term.", ["https://invoices.example/net30"])], ["https://invoices.example/net30"]) == 1
+
+    with store._connect() as conn:
+        conn.execute("UPDATE norms SET created_at = created_at - 2 * 86400")
+    # Citing a stored norm again does not make it young again
+    store.learn([_counter("Payment Terms", "Net 30 is the most common invoice term.", ["https://invoices.example/net30"])], ["https://invoices.example/net30"])
+    assert store.lookup("payment terms") == []
+
+
+def test_norms_learned_by_another_worker_are_found(tmp_path):
+    path = str(tmp_path / "norms.db")
+    store, other_worker = NormsStore(path), NormsStore(path)
+    other_worker.learn([_counter("Late Fee", "Late fees of 1.5% per month are common.", ["https://invoices.example/late"])], ["invoices.example"])
+
+    assert [norm["statement"] for norm in store.lookup("late fee")] == ["Late fees of 1.5% per month are common."]
+
+
+def test_advocate_lookups_hit_after_a_verified_analysis(tmp_path, monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NORMS", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NORMS_PATH", str(tmp_path / "norms.db"))
+    with open(SAMPLE_CONTRACT_PATH, "rb") as f:
+        pdf_bytes = f.read()
+    hits, misses, avoided = CACHE_LOOKUPS.get(cache="norms", result="hit"), CACHE_LOOKUPS.get(cache="norms", result="miss"), SEARCHES_AVOIDED.get()
+
+    asyncio.run(run_pipeline(pdf_bytes, "application/pdf", "norms_tester", str(uuid.uuid4())))
+    assert CACHE_LOOKUPS.get(cache="norms", result="miss") > misses
+    assert get_norms_store().stats()["entries"] >= 1
+
+    result = asyncio.run(run_pipeline(pdf_bytes, "application/pdf", "norms_tester", str(uuid.uuid4())))
+    assert result["status"] == "COMPLETE"
+    assert CACHE_LOOKUPS.get(cache="norms", result="hit") > hits
+    assert SEARCHES_AVOIDED.get() > avoided
+    assert lookup_industry_norms(result["advocate"]["counters"][0]["topic"])["found"] is True
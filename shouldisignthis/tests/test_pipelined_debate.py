@@ -0,0 +1,67 @@
+import asyncio
+import json
+import os
+import sys
+import types as pytypes
+import uuid
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import orchestrator
+
+RISK = {"risk": "Net 90 payment", "clause": "payment_terms"}
+COUNTER = {"counter": "Net 30 is standard", "topic": "Payment"}
+
+
+def _fake_agents(log, report_early=True):
+    async def fake_run_agent(agent_factory, app_name, user_id, session_id, message, initial_state=None, on_event=None, **kwargs):
+        if agent_factory is orchestrator.get_debate_team:
+            skeptic = json.dumps({"risks": [RISK]})
+            if report_early and on_event is not None:
+                on_event(pytypes.SimpleNamespace(actions=pytypes.SimpleNamespace(state_delta={"skeptic_risks": skeptic})))
+            # The Advocate is still searching
+            await asyncio.sleep(0.2)
+            log.append(("debate done", None))
+            return pytypes.SimpleNamespace(state={"skeptic_risks": skeptic, "advocate_defense": json.dumps({"counters": [COUNTER]})})
+        assert agent_factory is orchestrator.get_citation_loop
+        arguments = initial_state["current_arguments"]
+        log.append(("bailiff", arguments))
+        await asyncio.sleep(0.05)
+        verified = {key: [{**item, "verified": True} for item in items] for key, items in arguments.items()}
+        return pytypes.SimpleNamespace(state={"bailiff_verdict": {"status": "CLEAN", "verified_arguments": verified}})
+    return fake_run_agent
+
+
+def test_risks_are_verified_while_the_advocate_works(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_PIPELINED_BAILIFF", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE", "0")
+    log = []
+    monkeypatch.setattr(orchestrator, "_run_agent", _fake_agents(log))
+
+    state, evidence, timings = asyncio.run(orchestrator.run_debate_and_verification(
+        "pipeline_tester", str(uuid.uuid4()), {"payment_terms": {"value": "Net 90"}}, "Payment is due Net 90."
+    ))
+
+    assert log == [
+        ("bailiff", {"risks": [RISK], "counters": []}),
+        ("debate done", None),
+        ("bailiff", {"risks": [], "counters": [COUNTER]}),
+    ]
+    assert evidence == {"risks": [{**RISK, "verified": True}], "counters": [{**COUNTER, "verified": True}]}
+    # Only the counters are left to verify after the debate
+    assert timings["stage_2_5"] < 0.15
+
+
+def test_risks_filed_with_the_counters_are_verified_together(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_PIPELINED_BAILIFF", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE", "0")
+    log = []
+    monkeypatch.setattr(orchestrator, "_run_agent", _fake_agents(log, report_early=False))
+
+    _, evidence, _ = asyncio.run(orchestrator.run_debate_and_verification(
+        "pipeline_tester", str(uuid.uuid4()), {"payment_terms": {"value": "Net 90"}}, "Payment is due Net 90."
+    ))
+
+    assert log == [("debate done", None), ("bailiff", {"risks": [RISK], "counters": [COUNTER]})]
+    assert evidence == {"risks": [{**RISK, "verified": True}], "counters": [{**COUNTER, "verified": True}]}
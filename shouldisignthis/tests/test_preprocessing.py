@@ -0,0 +1,95 @@
+import asyncio
+import io
+import os
+import sys
+
+from PIL import Image, ImageDraw
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.observability.metrics import UPLOAD_BYTES_SAVED
+from shouldisignthis.preprocessing import estimate_image_tokens, get_preprocessing_settings, preprocess_bytes, preprocess_upload
+
+SETTINGS = get_preprocessing_settings({})
+
+
+def _photo(width=3072, height=2304) -> bytes:
+    # A noisy "phone photo" of a page of text
+    image = Image.effect_noise((width, height), 40).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for y in range(200, height - 200, 120):
+        draw.text((200, y), "The Tenant shall pay rent monthly in advance. " * 4, fill=(0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, "JPEG", quality=95)
+    return buffer.getvalue()
+
+
+def _pdf(pages) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for text in pages:
+        if text:
+            pdf.drawString(72, 720, text)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_image_tokens_follow_tiles():
+    assert estimate_image_tokens(300, 200) == 258
+    assert estimate_image_tokens(1536, 1152) == 4 * 258
+    assert estimate_image_tokens(4032, 3024) == 6 * 4 * 258
+
+
+def test_photo_is_downscaled_and_grayscale():
+    data = _photo()
+    slimmed, mime_type, stats = preprocess_bytes(data, "image/jpeg", SETTINGS)
+
+    assert stats["bytes_after"] == len(slimmed) < len(data)
+    assert stats["tokens_before"] == 4 * 3 * 258 and stats["tokens_after"] == 1032
+    with Image.open(io.BytesIO(slimmed)) as image:
+        assert image.mode == "L"
+        assert max(image.size) == SETTINGS["max_image_side"]
+    assert mime_type in ("image/png", "image/jpeg")
+
+
+def test_pdf_drops_blank_and_duplicate_pages():
+    data = _pdf(["1. Rent is due monthly.", None, "2. Deposit is refundable.", "2. Deposit is refundable."])
+    slimmed, mime_type, stats = preprocess_bytes(data, "application/pdf", SETTINGS)
+
+    assert mime_type == "application/pdf"
+    assert stats["pages"] == 4 and stats["pages_dropped"] == 2
+    assert stats["tokens_before"] - stats["tokens_after"] == 2 * 258
+    assert stats["page_map"] == [1, 3]
+    reader = PdfReader(io.BytesIO(slimmed))
+    assert [page.extract_text().strip() for page in reader.pages] == ["1. Rent is due monthly.", "2. Deposit is refundable."]
+
+
+def test_pdf_keeps_pages_whose_text_cannot_be_extracted(monkeypatch):
+    # e.g. a CID font without a ToUnicode map: the page shows text pypdf cannot read
+    monkeypatch.setattr("pypdf._page.PageObject.extract_text", lambda self, *args, **kwargs: "")
+    data = _pdf(["1. Rent is due monthly.", None, "2. Deposit is refundable."])
+    _, _, stats = preprocess_bytes(data, "application/pdf", SETTINGS)
+
+    assert stats["pages_dropped"] == 1
+
+
+def test_unreadable_upload_passes_through():
+    slimmed, mime_type, stats = preprocess_bytes(b"%PDF-1.4 not really", "application/pdf", SETTINGS)
+    assert (slimmed, mime_type) == (b"%PDF-1.4 not really", "application/pdf")
+    assert stats["bytes_after"] == stats["bytes_before"]
+
+
+def test_upload_preprocessing_reports_savings(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_PREPROCESSING", "0")
+    data = _photo(1600, 1200)
+    assert asyncio.run(preprocess_upload(data, "image/jpeg"))[0] == data
+
+    monkeypatch.delenv("SHOULDISIGNTHIS_PREPROCESSING")
+    before = UPLOAD_BYTES_SAVED.get(kind="image")
+    slimmed, _, stats = asyncio.run(preprocess_upload(data, "image/jpeg"))
+    assert UPLOAD_BYTES_SAVED.get(kind="image") - before == len(data) - len(slimmed) > 0
@@ -0,0 +1,25 @@
+import os
+import sys
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.ui.privacy import privacy_note
+
+
+def test_privacy_note_lists_the_enabled_stores(monkeypatch):
+    for name in ("SHOULDISIGNTHIS_NEAR_DUPLICATES", "SHOULDISIGNTHIS_CLAUSE_CACHE", "SHOULDISIGNTHIS_NORMS"):
+        monkeypatch.setenv(name, "0")
+    assert "stateless" in privacy_note() and "No data is stored" in privacy_note()
+
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NEAR_DUPLICATES_PATH", "/data/near.db")
+    note = privacy_note()
+    assert "stateless" not in note and "No data is stored" not in note
+    assert "contract text and verdict" in note and "/data/near.db" in note
+    assert "per clause" not in note and "industry norms" not in note
+
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_NORMS", "1")
+    note = privacy_note()
+    assert "per clause" in note and "industry norms" in note
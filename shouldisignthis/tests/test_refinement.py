@@ -0,0 +1,95 @@
+import asyncio
+import io
+import json
+import os
+import sys
+import types as pytypes
+import uuid
+
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import orchestrator
+from shouldisignthis.refinement import apply_refinements, fields_to_refine
+
+SCALAR_FIELDS = ["parties", "payment_terms", "liability_cap", "termination_clause"]
+
+
+def _fact(value, page, confidence):
+    return {"value": value, "page": page, "confidence": confidence}
+
+
+def _pdf(pages: int) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    for page in range(1, pages + 1):
+        pdf.drawString(72, 720, f"Page {page} of the agreement.")
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def test_low_confidence_fields_are_refined_and_missing_ones_only_when_extraction_is_poor():
+    sheet = {
+        "parties": _fact("Acme / Bob", 1, "HIGH"),
+        "payment_terms": _fact("Net 3?", 4, "LOW"),
+        "liability_cap": _fact("NOT FOUND", 1, "LOW"),
+        "termination_clause": _fact("30 days notice", 6, "MEDIUM"),
+        "financial_terms": [_fact("$100/hr", 2, "HIGH"), _fact("late fee 1.5", 3, "LOW")],
+    }
+    assert fields_to_refine(sheet, SCALAR_FIELDS, 0.4, 0.5) == (["payment_terms", "financial_terms[1]"], [])
+    assert fields_to_refine(sheet, SCALAR_FIELDS, 0.4, 0.8) == (["payment_terms", "financial_terms[1]"], ["liability_cap"])
+    assert fields_to_refine(sheet, SCALAR_FIELDS, 0.7, 0.5)[0] == ["payment_terms", "termination_clause", "financial_terms[1]"]
+
+
+def test_only_confident_answers_replace_fields():
+    sheet = {"payment_terms": _fact("Net 3?", 4, "LOW"), "liability_cap": _fact("NOT FOUND", 1, "LOW"), "financial_terms": [_fact("late fee 1.5", 3, "LOW")]}
+    refined = {
+        "payment_terms": _fact("Net 30", 4, "HIGH"),
+        "liability_cap": _fact("$1M", 7, "LOW"),
+        "financial_terms[0]": _fact("Late fee of 1.5% per month", 3, "MEDIUM"),
+    }
+    sheet, improved = apply_refinements(sheet, refined, 0.4)
+    assert improved == ["payment_terms", "financial_terms[0]"]
+    assert sheet["payment_terms"]["value"] == "Net 30"
+    assert sheet["liability_cap"]["value"] == "NOT FOUND"
+    assert sheet["financial_terms"] == [_fact("Late fee of 1.5% per month", 3, "MEDIUM")]
+
+
+def test_stage_1_5_rereads_only_the_pages_around_uncertain_fields(monkeypatch):
+    calls, running = [], {"now": 0, "max": 0}
+
+    async def fake_run_agent(agent_factory, app_name, user_id, session_id, message, initial_state=None, **kwargs):
+        assert agent_factory is orchestrator.get_field_extractor_agent
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        pages = len(PdfReader(io.BytesIO(message.parts[0].inline_data.data)).pages)
+        requested = [line.split(":")[0].strip("- ").strip() for line in message.parts[1].text.splitlines() if line.strip().startswith("- ")]
+        calls.append((pages, requested))
+        fields = [{"field": field, "value": f"clear {field}", "page": 2, "confidence": "HIGH"} for field in requested]
+        return pytypes.SimpleNamespace(state={"refined_fields": json.dumps({"fields": fields})})
+
+    monkeypatch.setattr(orchestrator, "_run_agent", fake_run_agent)
+    auditor_out = {"is_contract": True, "is_safe": True, "fact_sheet": {
+        "parties": _fact("Acme / Bob", 1, "HIGH"),
+        "payment_terms": _fact("Net 3?", 5, "LOW"),
+        "liability_cap": _fact("$1M?", 9, "LOW"),
+        "termination_clause": _fact("30 days notice", 6, "HIGH"),
+    }}
+
+    result = asyncio.run(orchestrator.run_stage_1_5(_pdf(12), "application/pdf", auditor_out, "refine_tester", str(uuid.uuid4())))
+
+    assert sorted(calls) == [(3, ["liability_cap"]), (3, ["payment_terms"])]
+    assert running["max"] == 2
+    facts = result["fact_sheet"]
+    # Page 2 of the excerpts starting at pages 4 and 8
+    assert (facts["payment_terms"]["value"], facts["payment_terms"]["page"]) == ("clear payment_terms", 5)
+    assert (facts["liability_cap"]["value"], facts["liability_cap"]["page"]) == ("clear liability_cap", 9)
+    assert facts["termination_clause"]["value"] == "30 days notice"
+    assert result["refinement"] == {"requested": ["payment_terms", "liability_cap"], "improved": ["payment_terms", "liability_cap"]}
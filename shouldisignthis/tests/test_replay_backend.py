@@ -0,0 +1,41 @@
+import os
+import sys
+import uuid
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.config import get_worker_model
+from shouldisignthis.llm.replay import ReplayLlm
+from shouldisignthis.orchestrator import run_pipeline
+
+SAMPLE_CONTRACT_PATH = os.path.join(os.path.dirname(__file__), "sample_contracts", "balanced_contract.pdf")
+
+
+@pytest.fixture
+def replay_backend(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+
+
+def test_backend_selection(replay_backend):
+    model = get_worker_model()
+    assert isinstance(model, ReplayLlm)
+    assert model.tier == "worker"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_runs_offline(replay_backend):
+    with open(SAMPLE_CONTRACT_PATH, "rb") as f:
+        pdf_bytes = f.read()
+
+    result = await run_pipeline(pdf_bytes, "application/pdf", "replay_tester", str(uuid.uuid4()), tone="Professional")
+
+    assert result["status"] == "COMPLETE"
+    # The uploaded PDF is matched to its recording by content hash
+    assert result["auditor"]["contract_type"]
+    assert result["skeptic"]["risks"]
+    assert result["evidence"]["risks"]
+    assert result["verdict"]["verdict"] in ("ACCEPT", "CAUTION", "REJECT")
+    assert "email_subject" in result["toolkit"]
@@ -0,0 +1,116 @@
+import asyncio
+import os
+import sys
+from typing import List
+
+import httpx
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from shouldisignthis.llm import retry
+from shouldisignthis.llm.base import retry_after_seconds
+from shouldisignthis.llm.retry import RetryBudget, RetryingLlm, backoff_seconds
+from shouldisignthis.observability.metrics import MODEL_RETRIES, RETRIES_DENIED
+
+POLICY = types.HttpRetryOptions(attempts=4, initial_delay=1, exp_base=2, max_delay=5, http_status_codes=[429, 503])
+
+
+class FlakyLlm(BaseLlm):
+    """Raises the queued HTTP errors (status, Retry-After) in order, then answers."""
+
+    failures: List = []
+    calls: int = 0
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls += 1
+        if self.failures:
+            status, retry_after = self.failures.pop(0)
+            headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+            response = httpx.Response(status, headers=headers, request=httpx.Request("POST", "https://example.invalid"))
+            errors.APIError.raise_error(status, {"error": {"code": status, "message": "failed"}}, response)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="ok")]))
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    # Record the backoff instead of sleeping
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+
+    monkeypatch.setattr(retry.asyncio, "sleep", fake_sleep)
+    return slept
+
+
+async def _call(llm):
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text="hi")])])
+    return [r async for r in llm.generate_content_async(request)]
+
+
+def test_backoff_is_full_jitter_and_honors_retry_after():
+    assert backoff_seconds(0, POLICY, rng=lambda: 0.999) < 1
+    assert backoff_seconds(2, POLICY, rng=lambda: 0.5) == 2  # uniform(0, 4)
+    assert backoff_seconds(10, POLICY, rng=lambda: 0.999) < 5  # capped at max_delay
+    assert backoff_seconds(0, POLICY, rng=lambda: 0.0) == 0
+    assert backoff_seconds(0, POLICY, retry_after=7, rng=lambda: 0.5) == 7.5
+
+
+def test_transient_errors_are_retried(sleeps):
+    inner = FlakyLlm(model="retry-test", failures=[(503, None), (429, 3)])
+    llm = RetryingLlm.wrap(inner, policy=POLICY, budget=RetryBudget(min_retries=10))
+    before = MODEL_RETRIES.get(model="retry-test")
+
+    assert asyncio.run(_call(llm))[0].content.parts[0].text == "ok"
+    assert inner.calls == 3
+    assert sleeps[0] < 1 and 3 <= sleeps[1] < 4
+    assert MODEL_RETRIES.get(model="retry-test") == before + 2
+
+
+def test_retry_info_in_error_body_wins_over_header():
+    def quota_error(body_details, headers):
+        response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "https://example.invalid"))
+        return errors.ClientError(429, {"error": {"code": 429, "status": "RESOURCE_EXHAUSTED", "details": body_details}}, response)
+
+    retry_info = [
+        {"@type": "type.googleapis.com/google.rpc.QuotaFailure", "violations": []},
+        {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "37s"},
+    ]
+    assert retry_after_seconds(quota_error(retry_info, {"retry-after": "5"})) == 37
+    assert retry_after_seconds(quota_error([{"retryDelay": "1.5s"}], {})) == 1.5
+    assert retry_after_seconds(quota_error([{"retryDelay": "soon"}], {"retry-after": "5"})) == 5
+    assert retry_after_seconds(quota_error(None, {})) is None
+
+
+def test_non_retryable_and_long_retry_after_surface(sleeps):
+    bad_request = FlakyLlm(model="retry-test", failures=[(400, None)])
+    with pytest.raises(errors.ClientError):
+        asyncio.run(_call(RetryingLlm.wrap(bad_request, policy=POLICY, budget=RetryBudget())))
+    assert bad_request.calls == 1
+
+    far_future = FlakyLlm(model="retry-test", failures=[(429, 600)])
+    with pytest.raises(errors.ClientError):
+        asyncio.run(_call(RetryingLlm.wrap(far_future, policy=POLICY, budget=RetryBudget(), max_retry_after=60)))
+    assert far_future.calls == 1 and not sleeps
+
+
+def test_retry_budget_caps_retries(sleeps):
+    budget = RetryBudget(ratio=0.1, window_seconds=60, min_retries=1)
+    for _ in range(9):
+        budget.record_call()
+    assert budget.try_acquire()  # 1 retry for 9 calls
+    assert not budget.try_acquire()
+
+    # The 10th call still only earns 1 retry, already spent
+    inner = FlakyLlm(model="retry-budget-test", failures=[(503, None)])
+    with pytest.raises(errors.ServerError):
+        asyncio.run(_call(RetryingLlm.wrap(inner, policy=POLICY, budget=budget)))
+    assert inner.calls == 1
+    assert RETRIES_DENIED.get(model="retry-budget-test") == 1
@@ -0,0 +1,152 @@
+import asyncio
+import io
+import json
+import os
+import sys
+import textwrap
+import types as pytypes
+import uuid
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import orchestrator
+from shouldisignthis.ingestion import SpooledUpload
+from shouldisignthis.revisions import diff_versions, merge_fact_sheets, stale_clauses
+
+CLAUSES = [
+    "The Consultant shall provide the services described in Exhibit A with reasonable skill and care.",
+    "The Client shall pay each invoice within thirty days of receipt by bank transfer.",
+    "Either party may terminate this Agreement on sixty days written notice to the other party.",
+    "The Consultant's total liability under this Agreement is limited to the fees paid in the prior twelve months.",
+    "All work product created under this Agreement is assigned to the Client upon full payment.",
+    "Each party shall keep the other party's confidential information secret for three years after termination.",
+    "Any dispute shall be resolved by arbitration in the city where the Consultant has its principal office.",
+    "This Agreement is governed by the laws of the State of Delaware without regard to conflict of laws rules.",
+]
+FACT_SHEET = {
+    "parties": {"value": "Acme Corp and Jordan Lee", "page": 1, "confidence": "HIGH"},
+    "payment_terms": {"value": "pay each invoice within thirty days of receipt", "page": 1, "confidence": "HIGH"},
+    "termination_clause": {"value": "Either party may terminate this Agreement on sixty days written notice", "page": 1, "confidence": "HIGH"},
+    "liability_cap": {"value": "limited to the fees paid in the prior twelve months", "page": 1, "confidence": "HIGH"},
+    "key_obligations": [{"value": "Keep confidential information secret for three years after termination", "page": 1, "confidence": "MEDIUM"}],
+}
+
+
+def _contract(clauses) -> str:
+    return "CONSULTING AGREEMENT between Acme Corp and Jordan Lee (the Consultant).\n" + "\n".join(
+        f"{number}. {clause}" for number, clause in enumerate(clauses, start=1)
+    )
+
+
+def _pdf(text: str) -> bytes:
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=letter)
+    y = 750
+    for line in text.splitlines():
+        for wrapped in textwrap.wrap(line, 95):
+            pdf.drawString(40, y, wrapped)
+            y -= 14
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _pages(text: str) -> list:
+    return SpooledUpload.from_bytes(_pdf(text), "application/pdf").extract_pages()
+
+
+def test_diff_finds_the_redline_across_line_breaks_and_renumbering():
+    old = _contract(CLAUSES)
+    revised = CLAUSES[:1] + ["The Consultant shall send a status report every Friday."] + CLAUSES[1:]
+    revised[2] = revised[2].replace("thirty days", "sixty days")
+
+    diff = diff_versions(old, _pages(_contract(revised)))
+    assert [(hunk["before"], hunk["after"]) for hunk in diff["hunks"]] == [(
+        "2. The Client shall pay each invoice within thirty days of receipt by bank transfer.",
+        "2. The Consultant shall send a status report every Friday. 3. The Client shall pay each invoice within sixty days of receipt by bank transfer.",
+    )]
+    assert diff["changed_passages"] == 2 and diff["passages"] == 10
+    assert diff_versions(old, _pages(old))["hunks"] == []
+
+
+def test_stale_facts_are_replaced_or_dropped():
+    hunks = [
+        {"page": 1, "before": "2. The Client shall pay each invoice within thirty days of receipt by bank transfer.", "after": "2. The Client shall pay each invoice within sixty days of receipt."},
+        {"page": 1, "before": CLAUSES[3] + " " + CLAUSES[5], "after": ""},
+    ]
+    stale = stale_clauses(FACT_SHEET, hunks)
+    assert stale == {"payment_terms", "liability_cap", "key_obligations[0]"}
+
+    changes = {
+        "parties": {"value": "NOT FOUND", "page": 1, "confidence": "LOW"},
+        "payment_terms": {"value": "pay each invoice within sixty days of receipt", "page": 1, "confidence": "HIGH"},
+        "key_obligations": [],
+    }
+    merged = merge_fact_sheets(FACT_SHEET, changes, stale)
+    assert merged["parties"] == FACT_SHEET["parties"]
+    assert merged["termination_clause"] == FACT_SHEET["termination_clause"]
+    assert merged["payment_terms"] == changes["payment_terms"]
+    assert merged["liability_cap"]["value"] == "NOT FOUND"
+    assert merged["key_obligations"] == []
+
+
+def test_revision_reruns_stages_only_on_the_changed_clause(monkeypatch):
+    monkeypatch.delenv("SHOULDISIGNTHIS_CLAUSE_CACHE", raising=False)
+    calls = {}
+
+    async def fake_run_agent(agent_factory, app_name, user_id, session_id, message, initial_state=None, **kwargs):
+        prompt = message.parts[-1].text
+        if agent_factory is orchestrator.get_auditor_agent:
+            calls["auditor"] = prompt
+            sheet = {"payment_terms": {"value": "pay each invoice within sixty days of receipt", "page": 1, "confidence": "HIGH"}}
+            return pytypes.SimpleNamespace(state={"auditor_output": json.dumps({"is_contract": True, "is_safe": True, "fact_sheet": sheet})})
+        if agent_factory is orchestrator.get_debate_team:
+            calls["debate"] = sorted(initial_state["auditor_output"])
+            risks = [{"risk": "Slow payment", "clause": clause_id} for clause_id in initial_state["auditor_output"]]
+            return pytypes.SimpleNamespace(state={"skeptic_risks": json.dumps({"risks": risks}), "advocate_defense": json.dumps({"counters": []})})
+        if agent_factory is orchestrator.get_citation_loop:
+            calls["bailiff"] = initial_state["current_arguments"]
+            return pytypes.SimpleNamespace(state={"bailiff_verdict": {"status": "CLEAN", "verified_arguments": initial_state["current_arguments"]}})
+        calls["judge"] = prompt
+        return pytypes.SimpleNamespace(state={"final_verdict": {"verdict": "CAUTION", "risk_score": 60}})
+
+    monkeypatch.setattr(orchestrator, "_run_agent", fake_run_agent)
+    previous = {
+        "status": "COMPLETE",
+        "auditor": {"is_contract": True, "is_safe": True, "full_text": _contract(CLAUSES), "fact_sheet": FACT_SHEET},
+        "evidence": {
+            "risks": [{"risk": "Low cap", "clause": "liability_cap"}, {"risk": "No IP indemnity", "clause": "general"}],
+            "counters": [{"counter": "Standard notice", "clause": "termination_clause"}],
+        },
+        "verdict": {"verdict": "CAUTION", "risk_score": 65},
+    }
+    revised = [clause.replace("thirty days", "sixty days") for clause in CLAUSES]
+
+    result = asyncio.run(orchestrator.run_revision(_pdf(_contract(revised)), "application/pdf", previous, "revision_tester", str(uuid.uuid4())))
+
+    assert "sixty days" in calls["auditor"] and "Delaware" not in calls["auditor"]
+    assert calls["debate"] == ["payment_terms"]
+    # New findings and the ones not tied to a clause are verified; the rest were verified before
+    assert calls["bailiff"] == {"risks": [{"risk": "Slow payment", "clause": "payment_terms"}, {"risk": "No IP indemnity", "clause": "general"}], "counters": []}
+    assert "Low cap" in calls["judge"] and "Standard notice" in calls["judge"]
+    assert result["auditor"]["fact_sheet"]["payment_terms"]["value"] == "pay each invoice within sixty days of receipt"
+    assert result["revision"]["version"] == 2
+    assert result["revision"]["reanalyzed_clauses"] == ["payment_terms"]
+    assert result["revision"]["reused_clauses"] == 4
+    assert result["verdict"]["risk_score"] == 60
+
+
+def test_large_redline_is_analyzed_in_full(monkeypatch):
+    async def fake_pipeline(file_bytes, mime_type, user_id, session_id, api_key=None, tone=None):
+        return {"status": "COMPLETE", "verdict": {"verdict": "SIGN"}}
+
+    monkeypatch.setattr(orchestrator, "run_pipeline", fake_pipeline)
+    previous = {"auditor": {"full_text": _contract(CLAUSES), "fact_sheet": FACT_SHEET}, "verdict": {"verdict": "CAUTION"}}
+    rewritten = _contract([f"Clause {number} was rewritten from scratch." for number in range(8)])
+
+    result = asyncio.run(orchestrator.run_revision(_pdf(rewritten), "application/pdf", previous, "revision_tester", str(uuid.uuid4())))
+    assert result["revision"]["full"] is True
+    assert "passages changed" in result["revision"]["reason"]
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import os
+import sys
+import types as pytypes
+import uuid
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis import orchestrator
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from shouldisignthis.agents.skeptic import _shard_request, shard_facts
+from shouldisignthis.deadlines import StageTimeoutError
+from shouldisignthis.observability.usage import track_usage
+
+GROUND_TRUTH_DIR = os.path.join(os.path.dirname(__file__), "ground_truth", "sample_contract")
+
+
+def _fact(value):
+    return {"value": value, "page": 1, "confidence": "HIGH"}
+
+
+def test_each_specialist_gets_only_its_fields():
+    sheet = {
+        "parties": _fact("Acme / Bob"),
+        "payment_terms": _fact("Net 90"),
+        "financial_terms[1]": _fact("Late fee 5% per month"),
+        "liability_cap": _fact("Unlimited"),
+        "governing_law": _fact("Laws of Mars"),
+    }
+    assert shard_facts(sheet, "financial") == {k: sheet[k] for k in ("parties", "payment_terms", "financial_terms[1]")}
+    # Fields no specialist claims go to the liability specialist
+    assert shard_facts(sheet, "liability") == {k: sheet[k] for k in ("parties", "liability_cap", "governing_law")}
+    # Context alone is nothing to review
+    assert shard_facts(sheet, "dispute") == {}
+
+
+def test_specialist_request_keeps_the_already_reviewed_note():
+    message = 'FACT SHEET:\n{"payment_terms": {"value": "Net 90"}}\nALREADY REVIEWED (omitted here; do not report them as missing): liability_cap\nAnalyze these contract terms.'
+    request = LlmRequest(contents=[types.Content(role="user", parts=[types.Part(text=message)])])
+    context = pytypes.SimpleNamespace(state={"auditor_output": {"payment_terms": _fact("Net 90")}})
+
+    assert _shard_request("financial")(context, request) is None
+    assert request.contents[0].parts[0].text == (
+        "ALREADY REVIEWED (omitted here; do not report them as missing): liability_cap\nAnalyze these contract terms."
+    )
+
+
+def test_sharded_skeptic_returns_the_single_skeptics_risks(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE", "0")
+    with open(os.path.join(GROUND_TRUTH_DIR, "auditor_output.json")) as f:
+        fact_sheet = json.load(f)["fact_sheet"]
+    fact_sheet.pop("dispute_resolution", None)
+
+    results = {}
+    for sharded in ("0", "1"):
+        monkeypatch.setenv("SHOULDISIGNTHIS_SHARDED_SKEPTIC", sharded)
+        with track_usage() as usage:
+            state, _ = asyncio.run(orchestrator.run_stage_2("shard_tester", str(uuid.uuid4()), fact_sheet))
+        risks = orchestrator.parse_json(state["skeptic_risks"])["risks"]
+        results[sharded] = (sorted(risk["risk"] for risk in risks), usage.as_dict()["served_by"])
+
+    assert results["1"][0] == results["0"][0]
+    assert set(results["0"][1]) == {"Skeptic", "Advocate"}
+    # No dispute resolution terms: that specialist makes no model call
+    assert "Skeptic_dispute" not in results["1"][1]
+    assert {"Skeptic_financial", "Skeptic_ip", "Skeptic_liability", "Advocate"} <= set(results["1"][1])
+
+
+def test_finished_specialists_are_judged_when_the_debate_times_out(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_SHARDED_SKEPTIC", "1")
+    monkeypatch.setenv("SHOULDISIGNTHIS_CLAUSE_CACHE", "0")
+
+    async def slow_debate(agent_factory, app_name, user_id, session_id, message, initial_state=None, **kwargs):
+        partial = {
+            "skeptic_risks_financial": json.dumps({"risks": [{"risk": "Net 90"}]}),
+            "skeptic_risks_ip": {"risks": []},
+            "skeptic_risks_termination": '{"risks": [{"risk": "No exit"}]}',
+        }
+        raise StageTimeoutError("Debate_Team", 90, session=pytypes.SimpleNamespace(state=partial))
+
+    monkeypatch.setattr(orchestrator, "_run_agent", slow_debate)
+    state, _ = asyncio.run(orchestrator.run_stage_2("shard_tester", str(uuid.uuid4()), {"payment_terms": _fact("Net 90")}))
+
+    assert state["skeptic_risks"] == {"risks": [{"risk": "Net 90"}, {"risk": "No exit"}]}
+    assert state["timed_out"] == ["Skeptic_liability", "Skeptic_non_compete", "Skeptic_dispute", "Advocate"]
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Must load on first use, not when the app starts
+HEAVY_MODULES = ["google.adk", "google.genai", "reportlab", "shouldisignthis.orchestrator"]
+
+
+def _loaded_after_import(module: str) -> list:
+    code = (
+        f"import sys, {module}\n"
+        f"print('LOADED=' + ','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT, env={**os.environ, "PYTHONPATH": REPO_ROOT},
+        capture_output=True, text=True, check=True
+    )
+    line = next(line for line in proc.stdout.splitlines() if line.startswith("LOADED="))
+    return [m for m in line[len("LOADED="):].split(",") if m]
+
+
+def test_app_import_defers_agents_and_reportlab():
+    assert _loaded_after_import("shouldisignthis.app") == []
+
+
+def test_config_loads_on_demand():
+    code = (
+        "import sys\n"
+        "import shouldisignthis.config as config\n"
+        "assert 'APP_CONFIG' not in vars(config)\n"
+        "assert config.APP_CONFIG is config.load_config()\n"
+        "assert 'google.genai' not in sys.modules\n"
+        "assert config.RETRY_POLICY.attempts == config.retry_cfg.get('attempts', 5)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT, env={**os.environ, "PYTHONPATH": REPO_ROOT}, check=True
+    )
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import uuid
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.observability.tracing import flush_traces, trace_span
+from shouldisignthis.orchestrator import run_pipeline
+
+SAMPLE_CONTRACT_PATH = os.path.join(os.path.dirname(__file__), "sample_contracts", "sample_contract.pdf")
+
+
+def load_spans(path):
+    flush_traces()
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_spans_are_nested(tmp_path, monkeypatch):
+    trace_path = str(tmp_path / "traces.jsonl")
+    monkeypatch.setenv("SHOULDISIGNTHIS_TRACE_PATH", trace_path)
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    with open(SAMPLE_CONTRACT_PATH, "rb") as f:
+        pdf_bytes = f.read()
+
+    with trace_span("compare"):
+        await run_pipeline(pdf_bytes, "application/pdf", "trace_tester", str(uuid.uuid4()))
+
+    spans = load_spans(trace_path)
+    by_id = {s["context"]["span_id"]: s for s in spans}
+
+    def parent_name(span):
+        return by_id[span["parent_id"]]["name"] if span["parent_id"] else None
+
+    names = {s["name"] for s in spans}
+    assert {"compare", "pipeline", "stage Auditor", "agent Skeptic", "model_call", "tool_call assess_contract_risk"} <= names
+
+    pipeline = next(s for s in spans if s["name"] == "pipeline")
+    assert parent_name(pipeline) == "compare"
+    assert pipeline["attributes"]["usage.model_calls"] > 0
+    assert pipeline["attributes"]["usage.input_tokens"] > 0
+
+    assert parent_name(next(s for s in spans if s["name"] == "stage Debate_Team")) == "pipeline"
+    assert parent_name(next(s for s in spans if s["name"] == "agent Skeptic")) == "agent Debate_Team"
+    assert parent_name(next(s for s in spans if s["name"] == "tool_call assess_contract_risk")) == "agent Judge"
+    judge_calls = [s for s in spans if s["name"] == "model_call" and parent_name(s) == "agent Judge"]
+    assert judge_calls and all(s["attributes"]["gen_ai.usage.output_tokens"] > 0 for s in judge_calls)
+    assert all(s["duration_ms"] >= 0 for s in spans)
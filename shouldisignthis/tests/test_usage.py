@@ -0,0 +1,48 @@
+import asyncio
+import os
+import sys
+import uuid
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.observability.plugins import UsagePlugin
+from shouldisignthis.observability.usage import track_usage, record_retry
+from shouldisignthis.orchestrator import run_stage_1
+
+SAMPLE_CONTRACT_PATH = os.path.join(os.path.dirname(__file__), "sample_contracts", "sample_contract.pdf")
+
+
+def test_nested_trackers():
+    with track_usage() as outer:
+        record_retry()
+        with track_usage() as inner:
+            record_retry()
+    record_retry()
+    assert outer.retries == 2
+    assert inner.retries == 1
+
+
+def test_failed_model_call_is_an_error_not_a_retry():
+    with track_usage() as usage:
+        record_retry()
+        asyncio.run(UsagePlugin().on_model_error_callback(callback_context=None, llm_request=None, error=TimeoutError()))
+    assert usage.retries == 1
+    assert usage.model_errors == 1
+
+
+@pytest.mark.asyncio
+async def test_stage_usage_is_tracked(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    monkeypatch.setenv("SHOULDISIGNTHIS_REPLAY_LATENCY_SCALE", "0")
+    with open(SAMPLE_CONTRACT_PATH, "rb") as f:
+        pdf_bytes = f.read()
+
+    with track_usage() as usage:
+        await run_stage_1(pdf_bytes, "application/pdf", "usage_tester", str(uuid.uuid4()))
+
+    stats = usage.as_dict()
+    assert stats["model_calls"] == 1
+    assert list(stats["served_by"]) == ["Auditor"]
+    assert stats["input_tokens"] > 0 and stats["output_tokens"] > 0
@@ -0,0 +1,48 @@
+import os
+import sys
+import urllib.error
+import urllib.request
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from shouldisignthis.observability.metrics import APP_READY, start_metrics_server
+from shouldisignthis.warmup import get_warmup_settings, is_ready, mark_ready, warm_up
+
+
+def _get_status(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def test_warmup_settings_env_override(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_WARMUP", "0")
+    assert get_warmup_settings({"enabled": True})["enabled"] is False
+    monkeypatch.setenv("SHOULDISIGNTHIS_WARMUP", "1")
+    assert get_warmup_settings({"enabled": False})["enabled"] is True
+    monkeypatch.delenv("SHOULDISIGNTHIS_WARMUP")
+    assert get_warmup_settings({}) == {"enabled": True, "smoke_request": True}
+
+
+def test_warm_up_replay_backend(monkeypatch):
+    monkeypatch.setenv("SHOULDISIGNTHIS_MODEL_BACKEND", "replay")
+    result = warm_up()
+    assert result["ok"], result["errors"]
+    assert set(result["steps"]) == {"imports", "agents", "clients", "caches", "smoke_request"}
+
+
+def test_ready_endpoint_flips_after_warmup():
+    server = start_metrics_server(host="127.0.0.1", port=0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/ready"
+    APP_READY.set(0)
+    try:
+        assert not is_ready()
+        assert _get_status(url) == 503
+        mark_ready(1.5)
+        assert is_ready()
+        assert _get_status(url) == 200
+    finally:
+        mark_ready()
@@ -0,0 +1,23 @@
+import logging
+
+from shouldisignthis.norms import get_norms_store, norms_settings
+
+
+def lookup_industry_norms(topic: str, industry: str = ""):
+    """
+    Looks up what is standard for a contract term in the local industry norms knowledge base
+    (norms found in earlier contract reviews, with their source URLs). Call it before searching the web.
+
+    Args:
+        topic (str): The contract term, e.g. "liability cap" or "payment terms".
+        industry (str): The industry or kind of work, e.g. "freelance graphic design".
+
+    Returns:
+        dict: {"found": bool, "norms": [{"topic", "statement", "sources"}]}. If found is false, search the web.
+    """
+    store = get_norms_store()
+    if store is None:
+        return {"found": False, "norms": []}
+    norms = store.lookup(topic, industry, limit=norms_settings()["max_results"])
+    logging.info(f"📚 TOOL CALL: Industry norms for '{topic}': {len(norms)} found")
+    return {"found": bool(norms), "norms": norms}
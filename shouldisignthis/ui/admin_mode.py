@@ -0,0 +1,153 @@
+import streamlit as st
+from shouldisignthis.observability.metrics import (
+    REGISTRY,
+    STAGE_LATENCY,
+    PIPELINES_IN_FLIGHT,
+    MODEL_CALLS,
+    MODEL_TOKENS,
+    MODEL_ERRORS,
+    MODEL_RETRIES,
+    RETRIES_DENIED,
+    RETRY_BUDGET_UTILIZATION,
+    TOOL_CALLS,
+    PARSE_FAILURES,
+    CACHE_LOOKUPS,
+    API_KEY_REQUESTS,
+    API_KEY_THROTTLES,
+    API_KEY_UTILIZATION,
+    CIRCUIT_STATE,
+    FALLBACK_CALLS,
+    HEDGE_CALLS,
+    HEDGE_LATENCY,
+    SEARCHES_AVOIDED,
+    cache_hit_ratio,
+)
+
+def render_admin_mode():
+    """
+    Renders the Admin (Metrics) UI mode.
+
+    Shows the metrics collected by this app process: stage latency, model calls
+    and token spend per model, retries, parse failures, cache hit ratios and
+    in-flight pipelines, plus the raw Prometheus exposition.
+    """
+    st.header("📈 Admin: Metrics")
+    st.markdown("Live metrics of this app instance (reset on restart). Scrape `/metrics` on the metrics port for Prometheus.")
+
+    if st.button("🔄 Refresh"):
+        st.rerun()
+
+    # --- HEADLINE NUMBERS ---
+    tokens = MODEL_TOKENS.values()
+    input_tokens = sum(v for (model, direction), v in tokens.items() if direction == "input")
+    output_tokens = sum(v for (model, direction), v in tokens.items() if direction == "output")
+
+    c1, c2, c3, c4, c5 = st.columns(5)
+    c1.metric("Pipelines In Flight", int(PIPELINES_IN_FLIGHT.get()))
+    c2.metric("Model Calls", int(sum(MODEL_CALLS.values().values())))
+    c3.metric("Input Tokens", f"{int(input_tokens):,}")
+    c4.metric("Output Tokens", f"{int(output_tokens):,}")
+    c5.metric("Parse Failures", int(PARSE_FAILURES.get()))
+
+    # --- STAGE LATENCY ---
+    st.subheader("⏱️ Stage Latency")
+    rows = []
+    for (stage,), state in sorted(STAGE_LATENCY.snapshot().items()):
+        rows.append({
+            "Stage": stage,
+            "Runs": state["count"],
+            "Mean (s)": round(state["sum"] / state["count"], 2) if state["count"] else None,
+            "p50 (s)": round(STAGE_LATENCY.quantile(0.5, stage=stage), 2),
+            "p95 (s)": round(STAGE_LATENCY.quantile(0.95, stage=stage), 2),
+        })
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    else:
+        st.info("No stages have run yet.")
+
+    # --- MODEL USAGE ---
+    st.subheader("🤖 Model Usage")
+    models = {}
+    for (model, agent), calls in MODEL_CALLS.values().items():
+        models.setdefault(model, {"Model": model, "Calls": 0, "Input Tokens": 0, "Output Tokens": 0, "Errors": 0, "Retries": 0})
+        models[model]["Calls"] += int(calls)
+    for (model, direction), count in tokens.items():
+        models.setdefault(model, {"Model": model, "Calls": 0, "Input Tokens": 0, "Output Tokens": 0, "Errors": 0, "Retries": 0})
+        models[model]["Input Tokens" if direction == "input" else "Output Tokens"] += int(count)
+    for metric, column in ((MODEL_ERRORS, "Errors"), (MODEL_RETRIES, "Retries")):
+        for (model,), count in metric.values().items():
+            models.setdefault(model, {"Model": model, "Calls": 0, "Input Tokens": 0, "Output Tokens": 0, "Errors": 0, "Retries": 0})
+            models[model][column] += int(count)
+    if models:
+        st.dataframe(list(models.values()), use_container_width=True, hide_index=True)
+        denied = int(sum(RETRIES_DENIED.values().values()))
+        st.caption(f"🔁 Retry budget {RETRY_BUDGET_UTILIZATION.get():.0%} used; {denied} retries denied")
+
+    tool_rows = [{"Tool": tool, "Calls": int(count)} for (tool,), count in sorted(TOOL_CALLS.values().items())]
+    if tool_rows:
+        st.dataframe(tool_rows, use_container_width=True, hide_index=True)
+
+    # --- CACHES ---
+    caches = sorted({cache for (cache, result) in CACHE_LOOKUPS.values()})
+    if caches:
+        st.subheader("🗄️ Caches")
+        cols = st.columns(len(caches))
+        for col, cache in zip(cols, caches):
+            col.metric(f"{cache} hit ratio", f"{cache_hit_ratio(cache):.0%}")
+        if "norms" in caches:
+            searches = int(TOOL_CALLS.get(tool="google_search_agent"))
+            st.caption(f"📚 Advocate web searches: {int(SEARCHES_AVOIDED.get())} avoided by the industry norms store, {searches} made")
+
+    # --- CIRCUIT BREAKERS ---
+    circuits = CIRCUIT_STATE.values()
+    if circuits:
+        st.subheader("🔌 Circuit Breakers")
+        state_names = {0: "🟢 closed", 1: "🟡 half-open", 2: "🔴 open"}
+        fallbacks = {}
+        for (tier, model), count in FALLBACK_CALLS.values().items():
+            fallbacks[tier] = fallbacks.get(tier, 0) + int(count)
+        st.dataframe([
+            {"Tier": tier, "State": state_names.get(int(state), state), "Fallback Calls": fallbacks.get(tier, 0)}
+            for (tier,), state in sorted(circuits.items())
+        ], use_container_width=True, hide_index=True)
+
+    # --- HEDGING ---
+    hedges = {}
+    for (model, outcome), count in HEDGE_CALLS.values().items():
+        hedges.setdefault(model, {})[outcome] = int(count)
+    if hedges:
+        st.subheader("🏇 Hedged Requests")
+        rows = []
+        for model, outcomes in sorted(hedges.items()):
+            hedgeable = sum(outcomes.get(o, 0) for o in ("unhedged", "primary_won", "hedge_won"))
+            hedged = outcomes.get("primary_won", 0) + outcomes.get("hedge_won", 0)
+            p99_hedged = HEDGE_LATENCY.quantile(0.99, model=model, group="hedged")
+            p99_control = HEDGE_LATENCY.quantile(0.99, model=model, group="control")
+            rows.append({
+                "Model": model,
+                "Calls": hedgeable + outcomes.get("control", 0),
+                "Hedge Rate": f"{hedged / hedgeable:.1%}" if hedgeable else None,
+                "Hedge Won": outcomes.get("hedge_won", 0),
+                "p99 Hedged (s)": round(p99_hedged, 2) if p99_hedged is not None else None,
+                "p99 Control (s)": round(p99_control, 2) if p99_control is not None else None,
+            })
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+
+    # --- API KEYS ---
+    keys = {}
+    for (key, model, quota), utilization in API_KEY_UTILIZATION.values().items():
+        row = keys.setdefault((key, model), {"Key": key, "Model": model, "RPM Used": "0%", "TPM Used": "0%", "Requests": 0, "Throttled": 0})
+        row["RPM Used" if quota == "rpm" else "TPM Used"] = f"{utilization:.0%}"
+    for metric, column in ((API_KEY_REQUESTS, "Requests"), (API_KEY_THROTTLES, "Throttled")):
+        for (key, model), count in metric.values().items():
+            if (key, model) in keys:
+                keys[(key, model)][column] = int(count)
+    if keys:
+        st.subheader("🔑 API Keys")
+        st.dataframe([keys[k] for k in sorted(keys)], use_container_width=True, hide_index=True)
+
+    # --- RAW ---
+    exposition = REGISTRY.render()
+    with st.expander("Prometheus exposition"):
+        st.code(exposition, language="text")
+    st.download_button("📥 Download metrics.txt", exposition, file_name="metrics.txt")
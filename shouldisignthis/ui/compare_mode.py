@@ -2,16 +2,8 @@ import streamlit as st
 import asyncio
 import uuid
 import os
-from shouldisignthis.orchestrator import (
-    run_stage_1,
-    run_stage_2,
-    run_stage_2_5,
-    run_stage_3,
-    run_stage_5_arbiter,
-    run_stage_6_comparison_drafter,
-    parse_json
-)
-from shouldisignthis.tools.pdf_generator import create_comparison_report
+from shouldisignthis.observability.metrics import PIPELINES_IN_FLIGHT
+from shouldisignthis.ui.privacy import privacy_note
 
 def render_compare_mode(api_key):
     """
@@ -43,14 +35,14 @@ def render_compare_mode(api_key):
         st.session_state.error_message = None
 
     # --- HELPER: Run Single Pipeline ---
-    async def run_pipeline(file_bytes, mime_type, user_id, session_id, pipeline_key, status_container):
+    async def run_pipeline(upload, mime_type, user_id, session_id, pipeline_key, status_container):
         """Runs Stages 1-3 for a single contract."""
         
         # STAGE 1: Auditor
         try:
             with status_container:
                 st.write("🔍 Stage 1: Auditing...")
-                auditor_out = await run_stage_1(file_bytes, mime_type, user_id, session_id, api_key=api_key)
+                auditor_out = await run_stage_1(upload, mime_type, user_id, session_id, api_key=api_key)
                 if not auditor_out or not auditor_out.get("is_contract"):
                     raise Exception("Invalid Contract")
                 st.session_state[pipeline_key]['auditor'] = auditor_out
@@ -58,39 +50,33 @@ def render_compare_mode(api_key):
                 # SAFETY CHECK
                 if auditor_out.get("is_safe") is False:
                     raise Exception(f"Flagged as UNSAFE: {auditor_out.get('safety_reason')}")
-    
+
+                # Stage 1.5: fields the Auditor was unsure of are re-read from their pages
+                auditor_out = await run_stage_1_5(upload, mime_type, auditor_out, user_id, session_id, api_key=api_key)
+                st.session_state[pipeline_key]['auditor'] = auditor_out
+                refinement = auditor_out.get("refinement")
+                if refinement:
+                    st.write(f"🔎 Re-checked {len(refinement['requested'])} uncertain fact field(s); {len(refinement['improved'])} improved")
                 st.write("✅ Stage 1 Complete")
         except Exception as e:
             with status_container:
                 st.error(f"⚠️ Stage 1 Failed: {e}")
             raise e
 
-        # STAGE 2: Debate
+        # STAGE 2 + 2.5: Debate and Bailiff
         try:
             with status_container:
-                st.write("⚔️ Stage 2: Debating...")
+                st.write("⚔️ Stage 2: Debating and verifying...")
                 fact_sheet = auditor_out.get('fact_sheet')
-                state, _ = await run_stage_2(user_id, session_id, fact_sheet, api_key=api_key)
-                st.session_state[pipeline_key]['stage2_state'] = state
-                st.write("✅ Stage 2 Complete")
-        except Exception as e:
-            with status_container:
-                st.error(f"⚠️ Stage 2 Failed: {e}")
-            raise e
-
-        # STAGE 2.5: Bailiff
-        try:
-            with status_container:
-                st.write("🕵️ Stage 2.5: Verifying...")
-                risks = parse_json(state.get('skeptic_risks', {})).get('risks', [])
-                counters = parse_json(state.get('advocate_defense', {})).get('counters', [])
                 full_text = auditor_out.get('full_text')
-                validated_evidence = await run_stage_2_5(user_id, session_id, risks, counters, full_text, api_key=api_key)
+                state, validated_evidence, timings = await run_debate_and_verification(user_id, session_id, fact_sheet, full_text, api_key=api_key)
+                st.session_state[pipeline_key]['stage2_state'] = state
                 st.session_state[pipeline_key]['evidence'] = validated_evidence
-                st.write("✅ Stage 2.5 Complete")
+                st.session_state[pipeline_key].setdefault('timings', {}).update(timings)
+                st.write(f"✅ Stage 2 Complete ({timings['stage_2']:.1f}s), Stage 2.5 Complete ({timings['stage_2_5']:.1f}s more)")
         except Exception as e:
             with status_container:
-                st.error(f"⚠️ Stage 2.5 Failed: {e}")
+                st.error(f"⚠️ Stage 2 Failed: {e}")
             raise e
 
         # STAGE 3: Judge
@@ -118,7 +104,7 @@ def render_compare_mode(api_key):
         st.header("Contract B")
         file_b = st.file_uploader("Upload Contract B", type=["pdf", "png", "jpg"], key="file_b", disabled=st.session_state.analyzing)
 
-    st.info("🔒 **Privacy Note:** This application is **stateless**. Your document is processed in-memory and deleted immediately after analysis. No data is stored on our servers.")
+    st.info(privacy_note())
 
     # START BUTTON
     if file_a and file_b:
@@ -147,11 +133,30 @@ def render_compare_mode(api_key):
 
     # RUN LOGIC
     if st.session_state.analyzing:
+        # The agents (google.adk) and tracing load on first use so the landing page renders fast
+        from shouldisignthis.orchestrator import run_stage_1, run_stage_1_5, run_debate_and_verification, run_stage_3, run_stage_5_arbiter
+        from shouldisignthis.observability.tracing import trace_span
+        from shouldisignthis.deadlines import pipeline_deadline
+        from shouldisignthis.ingestion import spool_upload
+        from shouldisignthis.observability.usage import track_usage
+
         # Run Parallel Pipelines
+        async def run_traced_pipeline(label, *args):
+            with trace_span("pipeline", contract=label, session_id=args[3]), PIPELINES_IN_FLIGHT.track_inprogress(), pipeline_deadline():
+                with track_usage() as usage:
+                    try:
+                        return await run_pipeline(*args)
+                    finally:
+                        st.session_state[args[4]]['served_by'] = usage.served_by
+
         async def run_parallel():
-            task_a = run_pipeline(file_a.getvalue(), file_a.type, "user_a", st.session_state.session_id_a, "pipeline_data_a", col1)
-            task_b = run_pipeline(file_b.getvalue(), file_b.type, "user_b", st.session_state.session_id_b, "pipeline_data_b", col2)
-            return await asyncio.gather(task_a, task_b)
+            # Both pipelines are child spans of one compare span
+            with trace_span("compare", session_id_a=st.session_state.session_id_a, session_id_b=st.session_state.session_id_b):
+                # Spooled to temp files and read page batch by page batch (deleted when done)
+                with spool_upload(file_a, file_a.type) as upload_a, spool_upload(file_b, file_b.type) as upload_b:
+                    task_a = run_traced_pipeline("A", upload_a, upload_a.mime_type, "user_a", st.session_state.session_id_a, "pipeline_data_a", col1)
+                    task_b = run_traced_pipeline("B", upload_b, upload_b.mime_type, "user_b", st.session_state.session_id_b, "pipeline_data_b", col2)
+                    return await asyncio.gather(task_a, task_b)
 
         with st.spinner("Running parallel analysis..."):
             try:
@@ -196,6 +201,11 @@ def render_compare_mode(api_key):
         with col_s2:
             st.metric("Contract B Risk Score", f"{v_b.get('risk_score')}/100", delta_color="inverse")
 
+        for label, data_key in (("A", "pipeline_data_a"), ("B", "pipeline_data_b")):
+            served_by = st.session_state[data_key].get('served_by') or {}
+            if any(model.endswith("(fallback)") for model in served_by.values()):
+                st.caption(f"⚠️ Contract {label} was partly answered by the fallback model: " + ", ".join(f"{agent} → {model}" for agent, model in served_by.items()))
+
         st.info(f"**Analysis Summary:** {res.get('comparison_summary')}")
         
         st.subheader("Key Differences")
@@ -219,6 +229,7 @@ def render_compare_mode(api_key):
         st.header("📧 Decision Brief")
         
         if 'comparison_email' not in st.session_state:
+            from shouldisignthis.orchestrator import run_stage_6_comparison_drafter
             try:
                 with st.spinner("Writing decision email..."):
                     email_toolkit = asyncio.run(run_stage_6_comparison_drafter("comparator_user", str(uuid.uuid4()), res, api_key=api_key))
@@ -250,6 +261,7 @@ def render_compare_mode(api_key):
             
             # --- PDF PREPARATION ---
             if 'comparison_pdf' not in st.session_state:
+                from shouldisignthis.tools.pdf_generator import create_comparison_report
                 with st.spinner("Preparing Comparison PDF..."):
                     v_a = st.session_state.pipeline_data_a.get('verdict', {})
                     v_b = st.session_state.pipeline_data_b.get('verdict', {})
@@ -0,0 +1,50 @@
+"""
+Privacy Note
+
+The upload itself is never kept, but the opt-in stores (near-duplicate index,
+clause cache, industry norms) keep data derived from analyzed contracts on the
+server's disk. The note shown next to the uploaders lists the ones enabled in
+this deployment; README "Privacy & Security" says how to purge them.
+"""
+
+from typing import List
+
+
+def enabled_stores() -> List[str]:
+    """
+    Describes what each enabled store keeps, and where.
+
+    Returns:
+        List[str]: One Markdown line per enabled store (empty when none is enabled).
+    """
+    from shouldisignthis.clause_cache import clause_cache_settings
+    from shouldisignthis.near_duplicates import near_duplicate_settings
+    from shouldisignthis.norms import norms_settings
+
+    stores = []
+    near = near_duplicate_settings()
+    if near["enabled"]:
+        stores.append(f"the **contract text and verdict** of each analysis, to recognize re-uploads (`{near['path']}`)")
+    clauses = clause_cache_settings()
+    if clauses["enabled"]:
+        kept = f"for {clauses['max_age_days']:g} days" if clauses["max_age_days"] else "until purged"
+        stores.append(f"the **risks and counter-arguments** found per clause, {kept} (`{clauses['path']}`)")
+    norms = norms_settings()
+    if norms["enabled"]:
+        stores.append(f"**industry norms** learned from public web sources, not from your contract's text (`{norms['path']}`)")
+    return stores
+
+
+def privacy_note() -> str:
+    """
+    Returns the privacy note for the upload page, matching the stores enabled in config.yaml.
+
+    Returns:
+        str: Markdown.
+    """
+    upload = "Your document is held in an unnamed temporary file only while it is analyzed and deleted immediately after."
+    stores = enabled_stores()
+    if not stores:
+        return f"🔒 **Privacy Note:** This application is **stateless**. {upload} No data is stored on our servers."
+    kept = "\n".join(f"- {store}" for store in stores)
+    return f"🔒 **Privacy Note:** {upload} This server keeps:\n{kept}"
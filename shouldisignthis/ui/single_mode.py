@@ -2,15 +2,7 @@ import streamlit as st
 import asyncio
 import uuid
 import os
-from shouldisignthis.orchestrator import (
-    run_stage_1,
-    run_stage_2,
-    run_stage_2_5,
-    run_stage_3,
-    run_stage_4,
-    parse_json
-)
-from shouldisignthis.tools.pdf_generator import create_contract_report
+from shouldisignthis.ui.privacy import privacy_note
 
 def render_single_mode(api_key):
     """
@@ -36,11 +28,43 @@ def render_single_mode(api_key):
         st.session_state.error_message = None
 
     # --- MAIN FLOW ---
+    def analysis_result(data):
+        # pipeline_data in the layout of a run_pipeline result
+        from shouldisignthis.orchestrator import parse_json
+        return {
+            "status": "COMPLETE",
+            "auditor": data['auditor'],
+            "skeptic": parse_json(data['stage2_state'].get('skeptic_risks')),
+            "advocate": parse_json(data['stage2_state'].get('advocate_defense')),
+            "evidence": data['evidence'],
+            "verdict": data['verdict'],
+            **({"revision": data['revision']} if data.get('revision') else {}),
+        }
+
     def reset_pipeline():
+        # A new upload may be the next revision of the contract analyzed last
+        if st.session_state.pipeline_data.get('verdict'):
+            st.session_state.previous_version = analysis_result(st.session_state.pipeline_data)
         st.session_state.pipeline_data = {}
         st.session_state.session_id = str(uuid.uuid4())
         st.session_state.analyzing = False
         st.session_state.error_message = None
+        st.session_state.pop("near_duplicate", None)
+
+    def as_pipeline_data(result):
+        # A run_pipeline / run_revision result, in the layout of pipeline_data
+        timed_out = [agent for agent in result.get("degraded") or [] if agent in ("Skeptic", "Advocate")]
+        return {
+            "auditor": result.get("auditor"),
+            "stage2_state": {"skeptic_risks": result.get("skeptic"), "advocate_defense": result.get("advocate"), **({"timed_out": timed_out} if timed_out else {})},
+            "evidence": result.get("evidence"),
+            "verdict": result.get("verdict"),
+            **({"served_by": result["served_by"]} if result.get("served_by") else {}),
+            **({"revision": result["revision"]} if result.get("revision") else {}),
+        }
+
+    def reuse_analysis(match):
+        return {**as_pipeline_data(match["result"]), "reused_from": {key: match[key] for key in ("id", "similarity", "changed_spans")}}
 
     uploaded_file = st.file_uploader(
         "Upload Contract (PDF/Image)", 
@@ -50,12 +74,29 @@ def render_single_mode(api_key):
         disabled=st.session_state.analyzing
     )
 
-    st.info("🔒 **Privacy Note:** This application is **stateless**. Your document is processed in-memory and deleted immediately after analysis. No data is stored on our servers.")
+    st.info(privacy_note())
 
     if uploaded_file:
-        # Security: File Size Limit (5MB)
-        if uploaded_file.size > 5 * 1024 * 1024:
-            st.error("❌ File too large. Maximum size is 5MB.")
+        # The agents (google.adk) load on first use so the landing page renders fast
+        from shouldisignthis.orchestrator import (
+            run_stage_1,
+            run_stage_1_5,
+            run_debate_and_verification,
+            run_stage_3,
+            run_stage_4,
+            run_revision,
+            parse_json
+        )
+        from shouldisignthis.config import APP_CONFIG
+        from shouldisignthis.deadlines import pipeline_deadline
+        from shouldisignthis.ingestion import get_ingestion_settings, spool_upload
+        from shouldisignthis.near_duplicates import get_near_duplicate_store, near_duplicate_settings
+        from shouldisignthis.observability.usage import track_usage
+
+        # Security: File Size Limit (ingestion.max_upload_mb)
+        max_upload_bytes = get_ingestion_settings(APP_CONFIG.get("ingestion", {}) or {})["max_upload_bytes"]
+        if uploaded_file.size > max_upload_bytes:
+            st.error(f"❌ File too large. Maximum size is {max_upload_bytes // (1024 * 1024)}MB.")
             st.stop()
 
         st.success(f"File uploaded: {uploaded_file.name}")
@@ -64,6 +105,31 @@ def render_single_mode(api_key):
         if st.session_state.error_message:
             st.error(st.session_state.error_message)
 
+        # NEAR DUPLICATE of an analyzed contract (by the PDF's text layer, no model call)
+        near_store = get_near_duplicate_store()
+        if near_store is not None and "near_duplicate" not in st.session_state:
+            with spool_upload(uploaded_file, uploaded_file.type) as upload:
+                text = upload.extract_text()
+            st.session_state.near_duplicate = {"text": text, "match": near_store.find(text) if text else None}
+        match = (st.session_state.get("near_duplicate") or {}).get("match")
+        if match and not st.session_state.pipeline_data and not st.session_state.analyzing:
+            # Auto-apply only when nothing but dates and party names changed; otherwise offer it
+            if near_duplicate_settings()["mode"] == "auto" and match.get("cosmetic"):
+                st.session_state.pipeline_data = reuse_analysis(match)
+                st.rerun()
+            st.info(f"🧬 This contract is a {match['similarity']:.0%} match for one analyzed before ({len(match['changed_spans'])} changed spans).")
+            if st.button("♻️ Use the previous verdict"):
+                st.session_state.pipeline_data = reuse_analysis(match)
+                st.rerun()
+
+        # REVISION of the contract analyzed before (only the redlined clauses are re-analyzed)
+        previous_version = st.session_state.get("previous_version")
+        as_revision = previous_version is not None and st.checkbox(
+            "📝 This is a revised version of the contract analyzed before (re-analyze only what changed)",
+            key="as_revision",
+            disabled=st.session_state.analyzing
+        )
+
         # START BUTTON
         if st.button("Start Analysis", type="primary", disabled=st.session_state.analyzing):
             st.session_state.analyzing = True
@@ -72,88 +138,140 @@ def render_single_mode(api_key):
             st.rerun()
 
         # RUN LOGIC
-        if st.session_state.analyzing:
-            # STAGE 1
+        if st.session_state.analyzing and as_revision:
             try:
-                with st.status("🔍 **Stage 1: The Auditor is scanning the document...**", expanded=True) as status:
-                    st.write("Extracting text and identifying key clauses...")
-                    file_bytes = uploaded_file.getvalue()
-                    mime_type = uploaded_file.type
-                    
-                    auditor_out = asyncio.run(run_stage_1(file_bytes, mime_type, "streamlit_user", st.session_state.session_id, api_key=api_key))
-                    
-                    if auditor_out and auditor_out.get("is_contract"):
-                        # SAFETY CHECK
-                        if auditor_out.get("is_safe") is False:
-                            st.session_state.error_message = f"🚫 Document Rejected: Unsafe Content. Reason: {auditor_out.get('safety_reason')}"
-                            st.session_state.analyzing = False
-                            st.rerun()
-    
-                        st.session_state.pipeline_data['auditor'] = auditor_out
-                        status.update(label="✅ Stage 1 Complete: Contract Ingested", state="complete", expanded=False)
+                with st.status("📝 **Re-analyzing the revised clauses...**", expanded=True) as status:
+                    st.write("Comparing this version with the previous one; only the changes go back to the agents...")
+                    with spool_upload(uploaded_file, uploaded_file.type) as upload:
+                        result = asyncio.run(run_revision(upload, upload.mime_type, previous_version, "streamlit_user", st.session_state.session_id, api_key=api_key))
+                    if result["status"] == "REJECTED":
+                        st.session_state.error_message = f"🚫 Document Rejected. Reason: {(result.get('auditor') or {}).get('safety_reason') or 'Not a contract.'}"
                     else:
-                        st.session_state.error_message = "🚫 Document rejected: Not a contract."
-                        st.session_state.analyzing = False
-                        st.rerun()
+                        st.session_state.pipeline_data = as_pipeline_data(result)
+                        status.update(label="✅ Revision Analyzed", state="complete", expanded=False)
             except Exception as e:
-                st.session_state.error_message = f"⚠️ Stage 1 (Auditor) Failed: {e}"
-                st.session_state.analyzing = False
-                st.rerun()
+                st.session_state.error_message = f"⚠️ Revision analysis failed: {e}"
+            st.session_state.analyzing = False
+            st.rerun()
 
-            # STAGE 2
-            try:
-                with st.status("⚔️ **Stage 2: The Debate Team is arguing...**", expanded=True) as status:
-                    st.write("The **Skeptic** is hunting for risks while the **Advocate** searches for industry norms...")
-                    fact_sheet = st.session_state.pipeline_data['auditor'].get('fact_sheet')
+        if st.session_state.analyzing:
+            # The stages share the pipeline deadline (each stage also has its own);
+            # usage records which model answered each agent
+            with pipeline_deadline(), track_usage() as usage:
+                # STAGE 1
+                try:
+                    with st.status("🔍 **Stage 1: The Auditor is scanning the document...**", expanded=True) as status:
+                        st.write("Extracting text and identifying key clauses...")
+                        # Spooled to a temp file and read page batch by page batch (deleted when done)
+                        with spool_upload(uploaded_file, uploaded_file.type) as upload:
+                            auditor_out = asyncio.run(run_stage_1(upload, upload.mime_type, "streamlit_user", st.session_state.session_id, api_key=api_key))
+                            # Stage 1.5: fields the Auditor was unsure of are re-read from their pages
+                            if auditor_out and auditor_out.get("is_contract") and auditor_out.get("is_safe") is not False:
+                                auditor_out = asyncio.run(run_stage_1_5(upload, upload.mime_type, auditor_out, "streamlit_user", st.session_state.session_id, api_key=api_key))
                     
-                    state, duration = asyncio.run(run_stage_2("streamlit_user", st.session_state.session_id, fact_sheet, api_key=api_key))
-                    st.session_state.pipeline_data['stage2_state'] = state
-                    status.update(label="✅ Stage 2 Complete: Arguments Filed", state="complete", expanded=False)
-            except Exception as e:
-                st.session_state.error_message = f"⚠️ Stage 2 (Debate) Failed: {e}"
-                st.session_state.analyzing = False
-                st.rerun()
+                        if auditor_out and auditor_out.get("is_contract"):
+                            # SAFETY CHECK
+                            if auditor_out.get("is_safe") is False:
+                                st.session_state.error_message = f"🚫 Document Rejected: Unsafe Content. Reason: {auditor_out.get('safety_reason')}"
+                                st.session_state.analyzing = False
+                                st.rerun()
+    
+                            st.session_state.pipeline_data['auditor'] = auditor_out
+                            upload_stats = auditor_out.get("upload") or {}
+                            if upload_stats.get("bytes_after", 0) < upload_stats.get("bytes_before", 0):
+                                tokens_saved = (upload_stats.get("tokens_before") or 0) - (upload_stats.get("tokens_after") or 0)
+                                st.write(f"🗜️ Upload slimmed: {upload_stats['bytes_before'] / 1024:.0f} KB → {upload_stats['bytes_after'] / 1024:.0f} KB, ~{tokens_saved} tokens saved")
+                            for first_page, last_page in auditor_out.get("timed_out_pages") or []:
+                                st.warning(f"⏰ The Auditor ran out of time on pages {first_page}-{last_page}; they are not in the fact sheet.")
+                            refinement = auditor_out.get("refinement")
+                            if refinement:
+                                st.write(f"🔎 Re-checked {len(refinement['requested'])} uncertain fact field(s); {len(refinement['improved'])} improved")
+                            status.update(label="✅ Stage 1 Complete: Contract Ingested", state="complete", expanded=False)
+                        else:
+                            st.session_state.error_message = "🚫 Document rejected: Not a contract."
+                            st.session_state.analyzing = False
+                            st.rerun()
+                except Exception as e:
+                    st.session_state.error_message = f"⚠️ Stage 1 (Auditor) Failed: {e}"
+                    st.session_state.analyzing = False
+                    st.rerun()
 
-            # STAGE 2.5
-            try:
-                with st.status("🕵️ **Stage 2.5: The Bailiff is verifying facts...**", expanded=True) as status:
-                    st.write("Checking for hallucinations and verifying citations against the contract text...")
-                    
-                    risks = parse_json(st.session_state.pipeline_data['stage2_state'].get('skeptic_risks', {})).get('risks', [])
-                    counters = parse_json(st.session_state.pipeline_data['stage2_state'].get('advocate_defense', {})).get('counters', [])
-                    full_text = st.session_state.pipeline_data['auditor'].get('full_text')
-                    
-                    validated_evidence = asyncio.run(run_stage_2_5("streamlit_user", st.session_state.session_id, risks, counters, full_text, api_key=api_key))
-                    st.session_state.pipeline_data['evidence'] = validated_evidence
-                    status.update(label="✅ Stage 2.5 Complete: Evidence Secured", state="complete", expanded=False)
-            except Exception as e:
-                st.session_state.error_message = f"⚠️ Stage 2.5 (Bailiff) Failed: {e}"
-                st.session_state.analyzing = False
-                st.rerun()
+                # STAGE 2 + 2.5 (with debate.pipelined_bailiff, the Bailiff starts on the risks while the Advocate searches)
+                try:
+                    with st.status("⚔️ **Stage 2: The Debate Team is arguing...**", expanded=True) as status:
+                        st.write("The **Skeptic** is hunting for risks while the **Advocate** searches for industry norms...")
+                        st.write("🕵️ The **Bailiff** then checks every argument against the contract text...")
+                        fact_sheet = st.session_state.pipeline_data['auditor'].get('fact_sheet')
+                        full_text = st.session_state.pipeline_data['auditor'].get('full_text')
 
-            # STAGE 3
-            try:
-                with st.status("👨‍⚖️ **Stage 3: The Judge is deliberating...**", expanded=True) as status:
-                    st.write("Weighing the arguments and calculating the final Risk Score...")
+                        state, validated_evidence, timings = asyncio.run(run_debate_and_verification("streamlit_user", st.session_state.session_id, fact_sheet, full_text, api_key=api_key))
+                        st.session_state.pipeline_data['stage2_state'] = state
+                        st.session_state.pipeline_data['evidence'] = validated_evidence
+                        st.session_state.pipeline_data.setdefault('timings', {}).update(timings)
+                        status.update(label=f"✅ Stage 2 & 2.5 Complete: Arguments Filed and Verified ({timings['stage_2']:.1f}s + {timings['stage_2_5']:.1f}s)", state="complete", expanded=False)
+                except Exception as e:
+                    st.session_state.error_message = f"⚠️ Stage 2 (Debate / Bailiff) Failed: {e}"
+                    st.session_state.analyzing = False
+                    st.rerun()
+
+                # STAGE 3
+                try:
+                    with st.status("👨‍⚖️ **Stage 3: The Judge is deliberating...**", expanded=True) as status:
+                        st.write("Weighing the arguments and calculating the final Risk Score...")
                     
-                    verdict = asyncio.run(run_stage_3("streamlit_user", st.session_state.session_id, fact_sheet, st.session_state.pipeline_data['evidence'], api_key=api_key))
-                    st.session_state.pipeline_data['verdict'] = verdict
-                    status.update(label="✅ Stage 3 Complete: Verdict Issued", state="complete", expanded=False)
-            except Exception as e:
-                st.session_state.error_message = f"⚠️ Stage 3 (Judge) Failed: {e}"
-                st.session_state.analyzing = False
-                st.rerun()
+                        verdict = asyncio.run(run_stage_3("streamlit_user", st.session_state.session_id, fact_sheet, st.session_state.pipeline_data['evidence'], api_key=api_key))
+                        st.session_state.pipeline_data['verdict'] = verdict
+                        status.update(label="✅ Stage 3 Complete: Verdict Issued", state="complete", expanded=False)
+                except Exception as e:
+                    st.session_state.error_message = f"⚠️ Stage 3 (Judge) Failed: {e}"
+                    st.session_state.analyzing = False
+                    st.rerun()
             
             # Done
+            st.session_state.pipeline_data['served_by'] = usage.served_by
+            # Only complete analyses are offered for reuse
+            data = st.session_state.pipeline_data
+            near_text = (st.session_state.get("near_duplicate") or {}).get("text")
+            if near_store is not None and near_text and data.get('verdict') and not data['auditor'].get('timed_out_pages') and not data['stage2_state'].get('timed_out') and not data['evidence'].get('unverified'):
+                near_store.add(near_text, analysis_result(data))
             st.session_state.analyzing = False
             st.rerun()
 
         # --- DISPLAY RESULTS (Persistent) ---
+        reused_from = st.session_state.pipeline_data.get('reused_from')
+        if reused_from:
+            st.info(f"🧬 Analysis reused from a {reused_from['similarity']:.0%} similar contract analyzed before. Check the changed spans below before relying on it.")
+            with st.expander(f"🔀 Changed spans ({len(reused_from['changed_spans'])})", expanded=True):
+                st.dataframe(
+                    [{"Before": span["before"], "After": span["after"]} for span in reused_from['changed_spans']],
+                    use_container_width=True, hide_index=True
+                )
+
+        revision = st.session_state.pipeline_data.get('revision')
+        if revision and revision.get('full'):
+            st.info(f"📝 Revision {revision['version']} was analyzed in full: {revision['reason']}.")
+        elif revision:
+            st.info(
+                f"📝 Revision {revision['version']}: {revision['changed_passages']} of {revision['passages']} passages changed; "
+                f"{len(revision['reanalyzed_clauses'])} clause(s) re-analyzed, {revision['reused_clauses']} kept from the previous version."
+            )
+            if revision['changes']:
+                with st.expander(f"🔀 Redline ({len(revision['changes'])} changes)", expanded=True):
+                    st.dataframe(
+                        [{"Page": change["page"], "Before": change["before"], "After": change["after"]} for change in revision['changes']],
+                        use_container_width=True, hide_index=True
+                    )
+
         if 'auditor' in st.session_state.pipeline_data:
             with st.expander("✅ Stage 1: Fact Sheet", expanded=False):
                 st.json(st.session_state.pipeline_data['auditor'].get("fact_sheet"))
 
         if 'stage2_state' in st.session_state.pipeline_data:
+            if st.session_state.pipeline_data['stage2_state'].get('timed_out'):
+                st.warning(f"⏰ Ran out of time for: {', '.join(st.session_state.pipeline_data['stage2_state']['timed_out'])}. The verdict is based on the remaining arguments.")
+            clause_cache = st.session_state.pipeline_data['stage2_state'].get('clause_cache')
+            if clause_cache and clause_cache['hits']:
+                st.caption(f"♻️ {clause_cache['hits']} of {clause_cache['hits'] + clause_cache['misses']} clauses reused from earlier analyses")
             with st.expander("✅ Stage 2: Debate Arguments", expanded=False):
                 col1, col2 = st.columns(2)
                 with col1:
@@ -164,6 +282,8 @@ def render_single_mode(api_key):
                     st.json(parse_json(st.session_state.pipeline_data['stage2_state'].get('advocate_defense')))
 
         if 'evidence' in st.session_state.pipeline_data:
+            if st.session_state.pipeline_data['evidence'].get('unverified'):
+                st.warning("⏰ The Bailiff ran out of time; the evidence was not verified against the contract text.")
             with st.expander("✅ Stage 2.5: Validated Evidence", expanded=False):
                 st.json(st.session_state.pipeline_data['evidence'])
 
@@ -189,6 +309,12 @@ def render_single_mode(api_key):
                     st.success(f"✅ **VERDICT: {v_str}**")
                     st.info(verdict.get('summary'))
 
+            served_by = st.session_state.pipeline_data.get('served_by') or {}
+            if served_by:
+                st.caption("🤖 Answered by: " + ", ".join(f"{agent} → {model}" for agent, model in served_by.items()))
+                if any(model.endswith("(fallback)") for model in served_by.values()):
+                    st.warning("⚠️ The primary model was unavailable for some stages; they were answered by the fallback model.")
+
             # --- STAGE 4: AUTO DRAFTER ---
             st.divider()
             st.header("✍️ Negotiation Toolkit")
@@ -236,6 +362,7 @@ def render_single_mode(api_key):
                 
                 # --- PDF PREPARATION ---
                 if 'pdf_report' not in st.session_state.pipeline_data:
+                    from shouldisignthis.tools.pdf_generator import create_contract_report
                     with st.spinner("Preparing PDF Report..."):
                         risks_data = parse_json(st.session_state.pipeline_data['stage2_state'].get('skeptic_risks', {})).get('risks', [])
                         pdf_buffer = create_contract_report(
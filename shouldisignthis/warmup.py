@@ -0,0 +1,227 @@
+"""
+Start-up Warm-up
+
+Pays the first-request costs at process start instead of on the first user
+request: imports the agents (google.adk, google.genai) and reportlab, builds
+the agent tree and Runner of every stage, constructs the model clients,
+primes the caches (replay recordings, cassette, tracer, PDF fonts) and, when
+`warmup.smoke_request` is set, runs one request end-to-end through a Runner
+against the local replay model (no API call, no tokens).
+
+`python -m shouldisignthis.serve` warms up before Streamlit opens its port;
+app.py (plain `streamlit run`) and the workers also call it once per
+process. Readiness (the
+`shouldisignthis_ready` gauge and the /ready endpoint of the metrics server)
+flips only when warm-up has finished, so a startup probe can hold traffic
+until then.
+
+Usage:
+    start_warmup()          # app.py: in a background thread, once per process
+    warm_up(api_key=key)    # Worker: inline before claiming jobs
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from shouldisignthis.config import APP_CONFIG
+from shouldisignthis.observability.metrics import APP_READY, WARMUP_DURATION
+
+_warmup_thread: Optional[threading.Thread] = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup_settings(warmup_cfg: Dict) -> Dict:
+    """
+    Reads the warm-up settings from the 'warmup' config section (env vars take priority).
+    SHOULDISIGNTHIS_WARMUP=0 disables warm-up, =1 enables it.
+
+    Args:
+        warmup_cfg (Dict): The 'warmup' section of the app config.
+
+    Returns:
+        Dict: {"enabled": bool, "smoke_request": bool}.
+    """
+    env_enabled = os.environ.get("SHOULDISIGNTHIS_WARMUP")
+    if env_enabled is not None:
+        enabled = env_enabled.strip().lower() not in ("0", "false", "no", "off", "")
+    else:
+        enabled = bool(warmup_cfg.get("enabled", True))
+    return {
+        "enabled": enabled,
+        "smoke_request": bool(warmup_cfg.get("smoke_request", True)),
+    }
+
+
+def is_ready() -> bool:
+    """Returns True once warm-up has completed (or was skipped)."""
+    return APP_READY.get() >= 1
+
+
+def mark_ready(duration: float = 0.0) -> None:
+    """
+    Flips the readiness signal.
+
+    Args:
+        duration (float, optional): Warm-up wall time in seconds. Defaults to 0.
+    """
+    WARMUP_DURATION.set(duration)
+    APP_READY.set(1)
+
+
+def _models_of(agent) -> List:
+    """Returns the model objects of an agent tree (innermost model of each wrapper chain)."""
+    from google.adk.models.base_llm import BaseLlm
+    from shouldisignthis.llm.base import DelegatingLlm
+
+    models = []
+    model = getattr(agent, "model", None)
+    if isinstance(model, DelegatingLlm):
+        model = model.innermost
+    if isinstance(model, BaseLlm):
+        models.append(model)
+    for sub_agent in getattr(agent, "sub_agents", None) or []:
+        models.extend(_models_of(sub_agent))
+    return models
+
+
+async def _smoke_request() -> None:
+    """Runs one request through an App/Runner backed by the zero-latency replay model."""
+    from google.adk.agents import LlmAgent
+    from google.adk.apps.app import App
+    from google.adk.runners import Runner
+    from google.genai import types
+    from shouldisignthis.config import models_cfg
+    from shouldisignthis.database import get_session_service
+    from shouldisignthis.llm.replay import ReplayLlm
+
+    agent = LlmAgent(
+        name="Warmup",
+        model=ReplayLlm(model=models_cfg.get("worker", "replay"), tier="worker", latency_scale=0),
+        instruction="ROLE: Professional Legal Correspondent\nWrite a short note.",
+        output_key="warmup_output",
+    )
+    runner = Runner(app=App(name="Warmup_App", root_agent=agent), session_service=get_session_service())
+    session = await get_session_service().create_session(app_name="Warmup_App", user_id="warmup")
+    try:
+        message = types.Content(role="user", parts=[types.Part(text="Warm-up request.")])
+        async for _ in runner.run_async(user_id="warmup", session_id=session.id, new_message=message):
+            pass
+    finally:
+        await get_session_service().delete_session(app_name="Warmup_App", user_id="warmup", session_id=session.id)
+
+
+def warm_up(api_key: Optional[str] = None) -> Dict:
+    """
+    Runs the warm-up steps (each one is timed; a failing step is logged and skipped).
+
+    Args:
+        api_key (Optional[str], optional): Google API Key for the model clients. Defaults to GOOGLE_API_KEY.
+
+    Returns:
+        Dict: {"ok": bool, "total_seconds": float, "steps": {step: seconds}, "errors": {step: message}}.
+    """
+    settings = get_warmup_settings(APP_CONFIG.get("warmup", {}) or {})
+    result = {"ok": True, "total_seconds": 0.0, "steps": {}, "errors": {}}
+    runners = []
+    start_all = time.perf_counter()
+
+    def step(name, func):
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            result["ok"] = False
+            result["errors"][name] = str(e)
+            logging.warning(f"⚠️ Warm-up step '{name}' failed: {e}")
+        result["steps"][name] = round(time.perf_counter() - start, 4)
+
+    def imports():
+        import shouldisignthis.orchestrator  # noqa: F401 (agents, google.adk, google.genai)
+        import shouldisignthis.tools.pdf_generator  # noqa: F401 (reportlab)
+
+    def agents():
+        from shouldisignthis import orchestrator
+        stages = [
+            ("Auditor_App", orchestrator.get_auditor_agent),
+            ("Debate_App", orchestrator.get_debate_team),
+            ("Auditor_App", orchestrator.get_citation_loop),
+            ("Auditor_App", orchestrator.get_judge_agent),
+            ("Auditor_App", orchestrator.get_drafter_agent),
+            ("Arbiter_App", orchestrator.get_arbiter_agent),
+            ("ComparisonDrafter_App", orchestrator.get_comparison_drafter_agent),
+        ]
+        for app_name, agent_factory in stages:
+            runners.append(orchestrator.build_runner(agent_factory, app_name, api_key=api_key))
+
+    def clients():
+        # Built outside an event loop: this pays for the client imports, auth and
+        # TLS context; each event loop then opens its own connections.
+        if not (api_key or os.environ.get("GOOGLE_API_KEY")):
+            logging.info("⏭️ Warm-up: no API key, model clients are built on first request")
+            return
+        seen = set()
+        for runner in runners:
+            for model in _models_of(runner.agent):
+                if id(model) not in seen and hasattr(type(model), "api_client"):
+                    seen.add(id(model))
+                    model.api_client
+
+    def caches():
+        from shouldisignthis.config import get_model_backend
+        from shouldisignthis.observability.tracing import get_tracer
+        from shouldisignthis.tools.pdf_generator import create_contract_report
+        if get_model_backend() == "replay":
+            from shouldisignthis.llm.replay import get_replay_library
+            get_replay_library()
+        get_tracer()
+        # Loads reportlab's fonts and page templates
+        create_contract_report(filename="warmup.pdf", verdict="ACCEPT", risk_score=100, summary="Warm-up.", risks=[])
+
+    step("imports", imports)
+    step("agents", agents)
+    step("clients", clients)
+    step("caches", caches)
+    if settings["smoke_request"]:
+        step("smoke_request", lambda: asyncio.run(_smoke_request()))
+
+    result["total_seconds"] = round(time.perf_counter() - start_all, 4)
+    steps = ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in result["steps"].items())
+    logging.info(f"🔥 Warm-up finished in {result['total_seconds']:.2f}s ({steps})")
+    return result
+
+
+def start_warmup(api_key: Optional[str] = None) -> Optional[threading.Thread]:
+    """
+    Starts warm-up in a daemon thread, once per process; readiness flips when it ends.
+    With warm-up disabled, the process is marked ready immediately.
+
+    Args:
+        api_key (Optional[str], optional): Google API Key for the model clients. Defaults to GOOGLE_API_KEY.
+
+    Returns:
+        Optional[threading.Thread]: The warm-up thread (None when disabled).
+    """
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is not None or is_ready():
+            return _warmup_thread
+        if not get_warmup_settings(APP_CONFIG.get("warmup", {}) or {})["enabled"]:
+            mark_ready()
+            return None
+
+        def run():
+            start = time.perf_counter()
+            try:
+                warm_up(api_key=api_key)
+            except Exception as e:
+                # Never hold readiness forever; the first request pays instead
+                logging.warning(f"⚠️ Warm-up failed: {e}")
+            mark_ready(time.perf_counter() - start)
+
+        _warmup_thread = threading.Thread(target=run, name="warmup", daemon=True)
+        _warmup_thread.start()
+        return _warmup_thread
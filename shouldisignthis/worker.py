@@ -0,0 +1,267 @@
+"""
+Batch Worker Pool
+
+Runs N worker processes that pull contracts from the durable job queue and
+run the headless analysis pipeline on them. Every process has its own GIL and
+event loop, so CPU-side work (PDF rendering, JSON handling, logging) no longer
+competes with the Streamlit UI.
+
+Usage:
+    # Queue contracts
+    python -m shouldisignthis.worker enqueue contract1.pdf contract2.pdf
+
+    # Start 4 workers (can be run on several nodes sharing the queue file)
+    python -m shouldisignthis.worker run --workers 4
+
+    # Check progress
+    python -m shouldisignthis.worker status
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import mimetypes
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, List, Optional
+
+from shouldisignthis.config import APP_CONFIG, configure_logging
+from shouldisignthis.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue, get_worker_config
+from shouldisignthis.observability.metrics import QUEUE_JOBS, get_metrics_settings, start_metrics_server
+from shouldisignthis.warmup import get_warmup_settings, mark_ready, warm_up
+
+DEFAULT_PIPELINE = "shouldisignthis.orchestrator:run_pipeline"
+
+
+def load_pipeline(path: str) -> Callable:
+    """
+    Resolves a 'module:function' path to the async pipeline callable.
+
+    Args:
+        path (str): e.g. 'shouldisignthis.orchestrator:run_pipeline'.
+
+    Returns:
+        Callable: The coroutine function to run per job.
+    """
+    module_name, func_name = path.split(":")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def _heartbeat_loop(queue: JobQueue, job_id: str, worker_id: str, stop: threading.Event, lease_seconds: float, interval: float):
+    """Keeps the job lease alive until the job finishes."""
+    while not stop.wait(interval):
+        if not queue.heartbeat(job_id, worker_id, lease_seconds):
+            logging.warning(f"⚠️ [{worker_id}] Lost lease on job {job_id}")
+            return
+
+
+def process_job(queue: JobQueue, job: dict, worker_id: str, pipeline: Callable, api_key: Optional[str] = None) -> bool:
+    """
+    Runs the pipeline on one claimed job, heartbeating while it runs.
+
+    Args:
+        queue (JobQueue): The job queue.
+        job (dict): The claimed job record.
+        worker_id (str): ID of this worker.
+        pipeline (Callable): Async pipeline callable.
+        api_key (str, optional): Google API Key. Defaults to None.
+
+    Returns:
+        bool: True if the job completed successfully (False if it failed or the lease was lost).
+    """
+    cfg = get_worker_config()
+    stop = threading.Event()
+    beat = threading.Thread(
+        target=_heartbeat_loop,
+        args=(queue, job["id"], worker_id, stop, cfg["lease_seconds"], cfg["heartbeat_seconds"]),
+        daemon=True
+    )
+    beat.start()
+    start = time.time()
+    try:
+        result = asyncio.run(pipeline(
+            job["payload"],
+            job["mime_type"],
+            f"worker_{worker_id}",
+            job["id"],
+            api_key=api_key,
+            tone=job["options"].get("tone")
+        ))
+        result["job"] = {"worker_id": worker_id, "started_at": start, "duration": time.time() - start, "filename": job["filename"]}
+        if not queue.complete(job["id"], worker_id, result):
+            # The lease expired and the job went back to the queue (or to another worker); this result is discarded
+            logging.warning(f"⚠️ [{worker_id}] Lost lease on job {job['id']} after {time.time() - start:.2f}s; result discarded")
+            return False
+        logging.info(f"✅ [{worker_id}] Job {job['id']} done in {time.time() - start:.2f}s")
+        return True
+    except Exception as e:
+        logging.error(f"❌ [{worker_id}] Job {job['id']} failed: {e}\n{traceback.format_exc()}")
+        queue.fail(job["id"], worker_id, f"{type(e).__name__}: {e}")
+        return False
+    finally:
+        stop.set()
+        beat.join()
+
+
+def worker_main(worker_id: str, queue_path: str, pipeline_path: str, stop_event=None, exit_when_empty: bool = False, ready_event=None):
+    """
+    Entry point of a single worker process: claim, run, repeat.
+
+    Args:
+        worker_id (str): Unique ID for this worker.
+        queue_path (str): Path to the shared queue file.
+        pipeline_path (str): 'module:function' of the async pipeline.
+        stop_event (multiprocessing.Event, optional): Set to request a graceful shutdown.
+        exit_when_empty (bool, optional): Exit once the queue has no runnable jobs. Defaults to False.
+        ready_event (multiprocessing.Event, optional): Set once this worker has warmed up.
+    """
+    configure_logging(log_file_override=f"worker_{os.getpid()}.log")
+    cfg = get_worker_config()
+    queue = JobQueue(queue_path)
+    pipeline = load_pipeline(pipeline_path)
+    api_key = os.environ.get("GOOGLE_API_KEY")
+    # Only the agent pipeline has anything to warm up (benchmarks plug in fake ones)
+    if get_warmup_settings(APP_CONFIG.get("warmup", {}) or {})["enabled"] and pipeline_path == DEFAULT_PIPELINE:
+        warm_up(api_key=api_key)
+    if ready_event is not None:
+        ready_event.set()
+
+    logging.info(f"👷 [{worker_id}] Worker started (pid={os.getpid()}, queue={queue_path})")
+    while stop_event is None or not stop_event.is_set():
+        job = queue.claim(worker_id, cfg["lease_seconds"])
+        if job is None:
+            if exit_when_empty:
+                break
+            time.sleep(cfg["poll_interval_seconds"])
+            continue
+        process_job(queue, job, worker_id, pipeline, api_key=api_key)
+    logging.info(f"👋 [{worker_id}] Worker stopped")
+
+
+def _await_first_warmup(ready_event, processes: List, started: float, poll_seconds: float = 0.5) -> bool:
+    """
+    Flips the pool's readiness signal once the first worker has warmed up.
+
+    Args:
+        ready_event (multiprocessing.Event): Set by a worker after its warm-up.
+        processes (List): The worker processes.
+        started (float): time.perf_counter() when they were started.
+        poll_seconds (float, optional): How often to check that a worker is still alive. Defaults to 0.5.
+
+    Returns:
+        bool: True if the pool was marked ready, False if every worker exited first.
+    """
+    while not ready_event.wait(poll_seconds):
+        if not any(p.is_alive() for p in processes):
+            logging.error("❌ Every worker exited before warming up; the pool never became ready")
+            return False
+    mark_ready(time.perf_counter() - started)
+    logging.info(f"🔥 Worker pool ready in {time.perf_counter() - started:.2f}s")
+    return True
+
+
+def run_pool(num_workers: int, queue_path: str, pipeline_path: str = DEFAULT_PIPELINE, exit_when_empty: bool = False) -> None:
+    """
+    Starts worker processes and waits for them (Ctrl+C for graceful shutdown).
+
+    Args:
+        num_workers (int): Number of worker processes.
+        queue_path (str): Path to the shared queue file.
+        pipeline_path (str, optional): 'module:function' of the async pipeline.
+        exit_when_empty (bool, optional): Stop workers once the queue drains. Defaults to False.
+    """
+    if get_metrics_settings(APP_CONFIG.get("metrics", {}) or {})["enabled"]:
+        # Queue depth is read from the shared queue file at scrape time
+        queue = JobQueue(queue_path)
+        for status in (QUEUED, RUNNING, DONE, FAILED):
+            QUEUE_JOBS.set_function(lambda status=status: queue.stats()[status], status=status.lower())
+        start_metrics_server()
+
+    # Each worker process keeps its own key pool accounting; split the per-key quotas between them
+    os.environ.setdefault("SHOULDISIGNTHIS_KEY_POOL_SHARE", str(1 / max(1, num_workers)))
+
+    ctx = multiprocessing.get_context("spawn")
+    stop_event = ctx.Event()
+    ready_event = ctx.Event()
+    host = socket.gethostname()
+    processes = []
+    started = time.perf_counter()
+    for i in range(num_workers):
+        worker_id = f"{host}-{i}-{uuid.uuid4().hex[:6]}"
+        p = ctx.Process(target=worker_main, args=(worker_id, queue_path, pipeline_path, stop_event, exit_when_empty, ready_event))
+        p.start()
+        processes.append(p)
+    # Workers warm up before claiming jobs; the pool is ready once the first one can take a job
+    threading.Thread(target=_await_first_warmup, args=(ready_event, processes, started), name="pool-readiness", daemon=True).start()
+
+    try:
+        for p in processes:
+            p.join()
+    except KeyboardInterrupt:
+        print("🛑 Stopping workers after their current job...")
+        stop_event.set()
+        for p in processes:
+            p.join()
+
+
+def enqueue_files(paths: List[str], queue_path: str, tone: Optional[str] = None) -> List[str]:
+    """
+    Adds files to the queue.
+
+    Args:
+        paths (List[str]): Contract files (PDF/Image).
+        queue_path (str): Path to the shared queue file.
+        tone (str, optional): If set, the workers also run the Drafter.
+
+    Returns:
+        List[str]: The job IDs, in the order of `paths`.
+    """
+    queue = JobQueue(queue_path)
+    job_ids = []
+    for path in paths:
+        mime_type = mimetypes.guess_type(path)[0] or "application/pdf"
+        with open(path, "rb") as f:
+            job_ids.append(queue.enqueue(f.read(), mime_type, os.path.basename(path), options={"tone": tone} if tone else {}))
+    return job_ids
+
+
+if __name__ == "__main__":
+    cfg = get_worker_config()
+    parser = argparse.ArgumentParser(description="ShouldISignThis? batch worker pool.")
+    parser.add_argument("--queue", type=str, default=cfg["queue_path"], help="Path to the SQLite job queue")
+    sub = parser.add_subparsers(dest="command")
+
+    run_p = sub.add_parser("run", help="Start worker processes")
+    run_p.add_argument("--workers", type=int, default=cfg["num_workers"], help="Number of worker processes")
+    run_p.add_argument("--pipeline", type=str, default=DEFAULT_PIPELINE, help="Async pipeline as module:function")
+    run_p.add_argument("--exit-when-empty", action="store_true", help="Stop once the queue is drained")
+
+    enq_p = sub.add_parser("enqueue", help="Queue contract files")
+    enq_p.add_argument("files", nargs="+", help="Contract files (PDF/Image)")
+    enq_p.add_argument("--tone", type=str, help="Also draft a negotiation email with this tone")
+
+    status_p = sub.add_parser("status", help="Show queue or job status")
+    status_p.add_argument("job_id", nargs="?", help="Job ID (omit for queue summary)")
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run_pool(args.workers, args.queue, args.pipeline, args.exit_when_empty)
+    elif args.command == "enqueue":
+        for path, job_id in zip(args.files, enqueue_files(args.files, args.queue, args.tone)):
+            print(f"📥 {path} -> {job_id}")
+    elif args.command == "status":
+        queue = JobQueue(args.queue)
+        if args.job_id:
+            print(json.dumps(queue.get(args.job_id), indent=2))
+        else:
+            print(json.dumps(queue.stats(), indent=2))
+    else:
+        parser.print_help()